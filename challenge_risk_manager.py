@@ -8,10 +8,11 @@ from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, date
-import json
 from pathlib import Path
 import logging
 
+from tradr.utils.state_store import StateStore, get_state_store, get_write_behind
+
 log = logging.getLogger(__name__)
 
 
@@ -108,11 +109,16 @@ class ChallengeRiskManager:
         self,
         config: ChallengeConfig,
         mt5_client: Any = None,
-        state_file: str = "challenge_risk_state.json"
+        state_file: str = "challenge_risk_state.json",
+        store: Optional[StateStore] = None,
     ):
         self.config = config
         self.mt5 = mt5_client
+        # Persisted in the state store under the legacy file's stem (migrated on first use)
         self.state_file = Path(state_file)
+        self.store = store or get_state_store()
+        self.writer = get_write_behind(self.store)
+        self.namespace = self.state_file.stem
         
         # State tracking
         self.starting_balance: float = config.account_size
@@ -136,12 +142,11 @@ class ChallengeRiskManager:
         self._load_state()
     
     def _load_state(self):
-        """Load persisted state from file."""
-        if self.state_file.exists():
+        """Load persisted state from the state store."""
+        self.store.migrate_json(self.namespace, self.state_file)
+        state = self.store.items(self.namespace)
+        if state:
             try:
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                
                 self.starting_balance = state.get('starting_balance', self.config.account_size)
                 self.peak_equity = state.get('peak_equity', self.config.account_size)
                 self.day_start_balance = state.get('day_start_balance', self.config.account_size)
@@ -153,10 +158,15 @@ class ChallengeRiskManager:
                     
                 log.info(f"Loaded challenge state: peak_equity=${self.peak_equity:,.2f}")
             except Exception as e:
-                log.warning(f"Could not load state file: {e}")
+                log.warning(f"Could not load state: {e}")
     
-    def _save_state(self):
-        """Persist state to file."""
+    def _save_state(self, critical: bool = True):
+        """
+        Persist state to the state store.
+        
+        Non-critical saves (sync_with_mt5 on every protection tick) are
+        coalesced and written on the WriteBehind cadence.
+        """
         state = {
             'starting_balance': self.starting_balance,
             'peak_equity': self.peak_equity,
@@ -166,10 +176,9 @@ class ChallengeRiskManager:
             'last_update': datetime.now().isoformat()
         }
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+            self.writer.stage(self.namespace, state, critical=critical)
         except Exception as e:
-            log.error(f"Could not save state file: {e}")
+            log.error(f"Could not save state: {e}")
     
     def sync_with_mt5(self, balance: float, equity: float):
         """
@@ -177,9 +186,11 @@ class ChallengeRiskManager:
         Call this at startup and periodically.
         """
         today = date.today()
+        new_day = today != self.current_date
+        old_mode = self.risk_mode
         
         # Check for new day
-        if today != self.current_date:
+        if new_day:
             log.info(f"New trading day detected: {today}")
             self.day_start_balance = balance
             self.trades_today = 0
@@ -204,8 +215,8 @@ class ChallengeRiskManager:
         # Determine risk mode
         self._update_risk_mode()
         
-        # Persist state
-        self._save_state()
+        # Persist state: write through on a new day or a risk mode change (halt/emergency)
+        self._save_state(critical=new_day or self.risk_mode != old_mode)
     
     def _update_risk_mode(self):
         """Update risk mode based on current metrics."""
@@ -20,6 +20,7 @@ Usage:
   python ftmo_challenge_analyzer.py              # Run/resume optimization
   python ftmo_challenge_analyzer.py --status     # Check progress without running
   python ftmo_challenge_analyzer.py --trials 100 # Set number of trials
+  python ftmo_challenge_analyzer.py --multi-fidelity  # Successive-halving asset subsampling
 """
 
 import argparse
@@ -51,6 +52,7 @@ from strategy_core import (
 )
 
 from ftmo_config import FTMO_CONFIG, FTMO10KConfig, get_pip_size, get_sl_limits
+from challenge_rules import ChallengeRules, FIVEERS_60K_RULES
 from config import FOREX_PAIRS, METALS, INDICES, CRYPTO_ASSETS
 from tradr.risk.position_sizing import calculate_lot_size, get_contract_specs
 # Note: save_optimized_params NOT imported - we don't auto-save to current_params.json
@@ -60,12 +62,15 @@ from params.defaults import PARAMETER_DEFAULTS, merge_with_defaults
 from professional_quant_suite import (
     RiskMetrics,
     calculate_risk_metrics,
+    risk_metrics_from_r,
+    to_epoch,
     WalkForwardTester,
     ParameterSensitivityAnalyzer,
     generate_professional_report,
 )
 
 from tradr.utils.output_manager import get_output_manager, set_output_manager
+from tradr.utils.artifact_store import get_artifact_store
 
 OUTPUT_DIR = Path("ftmo_analysis_output")
 OUTPUT_DIR.mkdir(exist_ok=True)
@@ -145,6 +150,17 @@ ACCOUNT_SIZE = 60000.0  # 5ers 60K High Stakes
 
 DEFAULT_EXCLUDED_ASSETS: List[str] = []
 
+# MULTI-FIDELITY OBJECTIVE (Successive Halving / ASHA)
+# Rung 0 backtests a fixed, liquid asset subset over a shortened training window.
+# Only trials that survive the pruner at rung 0 are promoted to the full universe.
+FIDELITY_SUBSET_ASSETS: List[str] = [
+    "EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD",
+    "USD_CAD", "EUR_JPY", "GBP_JPY", "XAU_USD",
+]
+FIDELITY_SUBSET_MONTHS = 9          # Rung 0 uses the last 9 months of TRAINING
+FIDELITY_LOW_STEP = 1               # Optuna step (resource units) reported for rung 0
+FIDELITY_REDUCTION_FACTOR = 3       # Keep top 1/3 of trials at each rung
+
 # TIMEFRAME CONFIGURATION
 # Allows switching between D1 and H4 entry timeframes for comparison
 TIMEFRAME_CONFIG = {
@@ -591,6 +607,42 @@ def compute_ftmo_compliance(trades: List[Any], risk_per_trade_usd: float) -> Dic
     return tracker.get_report()
 
 
+# Trial attributes holding artifact-store keys (the bulky results live in the side store)
+TRIAL_ARTIFACT_ATTR = 'artifact'
+TRIAL_TRADES_ATTR = 'trades_artifact'
+
+
+def load_trial_artifact(trial) -> Dict:
+    """
+    compliance_report / score_breakdown / quarterly_stats of a trial.
+    
+    Read from the artifact store; trials stored before the side store
+    existed still carry them as inline user attributes.
+    """
+    artifact = get_artifact_store().get(trial.user_attrs.get(TRIAL_ARTIFACT_ATTR))
+    if artifact is not None:
+        return artifact
+    return {
+        k: trial.user_attrs[k]
+        for k in ('compliance_report', 'score_breakdown', 'quarterly_stats')
+        if k in trial.user_attrs
+    }
+
+
+def load_trial_trades(trial) -> Optional[List[Trade]]:
+    """The training trades snapshotted for a trial (None if it has no snapshot)."""
+    records = get_artifact_store().get(trial.user_attrs.get(TRIAL_TRADES_ATTR))
+    if records is None:
+        return None
+    trades = []
+    for rec in records:
+        rec = dict(rec)
+        rec['entry_date'] = pd.Timestamp(rec['entry_date'])
+        rec['exit_date'] = pd.Timestamp(rec['exit_date'])
+        trades.append(Trade(**rec))
+    return trades
+
+
 def log_optimization_progress(trial_num: int, value: float, best_value: float, best_params: Dict):
     """Append optimization progress to log file."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -625,7 +677,7 @@ def show_optimization_status():
         )
         
         print(f"\nStudy Name: {OPTUNA_STUDY_NAME}")
-        print(f"Completed Trials: {len(study.trials)}")
+        print(f"Completed Trials: {len(study.get_trials(deepcopy=False))}")
         
         if study.best_trial:
             print(f"\nBest Value: {study.best_value:.0f}")
@@ -794,61 +846,143 @@ class BacktestTrade:
 
 
 class MonteCarloSimulator:
-    """Monte Carlo simulation for robustness testing."""
+    """
+    Monte Carlo simulation for robustness testing.
+    
+    Vectorized engine: bootstrap indices for a whole chunk of simulations are
+    drawn as one (simulations x trades) array, equity curves come from cumsum
+    and drawdowns from maximum.accumulate. Chunks are sized to stay within
+    memory_budget_mb, so 100k+ simulations run in seconds.
+    
+    Resampling modes:
+    - "iid":   classic bootstrap of individual trade R values
+    - "block": circular block bootstrap (keeps win/loss streaks together)
+    - "daily": resample whole trading days, preserving intraday clustering
+               so daily-drawdown risk is modeled
+    """
     
-    def __init__(self, trades: List[Any], num_simulations: int = 1000):
+    RESAMPLING_MODES = ("iid", "block", "daily")
+    
+    def __init__(
+        self,
+        trades: List[Any],
+        num_simulations: int = 1000,
+        resampling: str = "iid",
+        block_size: int = 5,
+        memory_budget_mb: float = 256.0,
+        seed: int = 42,
+    ):
+        if resampling not in self.RESAMPLING_MODES:
+            raise ValueError(f"Unknown resampling mode '{resampling}' (expected one of {self.RESAMPLING_MODES})")
         self.trades = trades
         self.num_simulations = num_simulations
+        self.resampling = resampling
+        self.block_size = max(1, int(block_size))
+        self.memory_budget_mb = memory_budget_mb
+        self.seed = seed
         self.r_values = self._extract_r_values()
     
-    def _extract_r_values(self) -> List[float]:
-        r_values = []
-        for t in self.trades:
+    def _extract_r_values(self) -> np.ndarray:
+        r_values = np.empty(len(self.trades), dtype=np.float64)
+        for i, t in enumerate(self.trades):
             r = getattr(t, 'rr', None) or getattr(t, 'r_multiple', None) or 0.0
-            r_values.append(float(r))
+            r_values[i] = float(r)
         return r_values
     
+    def _extract_day_keys(self) -> List[str]:
+        """Trading day per trade (exit day, falling back to entry day)."""
+        keys = []
+        for t in self.trades:
+            day = getattr(t, 'exit_date', None) or getattr(t, 'entry_date', None)
+            keys.append(str(day)[:10] if day else "")
+        return keys
+    
+    def _chunk_size(self, row_len: int) -> int:
+        """Simulations per chunk so that ~4 float64 work arrays fit the memory budget."""
+        bytes_per_row = max(1, row_len) * 8 * 4
+        return max(1, int(self.memory_budget_mb * 1024 * 1024 // bytes_per_row))
+    
+    def _draw_indices(self, rng: np.random.Generator, n_rows: int, n: int) -> np.ndarray:
+        if self.resampling == "block" and self.block_size > 1:
+            n_blocks = -(-n // self.block_size)
+            starts = rng.integers(0, n, size=(n_rows, n_blocks))
+            idx = (starts[:, :, None] + np.arange(self.block_size)) % n
+            return idx.reshape(n_rows, -1)[:, :n]
+        return rng.integers(0, n, size=(n_rows, n))
+    
+    def _build_daily_groups(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Per-day (sum R, intraday min prefix R, trade count, win count)."""
+        keys = self._extract_day_keys()
+        order = sorted(range(len(keys)), key=lambda i: keys[i])
+        sorted_keys = [keys[i] for i in order]
+        r_sorted = self.r_values[order]
+        
+        boundaries = [0] + [i for i in range(1, len(sorted_keys)) if sorted_keys[i] != sorted_keys[i - 1]]
+        starts = np.asarray(boundaries, dtype=np.int64)
+        
+        day_sum = np.add.reduceat(r_sorted, starts)
+        day_count = np.diff(np.append(starts, len(r_sorted)))
+        day_wins = np.add.reduceat((r_sorted > 0).astype(np.int64), starts)
+        
+        prefix = np.cumsum(r_sorted)
+        offsets = np.repeat(prefix[starts] - r_sorted[starts], day_count)
+        day_min = np.minimum(np.minimum.reduceat(prefix - offsets, starts), 0.0)
+        return day_sum, day_min, day_count, day_wins
+    
     def run_simulation(self) -> Dict[str, Any]:
-        if not self.r_values:
+        if self.r_values.size == 0:
             return {"error": "No trades to simulate", "num_simulations": 0}
         
-        np.random.seed(42)
+        rng = np.random.default_rng(self.seed)
+        num_trades = int(self.r_values.size)
         
-        final_equities = []
-        max_drawdowns = []
-        win_rates = []
+        final_equities = np.empty(self.num_simulations)
+        max_drawdowns = np.empty(self.num_simulations)
+        win_rates = np.empty(self.num_simulations)
+        worst_daily_losses = np.empty(self.num_simulations) if self.resampling == "daily" else None
         
-        num_trades = len(self.r_values)
+        if self.resampling == "daily":
+            day_sum, day_min, day_count, day_wins = self._build_daily_groups()
+            row_len = day_sum.size
+        else:
+            row_len = num_trades
         
-        for _ in range(self.num_simulations):
-            indices = np.random.choice(num_trades, size=num_trades, replace=True)
-            resampled_trades = [self.r_values[i] for i in indices]
-            
-            noise = np.random.uniform(0.9, 1.1, size=num_trades)
-            perturbed_trades = [r * n for r, n in zip(resampled_trades, noise)]
+        chunk = self._chunk_size(row_len)
+        for lo in range(0, self.num_simulations, chunk):
+            hi = min(lo + chunk, self.num_simulations)
+            rows = hi - lo
+            noise = rng.uniform(0.9, 1.1, size=(rows, row_len))
             
-            equity_curve = [0.0]
-            for r in perturbed_trades:
-                equity_curve.append(equity_curve[-1] + r)
-            
-            final_equities.append(equity_curve[-1])
-            
-            peak = equity_curve[0]
-            max_dd = 0.0
-            for eq in equity_curve:
-                if eq > peak:
-                    peak = eq
-                dd = peak - eq
-                if dd > max_dd:
-                    max_dd = dd
-            max_drawdowns.append(max_dd)
+            if self.resampling == "daily":
+                idx = rng.integers(0, row_len, size=(rows, row_len))
+                day_pnl = day_sum[idx] * noise
+                day_trough = day_min[idx] * noise
+                
+                equity = np.cumsum(day_pnl, axis=1)
+                prev_equity = equity - day_pnl
+                peak = np.maximum(np.maximum.accumulate(prev_equity, axis=1), 0.0)
+                dd = np.maximum(peak - (prev_equity + day_trough), peak - equity)
+                
+                trades_drawn = day_count[idx].sum(axis=1)
+                win_rates[lo:hi] = day_wins[idx].sum(axis=1) / trades_drawn * 100
+                worst_daily_losses[lo:hi] = -day_trough.min(axis=1)
+            else:
+                idx = self._draw_indices(rng, rows, num_trades)
+                perturbed = self.r_values[idx] * noise
+                
+                equity = np.cumsum(perturbed, axis=1)
+                peak = np.maximum(np.maximum.accumulate(equity, axis=1), 0.0)
+                dd = peak - equity
+                
+                win_rates[lo:hi] = (perturbed > 0).sum(axis=1) / num_trades * 100
             
-            wins = sum(1 for r in perturbed_trades if r > 0)
-            win_rates.append(wins / num_trades * 100 if num_trades > 0 else 0)
+            final_equities[lo:hi] = equity[:, -1]
+            max_drawdowns[lo:hi] = np.maximum(dd.max(axis=1), 0.0)
         
-        return {
+        results = {
             "num_simulations": self.num_simulations,
             "num_trades": num_trades,
+            "resampling": self.resampling,
             "mean_return": float(np.mean(final_equities)),
             "std_return": float(np.std(final_equities)),
             "mean_max_dd": float(np.mean(max_drawdowns)),
@@ -861,22 +995,30 @@ class MonteCarloSimulator:
                 "max_drawdown": {f"p{p}": float(np.percentile(max_drawdowns, p)) for p in [5, 25, 50, 75, 95]},
             },
         }
+        if worst_daily_losses is not None:
+            results["worst_daily_loss_95"] = float(np.percentile(worst_daily_losses, 95))
+            results["confidence_intervals"]["worst_daily_loss"] = {
+                f"p{p}": float(np.percentile(worst_daily_losses, p)) for p in [5, 25, 50, 75, 95]
+            }
+        return results
 
 
-def run_monte_carlo_analysis(trades: List[Any], num_simulations: int = 1000) -> Dict:
+def run_monte_carlo_analysis(trades: List[Any], num_simulations: int = 1000, resampling: str = "iid") -> Dict:
     """Run Monte Carlo analysis on trades."""
     if not trades:
         return {"error": "No trades provided"}
     
-    simulator = MonteCarloSimulator(trades, num_simulations)
+    simulator = MonteCarloSimulator(trades, num_simulations, resampling=resampling)
     results = simulator.run_simulation()
     
-    print(f"\nMonte Carlo Simulation ({results.get('num_simulations', 0)} iterations):")
+    print(f"\nMonte Carlo Simulation ({results.get('num_simulations', 0)} iterations, {resampling}):")
     print(f"  Mean Return: {results.get('mean_return', 0):+.2f}R")
     print(f"  Std Dev: {results.get('std_return', 0):.2f}R")
     print(f"  Best Case (95th): {results.get('best_case_return', 0):+.2f}R")
     print(f"  Worst Case (5th): {results.get('worst_case_return', 0):+.2f}R")
     print(f"  Worst Case DD (95th): {results.get('worst_case_dd', 0):.2f}R")
+    if 'worst_daily_loss_95' in results:
+        print(f"  Worst Daily Loss (95th): {results['worst_daily_loss_95']:.2f}R")
     
     return results
 
@@ -949,6 +1091,193 @@ def simulate_ftmo_challenge(trades: List[Any], start_month: str = "2024-01", ris
     }
 
 
+def _first_true_index(mask: np.ndarray) -> np.ndarray:
+    """Column index of the first True per row, or -1 when a row has none."""
+    first = mask.argmax(axis=1)
+    return np.where(mask.any(axis=1), first, -1)
+
+
+def simulate_rolling_challenge_starts(
+    trades: List[Any],
+    risk_pct: float = 0.6,
+    granularity: str = "day",
+    rules: ChallengeRules = FIVEERS_60K_RULES,
+    max_days: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Evaluate a 5ers challenge from EVERY possible start (day or month) at once.
+    
+    Trades are bucketed into a calendar-day P&L series (by exit day, falling
+    back to entry day) with fixed risk on the starting balance, exactly like
+    simulate_ftmo_challenge(). For a start day s the challenge equity at day
+    s+k is then cumsum[s+k] - cumsum[s-1], so all starts are evaluated in one
+    (starts x horizon) matrix instead of one Python walk per start.
+    
+    A start FAILS on the first day the intraday trough drops below the total
+    DD limit (static, measured from the start balance) or a day's intraday
+    loss exceeds the daily limit. It PASSES on the first day profit reaches
+    the step target with at least min_profitable_days profitable days.
+    Starts that reach the end of history (or max_days) undecided are
+    reported as unresolved and excluded from pass_probability.
+    
+    Args:
+        trades: Trade objects with rr and entry_date/exit_date
+        risk_pct: Risk per trade in % of account size
+        granularity: "day" (every weekday) or "month" (first day of each month)
+        rules: Challenge rules (targets, DD limits, profitable day rule)
+        max_days: Optional calendar-day horizon per start (None = unlimited)
+    
+    Returns:
+        Dict with per-step summaries and a per-start DataFrame under "matrix"
+    """
+    if granularity not in ("day", "month"):
+        raise ValueError(f"granularity must be 'day' or 'month', got '{granularity}'")
+    if max_days is not None and max_days < 1:
+        raise ValueError(f"max_days must be >= 1, got {max_days}")
+    
+    dated = []
+    for t in trades:
+        when = getattr(t, 'exit_date', None) or getattr(t, 'entry_date', None)
+        if when:
+            dated.append((str(when), float(getattr(t, 'rr', 0) or 0.0)))
+    if not dated:
+        return {"error": "No dated trades to simulate", "num_starts": 0}
+    dated.sort(key=lambda x: x[0])
+    
+    account_size = rules.account_size
+    risk_usd = account_size * (risk_pct / 100)
+    
+    trade_days = np.array([d[:10] for d, _ in dated], dtype='datetime64[D]')
+    trade_pnl = np.array([rr for _, rr in dated]) * risk_usd
+    
+    first_day, last_day = trade_days[0], trade_days[-1]
+    n_days = int((last_day - first_day).astype(int)) + 1
+    day_idx = (trade_days - first_day).astype(np.int64)
+    
+    # Daily P&L and intraday worst point (trades within a day in time order)
+    daily_pnl = np.bincount(day_idx, weights=trade_pnl, minlength=n_days)
+    day_starts = np.flatnonzero(np.r_[True, day_idx[1:] != day_idx[:-1]])
+    prefix = np.cumsum(trade_pnl)
+    day_counts = np.diff(np.r_[day_starts, trade_pnl.size])
+    intraday = prefix - np.repeat(prefix[day_starts] - trade_pnl[day_starts], day_counts)
+    daily_trough = np.zeros(n_days)
+    daily_trough[day_idx[day_starts]] = np.minimum(np.minimum.reduceat(intraday, day_starts), 0.0)
+    
+    profitable_threshold = account_size * rules.profitable_day_threshold_pct / 100
+    cum_pnl = np.r_[0.0, np.cumsum(daily_pnl)]
+    cum_profitable = np.r_[0, np.cumsum(daily_pnl >= profitable_threshold)]
+    
+    calendar = first_day + np.arange(n_days)
+    if granularity == "month":
+        months = calendar.astype('datetime64[M]')
+        start_idx = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    else:
+        weekday = (calendar.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        start_idx = np.flatnonzero(weekday < 5)
+    if start_idx.size == 0:
+        return {"error": "No start days in the trade history", "num_starts": 0}
+    
+    horizon = n_days if max_days is None else min(n_days, max_days)
+    total_limit = account_size * rules.max_total_drawdown_pct / 100
+    daily_limit = account_size * rules.max_daily_loss_pct / 100
+    steps = (("step1", rules.step1_profit_target_pct), ("step2", rules.step2_profit_target_pct))
+    columns = {f"{step}_{col}": [] for step, _ in steps
+               for col in ("passed", "failed", "days_to_target", "max_total_dd", "max_daily_dd")}
+    
+    # Chunk starts so each (starts x horizon) work matrix stays around 2M cells
+    k = np.arange(horizon)
+    chunk = max(1, 2_000_000 // horizon)
+    for lo in range(0, start_idx.size, chunk):
+        starts = start_idx[lo:lo + chunk]
+        day_matrix = starts[:, None] + k[None, :]
+        valid = day_matrix < n_days
+        day_matrix = np.minimum(day_matrix, n_days - 1)
+        
+        base = cum_pnl[starts][:, None]
+        equity = cum_pnl[day_matrix + 1] - base
+        trough = cum_pnl[day_matrix] - base + daily_trough[day_matrix]
+        day_loss = -daily_trough[day_matrix]
+        profitable_days = cum_profitable[day_matrix + 1] - cum_profitable[starts][:, None]
+        
+        fail_k = _first_true_index(valid & ((trough < -total_limit) | (day_loss > daily_limit)))
+        
+        for step, target_pct in steps:
+            target = account_size * target_pct / 100
+            pass_k = _first_true_index(valid & (equity >= target) & (profitable_days >= rules.min_profitable_days))
+            
+            passed = (pass_k >= 0) & ((fail_k < 0) | (pass_k < fail_k))
+            failed = (fail_k >= 0) & ~passed
+            end_k = np.where(passed, pass_k, np.where(failed, fail_k, horizon - 1))
+            in_window = valid & (k[None, :] <= end_k[:, None])
+            
+            columns[f"{step}_passed"].append(passed)
+            columns[f"{step}_failed"].append(failed)
+            columns[f"{step}_days_to_target"].append(np.where(passed, pass_k + 1, -1))
+            columns[f"{step}_max_total_dd"].append(np.maximum(np.where(in_window, -trough, 0.0).max(axis=1), 0.0))
+            columns[f"{step}_max_daily_dd"].append(np.where(in_window, day_loss, 0.0).max(axis=1))
+    
+    columns = {name: np.concatenate(parts) for name, parts in columns.items()}
+    
+    matrix = pd.DataFrame({"start": calendar[start_idx].astype(str)})
+    summary: Dict[str, Any] = {
+        "granularity": granularity,
+        "risk_pct": risk_pct,
+        "num_starts": int(start_idx.size),
+        "history_start": str(first_day),
+        "history_end": str(last_day),
+    }
+    
+    for step, target_pct in steps:
+        passed = columns[f"{step}_passed"]
+        failed = columns[f"{step}_failed"]
+        resolved = passed | failed
+        days_to_target = columns[f"{step}_days_to_target"]
+        max_total_dd = columns[f"{step}_max_total_dd"]
+        max_daily_dd = columns[f"{step}_max_daily_dd"]
+        
+        matrix[f"{step}_passed"] = passed
+        matrix[f"{step}_resolved"] = resolved
+        matrix[f"{step}_days_to_target"] = days_to_target
+        matrix[f"{step}_max_total_dd_pct"] = max_total_dd / account_size * 100
+        matrix[f"{step}_max_daily_dd_pct"] = max_daily_dd / account_size * 100
+        
+        n_resolved = int(resolved.sum())
+        pass_days = days_to_target[passed]
+        summary[step] = {
+            "target_pct": target_pct,
+            "resolved_starts": n_resolved,
+            "passed": int(passed.sum()),
+            "failed": int(failed.sum()),
+            "pass_probability": float(passed.sum() / n_resolved) if n_resolved else 0.0,
+            "median_days_to_target": float(np.median(pass_days)) if pass_days.size else None,
+            "p90_days_to_target": float(np.percentile(pass_days, 90)) if pass_days.size else None,
+            "p95_max_total_dd_pct": float(np.percentile(max_total_dd, 95) / account_size * 100),
+            "p95_max_daily_dd_pct": float(np.percentile(max_daily_dd, 95) / account_size * 100),
+        }
+    
+    summary["matrix"] = matrix
+    return summary
+
+
+def run_rolling_start_analysis(trades: List[Any], risk_pct: float = 0.6, granularity: str = "day") -> Dict:
+    """Run the rolling challenge-start simulation on trades and print a summary."""
+    results = simulate_rolling_challenge_starts(trades, risk_pct=risk_pct, granularity=granularity)
+    if "error" in results:
+        print(f"\nRolling challenge starts skipped: {results['error']}")
+        return results
+    
+    print(f"\nRolling Challenge Starts ({results['num_starts']} starts, every {granularity}, "
+          f"{results['history_start']} to {results['history_end']}):")
+    for step in ("step1", "step2"):
+        s = results[step]
+        median_days = f"{s['median_days_to_target']:.0f}d" if s['median_days_to_target'] is not None else "n/a"
+        print(f"  {step.upper()} ({s['target_pct']:.0f}%): pass {s['pass_probability']*100:.1f}% "
+              f"({s['passed']}/{s['resolved_starts']} resolved), median {median_days} to target, "
+              f"p95 max DD {s['p95_max_total_dd_pct']:.2f}%")
+    
+    return results
+
+
 def load_ohlcv_data(symbol: str, timeframe: str, start_date: datetime, end_date: datetime) -> List[Dict]:
     """Load OHLCV data from local CSV files only (no API calls). Uses cache for performance."""
     global _DATA_CACHE
@@ -1050,6 +1379,7 @@ def run_full_period_backtest(
     volatile_asset_boost: float = 1.5,
     ml_min_prob: Optional[float] = None,
     excluded_assets: Optional[List[str]] = None,
+    assets: Optional[List[str]] = None,  # Explicit universe (None = all trading assets)
     require_adx_filter: bool = True,
     min_adx: float = 25.0,
     # ============================================================================
@@ -1129,7 +1459,7 @@ def run_full_period_backtest(
     
     December is fully open for trading.
     """
-    assets = get_all_trading_assets()
+    assets = list(assets) if assets is not None else get_all_trading_assets()
     effective_excluded = excluded_assets if excluded_assets is not None else DEFAULT_EXCLUDED_ASSETS
     
     if effective_excluded:
@@ -1543,6 +1873,171 @@ def train_ml_model(trades: List[Trade]) -> bool:
         return False
 
 
+def suggest_optuna_params(trial, warm_start: bool = False) -> Dict:
+    """
+    Sample one parameter set from the TPE search space.
+    
+    warm_start uses the tight WARM_START_SEARCH_SPACE around run_006. Also
+    works on optuna.trial.FixedTrial(params) to rebuild a complete set from
+    a trial's params (the constant entries are not stored by Optuna).
+    """
+    # ============================================================================
+    # REGIME-ADAPTIVE V2 EXPANDED PARAMETER SEARCH SPACE (35+ Parameters)
+    # ============================================================================
+    # COMPLETE PARAMETER SPACE including TP system, filter toggles, FTMO compliance
+    # Goal: Generate 200+ trades in training period + meaningful validation trades
+    if warm_start:
+        # Tight search space centered on run_006
+        rp_low, rp_high, rp_step = WARM_START_SEARCH_SPACE['risk_per_trade_pct']
+        mcs_low, mcs_high, mcs_step = WARM_START_SEARCH_SPACE['min_confluence']
+        mqf_low, mqf_high, mqf_step = WARM_START_SEARCH_SPACE['min_quality_factors']
+        adx_trend_low, adx_trend_high, adx_trend_step = WARM_START_SEARCH_SPACE['adx_trend_threshold']
+        adx_range_low, adx_range_high, adx_range_step = WARM_START_SEARCH_SPACE['adx_range_threshold']
+        tmc_low, tmc_high, tmc_step = WARM_START_SEARCH_SPACE['trend_min_confluence']
+        rmc_low, rmc_high, rmc_step = WARM_START_SEARCH_SPACE['range_min_confluence']
+        atrmp_low, atrmp_high, atrmp_step = WARM_START_SEARCH_SPACE['atr_min_percentile']
+        atrtm_low, atrtm_high, atrtm_step = WARM_START_SEARCH_SPACE['atr_trail_multiplier']
+        atrvr_low, atrvr_high, atrvr_step = WARM_START_SEARCH_SPACE['atr_vol_ratio_range']
+        tar_low, tar_high, tar_step = WARM_START_SEARCH_SPACE['trail_activation_r']
+        tp1_low, tp1_high, tp1_step = WARM_START_SEARCH_SPACE['tp1_r_multiple']
+        tp2_low, tp2_high, tp2_step = WARM_START_SEARCH_SPACE['tp2_r_multiple']
+        tp3_low, tp3_high, tp3_step = WARM_START_SEARCH_SPACE['tp3_r_multiple']
+        tp1c_low, tp1c_high, tp1c_step = WARM_START_SEARCH_SPACE['tp1_close_pct']
+        tp2c_low, tp2c_high, tp2c_step = WARM_START_SEARCH_SPACE['tp2_close_pct']
+        tp3c_low, tp3c_high, tp3c_step = WARM_START_SEARCH_SPACE['tp3_close_pct']
+        pexit_low, pexit_high, pexit_step = WARM_START_SEARCH_SPACE['partial_exit_pct']
+        decatr_low, decatr_high, decatr_step = WARM_START_SEARCH_SPACE['december_atr_multiplier']
+        vab_low, vab_high, vab_step = WARM_START_SEARCH_SPACE['volatile_asset_boost']
+        # Note: daily_loss_halt_pct removed - 5ers has no daily DD limit
+        ddw_low, ddw_high, ddw_step = WARM_START_SEARCH_SPACE['max_total_dd_warning']
+        params = {
+            'risk_per_trade_pct': trial.suggest_float('risk_per_trade_pct', rp_low, rp_high, step=rp_step),
+            'min_confluence': trial.suggest_int('min_confluence', mcs_low, mcs_high, step=mcs_step),
+            'min_quality_factors': trial.suggest_int('min_quality_factors', mqf_low, mqf_high, step=mqf_step),
+            'adx_trend_threshold': trial.suggest_float('adx_trend_threshold', adx_trend_low, adx_trend_high, step=adx_trend_step),
+            'adx_range_threshold': trial.suggest_float('adx_range_threshold', adx_range_low, adx_range_high, step=adx_range_step),
+            'trend_min_confluence': trial.suggest_int('trend_min_confluence', tmc_low, tmc_high, step=tmc_step),
+            'range_min_confluence': trial.suggest_int('range_min_confluence', rmc_low, rmc_high, step=rmc_step),
+            'atr_trail_multiplier': trial.suggest_float('atr_trail_multiplier', atrtm_low, atrtm_high, step=atrtm_step),
+            'atr_vol_ratio_range': trial.suggest_float('atr_vol_ratio_range', atrvr_low, atrvr_high, step=atrvr_step),
+            'atr_min_percentile': trial.suggest_float('atr_min_percentile', atrmp_low, atrmp_high, step=atrmp_step),
+            'trail_activation_r': trial.suggest_float('trail_activation_r', tar_low, tar_high, step=tar_step),
+            'partial_exit_at_1r': trial.suggest_categorical('partial_exit_at_1r', WARM_START_SEARCH_SPACE['partial_exit_at_1r']),
+            'partial_exit_pct': trial.suggest_float('partial_exit_pct', pexit_low, pexit_high, step=pexit_step),
+            'december_atr_multiplier': trial.suggest_float('december_atr_multiplier', decatr_low, decatr_high, step=decatr_step),
+            'volatile_asset_boost': trial.suggest_float('volatile_asset_boost', vab_low, vab_high, step=vab_step),
+            'tp1_r_multiple': trial.suggest_float('tp1_r_multiple', tp1_low, tp1_high, step=tp1_step),
+            'tp2_r_multiple': trial.suggest_float('tp2_r_multiple', tp2_low, tp2_high, step=tp2_step),
+            'tp3_r_multiple': trial.suggest_float('tp3_r_multiple', tp3_low, tp3_high, step=tp3_step),
+            'tp1_close_pct': trial.suggest_float('tp1_close_pct', tp1c_low, tp1c_high, step=tp1c_step),
+            'tp2_close_pct': trial.suggest_float('tp2_close_pct', tp2c_low, tp2c_high, step=tp2c_step),
+            'tp3_close_pct': trial.suggest_float('tp3_close_pct', tp3c_low, tp3c_high, step=tp3c_step),
+            'use_htf_filter': trial.suggest_categorical('use_htf_filter', WARM_START_SEARCH_SPACE['use_htf_filter']),
+            'use_structure_filter': trial.suggest_categorical('use_structure_filter', WARM_START_SEARCH_SPACE['use_structure_filter']),
+            'use_confirmation_filter': trial.suggest_categorical('use_confirmation_filter', WARM_START_SEARCH_SPACE['use_confirmation_filter']),
+            'use_fib_filter': trial.suggest_categorical('use_fib_filter', WARM_START_SEARCH_SPACE['use_fib_filter']),
+            'use_displacement_filter': trial.suggest_categorical('use_displacement_filter', WARM_START_SEARCH_SPACE['use_displacement_filter']),
+            'use_candle_rejection': trial.suggest_categorical('use_candle_rejection', WARM_START_SEARCH_SPACE['use_candle_rejection']),
+            # Note: daily_loss_halt_pct removed - 5ers has no daily DD limit
+            'max_total_dd_warning': trial.suggest_float('max_total_dd_warning', ddw_low, ddw_high, step=ddw_step),
+            'consecutive_loss_halt': 999,  # Disabled for 5ers
+        }
+    else:
+        params = {
+            'risk_per_trade_pct': trial.suggest_float('risk_per_trade_pct', 0.3, 0.8, step=0.05),
+            'min_confluence': trial.suggest_int('min_confluence', 2, 4),
+            'min_quality_factors': trial.suggest_int('min_quality_factors', 1, 2),
+            'adx_trend_threshold': trial.suggest_float('adx_trend_threshold', 15.0, 24.0, step=1.0),
+            'adx_range_threshold': trial.suggest_float('adx_range_threshold', 10.0, 18.0, step=1.0),
+            'trend_min_confluence': trial.suggest_int('trend_min_confluence', 3, 6),
+            'range_min_confluence': trial.suggest_int('range_min_confluence', 2, 5),
+            'atr_trail_multiplier': trial.suggest_float('atr_trail_multiplier', 1.2, 3.5, step=0.2),
+            'atr_vol_ratio_range': trial.suggest_float('atr_vol_ratio_range', 0.5, 1.0, step=0.05),
+            'atr_min_percentile': trial.suggest_float('atr_min_percentile', 30.0, 70.0, step=5.0),
+            'trail_activation_r': trial.suggest_float('trail_activation_r', 1.0, 3.0, step=0.2),
+            'partial_exit_at_1r': trial.suggest_categorical('partial_exit_at_1r', [True, False]),
+            'partial_exit_pct': trial.suggest_float('partial_exit_pct', 0.3, 0.8, step=0.05),
+            'december_atr_multiplier': trial.suggest_float('december_atr_multiplier', 1.0, 2.0, step=0.1),
+            'volatile_asset_boost': trial.suggest_float('volatile_asset_boost', 1.0, 2.0, step=0.1),
+            'tp1_r_multiple': trial.suggest_float('tp1_r_multiple', 1.0, 2.0, step=0.25),
+            'tp2_r_multiple': trial.suggest_float('tp2_r_multiple', 2.0, 4.0, step=0.5),
+            'tp3_r_multiple': trial.suggest_float('tp3_r_multiple', 3.5, 6.0, step=0.5),
+            'tp1_close_pct': trial.suggest_float('tp1_close_pct', 0.15, 0.40, step=0.05),
+            'tp2_close_pct': trial.suggest_float('tp2_close_pct', 0.10, 0.30, step=0.05),
+            'tp3_close_pct': trial.suggest_float('tp3_close_pct', 0.10, 0.25, step=0.05),
+            'use_htf_filter': trial.suggest_categorical('use_htf_filter', [False]),
+            'use_structure_filter': trial.suggest_categorical('use_structure_filter', [False]),
+            'use_confirmation_filter': trial.suggest_categorical('use_confirmation_filter', [False]),
+            'use_fib_filter': trial.suggest_categorical('use_fib_filter', [False]),
+            'use_displacement_filter': trial.suggest_categorical('use_displacement_filter', [False]),
+            'use_candle_rejection': trial.suggest_categorical('use_candle_rejection', [False]),
+            # Note: daily_loss_halt_pct removed - 5ers has no daily DD limit
+            'max_total_dd_warning': trial.suggest_float('max_total_dd_warning', 7.0, 9.0, step=0.5),
+            'consecutive_loss_halt': 999,  # Disabled for 5ers
+        }
+    return params
+
+
+def param_constraint_violation(params: Dict) -> Optional[str]:
+    """Reason a sampled parameter set is invalid, or None."""
+    # TP R-Multiple monotonic constraint: TP1 < TP2 < TP3
+    if not (params['tp1_r_multiple'] < params['tp2_r_multiple'] < params['tp3_r_multiple']):
+        return 'TP R-multiples not ascending'
+    
+    # TP Close percentage sum constraint: tp1 + tp2 + tp3 <= 0.85
+    total_close_pct = params['tp1_close_pct'] + params['tp2_close_pct'] + params['tp3_close_pct']
+    if total_close_pct > 0.85:
+        return f'TP close sum {total_close_pct:.2f} > 0.85'
+    
+    # ADX threshold constraint: range < trend
+    if params['adx_range_threshold'] >= params['adx_trend_threshold']:
+        return 'ADX range >= trend threshold'
+    return None
+
+
+def backtest_kwargs_from_params(params: Dict) -> Dict:
+    """run_full_period_backtest keyword arguments for a sampled parameter set (as the TPE objective runs it)."""
+    return dict(
+        min_confluence=params['min_confluence'],
+        min_quality_factors=params['min_quality_factors'],
+        risk_per_trade_pct=params['risk_per_trade_pct'],
+        atr_min_percentile=params['atr_min_percentile'],
+        trail_activation_r=params['trail_activation_r'],
+        december_atr_multiplier=params['december_atr_multiplier'],
+        volatile_asset_boost=params['volatile_asset_boost'],
+        ml_min_prob=None,
+        require_adx_filter=True,
+        min_adx=25.0,
+        use_adx_regime_filter=False,  # DISABLED: ADX regime filtering disabled for now
+        adx_trend_threshold=params['adx_trend_threshold'],
+        adx_range_threshold=params['adx_range_threshold'],
+        trend_min_confluence=params['trend_min_confluence'],
+        range_min_confluence=params['range_min_confluence'],
+        atr_volatility_ratio=params['atr_vol_ratio_range'],
+        atr_vol_ratio_range=params['atr_vol_ratio_range'],
+        atr_trail_multiplier=params['atr_trail_multiplier'],
+        partial_exit_at_1r=params['partial_exit_at_1r'],
+        partial_exit_pct=params['partial_exit_pct'],
+        # NEW: TP parameters
+        tp1_r_multiple=params['tp1_r_multiple'],
+        tp2_r_multiple=params['tp2_r_multiple'],
+        tp3_r_multiple=params['tp3_r_multiple'],
+        tp1_close_pct=params['tp1_close_pct'],
+        tp2_close_pct=params['tp2_close_pct'],
+        tp3_close_pct=params['tp3_close_pct'],
+        # NEW: Filter toggles
+        use_htf_filter=params['use_htf_filter'],
+        use_structure_filter=params['use_structure_filter'],
+        use_confirmation_filter=params['use_confirmation_filter'],
+        use_fib_filter=params['use_fib_filter'],
+        use_displacement_filter=params['use_displacement_filter'],
+        use_candle_rejection=params['use_candle_rejection'],
+        # 5ers compliance (no daily DD limit!)
+        max_total_dd_warning=params['max_total_dd_warning'],
+        consecutive_loss_halt=params['consecutive_loss_halt'],
+    )
+
+
 class OptunaOptimizer:
     """
     Optuna-based optimizer for FTMO strategy parameters.
@@ -1550,11 +2045,46 @@ class OptunaOptimizer:
     Uses persistent SQLite storage for resumability.
     """
     
-    def __init__(self, tf_config: Optional[Dict] = None, use_warm_start: bool = False):
+    def __init__(
+        self,
+        tf_config: Optional[Dict] = None,
+        use_warm_start: bool = False,
+        use_multi_fidelity: bool = False,
+    ):
         self.best_params: Dict = {}
         self.best_score: float = -float('inf')
+        # Best score whose trades are snapshotted in the artifact store
+        self.snapshot_best: float = -float('inf')
         self.tf_config = tf_config if tf_config else TIMEFRAME_CONFIG['TPE']
         self.use_warm_start = use_warm_start
+        self.use_multi_fidelity = use_multi_fidelity
+    
+    def _run_low_fidelity_rung(self, trial, backtest_kwargs: Dict) -> None:
+        """
+        Rung 0 of the multi-fidelity objective.
+        
+        Backtests FIDELITY_SUBSET_ASSETS over the last FIDELITY_SUBSET_MONTHS of
+        the training period and reports total R to the pruner. Raises
+        optuna.TrialPruned when the trial does not survive successive halving.
+        """
+        import optuna
+        
+        low_start = TRAINING_END - timedelta(days=int(FIDELITY_SUBSET_MONTHS * 30.5))
+        low_trades = run_full_period_backtest(
+            start_date=max(TRAINING_START, low_start),
+            end_date=TRAINING_END,
+            assets=FIDELITY_SUBSET_ASSETS,
+            **backtest_kwargs,
+        )
+        low_r = sum(getattr(t, 'rr', 0) for t in low_trades)
+        
+        trial.set_user_attr('fidelity_low_r', round(low_r, 2))
+        trial.set_user_attr('fidelity_low_trades', len(low_trades))
+        trial.report(low_r, step=FIDELITY_LOW_STEP)
+        
+        if trial.should_prune():
+            trial.set_user_attr('fidelity_level', 0)
+            raise optuna.TrialPruned(f"Pruned at rung 0 (subset R={low_r:+.2f})")
     
     def _objective(self, trial) -> float:
         """
@@ -1567,171 +2097,31 @@ class OptunaOptimizer:
         - Mode-specific confluence requirements
         - Partial profit taking and trail management
         """
-        # ============================================================================
-        # REGIME-ADAPTIVE V2 EXPANDED PARAMETER SEARCH SPACE (35+ Parameters)
-        # ============================================================================
-        # COMPLETE PARAMETER SPACE including TP system, filter toggles, FTMO compliance
-        # Goal: Generate 200+ trades in training period + meaningful validation trades
-        if self.use_warm_start:
-            # Tight search space centered on run_006
-            rp_low, rp_high, rp_step = WARM_START_SEARCH_SPACE['risk_per_trade_pct']
-            mcs_low, mcs_high, mcs_step = WARM_START_SEARCH_SPACE['min_confluence']
-            mqf_low, mqf_high, mqf_step = WARM_START_SEARCH_SPACE['min_quality_factors']
-            adx_trend_low, adx_trend_high, adx_trend_step = WARM_START_SEARCH_SPACE['adx_trend_threshold']
-            adx_range_low, adx_range_high, adx_range_step = WARM_START_SEARCH_SPACE['adx_range_threshold']
-            tmc_low, tmc_high, tmc_step = WARM_START_SEARCH_SPACE['trend_min_confluence']
-            rmc_low, rmc_high, rmc_step = WARM_START_SEARCH_SPACE['range_min_confluence']
-            atrmp_low, atrmp_high, atrmp_step = WARM_START_SEARCH_SPACE['atr_min_percentile']
-            atrtm_low, atrtm_high, atrtm_step = WARM_START_SEARCH_SPACE['atr_trail_multiplier']
-            atrvr_low, atrvr_high, atrvr_step = WARM_START_SEARCH_SPACE['atr_vol_ratio_range']
-            tar_low, tar_high, tar_step = WARM_START_SEARCH_SPACE['trail_activation_r']
-            tp1_low, tp1_high, tp1_step = WARM_START_SEARCH_SPACE['tp1_r_multiple']
-            tp2_low, tp2_high, tp2_step = WARM_START_SEARCH_SPACE['tp2_r_multiple']
-            tp3_low, tp3_high, tp3_step = WARM_START_SEARCH_SPACE['tp3_r_multiple']
-            tp1c_low, tp1c_high, tp1c_step = WARM_START_SEARCH_SPACE['tp1_close_pct']
-            tp2c_low, tp2c_high, tp2c_step = WARM_START_SEARCH_SPACE['tp2_close_pct']
-            tp3c_low, tp3c_high, tp3c_step = WARM_START_SEARCH_SPACE['tp3_close_pct']
-            pexit_low, pexit_high, pexit_step = WARM_START_SEARCH_SPACE['partial_exit_pct']
-            decatr_low, decatr_high, decatr_step = WARM_START_SEARCH_SPACE['december_atr_multiplier']
-            vab_low, vab_high, vab_step = WARM_START_SEARCH_SPACE['volatile_asset_boost']
-            # Note: daily_loss_halt_pct removed - 5ers has no daily DD limit
-            ddw_low, ddw_high, ddw_step = WARM_START_SEARCH_SPACE['max_total_dd_warning']
-            params = {
-                'risk_per_trade_pct': trial.suggest_float('risk_per_trade_pct', rp_low, rp_high, step=rp_step),
-                'min_confluence': trial.suggest_int('min_confluence', mcs_low, mcs_high, step=mcs_step),
-                'min_quality_factors': trial.suggest_int('min_quality_factors', mqf_low, mqf_high, step=mqf_step),
-                'adx_trend_threshold': trial.suggest_float('adx_trend_threshold', adx_trend_low, adx_trend_high, step=adx_trend_step),
-                'adx_range_threshold': trial.suggest_float('adx_range_threshold', adx_range_low, adx_range_high, step=adx_range_step),
-                'trend_min_confluence': trial.suggest_int('trend_min_confluence', tmc_low, tmc_high, step=tmc_step),
-                'range_min_confluence': trial.suggest_int('range_min_confluence', rmc_low, rmc_high, step=rmc_step),
-                'atr_trail_multiplier': trial.suggest_float('atr_trail_multiplier', atrtm_low, atrtm_high, step=atrtm_step),
-                'atr_vol_ratio_range': trial.suggest_float('atr_vol_ratio_range', atrvr_low, atrvr_high, step=atrvr_step),
-                'atr_min_percentile': trial.suggest_float('atr_min_percentile', atrmp_low, atrmp_high, step=atrmp_step),
-                'trail_activation_r': trial.suggest_float('trail_activation_r', tar_low, tar_high, step=tar_step),
-                'partial_exit_at_1r': trial.suggest_categorical('partial_exit_at_1r', WARM_START_SEARCH_SPACE['partial_exit_at_1r']),
-                'partial_exit_pct': trial.suggest_float('partial_exit_pct', pexit_low, pexit_high, step=pexit_step),
-                'december_atr_multiplier': trial.suggest_float('december_atr_multiplier', decatr_low, decatr_high, step=decatr_step),
-                'volatile_asset_boost': trial.suggest_float('volatile_asset_boost', vab_low, vab_high, step=vab_step),
-                'tp1_r_multiple': trial.suggest_float('tp1_r_multiple', tp1_low, tp1_high, step=tp1_step),
-                'tp2_r_multiple': trial.suggest_float('tp2_r_multiple', tp2_low, tp2_high, step=tp2_step),
-                'tp3_r_multiple': trial.suggest_float('tp3_r_multiple', tp3_low, tp3_high, step=tp3_step),
-                'tp1_close_pct': trial.suggest_float('tp1_close_pct', tp1c_low, tp1c_high, step=tp1c_step),
-                'tp2_close_pct': trial.suggest_float('tp2_close_pct', tp2c_low, tp2c_high, step=tp2c_step),
-                'tp3_close_pct': trial.suggest_float('tp3_close_pct', tp3c_low, tp3c_high, step=tp3c_step),
-                'use_htf_filter': trial.suggest_categorical('use_htf_filter', WARM_START_SEARCH_SPACE['use_htf_filter']),
-                'use_structure_filter': trial.suggest_categorical('use_structure_filter', WARM_START_SEARCH_SPACE['use_structure_filter']),
-                'use_confirmation_filter': trial.suggest_categorical('use_confirmation_filter', WARM_START_SEARCH_SPACE['use_confirmation_filter']),
-                'use_fib_filter': trial.suggest_categorical('use_fib_filter', WARM_START_SEARCH_SPACE['use_fib_filter']),
-                'use_displacement_filter': trial.suggest_categorical('use_displacement_filter', WARM_START_SEARCH_SPACE['use_displacement_filter']),
-                'use_candle_rejection': trial.suggest_categorical('use_candle_rejection', WARM_START_SEARCH_SPACE['use_candle_rejection']),
-                # Note: daily_loss_halt_pct removed - 5ers has no daily DD limit
-                'max_total_dd_warning': trial.suggest_float('max_total_dd_warning', ddw_low, ddw_high, step=ddw_step),
-                'consecutive_loss_halt': 999,  # Disabled for 5ers
-            }
-        else:
-            params = {
-                'risk_per_trade_pct': trial.suggest_float('risk_per_trade_pct', 0.3, 0.8, step=0.05),
-                'min_confluence': trial.suggest_int('min_confluence', 2, 4),
-                'min_quality_factors': trial.suggest_int('min_quality_factors', 1, 2),
-                'adx_trend_threshold': trial.suggest_float('adx_trend_threshold', 15.0, 24.0, step=1.0),
-                'adx_range_threshold': trial.suggest_float('adx_range_threshold', 10.0, 18.0, step=1.0),
-                'trend_min_confluence': trial.suggest_int('trend_min_confluence', 3, 6),
-                'range_min_confluence': trial.suggest_int('range_min_confluence', 2, 5),
-                'atr_trail_multiplier': trial.suggest_float('atr_trail_multiplier', 1.2, 3.5, step=0.2),
-                'atr_vol_ratio_range': trial.suggest_float('atr_vol_ratio_range', 0.5, 1.0, step=0.05),
-                'atr_min_percentile': trial.suggest_float('atr_min_percentile', 30.0, 70.0, step=5.0),
-                'trail_activation_r': trial.suggest_float('trail_activation_r', 1.0, 3.0, step=0.2),
-                'partial_exit_at_1r': trial.suggest_categorical('partial_exit_at_1r', [True, False]),
-                'partial_exit_pct': trial.suggest_float('partial_exit_pct', 0.3, 0.8, step=0.05),
-                'december_atr_multiplier': trial.suggest_float('december_atr_multiplier', 1.0, 2.0, step=0.1),
-                'volatile_asset_boost': trial.suggest_float('volatile_asset_boost', 1.0, 2.0, step=0.1),
-                'tp1_r_multiple': trial.suggest_float('tp1_r_multiple', 1.0, 2.0, step=0.25),
-                'tp2_r_multiple': trial.suggest_float('tp2_r_multiple', 2.0, 4.0, step=0.5),
-                'tp3_r_multiple': trial.suggest_float('tp3_r_multiple', 3.5, 6.0, step=0.5),
-                'tp1_close_pct': trial.suggest_float('tp1_close_pct', 0.15, 0.40, step=0.05),
-                'tp2_close_pct': trial.suggest_float('tp2_close_pct', 0.10, 0.30, step=0.05),
-                'tp3_close_pct': trial.suggest_float('tp3_close_pct', 0.10, 0.25, step=0.05),
-                'use_htf_filter': trial.suggest_categorical('use_htf_filter', [False]),
-                'use_structure_filter': trial.suggest_categorical('use_structure_filter', [False]),
-                'use_confirmation_filter': trial.suggest_categorical('use_confirmation_filter', [False]),
-                'use_fib_filter': trial.suggest_categorical('use_fib_filter', [False]),
-                'use_displacement_filter': trial.suggest_categorical('use_displacement_filter', [False]),
-                'use_candle_rejection': trial.suggest_categorical('use_candle_rejection', [False]),
-                # Note: daily_loss_halt_pct removed - 5ers has no daily DD limit
-                'max_total_dd_warning': trial.suggest_float('max_total_dd_warning', 7.0, 9.0, step=0.5),
-                'consecutive_loss_halt': 999,  # Disabled for 5ers
-            }
+        params = suggest_optuna_params(trial, warm_start=self.use_warm_start)
         
         # ============================================================================
         # VALIDATION CONSTRAINTS: Reject invalid parameter combinations
         # ============================================================================
-        
-        # TP R-Multiple monotonic constraint: TP1 < TP2 < TP3
-        if not (params['tp1_r_multiple'] < params['tp2_r_multiple'] < params['tp3_r_multiple']):
-            trial.set_user_attr('rejection_reason', 'TP R-multiples not ascending')
-            trial.set_user_attr('quarterly_stats', {})
+        rejection_reason = param_constraint_violation(params)
+        if rejection_reason:
+            trial.set_user_attr('rejection_reason', rejection_reason)
             trial.set_user_attr('overall_stats', {'trades': 0, 'profit': 0, 'win_rate': 0})
             return -999999.0
         
-        # TP Close percentage sum constraint: tp1 + tp2 + tp3 <= 0.85
-        total_close_pct = params['tp1_close_pct'] + params['tp2_close_pct'] + params['tp3_close_pct']
-        if total_close_pct > 0.85:
-            trial.set_user_attr('rejection_reason', f'TP close sum {total_close_pct:.2f} > 0.85')
-            trial.set_user_attr('quarterly_stats', {})
-            trial.set_user_attr('overall_stats', {'trades': 0, 'profit': 0, 'win_rate': 0})
-            return -999999.0
+        backtest_kwargs = backtest_kwargs_from_params(params)
         
-        # ADX threshold constraint: range < trend
-        if params['adx_range_threshold'] >= params['adx_trend_threshold']:
-            trial.set_user_attr('rejection_reason', 'ADX range >= trend threshold')
-            trial.set_user_attr('quarterly_stats', {})
-            trial.set_user_attr('overall_stats', {'trades': 0, 'profit': 0, 'win_rate': 0})
-            return -999999.0
+        # Multi-fidelity: cheap rung on liquid subset first, full universe only for survivors
+        if self.use_multi_fidelity:
+            self._run_low_fidelity_rung(trial, backtest_kwargs)
+            trial.set_user_attr('fidelity_level', 1)
         
         training_trades = run_full_period_backtest(
             start_date=TRAINING_START,
             end_date=TRAINING_END,
-            min_confluence=params['min_confluence'],
-            min_quality_factors=params['min_quality_factors'],
-            risk_per_trade_pct=params['risk_per_trade_pct'],
-            atr_min_percentile=params['atr_min_percentile'],
-            trail_activation_r=params['trail_activation_r'],
-            december_atr_multiplier=params['december_atr_multiplier'],
-            volatile_asset_boost=params['volatile_asset_boost'],
-            ml_min_prob=None,
-            require_adx_filter=True,
-            min_adx=25.0,
-            use_adx_regime_filter=False,  # DISABLED: ADX regime filtering disabled for now
-            adx_trend_threshold=params['adx_trend_threshold'],
-            adx_range_threshold=params['adx_range_threshold'],
-            trend_min_confluence=params['trend_min_confluence'],
-            range_min_confluence=params['range_min_confluence'],
-            atr_volatility_ratio=params['atr_vol_ratio_range'],
-            atr_vol_ratio_range=params['atr_vol_ratio_range'],
-            atr_trail_multiplier=params['atr_trail_multiplier'],
-            partial_exit_at_1r=params['partial_exit_at_1r'],
-            partial_exit_pct=params['partial_exit_pct'],
-            # NEW: TP parameters
-            tp1_r_multiple=params['tp1_r_multiple'],
-            tp2_r_multiple=params['tp2_r_multiple'],
-            tp3_r_multiple=params['tp3_r_multiple'],
-            tp1_close_pct=params['tp1_close_pct'],
-            tp2_close_pct=params['tp2_close_pct'],
-            tp3_close_pct=params['tp3_close_pct'],
-            # NEW: Filter toggles
-            use_htf_filter=params['use_htf_filter'],
-            use_structure_filter=params['use_structure_filter'],
-            use_confirmation_filter=params['use_confirmation_filter'],
-            use_fib_filter=params['use_fib_filter'],
-            use_displacement_filter=params['use_displacement_filter'],
-            use_candle_rejection=params['use_candle_rejection'],
-            # 5ers compliance (no daily DD limit!)
-            max_total_dd_warning=params['max_total_dd_warning'],
-            consecutive_loss_halt=params['consecutive_loss_halt'],
+            **backtest_kwargs,
         )
         
         if not training_trades or len(training_trades) == 0:
-            trial.set_user_attr('quarterly_stats', {})
             trial.set_user_attr('overall_stats', {'trades': 0, 'profit': 0, 'win_rate': 0})
             return -50000.0
         
@@ -1741,7 +2131,6 @@ class OptunaOptimizer:
         overall_win_rate = (wins / total_trades * 100) if total_trades > 0 else 0
         
         if total_r <= 0:
-            trial.set_user_attr('quarterly_stats', {})
             trial.set_user_attr('overall_stats', {'trades': total_trades, 'profit': total_r, 'win_rate': overall_win_rate})
             return -50000.0
         
@@ -1784,7 +2173,6 @@ class OptunaOptimizer:
                 'win_rate': round(q_wr, 1)
             }
         
-        trial.set_user_attr('quarterly_stats', quarterly_stats)
         trial.set_user_attr('overall_stats', {
             'trades': total_trades,
             'wins': wins,
@@ -2009,8 +2397,10 @@ class OptunaOptimizer:
         trial.set_user_attr('win_rate', round(overall_win_rate, 2))
         trial.set_user_attr('max_ftmo_dd_pct', round(max_ftmo_dd, 2))
         trial.set_user_attr('ftmo_challenge_passed', compliance_report.get('challenge_passed', False))
-        trial.set_user_attr('compliance_report', compliance_report)
-        trial.set_user_attr('score_breakdown', {
+        
+        # Dicts go to the artifact store; the study DB keeps only their key
+        store = get_artifact_store()
+        score_breakdown = {
             'base_r_component': round(r_component, 2),
             'base_profit_component': round(profit_component, 2),
             'base_score_total': round(base_score, 2),
@@ -2022,14 +2412,24 @@ class OptunaOptimizer:
             'dd_penalty': round(dd_penalty, 2),
             'ftmo_dd_penalty': round(ftmo_dd_penalty, 2),
             'consistency_penalty': round(consistency_penalty, 2),
-        })
+        }
+        trial.set_user_attr(TRIAL_ARTIFACT_ATTR, store.put({
+            'compliance_report': compliance_report,
+            'score_breakdown': score_breakdown,
+            'quarterly_stats': quarterly_stats,
+        }))
+        
+        # Trade snapshot only when the run's best improves (a handful per study)
+        if final_score > self.snapshot_best:
+            self.snapshot_best = final_score
+            trial.set_user_attr(TRIAL_TRADES_ATTR, store.put([t.to_dict() for t in training_trades]))
         
         return final_score
     
     def run_optimization(self, n_trials: int = 5) -> Dict:
         """Run Optuna optimization on TRAINING data only."""
         import optuna
-        from optuna.pruners import MedianPruner
+        from optuna.pruners import MedianPruner, SuccessiveHalvingPruner
         
         optuna.logging.set_verbosity(optuna.logging.WARNING)
         
@@ -2038,8 +2438,19 @@ class OptunaOptimizer:
         print(f"TRAINING PERIOD: 2023-01-01 to 2024-09-30")
         print(f"Regime-Adaptive V2: Trend (ADX >= threshold) + Conservative Range (ADX < threshold)")
         print(f"Storage: {OPTUNA_DB_PATH} (resumable)")
+        if self.use_multi_fidelity:
+            print(f"Multi-fidelity: rung 0 = {len(FIDELITY_SUBSET_ASSETS)} assets x {FIDELITY_SUBSET_MONTHS} months "
+                  f"(successive halving, keep 1/{FIDELITY_REDUCTION_FACTOR})")
         print(f"{'='*60}")
         
+        if self.use_multi_fidelity:
+            pruner = SuccessiveHalvingPruner(
+                min_resource=FIDELITY_LOW_STEP,
+                reduction_factor=FIDELITY_REDUCTION_FACTOR,
+            )
+        else:
+            pruner = MedianPruner()
+        
         sampler = optuna.samplers.TPESampler(
             seed=42,
             n_startup_trials=1 if self.use_warm_start else 5,
@@ -2050,16 +2461,17 @@ class OptunaOptimizer:
             storage=OPTUNA_DB_PATH,
             load_if_exists=True,
             sampler=sampler,
-            pruner=MedianPruner()
+            pruner=pruner
         )
         
-        existing_trials = len(study.trials)
+        existing_trials = len(study.get_trials(deepcopy=False))
         previous_best_value = None  # Track previous best to detect real improvements
         if existing_trials > 0:
             print(f"Resuming from existing study with {existing_trials} completed trials")
             try:
                 if study.best_trial and study.best_value is not None:
                     previous_best_value = study.best_value
+                    self.snapshot_best = previous_best_value
                     print(f"Current best value: {study.best_value:.0f}")
                 else:
                     print("No best trial found yet (all trials may have failed)")
@@ -2088,6 +2500,12 @@ class OptunaOptimizer:
             """
             nonlocal best_value_before_run
             
+            if trial.state == optuna.trial.TrialState.PRUNED:
+                low_r = trial.user_attrs.get('fidelity_low_r', 0)
+                print(f"\n✂️  TRIAL #{trial.number} PRUNED at rung 0 | Subset R: {low_r:+.2f} "
+                      f"({trial.user_attrs.get('fidelity_low_trades', 0)} trades)")
+                return
+            
             log_optimization_progress(
                 trial_num=trial.number,
                 value=trial.value if trial.value is not None else 0,
@@ -2113,7 +2531,7 @@ class OptunaOptimizer:
             except (ValueError, AttributeError):
                 pass
             
-            quarterly_stats = trial.user_attrs.get('quarterly_stats', {})
+            quarterly_stats = load_trial_artifact(trial).get('quarterly_stats', {})
             overall_stats = trial.user_attrs.get('overall_stats', {})
             
             # Display current best value
@@ -2218,7 +2636,7 @@ class OptunaOptimizer:
         print(f"\n{'='*60}")
         print(f"OPTIMIZATION COMPLETE")
         print(f"{'='*60}")
-        print(f"Total Trials: {len(study.trials)}")
+        print(f"Total Trials: {len(study.get_trials(deepcopy=False))}")
         print(f"Best Score: {self.best_score:.0f}")
         print(f"Best Parameters:")
         for k, v in sorted(self.best_params.items()):
@@ -2266,7 +2684,7 @@ class OptunaOptimizer:
             'best_params': self.best_params,
             'best_score': self.best_score,
             'n_trials': n_trials,
-            'total_trials': len(study.trials),
+            'total_trials': len(study.get_trials(deepcopy=False)),
             'study': study,  # Return study for top 5 analysis
         }
 
@@ -2287,7 +2705,7 @@ def validate_top_trials(study, top_n: int = 5) -> List[Dict]:
     is_multi_objective = len(study.directions) > 1 if hasattr(study, 'directions') else False
     
     # Get all completed trials
-    completed_trials = [t for t in study.trials if t.state == optuna.trial.TrialState.COMPLETE]
+    completed_trials = [t for t in study.get_trials(deepcopy=False) if t.state == optuna.trial.TrialState.COMPLETE]
     
     if is_multi_objective:
         # For multi-objective: filter trials with valid values tuple
@@ -2459,9 +2877,10 @@ def finalize_incomplete_run(optimization_mode: str = "TPE", top_n: int = 5):
     # Load study
     try:
         study = optuna.load_study(study_name=study_name, storage=db_path)
+        trials = study.get_trials(deepcopy=False)
         print(f"✓ Loaded study: {study_name}")
-        print(f"  Total trials: {len(study.trials)}")
-        print(f"  Completed: {len([t for t in study.trials if t.state == optuna.trial.TrialState.COMPLETE])}")
+        print(f"  Total trials: {len(trials)}")
+        print(f"  Completed: {len([t for t in trials if t.state == optuna.trial.TrialState.COMPLETE])}")
     except Exception as e:
         print(f"❌ Failed to load study: {e}")
         return
@@ -2480,51 +2899,55 @@ def finalize_incomplete_run(optimization_mode: str = "TPE", top_n: int = 5):
     # Get best trial (best validation performance)
     best_result = validation_results[0]
     best_trial_number = best_result['trial_number']
-    best_trial = study.trials[best_trial_number]
+    best_trial = trials[best_trial_number]
     best_params = best_trial.params
     
     print(f"\n🏆 Best Trial: #{best_trial_number} (Validation R: {best_result['validation_r']:+.1f})")
     print(f"   Fetching training trades...")
     
-    # Now fetch training trades for the best trial only
-    training_trades = run_full_period_backtest(
-        start_date=TRAINING_START,
-        end_date=TRAINING_END,
-        tf_config=GLOBAL_TF_CONFIG,
-        min_confluence=best_params.get('min_confluence', 3),
-        min_quality_factors=best_params.get('min_quality_factors', 2),
-        risk_per_trade_pct=best_params.get('risk_per_trade_pct', 0.5),
-        atr_min_percentile=best_params.get('atr_min_percentile', 60.0),
-        trail_activation_r=best_params.get('trail_activation_r', 2.2),
-        december_atr_multiplier=best_params.get('december_atr_multiplier', 1.5),
-        volatile_asset_boost=best_params.get('volatile_asset_boost', 1.5),
-        ml_min_prob=None,
-        require_adx_filter=True,
-        use_adx_regime_filter=False,
-        adx_trend_threshold=best_params.get('adx_trend_threshold', 25.0),
-        adx_range_threshold=best_params.get('adx_range_threshold', 20.0),
-        trend_min_confluence=best_params.get('trend_min_confluence', 6),
-        range_min_confluence=best_params.get('range_min_confluence', 5),
-        atr_volatility_ratio=best_params.get('atr_vol_ratio_range', 0.8),
-        atr_trail_multiplier=best_params.get('atr_trail_multiplier', 1.5),
-        partial_exit_at_1r=best_params.get('partial_exit_at_1r', True),
-        partial_exit_pct=best_params.get('partial_exit_pct', 0.5),
-        tp1_r_multiple=best_params.get('tp1_r_multiple', 1.0),
-        tp2_r_multiple=best_params.get('tp2_r_multiple', 2.0),
-        tp3_r_multiple=best_params.get('tp3_r_multiple', 3.0),
-        tp1_close_pct=best_params.get('tp1_close_pct', 0.20),
-        tp2_close_pct=best_params.get('tp2_close_pct', 0.20),
-        tp3_close_pct=best_params.get('tp3_close_pct', 0.20),
-        use_htf_filter=best_params.get('use_htf_filter', False),
-        use_structure_filter=best_params.get('use_structure_filter', False),
-        use_confirmation_filter=best_params.get('use_confirmation_filter', False),
-        use_fib_filter=best_params.get('use_fib_filter', False),
-        use_displacement_filter=best_params.get('use_displacement_filter', False),
-        use_candle_rejection=best_params.get('use_candle_rejection', False),
-        # 5ers compliance (no daily DD limit!)
-        max_total_dd_warning=best_params.get('max_total_dd_warning', 8.0),
-        consecutive_loss_halt=best_params.get('consecutive_loss_halt', 999),
-    )
+    # Trades snapshotted when the trial was scored; older trials are re-run
+    training_trades = load_trial_trades(best_trial)
+    if training_trades is not None:
+        print(f"   ✓ Training trades loaded from snapshot")
+    else:
+        training_trades = run_full_period_backtest(
+            start_date=TRAINING_START,
+            end_date=TRAINING_END,
+            tf_config=GLOBAL_TF_CONFIG,
+            min_confluence=best_params.get('min_confluence', 3),
+            min_quality_factors=best_params.get('min_quality_factors', 2),
+            risk_per_trade_pct=best_params.get('risk_per_trade_pct', 0.5),
+            atr_min_percentile=best_params.get('atr_min_percentile', 60.0),
+            trail_activation_r=best_params.get('trail_activation_r', 2.2),
+            december_atr_multiplier=best_params.get('december_atr_multiplier', 1.5),
+            volatile_asset_boost=best_params.get('volatile_asset_boost', 1.5),
+            ml_min_prob=None,
+            require_adx_filter=True,
+            use_adx_regime_filter=False,
+            adx_trend_threshold=best_params.get('adx_trend_threshold', 25.0),
+            adx_range_threshold=best_params.get('adx_range_threshold', 20.0),
+            trend_min_confluence=best_params.get('trend_min_confluence', 6),
+            range_min_confluence=best_params.get('range_min_confluence', 5),
+            atr_volatility_ratio=best_params.get('atr_vol_ratio_range', 0.8),
+            atr_trail_multiplier=best_params.get('atr_trail_multiplier', 1.5),
+            partial_exit_at_1r=best_params.get('partial_exit_at_1r', True),
+            partial_exit_pct=best_params.get('partial_exit_pct', 0.5),
+            tp1_r_multiple=best_params.get('tp1_r_multiple', 1.0),
+            tp2_r_multiple=best_params.get('tp2_r_multiple', 2.0),
+            tp3_r_multiple=best_params.get('tp3_r_multiple', 3.0),
+            tp1_close_pct=best_params.get('tp1_close_pct', 0.20),
+            tp2_close_pct=best_params.get('tp2_close_pct', 0.20),
+            tp3_close_pct=best_params.get('tp3_close_pct', 0.20),
+            use_htf_filter=best_params.get('use_htf_filter', False),
+            use_structure_filter=best_params.get('use_structure_filter', False),
+            use_confirmation_filter=best_params.get('use_confirmation_filter', False),
+            use_fib_filter=best_params.get('use_fib_filter', False),
+            use_displacement_filter=best_params.get('use_displacement_filter', False),
+            use_candle_rejection=best_params.get('use_candle_rejection', False),
+            # 5ers compliance (no daily DD limit!)
+            max_total_dd_warning=best_params.get('max_total_dd_warning', 8.0),
+            consecutive_loss_halt=best_params.get('consecutive_loss_halt', 999),
+        )
     
     print(f"   ✓ Training: {len(training_trades)} trades")
     
@@ -2583,16 +3006,13 @@ def finalize_incomplete_run(optimization_mode: str = "TPE", top_n: int = 5):
     
     # training_trades and validation_trades already fetched above
     
-    # Export CSVs
-    from tradr.utils.output_manager import export_trades_to_csv
-    
-    export_trades_to_csv(training_trades, output_mgr.output_dir / "best_trades_training.csv")
-    export_trades_to_csv(validation_trades, output_mgr.output_dir / "best_trades_validation.csv")
-    export_trades_to_csv(full_year_trades, output_mgr.output_dir / "best_trades_final.csv")
-    
-    print(f"✓ Exported training trades: {len(training_trades)}")
-    print(f"✓ Exported validation trades: {len(validation_trades)}")
-    print(f"✓ Exported full period trades: {len(full_year_trades)}")
+    # Export CSVs (best_trades_training / _validation / _final.csv)
+    output_mgr.save_best_trial_trades(
+        training_trades,
+        validation_trades,
+        full_year_trades,
+        risk_pct=best_params.get('risk_per_trade_pct', 0.5),
+    )
     
     # Step 4: Generate professional report
     print(f"\n{'='*80}")
@@ -2659,8 +3079,8 @@ def finalize_incomplete_run(optimization_mode: str = "TPE", top_n: int = 5):
     results = {
         'best_params': best_params,
         'best_score': best_score,
-        'n_trials': len([t for t in study.trials if t.state == optuna.trial.TrialState.COMPLETE]),
-        'total_trials': len(study.trials)
+        'n_trials': len([t for t in trials if t.state == optuna.trial.TrialState.COMPLETE]),
+        'total_trials': len(trials)
     }
     
     summary_file = generate_summary_txt(
@@ -2866,6 +3286,617 @@ def generate_summary_txt(
     return str(summary_filename)
 
 
+# ============================================================================
+# WALK-FORWARD RE-OPTIMIZATION
+# Re-runs a bounded TPE study on every training window and trades the winner
+# out of sample on the following span; the OOS spans are stitched together
+# ============================================================================
+
+WFO_OUTPUT_DIR = OUTPUT_DIR / "wfo"
+
+
+def preload_ohlcv_cache(assets: Optional[List[str]] = None, tf_config: Optional[Dict] = None) -> int:
+    """
+    Load every CSV a backtest needs into _DATA_CACHE up front.
+    
+    Worker processes forked afterwards inherit the parsed candles
+    (copy-on-write), so parallel windows / sweeps share one feature cache
+    instead of each re-reading the CSVs. Returns the number of series cached.
+    """
+    tf_config = tf_config or TIMEFRAME_CONFIG['TPE']
+    timeframes = {tf_config[k] for k in ('entry_tf', 'confirmation_tf', 'bias_tf', 'sr_tf')}
+    probe = datetime(2000, 1, 1)
+    for symbol in assets if assets is not None else get_all_trading_assets():
+        for tf in timeframes:
+            load_ohlcv_data(symbol, tf, probe, probe)
+    return len(_DATA_CACHE)
+
+
+def _init_backtest_worker(tf_config: Dict, excluded_assets: List[str]) -> None:
+    """Process-pool initializer: same exclusions as the parent, cache loaded once per worker."""
+    global DEFAULT_EXCLUDED_ASSETS
+    DEFAULT_EXCLUDED_ASSETS = list(excluded_assets)
+    if not _DATA_CACHE:  # spawn start method: nothing inherited
+        preload_ohlcv_cache(tf_config=tf_config)
+
+
+def _backtest_pool(workers: int, tf_config: Dict):
+    """ProcessPoolExecutor that forks (sharing _DATA_CACHE) where the platform allows it."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_backtest_worker,
+        initargs=(tf_config, DEFAULT_EXCLUDED_ASSETS),
+    )
+
+
+def _trade_record(trade: Any) -> Dict:
+    return {
+        'symbol': getattr(trade, 'symbol', ''),
+        'direction': getattr(trade, 'direction', ''),
+        'entry_date': str(getattr(trade, 'entry_date', '')),
+        'exit_date': str(getattr(trade, 'exit_date', '')),
+        'rr': float(getattr(trade, 'rr', 0) or 0),
+    }
+
+
+def score_window_trades(trades: List[Any], risk_per_trade_pct: float) -> Tuple[float, Dict]:
+    """
+    Training-window objective for walk-forward re-optimization.
+    
+    Total R, disqualified (-999999) at >= 10% 5ers drawdown; -50000 without
+    trades, as in the main objective.
+    """
+    if not trades:
+        return -50000.0, {'trades': 0}
+    risk_usd = ACCOUNT_SIZE * (risk_per_trade_pct / 100)
+    compliance = compute_ftmo_compliance(trades, risk_usd)
+    total_r = sum(getattr(t, 'rr', 0) for t in trades)
+    wins = sum(1 for t in trades if getattr(t, 'rr', 0) > 0)
+    stats = {
+        'trades': len(trades),
+        'total_r': round(total_r, 2),
+        'win_rate': round(wins / len(trades) * 100, 1),
+        'max_ftmo_dd_pct': round(compliance.get('max_ftmo_dd_pct', 0), 2),
+    }
+    if compliance.get('max_ftmo_dd_pct', 0) >= 10.0:
+        return -999999.0, stats
+    return total_r, stats
+
+
+def _wfo_task_key(task: Dict) -> Dict:
+    """The settings a window checkpoint must match to be reused on resume."""
+    return {k: task[k] for k in ('train_start', 'train_end', 'val_start', 'val_end', 'n_trials', 'seed',
+                                 'warm_start', 'tf_config', 'excluded_assets')}
+
+
+def run_wfo_window(task: Dict) -> Dict:
+    """
+    Optimize one walk-forward window and trade the winner out of sample.
+    
+    Runs in a worker process. The result is written to task['checkpoint']
+    (atomically) before it is returned. If every trial was rejected by the
+    parameter constraints or disqualified (-999999), the window is marked
+    'skipped' and trades nothing out of sample.
+    """
+    import time
+    import optuna
+    
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    t0 = time.perf_counter()
+    train_start, train_end, val_start, val_end = (
+        datetime.fromisoformat(task[k]) for k in ('train_start', 'train_end', 'val_start', 'val_end')
+    )
+    tf_config = task['tf_config']
+    
+    def objective(trial) -> float:
+        params = suggest_optuna_params(trial, warm_start=task['warm_start'])
+        reason = param_constraint_violation(params)
+        if reason:
+            trial.set_user_attr('rejection_reason', reason)
+            return -999999.0
+        trades = run_full_period_backtest(
+            start_date=train_start, end_date=train_end, tf_config=tf_config,
+            **backtest_kwargs_from_params(params),
+        )
+        score, stats = score_window_trades(trades, params['risk_per_trade_pct'])
+        trial.set_user_attr('stats', stats)
+        return score
+    
+    study = optuna.create_study(
+        direction='maximize',
+        sampler=optuna.samplers.TPESampler(seed=task['seed'], n_startup_trials=min(10, task['n_trials'])),
+    )
+    study.optimize(objective, n_trials=task['n_trials'], timeout=task.get('timeout_s'))
+    
+    valid = [
+        t for t in study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+        if t.value is not None and t.value > -999999.0 and 'rejection_reason' not in t.user_attrs
+    ]
+    result = {
+        'window': task['window'],
+        'task': _wfo_task_key(task),
+        'trials': len(study.trials),
+    }
+    if not valid:
+        result.update({
+            'skipped': 'no valid trial (all rejected or disqualified)',
+            'best_params': None,
+            'train_score': None,
+            'train_stats': {},
+            'oos_trades': [],
+            'oos_total_r': 0.0,
+            'oos_metrics': {},
+        })
+    else:
+        best = max(valid, key=lambda t: t.value)
+        best_params = suggest_optuna_params(optuna.trial.FixedTrial(best.params), warm_start=task['warm_start'])
+        oos_trades = run_full_period_backtest(
+            start_date=val_start, end_date=val_end, tf_config=tf_config,
+            **backtest_kwargs_from_params(best_params),
+        )
+        oos_metrics = calculate_risk_metrics(oos_trades, best_params['risk_per_trade_pct'], account_size=ACCOUNT_SIZE)
+        result.update({
+            'best_params': best_params,
+            'train_score': round(best.value, 4),
+            'train_stats': best.user_attrs.get('stats', {}),
+            'oos_trades': [_trade_record(t) for t in oos_trades],
+            'oos_total_r': round(sum(getattr(t, 'rr', 0) for t in oos_trades), 2),
+            'oos_metrics': oos_metrics.to_dict(),
+        })
+    result['elapsed_s'] = round(time.perf_counter() - t0, 1)
+    
+    checkpoint = Path(task['checkpoint'])
+    tmp = checkpoint.with_suffix('.tmp')
+    tmp.write_text(json.dumps(result, indent=2, default=str))
+    tmp.replace(checkpoint)
+    return result
+
+
+def stitch_oos_trades(results: List[Dict]) -> List[Dict]:
+    """
+    Concatenate the windows' OOS trades in window order (skipped windows
+    are left out).
+    
+    Where validation spans overlap (step < validation length) each window
+    keeps only trades before the next window's validation start, so every
+    day is traded by exactly one parameter set. Each record gets the
+    window's risk_per_trade_pct.
+    """
+    results = sorted((r for r in results if not r.get('skipped')), key=lambda r: r['window'])
+    stitched = []
+    for i, result in enumerate(results):
+        cutoff = results[i + 1]['task']['val_start'] if i + 1 < len(results) else None
+        risk_pct = result['best_params']['risk_per_trade_pct']
+        for trade in result['oos_trades']:
+            if cutoff is None or trade['entry_date'][:10] < cutoff[:10]:
+                stitched.append({**trade, 'window': result['window'], 'risk_per_trade_pct': risk_pct})
+    return stitched
+
+
+def run_walk_forward_optimization(
+    start_date: datetime = FULL_PERIOD_START,
+    end_date: datetime = FULL_PERIOD_END,
+    train_months: int = 12,
+    validate_months: int = 3,
+    step_months: Optional[int] = None,
+    rolling: bool = True,
+    n_trials: int = 30,
+    workers: Optional[int] = None,
+    run_name: str = "wfo",
+    tf_config: Optional[Dict] = None,
+    warm_start: bool = False,
+    timeout_s: Optional[float] = None,
+    seed: int = 42,
+) -> Dict:
+    """
+    Walk-forward optimization: re-optimize on every training window, trade OOS.
+    
+    Windows come from WalkForwardTester (step defaults to the validation
+    length, so OOS spans tile the period). Each window runs `n_trials` TPE
+    trials on its training span in its own process; the winner is backtested
+    on the validation span. Finished windows are checkpointed under
+    ftmo_analysis_output/wfo/<run_name>/ and skipped when the run is resumed
+    with the same settings.
+    
+    Returns:
+        Summary dict (per-window results, stitched OOS metrics, WF efficiency)
+    """
+    import os
+    import time
+    from concurrent.futures import as_completed
+    
+    tf_config = tf_config or GLOBAL_TF_CONFIG or TIMEFRAME_CONFIG['TPE']
+    step_months = step_months or validate_months
+    workers = workers or min(4, os.cpu_count() or 1)
+    run_dir = WFO_OUTPUT_DIR / run_name
+    run_dir.mkdir(parents=True, exist_ok=True)
+    
+    windows = WalkForwardTester(
+        [], start_date, end_date,
+        train_months=train_months, validate_months=validate_months,
+        rolling=rolling, step_months=step_months,
+    ).get_date_windows()
+    
+    print(f"\n{'='*80}")
+    print(f"WALK-FORWARD OPTIMIZATION ({'rolling' if rolling else 'anchored'})")
+    print(f"{'='*80}")
+    print(f"  Period:   {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}")
+    print(f"  Windows:  {len(windows)} (train {train_months}m, OOS {validate_months}m, step {step_months}m)")
+    print(f"  Trials:   {n_trials} per window, {workers} workers")
+    print(f"  Output:   {run_dir}/")
+    
+    results: Dict[int, Dict] = {}
+    pending = []
+    for i, (train_start, train_end, val_start, val_end) in enumerate(windows, start=1):
+        task = {
+            'window': i,
+            'train_start': train_start.isoformat(),
+            'train_end': train_end.isoformat(),
+            'val_start': val_start.isoformat(),
+            'val_end': val_end.isoformat(),
+            'n_trials': n_trials,
+            'seed': seed + i,
+            'warm_start': warm_start,
+            'tf_config': tf_config,
+            'excluded_assets': list(DEFAULT_EXCLUDED_ASSETS),
+            'timeout_s': timeout_s,
+            'checkpoint': str(run_dir / f"window_{i:03d}.json"),
+        }
+        checkpoint = Path(task['checkpoint'])
+        if checkpoint.exists():
+            try:
+                saved = json.loads(checkpoint.read_text())
+                if saved.get('task') == json.loads(json.dumps(_wfo_task_key(task), default=str)):
+                    results[i] = saved
+                    continue
+            except (OSError, ValueError):
+                pass
+        pending.append(task)
+    
+    if results:
+        print(f"  Resumed:  {len(results)} window(s) from checkpoints")
+    
+    t0 = time.perf_counter()
+    if pending:
+        print(f"\n  Preloading candle cache... {preload_ohlcv_cache(tf_config=tf_config)} series")
+        with _backtest_pool(min(workers, len(pending)), tf_config) as pool:
+            futures = {pool.submit(run_wfo_window, task): task for task in pending}
+            for future in as_completed(futures):
+                task = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"\n  ❌ Window {task['window']} failed: {e}")
+                    continue
+                results[result['window']] = result
+                if result.get('skipped'):
+                    print(f"\n  ⚠️ Window {result['window']:>3}  {task['val_start'][:10]} → {task['val_end'][:10]}  "
+                          f"skipped: {result['skipped']} ({result['trials']} trials)")
+                    continue
+                print(f"\n  ✓ Window {result['window']:>3}  {task['val_start'][:10]} → {task['val_end'][:10]}  "
+                      f"IS {result['train_stats'].get('total_r', 0):+7.2f}R  OOS {result['oos_total_r']:+7.2f}R  "
+                      f"({result['trials']} trials, {result['elapsed_s']:.0f}s)")
+    
+    ordered = [results[i] for i in sorted(results)]
+    traded = [r for r in ordered if not r.get('skipped')]
+    stitched = stitch_oos_trades(traded)
+    
+    # Stitched OOS metrics in USD: scale each trade by its window's risk (R at 1%)
+    rr_at_1pct = np.array([t['rr'] * t['risk_per_trade_pct'] for t in stitched])
+    entry = np.array([to_epoch(t['entry_date']) for t in stitched])
+    oos_metrics = risk_metrics_from_r(rr_at_1pct, entry, risk_per_trade_pct=1.0, account_size=ACCOUNT_SIZE)
+    
+    # Walk-forward efficiency: OOS R per month / IS R per month
+    is_r_per_month = [
+        r['train_stats'].get('total_r', 0) * 30 / max(1, (
+            datetime.fromisoformat(r['task']['train_end']) - datetime.fromisoformat(r['task']['train_start'])
+        ).days)
+        for r in traded
+    ]
+    oos_r_per_month = [r['oos_total_r'] / validate_months for r in traded]
+    mean_is = float(np.mean(is_r_per_month)) if traded else 0.0
+    wf_efficiency = float(np.mean(oos_r_per_month)) / mean_is if mean_is > 0 else 0.0
+    
+    summary = {
+        'run_name': run_name,
+        'rolling': rolling,
+        'train_months': train_months,
+        'validate_months': validate_months,
+        'step_months': step_months,
+        'n_trials': n_trials,
+        'total_windows': len(windows),
+        'completed_windows': len(ordered),
+        'skipped_windows': len(ordered) - len(traded),
+        'elapsed_s': round(time.perf_counter() - t0, 1),
+        'oos_trades': len(stitched),
+        'oos_total_r': round(sum(t['rr'] for t in stitched), 2),
+        'oos_metrics': oos_metrics.to_dict(),
+        'wf_efficiency': round(wf_efficiency, 3),
+        'windows': [
+            {
+                'window': r['window'],
+                'train_start': r['task']['train_start'][:10],
+                'train_end': r['task']['train_end'][:10],
+                'val_start': r['task']['val_start'][:10],
+                'val_end': r['task']['val_end'][:10],
+                'train_score': r['train_score'],
+                'train_total_r': r['train_stats'].get('total_r', 0),
+                'oos_total_r': r['oos_total_r'],
+                'oos_trades': len(r['oos_trades']),
+                'best_params': r['best_params'],
+                'skipped': r.get('skipped'),
+            }
+            for r in ordered
+        ],
+    }
+    (run_dir / "summary.json").write_text(json.dumps(summary, indent=2, default=str))
+    (run_dir / "oos_trades.json").write_text(json.dumps(stitched, indent=2, default=str))
+    
+    print(f"\n{'='*80}")
+    print("WALK-FORWARD OPTIMIZATION SUMMARY")
+    print(f"{'='*80}")
+    print(f"  Windows:        {len(ordered)}/{len(windows)}"
+          + (f"  ({summary['skipped_windows']} skipped, no valid trial)" if summary['skipped_windows'] else ""))
+    print(f"  OOS trades:     {len(stitched)}  ({summary['oos_total_r']:+.2f}R)")
+    print(f"  OOS Sharpe:     {oos_metrics.sharpe_ratio:+.2f}   Max DD ${oos_metrics.max_drawdown:,.0f}")
+    print(f"  WF efficiency:  {wf_efficiency:.2f}  (OOS R/month ÷ IS R/month)")
+    print(f"  Saved:          {run_dir / 'summary.json'}")
+    
+    return summary
+
+
+# ============================================================================
+# PARAMETER SENSITIVITY SWEEP
+# Perturbs every backtest parameter around a params file and backtests all
+# perturbations in parallel (tornado, heat-map and interaction data)
+# ============================================================================
+
+SENSITIVITY_OUTPUT_DIR = OUTPUT_DIR / "sensitivity"
+
+# Parameters backtest_kwargs_from_params passes to run_full_period_backtest
+SENSITIVITY_PARAMETERS = (
+    'min_confluence', 'min_quality_factors', 'risk_per_trade_pct', 'atr_min_percentile',
+    'trail_activation_r', 'december_atr_multiplier', 'volatile_asset_boost',
+    'adx_trend_threshold', 'adx_range_threshold', 'trend_min_confluence', 'range_min_confluence',
+    'atr_vol_ratio_range', 'atr_trail_multiplier', 'partial_exit_at_1r', 'partial_exit_pct',
+    'tp1_r_multiple', 'tp2_r_multiple', 'tp3_r_multiple', 'tp1_close_pct', 'tp2_close_pct', 'tp3_close_pct',
+    'use_htf_filter', 'use_structure_filter', 'use_confirmation_filter', 'use_fib_filter',
+    'use_displacement_filter', 'use_candle_rejection', 'max_total_dd_warning', 'consecutive_loss_halt',
+)
+
+SENSITIVITY_METRICS = ('total_r', 'max_ftmo_dd_pct', 'win_rate', 'trades')
+
+
+def unwrap_params_payload(data: Dict) -> Dict:
+    """The parameter dict of {...}, {"parameters": {...}} or {"parameters": {"parameters": {...}}}."""
+    if 'parameters' in data and isinstance(data['parameters'], dict):
+        # Check for double-nesting: {"parameters": {"parameters": {...}}}
+        if 'parameters' in data['parameters']:
+            return data['parameters']['parameters']
+        return data['parameters']
+    return data
+
+
+def load_merged_params(params_file: str = "params/current_params.json") -> Dict:
+    """
+    Parameters from a params / best_params JSON merged over PARAMETER_DEFAULTS.
+    
+    Accepts every layout unwrap_params_payload() does and maps the legacy
+    min_confluence_score key to min_confluence.
+    """
+    with open(params_file, 'r') as f:
+        raw_params = unwrap_params_payload(json.load(f))
+    
+    params = PARAMETER_DEFAULTS.copy()
+    for key, value in raw_params.items():
+        if key in params and not key.startswith('_'):
+            params[key] = value
+    
+    # Handle min_confluence_score -> min_confluence alias
+    if 'min_confluence_score' in raw_params and 'min_confluence' not in raw_params:
+        params['min_confluence'] = raw_params['min_confluence_score']
+    return params
+
+
+def sweep_metrics(trades: List[Any], risk_per_trade_pct: float) -> Dict:
+    """Total R, max 5ers drawdown and win rate of one sweep backtest."""
+    risk_usd = ACCOUNT_SIZE * (risk_per_trade_pct / 100)
+    rr = np.array([getattr(t, 'rr', 0) or 0 for t in trades], dtype=float)
+    compliance = compute_ftmo_compliance(trades, risk_usd) if trades else {}
+    return {
+        'total_r': round(float(rr.sum()), 2),
+        'max_ftmo_dd_pct': round(compliance.get('max_ftmo_dd_pct', 0.0), 2),
+        'win_rate': round(float((rr > 0).mean() * 100), 1) if rr.size else 0.0,
+        'trades': int(rr.size),
+    }
+
+
+def _run_sensitivity_point(task: Dict) -> Tuple[str, Dict]:
+    """Worker: backtest one perturbed parameter set."""
+    params = task['params']
+    trades = run_full_period_backtest(
+        start_date=task['start'], end_date=task['end'], tf_config=task['tf_config'],
+        **backtest_kwargs_from_params(params),
+    )
+    return task['key'], sweep_metrics(trades, params['risk_per_trade_pct'])
+
+
+def run_sensitivity_sweep(
+    params_file: str = "params/current_params.json",
+    start_date: datetime = TRAINING_START,
+    end_date: datetime = TRAINING_END,
+    steps: int = 2,
+    rel_step: float = 0.1,
+    top_k: int = 3,
+    workers: Optional[int] = None,
+    run_name: str = "sensitivity",
+    tf_config: Optional[Dict] = None,
+) -> Dict:
+    """
+    One-at-a-time sensitivity of every backtest parameter, plus pairwise
+    interaction surfaces for the `top_k` parameters with the widest total R
+    range.
+    
+    Every parameter in SENSITIVITY_PARAMETERS is moved -steps..+steps around
+    its value in `params_file` (ParameterSensitivityAnalyzer.perturbation_grid);
+    combinations that break the optimizer's constraints are not run. All
+    distinct points are backtested once, in parallel, on workers that share the
+    preloaded candle cache. Output: ftmo_analysis_output/sensitivity/<run_name>.json
+    
+    Returns:
+        Dict with baseline, tornado (per metric), heatmap and interactions
+    """
+    import os
+    import time
+    from concurrent.futures import as_completed
+    from itertools import combinations
+    
+    tf_config = tf_config or GLOBAL_TF_CONFIG or TIMEFRAME_CONFIG['TPE']
+    workers = workers or min(4, os.cpu_count() or 1)
+    
+    baseline = load_merged_params(params_file)
+    for name in SENSITIVITY_PARAMETERS:
+        # JSON may store 2 for 2.0: perturb with the default's type
+        default = PARAMETER_DEFAULTS[name]
+        if isinstance(default, float) and not isinstance(baseline[name], bool):
+            baseline[name] = float(baseline[name])
+    
+    analyzer = ParameterSensitivityAnalyzer
+    grid = analyzer.perturbation_grid(baseline, list(SENSITIVITY_PARAMETERS), steps=steps, rel_step=rel_step)
+    
+    # A baseline outside the optimizer's constraints (hand-edited params) is swept unfiltered
+    baseline_violation = param_constraint_violation(baseline)
+    
+    def point_key(overrides: Dict) -> Optional[str]:
+        """Stable key of a parameter set (None if it violates a constraint)."""
+        changed = {k: v for k, v in overrides.items() if v != baseline[k]}
+        if not baseline_violation and param_constraint_violation({**baseline, **changed}):
+            return None
+        return json.dumps(changed, sort_keys=True)
+    
+    points: Dict[str, Dict] = {}  # key -> full params
+    
+    def add_point(overrides: Dict) -> Optional[str]:
+        key = point_key(overrides)
+        if key is not None and key not in points:
+            points[key] = {**baseline, **overrides}
+        return key
+    
+    baseline_key = add_point({})
+    single_keys = {
+        name: [(offset, value, add_point({name: value})) for offset, value in values]
+        for name, values in grid.items()
+    }
+    
+    print(f"\n{'='*80}")
+    print("PARAMETER SENSITIVITY SWEEP")
+    print(f"{'='*80}")
+    print(f"  Params:     {params_file}")
+    print(f"  Period:     {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}")
+    print(f"  Grid:       {len(grid)} parameters x ±{steps} steps of {rel_step:.0%}")
+    if baseline_violation:
+        print(f"  [!] Baseline breaks an optimizer constraint ({baseline_violation}); no points filtered")
+    
+    results: Dict[str, Dict] = {}
+    t0 = time.perf_counter()
+    
+    def run_points(keys: List[str]) -> None:
+        todo = [k for k in keys if k not in results]
+        if not todo:
+            return
+        print(f"  Running {len(todo)} backtests on {workers} workers...")
+        with _backtest_pool(min(workers, len(todo)), tf_config) as pool:
+            futures = [
+                pool.submit(_run_sensitivity_point, {
+                    'key': key, 'params': points[key], 'start': start_date, 'end': end_date, 'tf_config': tf_config,
+                })
+                for key in todo
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    key, metrics = future.result()
+                    results[key] = metrics
+                except Exception as e:
+                    print(f"\n  ❌ Sensitivity backtest failed: {e}")
+                if done % 10 == 0 or done == len(todo):
+                    print(f"\n  {done}/{len(todo)} done ({time.perf_counter() - t0:.0f}s)")
+    
+    print(f"  Preloading candle cache... {preload_ohlcv_cache(tf_config=tf_config)} series")
+    run_points(list(points))
+    
+    baseline_metrics = results.get(baseline_key, {})
+    sensitivity = {
+        name: [(offset, value, results.get(key) if key else None) for offset, value, key in entries]
+        for name, entries in single_keys.items()
+    }
+    by_value = {name: [(value, metrics) for offset, value, metrics in entries if offset != 0]
+                for name, entries in sensitivity.items()}
+    tornado = {
+        'total_r': analyzer.tornado_analysis(baseline_metrics, by_value, metric='total_r'),
+        'max_ftmo_dd_pct': analyzer.tornado_analysis(baseline_metrics, by_value, metric='max_ftmo_dd_pct',
+                                                     higher_is_better=False),
+        'win_rate': analyzer.tornado_analysis(baseline_metrics, by_value, metric='win_rate'),
+    }
+    heatmap = analyzer.heatmap(sensitivity, list(SENSITIVITY_METRICS))
+    
+    # Pairwise interaction surfaces for the most influential numeric parameters
+    top = [row['parameter'] for row in tornado['total_r']
+           if not isinstance(baseline[row['parameter']], bool)][:top_k]
+    pair_keys = {}
+    for a, b in combinations(top, 2):
+        pair_keys[(a, b)] = [
+            [add_point({a: va, b: vb}) for _, vb in grid[b]]
+            for _, va in grid[a]
+        ]
+    run_points([key for rows in pair_keys.values() for row in rows for key in row if key])
+    
+    interactions = []
+    for (a, b), rows in pair_keys.items():
+        surface = {
+            'parameters': [a, b],
+            'values_a': [value for _, value in grid[a]],
+            'values_b': [value for _, value in grid[b]],
+        }
+        for metric in SENSITIVITY_METRICS:
+            surface[metric] = [[results.get(key, {}).get(metric) if key else None for key in row] for row in rows]
+        interactions.append(surface)
+    
+    report = {
+        'params_file': str(params_file),
+        'start': start_date.strftime('%Y-%m-%d'),
+        'end': end_date.strftime('%Y-%m-%d'),
+        'steps': steps,
+        'rel_step': rel_step,
+        'backtests': len(results),
+        'elapsed_s': round(time.perf_counter() - t0, 1),
+        'baseline': baseline_metrics,
+        'baseline_params': {name: baseline[name] for name in SENSITIVITY_PARAMETERS},
+        'tornado': tornado,
+        'heatmap': heatmap,
+        'interactions': interactions,
+    }
+    SENSITIVITY_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_file = SENSITIVITY_OUTPUT_DIR / f"{run_name}.json"
+    output_file.write_text(json.dumps(report, indent=2, default=str))
+    
+    print(f"\n{'='*80}")
+    print("SENSITIVITY SUMMARY (total R range)")
+    print(f"{'='*80}")
+    print(f"  Baseline: {baseline_metrics.get('total_r', 0):+.2f}R, "
+          f"max DD {baseline_metrics.get('max_ftmo_dd_pct', 0):.2f}%, WR {baseline_metrics.get('win_rate', 0):.1f}%")
+    for row in tornado['total_r'][:10]:
+        print(f"  {row['parameter']:<28} {row['worst_impact']:+8.2f}R .. {row['best_impact']:+8.2f}R")
+    print(f"  {len(results)} backtests in {report['elapsed_s']:.0f}s -> {output_file}")
+    
+    return report
+
+
 # ============================================================================
 # NSGA-II MULTI-OBJECTIVE OPTIMIZATION
 # Optimizes three objectives simultaneously: Total R, Sharpe Ratio, Win Rate
@@ -3061,7 +4092,7 @@ def run_multi_objective_optimization(n_trials: int = 50) -> Dict:
         sampler=NSGAIISampler(seed=42)
     )
     
-    existing_trials = len(study.trials)
+    existing_trials = len(study.get_trials(deepcopy=False))
     if existing_trials > 0:
         print(f"Resuming study with {existing_trials} existing trials")
     
@@ -3127,7 +4158,7 @@ def run_multi_objective_optimization(n_trials: int = 50) -> Dict:
             'win_rate': wr,
             'study': study,
             'n_trials': n_trials,
-            'total_trials': len(study.trials),
+            'total_trials': len(study.get_trials(deepcopy=False)),
         }
     else:
         print("\n⚠️ No valid solutions found on Pareto frontier")
@@ -3178,13 +4209,7 @@ def run_validation_mode(start_date_str: str, end_date_str: str, params_file: str
         best_params = json.load(f)
 
     # Handle nested "parameters" structure from best_params.json for display
-    # Format can be: {"parameters": {...}} or just {...}
-    display_params = best_params
-    if 'parameters' in best_params and isinstance(best_params['parameters'], dict):
-        if 'parameters' in best_params['parameters']:
-            display_params = best_params['parameters']['parameters']
-        else:
-            display_params = best_params['parameters']
+    display_params = unwrap_params_payload(best_params)
 
     print(f"\n{'='*80}")
     print("FTMO PARAMETER VALIDATION MODE")
@@ -3235,29 +4260,11 @@ def run_validation_mode(start_date_str: str, end_date_str: str, params_file: str
     # Run backtests on all three periods
     print("Running backtests with loaded parameters...")
 
-    # Handle nested "parameters" structure from best_params.json
-    # Format can be: {"parameters": {...}} or just {...}
-    if 'parameters' in best_params and isinstance(best_params['parameters'], dict):
-        # Check for double-nesting: {"parameters": {"parameters": {...}}}
-        if 'parameters' in best_params['parameters']:
-            raw_params = best_params['parameters']['parameters']
-        else:
-            raw_params = best_params['parameters']
-    else:
-        raw_params = best_params
-
     # CRITICAL: Merge with PARAMETER_DEFAULTS for parity with TPE/NSGA and live bot
     # This ensures all 77 params are present with consistent defaults
-    params = PARAMETER_DEFAULTS.copy()
-    for key, value in raw_params.items():
-        if key in params and not key.startswith('_'):
-            params[key] = value
-    
-    # Handle min_confluence_score -> min_confluence alias
-    if 'min_confluence_score' in raw_params and 'min_confluence' not in raw_params:
-        params['min_confluence'] = raw_params['min_confluence_score']
+    params = load_merged_params(params_file)
     
-    print(f"   Loaded {len([k for k in raw_params if not k.startswith('_')])} params from file, merged with {len(PARAMETER_DEFAULTS)} defaults")
+    print(f"   Loaded {len([k for k in display_params if not k.startswith('_')])} params from file, merged with {len(PARAMETER_DEFAULTS)} defaults")
 
     # Get parameter values (all from merged params dict now)
     min_confluence = params['min_confluence']
@@ -3584,6 +4591,11 @@ def main():
     python ftmo_challenge_analyzer.py --status     # Check progress without running
     python ftmo_challenge_analyzer.py --trials 100 # Run 100 trials
     python ftmo_challenge_analyzer.py --multi      # Use NSGA-II multi-objective optimization
+    python ftmo_challenge_analyzer.py --multi-fidelity  # Prune weak trials on a liquid subset first
+    python ftmo_challenge_analyzer.py --wfo --trials 30 --workers 4  # Walk-forward re-optimization
+    python ftmo_challenge_analyzer.py --sensitivity --workers 8      # Perturb current_params.json
+    python ftmo_challenge_analyzer.py --rolling-starts day           # Pass rate over every start day
+    python ftmo_challenge_analyzer.py --mc-resampling daily          # Monte Carlo over whole trading days
       
     # Timeframe modes (NEW)
     python ftmo_challenge_analyzer.py --mode TPE      # D1 entries (default)
@@ -3595,7 +4607,7 @@ def main():
       python ftmo_challenge_analyzer.py --validate --start 2020-01-01 --end 2022-12-31
       python ftmo_challenge_analyzer.py --validate --start 2018-01-01 --end 2019-12-31 --params-file best_params.json
     """
-    global OPTUNA_DB_PATH, OPTUNA_STUDY_NAME, PROGRESS_LOG_FILE
+    global OPTUNA_DB_PATH, OPTUNA_STUDY_NAME, PROGRESS_LOG_FILE, GLOBAL_TF_CONFIG
     parser = argparse.ArgumentParser(
         description="FTMO Professional Optimization System - Resumable with ADX Filter"
     )
@@ -3627,6 +4639,11 @@ def main():
         default=None,
         help="Optimization mode: TPE (D1 entries), TPE_H4 (H4 entries), NSGA (D1 multi-obj), NSGA_H4 (H4 multi-obj)"
     )
+    parser.add_argument(
+        "--multi-fidelity",
+        action="store_true",
+        help="Successive-halving objective: screen trials on a liquid asset subset before the full universe (TPE only)"
+    )
     parser.add_argument(
         "--warm-start",
         action="store_true",
@@ -3662,6 +4679,79 @@ def main():
         default=None,
         help="Comma-separated symbols to exclude (e.g., CAD_CHF,CHF_JPY)"
     )
+    # === WALK-FORWARD OPTIMIZATION ===
+    parser.add_argument(
+        "--wfo",
+        action="store_true",
+        help="Walk-forward optimization: re-optimize per training window (--trials each), trade OOS, stitch (resumable)"
+    )
+    parser.add_argument(
+        "--wfo-train-months",
+        type=int,
+        default=12,
+        help="WFO training window in months (default: 12)"
+    )
+    parser.add_argument(
+        "--wfo-val-months",
+        type=int,
+        default=3,
+        help="WFO out-of-sample window in months, also the step (default: 3)"
+    )
+    parser.add_argument(
+        "--wfo-anchored",
+        action="store_true",
+        help="WFO with an anchored (growing) training window instead of rolling"
+    )
+    parser.add_argument(
+        "--wfo-run-name",
+        type=str,
+        default=None,
+        help="WFO checkpoint folder under ftmo_analysis_output/wfo/ (default: wfo_<mode>)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --wfo / --sensitivity (default: min(4, CPUs))"
+    )
+    # === PARAMETER SENSITIVITY ===
+    parser.add_argument(
+        "--sensitivity",
+        action="store_true",
+        help="Sensitivity sweep around --params-file on the training period (or --start/--end)"
+    )
+    parser.add_argument(
+        "--sens-steps",
+        type=int,
+        default=2,
+        help="Perturbation steps on each side of the baseline (default: 2 -> 5 points)"
+    )
+    parser.add_argument(
+        "--sens-rel-step",
+        type=float,
+        default=0.1,
+        help="Relative size of one perturbation step (default: 0.1 = 10%%)"
+    )
+    parser.add_argument(
+        "--sens-top",
+        type=int,
+        default=3,
+        help="Parameters combined pairwise into interaction surfaces (default: 3)"
+    )
+    parser.add_argument(
+        "--mc-resampling",
+        type=str,
+        choices=list(MonteCarloSimulator.RESAMPLING_MODES),
+        default="iid",
+        help="Monte Carlo resampling: iid trades, block (serial correlation) or daily (whole days) (default: iid)"
+    )
+    parser.add_argument(
+        "--rolling-starts",
+        type=str,
+        choices=['day', 'month'],
+        default=None,
+        help="After optimization, simulate the challenge from every start day/month of the final trades"
+    )
     parser.add_argument(
         "--finalize",
         action="store_true",
@@ -3704,6 +4794,44 @@ def main():
         )
         return
 
+    # === WALK-FORWARD OPTIMIZATION MODE ===
+    if args.wfo:
+        wfo_mode = args.mode or "TPE"
+        if 'NSGA' in wfo_mode:
+            print("❌ Error: --wfo re-optimizes with TPE; use --mode TPE or TPE_H4")
+            return
+        GLOBAL_TF_CONFIG = get_timeframe_config(wfo_mode)
+        run_walk_forward_optimization(
+            start_date=datetime.strptime(args.start, "%Y-%m-%d") if args.start else FULL_PERIOD_START,
+            end_date=datetime.strptime(args.end, "%Y-%m-%d") if args.end else FULL_PERIOD_END,
+            train_months=args.wfo_train_months,
+            validate_months=args.wfo_val_months,
+            rolling=not args.wfo_anchored,
+            n_trials=args.trials,
+            workers=args.workers,
+            run_name=args.wfo_run_name or f"wfo_{wfo_mode.lower()}",
+            tf_config=GLOBAL_TF_CONFIG,
+            warm_start=args.warm_start,
+        )
+        return
+    
+    # === PARAMETER SENSITIVITY MODE ===
+    if args.sensitivity:
+        sens_mode = args.mode or "TPE"
+        GLOBAL_TF_CONFIG = get_timeframe_config(sens_mode)
+        run_sensitivity_sweep(
+            params_file=args.params_file,
+            start_date=datetime.strptime(args.start, "%Y-%m-%d") if args.start else TRAINING_START,
+            end_date=datetime.strptime(args.end, "%Y-%m-%d") if args.end else TRAINING_END,
+            steps=args.sens_steps,
+            rel_step=args.sens_rel_step,
+            top_k=args.sens_top,
+            workers=args.workers,
+            run_name=f"sensitivity_{Path(args.params_file).stem}",
+            tf_config=GLOBAL_TF_CONFIG,
+        )
+        return
+    
     n_trials = args.trials
     
     # Determine optimization mode (supports new --mode flag)
@@ -3726,7 +4854,6 @@ def main():
     tf_config = get_timeframe_config(optimization_mode)
     
     # Set global TF config for use by objective functions
-    global GLOBAL_TF_CONFIG
     GLOBAL_TF_CONFIG = tf_config
     
     print(f"\n⏱️  TIMEFRAME CONFIGURATION: {optimization_mode}")
@@ -3774,11 +4901,17 @@ def main():
     if use_multi_objective:
         if args.warm_start:
             print("[warm-start] Ignored: warm-start only applies to TPE (single-objective) mode")
+        if args.multi_fidelity:
+            print("[multi-fidelity] Ignored: successive halving only applies to TPE (single-objective) mode")
         results = run_multi_objective_optimization(n_trials=n_trials)
         study = results.get('study')
         best_params = results.get('best_params', {})
     else:
-        optimizer = OptunaOptimizer(tf_config=tf_config, use_warm_start=warm_start_enabled)
+        optimizer = OptunaOptimizer(
+            tf_config=tf_config,
+            use_warm_start=warm_start_enabled,
+            use_multi_fidelity=args.multi_fidelity,
+        )
         results = optimizer.run_optimization(n_trials=n_trials)
         study = results.get('study')
         best_params = results.get('best_params', optimizer.best_params)
@@ -3889,9 +5022,17 @@ def main():
     
     if full_year_trades and len(full_year_trades) >= 30:
         print(f"\n{'='*80}")
-        print("MONTE CARLO SIMULATION (1000 iterations)")
+        print(f"MONTE CARLO SIMULATION (1000 iterations, {args.mc_resampling} resampling)")
+        print(f"{'='*80}")
+        mc_results = run_monte_carlo_analysis(full_year_trades, num_simulations=1000, resampling=args.mc_resampling)
+    
+    if args.rolling_starts and full_year_trades:
+        print(f"\n{'='*80}")
+        print(f"ROLLING CHALLENGE STARTS (every {args.rolling_starts})")
         print(f"{'='*80}")
-        mc_results = run_monte_carlo_analysis(full_year_trades, num_simulations=1000)
+        rolling_results = run_rolling_start_analysis(full_year_trades, risk_pct=risk_pct, granularity=args.rolling_starts)
+        if "error" not in rolling_results:
+            output_mgr.save_rolling_starts(rolling_results)
     
     print(f"\n{'='*80}")
     print("QUARTERLY PERFORMANCE BREAKDOWN (Full Year)")
@@ -4001,6 +5142,7 @@ def main():
     print(f"  - best_trades_final.csv ({len(full_year_trades) if full_year_trades else 0} trades)")
     print(f"  - monthly_stats.csv")
     print(f"  - symbol_performance.csv")
+    print(f"  - trials.jsonl (structured trial log)")
     print(f"  - optimization.log")
     print(f"  - optimization_report.csv")
     print(f"\nAlso created:")
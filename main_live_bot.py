@@ -30,13 +30,16 @@ Configuration:
 import os
 import sys
 import time
-import json
 import argparse
 import signal as sig_module
+import threading
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional
+from functools import lru_cache
 from dataclasses import dataclass, asdict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from zoneinfo import ZoneInfo  # Python 3.9+
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -52,10 +55,7 @@ except ImportError:
 
 from strategy_core import (
     StrategyParams,
-    compute_confluence,
     compute_trade_levels,
-    _infer_trend,
-    _pick_direction_from_bias,
 )
 
 try:
@@ -67,8 +67,22 @@ except ImportError:
         return {'monthly': [], 'weekly': []}
 
 from tradr.mt5.client import MT5Client, PendingOrder
+from tradr.mt5.gateway import OrderOp
+from tradr.mt5.quotes import QuoteService
+from tradr.data.candle_cache import CandleCache
+from tradr.strategy.scanner import (
+    RateLimiter,
+    average_true_range,
+    last_daily_close,
+    params_fingerprint,
+    precompute_symbol,
+)
 from tradr.risk.manager import RiskManager
+from tradr.risk.equity_history import DEFAULT_WINDOWS as EQUITY_WINDOWS, EquityHistory
+from tradr.risk.portfolio import PortfolioRiskEngine
 from tradr.utils.logger import setup_logger
+from tradr.utils.scheduler import Scheduler, daily_at, weekly_at
+from tradr.utils.state_store import flush_all as flush_state_store, get_state_store
 from challenge_risk_manager import ChallengeRiskManager, ChallengeConfig, RiskMode, ActionType, create_challenge_manager
 
 # Import broker config for multi-broker support
@@ -105,6 +119,7 @@ class PendingSetup:
     tp3_hit: bool = False
     tp4_hit: bool = False  # Added for 5-TP system
     tp5_hit: bool = False  # Added for 5-TP system
+    daily_bar: Optional[int] = None  # Open time of the closed D1 bar the setup was (re-)validated on
     
     def to_dict(self) -> Dict:
         return asdict(self)
@@ -143,7 +158,32 @@ except Exception:
 # Get tradable symbols from broker config (respects excluded_symbols)
 TRADABLE_SYMBOLS = BROKER_CONFIG.get_tradable_symbols()
 
+# Scan pipeline: candle fetches are rate limited, confluence runs on a process pool
+SCAN_FETCH_INTERVAL_S = float(os.getenv("SCAN_FETCH_INTERVAL_S", "0.1"))
+SCAN_COMPUTE_WORKERS = int(os.getenv("SCAN_COMPUTE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Scheduler watchdog: flag a daily scan still running after this long
+SCAN_TIMEOUT_S = float(os.getenv("SCAN_TIMEOUT_S", "1800"))
+
+# Correlated stress check before each order: block it when the projected
+# daily loss quantile (open + pending + new, rolling return covariance)
+# reaches the daily loss limit. PORTFOLIO_STRESS_CHECK=0 disables it.
+PORTFOLIO_STRESS_CHECK = os.getenv("PORTFOLIO_STRESS_CHECK", "1") == "1"
+PORTFOLIO_STRESS_CONFIDENCE = float(os.getenv("PORTFOLIO_STRESS_CONFIDENCE", "0.99"))
+PORTFOLIO_STRESS_WINDOW = int(os.getenv("PORTFOLIO_STRESS_WINDOW", "250"))
+
+# Intraday equity history (DrawdownMonitor): rotated samples are dumped here;
+# a drop of INTRADAY_DD_REDUCE_PCT from the rolling INTRADAY_DD_WINDOW equity
+# peak scales new orders' risk by 0.7
+EQUITY_HISTORY_DIR = os.getenv("EQUITY_HISTORY_DIR", "logs/equity")
+INTRADAY_DD_WINDOW = os.getenv("INTRADAY_DD_WINDOW", "4h")
+INTRADAY_DD_REDUCE_PCT = float(os.getenv("INTRADAY_DD_REDUCE_PCT", "2.0"))
+
 log = setup_logger("tradr", log_file="logs/tradr_live.log")
+
+if INTRADAY_DD_WINDOW not in EQUITY_WINDOWS:
+    log.warning(f"INTRADAY_DD_WINDOW={INTRADAY_DD_WINDOW!r} is not one of {', '.join(EQUITY_WINDOWS)} - using 4h")
+    INTRADAY_DD_WINDOW = "4h"
 running = True
 
 
@@ -151,9 +191,79 @@ running = True
 # TIMEZONE HELPERS - MT5/5ERS SERVER TIME
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Epoch-seconds clock behind every "now" in this module: wall time live,
+# the emulator's simulated clock under MT5_BACKEND=emulator (see set_clock).
+# _sleep is the matching pause used for pacing broker calls.
+_clock = time.time
+_sleep = time.sleep
+
+
+def _no_sleep(seconds: float) -> None:
+    """Simulated time only moves when the replay advances it: never block."""
+
+
+def set_clock(clock, sleep=None) -> None:
+    """Drive the bot from another clock (offline replay via tradr.mt5.emulator).
+    
+    Without an explicit `sleep`, pauses become no-ops for any clock other
+    than time.time, so a replay never waits on the wall clock.
+    """
+    global _clock, _sleep
+    _clock = clock
+    if sleep is None:
+        sleep = time.sleep if clock is time.time else _no_sleep
+    _sleep = sleep
+
+
+def _fetch_limiter() -> RateLimiter:
+    """SCAN_FETCH_INTERVAL_S pacing for history requests, on the bot clock."""
+    return RateLimiter(SCAN_FETCH_INTERVAL_S, clock=lambda: _clock(), sleep=lambda s: _sleep(s))
+
+
+def utc_now() -> datetime:
+    """Current time (UTC) on the bot clock."""
+    return datetime.fromtimestamp(_clock(), tz=timezone.utc)
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_utc(value: str) -> Optional[datetime]:
+    """Queue timestamps (ISO strings in the JSON state) -> datetime, parsed once per value."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _entry_crossing(setup: Dict):
+    """Quote watch for the entry queue: price within proximity of entry, or too far to keep."""
+    entry = setup.get("entry", 0)
+    sl = setup.get("stop_loss", 0)
+    risk = abs(entry - sl) if entry and sl else 0
+    bullish = setup.get("direction") == "bullish"
+    proximity_r = FIVEERS_CONFIG.limit_order_proximity_r
+    max_distance_r = FIVEERS_CONFIG.max_entry_distance_r
+    
+    def condition(tick) -> bool:
+        if risk <= 0:
+            return True  # Invalid setup - let the queue drop it
+        distance_r = abs((tick.bid if bullish else tick.ask) - entry) / risk
+        return distance_r <= proximity_r or distance_r > max_distance_r
+    return condition
+
+
+def _spread_ok(pip_size: float, max_spread_pips: float):
+    """Quote watch for the spread queue: spread back under the symbol's limit."""
+    def condition(tick) -> bool:
+        spread_pips = tick.spread / pip_size if pip_size > 0 else tick.spread
+        return spread_pips <= max_spread_pips
+    return condition
+
+
 def get_server_time() -> datetime:
     """Get current time in MT5 server timezone (UTC+2/+3)."""
-    return datetime.now(SERVER_TZ)
+    return utc_now().astimezone(SERVER_TZ)
 
 
 def get_server_date() -> datetime.date:
@@ -200,7 +310,7 @@ def is_market_open() -> bool:
     Check if forex market is open (not weekend).
     Forex: Opens Sunday 22:00 UTC, closes Friday 22:00 UTC.
     """
-    now = datetime.now(timezone.utc)
+    now = utc_now()
     weekday = now.weekday()  # 0=Monday, 6=Sunday
     hour = now.hour
     
@@ -231,6 +341,9 @@ class DrawdownMonitor:
     - Stop-out level = $54,000 (voor 60K account) - CONSTANT
     
     Dit is NIET hetzelfde als FTMO waar daily DD wel geldt!
+    
+    Every update is also kept in `history` (EquityHistory ring buffer with
+    rolling 1h / 4h / session / day equity peaks and troughs).
     """
     
     initial_balance: float = 20000.0
@@ -244,10 +357,17 @@ class DrawdownMonitor:
         self.high_water_mark = self.initial_balance
         self.current_equity = self.initial_balance
         self.total_dd_pct = 0.0
+        self.history = EquityHistory(dump_dir=EQUITY_HISTORY_DIR)  # One day at the 10s DD monitor cadence
     
-    def update(self, current_equity: float) -> Dict:
+    def update(self, current_equity: float, balance: Optional[float] = None,
+               timestamp: Optional[float] = None) -> Dict:
         """Update equity and calculate drawdown."""
         self.current_equity = current_equity
+        self.history.add(
+            _clock() if timestamp is None else timestamp,
+            current_equity if balance is None else balance,
+            current_equity,
+        )
         
         # Update HWM (for profit tracking, not DD calculation)
         if current_equity > self.high_water_mark:
@@ -274,6 +394,7 @@ class DrawdownMonitor:
             "is_warning": self.current_equity <= self.warning_level,
             "is_caution": self.current_equity <= self.caution_level,
             "is_stopped_out": self.current_equity <= self.stop_out_level,
+            "intraday_dd_pct": self.history.drawdown_pct(INTRADAY_DD_WINDOW),
         }
     
     def should_halt_trading(self) -> bool:
@@ -286,11 +407,23 @@ class DrawdownMonitor:
     
     def get_risk_multiplier(self) -> float:
         """Get risk multiplier based on drawdown level."""
-        if self.current_equity <= self.caution_level:
-            return 0.5  # 50% of normal risk
         if self.current_equity <= self.warning_level:
+            return 0.5  # 50% of normal risk
+        if self.current_equity <= self.caution_level:
             return 0.7  # 70% of normal risk
         return 1.0  # Normal risk
+    
+    def intraday_risk_multiplier(self) -> float:
+        """
+        0.7 after a drop of INTRADAY_DD_REDUCE_PCT from the rolling
+        INTRADAY_DD_WINDOW equity peak, else 1.0.
+        
+        Only this factor scales order risk: the balance-based DD tiers are
+        already applied by FIVEERS_CONFIG.get_risk_pct / get_dynamic_risk_pct.
+        """
+        if self.history.drawdown_pct(INTRADAY_DD_WINDOW) >= INTRADAY_DD_REDUCE_PCT:
+            return 0.7
+        return 1.0
 
 # Print broker config on startup
 log.info("=" * 70)
@@ -345,6 +478,8 @@ def signal_handler(sig, frame):
     global running
     log.info("Shutdown signal received, stopping bot...")
     running = False
+    # Deferred risk-manager state must not wait for the next flush interval
+    flush_state_store()
 
 
 sig_module.signal(sig_module.SIGINT, signal_handler)
@@ -375,7 +510,9 @@ class LiveTradingBot:
     VALIDATE_INTERVAL_MINUTES = 10
     MAIN_LOOP_INTERVAL_SECONDS = 10
     SPREAD_CHECK_INTERVAL_MINUTES = 10
-    ENTRY_CHECK_INTERVAL_MINUTES = 30  # Check entry proximity every 30 min
+    ENTRY_CHECK_INTERVAL_MINUTES = 30  # Full entry-queue sweep every 30 min
+    QUOTE_POLL_INTERVAL_SECONDS = 5  # Batched tick poll for the entry/spread queues
+    QUOTE_MAX_AGE_SECONDS = 15  # Queue sweeps reuse polled quotes younger than this
     MAX_SPREAD_WAIT_HOURS = 120  # 5 days - matches backtest max_wait_bars=5
     MAX_ENTRY_WAIT_HOURS = 120  # 5 days - matches backtest max_wait_bars=5
     WEEKEND_GAP_THRESHOLD_PCT = 1.0  # 1% gap threshold
@@ -385,17 +522,31 @@ class LiveTradingBot:
             server=MT5_SERVER,
             login=MT5_LOGIN,
             password=MT5_PASSWORD,
+            clock=lambda: _clock(),
         )
-        self.risk_manager = RiskManager(state_file="challenge_state.json")
+        # Incremental MN/W1/D1/H4 cache - full history once, then only new bars
+        self.candle_cache = CandleCache(self.mt5, clock=lambda: _clock())
+        # Latest bid/ask for queued symbols, refreshed in one pass by poll_quotes
+        self.quotes = QuoteService(self.mt5, clock=lambda: _clock())
+        # All persisted bot state lives in one SQLite/WAL store (bot_state.db);
+        # the legacy *.json files are migrated into it on first start
+        self.state_store = get_state_store()
+        self.risk_manager = RiskManager(state_file="challenge_state.json", store=self.state_store)
         
         # STRICT: Load params (merged with defaults) - no fallback to dataclass defaults
         # load_best_params_from_file() returns StrategyParams with defaults merged
         self.params = load_best_params_from_file()
+        self._params_fingerprint = params_fingerprint(self.params)
+        # Closed-bar confluence per symbol: {symbol: (params fingerprint, evaluation)},
+        # filled by the post-close precompute job and reused by every scan that day
+        self.precomputed: Dict[str, tuple] = {}
+        # Rolling return covariance over closed D1 bars, fed by the scan/precompute fetches
+        self.portfolio_risk = PortfolioRiskEngine(
+            window=PORTFOLIO_STRESS_WINDOW, confidence=PORTFOLIO_STRESS_CONFIDENCE,
+        )
         
         self.last_scan_time: Optional[datetime] = None
         self.last_validate_time: Optional[datetime] = None
-        self.last_spread_check_time: Optional[datetime] = None
-        self.last_entry_check_time: Optional[datetime] = None  # Track entry proximity checks
         self.scan_count = 0
         self.pending_setups: Dict[str, PendingSetup] = {}
         self.symbol_map: Dict[str, str] = {}  # our_symbol -> broker_symbol
@@ -409,6 +560,12 @@ class LiveTradingBot:
         # 5ers DD Monitor (no daily DD, only total DD from start balance!)
         self.dd_monitor = DrawdownMonitor(initial_balance=ACCOUNT_SIZE)
         
+        # Scheduler jobs run on two threads (main + protection); every job holds
+        # this lock, scans take it per symbol so protection can run in between
+        self.scheduler: Optional[Scheduler] = None
+        self._state_lock = threading.RLock()
+        self.emergency_triggered = False
+        
         # Trading days tracking for 5ers minimum trading days requirement
         self.trading_days: set = set()
         self.challenge_start_date: Optional[datetime] = None
@@ -429,7 +586,7 @@ class LiveTradingBot:
     # ═══════════════════════════════════════════════════════════════════════════
     
     def _clear_state_files(self):
-        """Clear old state files on --first-run to start fresh (no old pending orders)."""
+        """Clear old queue/setup state on --first-run to start fresh (no old pending orders)."""
         state_files = [
             self.PENDING_SETUPS_FILE,
             self.AWAITING_SPREAD_FILE,
@@ -440,6 +597,10 @@ class LiveTradingBot:
                 if Path(file).exists():
                     Path(file).unlink()
                     log.info(f"Cleared {file}")
+                namespace = Path(file).stem
+                if self.state_store.has(namespace):
+                    self.state_store.clear(namespace)
+                    log.info(f"Cleared {namespace} state")
             except Exception as e:
                 log.warning(f"Could not clear {file}: {e}")
     
@@ -477,20 +638,18 @@ class LiveTradingBot:
         """Load signals waiting for better spread."""
         self.awaiting_spread: Dict = {}
         try:
-            if Path(self.AWAITING_SPREAD_FILE).exists():
-                with open(self.AWAITING_SPREAD_FILE, 'r') as f:
-                    self.awaiting_spread = json.load(f)
-                if self.awaiting_spread:
-                    log.info(f"Loaded {len(self.awaiting_spread)} signals awaiting spread improvement")
+            self.state_store.migrate_json("awaiting_spread", self.AWAITING_SPREAD_FILE)
+            self.awaiting_spread = self.state_store.items("awaiting_spread")
+            if self.awaiting_spread:
+                log.info(f"Loaded {len(self.awaiting_spread)} signals awaiting spread improvement")
         except Exception as e:
             log.error(f"Error loading awaiting_spread: {e}")
             self.awaiting_spread = {}
     
     def _save_awaiting_spread(self):
-        """Save signals waiting for better spread."""
+        """Save signals waiting for better spread (only changed signals are written)."""
         try:
-            with open(self.AWAITING_SPREAD_FILE, 'w') as f:
-                json.dump(self.awaiting_spread, f, indent=2, default=str)
+            self.state_store.replace("awaiting_spread", self.awaiting_spread)
         except Exception as e:
             log.error(f"Error saving awaiting_spread: {e}")
     
@@ -502,20 +661,18 @@ class LiveTradingBot:
         """Load signals waiting for price to approach entry level."""
         self.awaiting_entry: Dict = {}
         try:
-            if Path(self.AWAITING_ENTRY_FILE).exists():
-                with open(self.AWAITING_ENTRY_FILE, 'r') as f:
-                    self.awaiting_entry = json.load(f)
-                if self.awaiting_entry:
-                    log.info(f"Loaded {len(self.awaiting_entry)} signals awaiting entry proximity")
+            self.state_store.migrate_json("awaiting_entry", self.AWAITING_ENTRY_FILE)
+            self.awaiting_entry = self.state_store.items("awaiting_entry")
+            if self.awaiting_entry:
+                log.info(f"Loaded {len(self.awaiting_entry)} signals awaiting entry proximity")
         except Exception as e:
             log.error(f"Error loading awaiting_entry: {e}")
             self.awaiting_entry = {}
     
     def _save_awaiting_entry(self):
-        """Save signals waiting for price proximity."""
+        """Save signals waiting for price proximity (only changed signals are written)."""
         try:
-            with open(self.AWAITING_ENTRY_FILE, 'w') as f:
-                json.dump(self.awaiting_entry, f, indent=2, default=str)
+            self.state_store.replace("awaiting_entry", self.awaiting_entry)
         except Exception as e:
             log.error(f"Error saving awaiting_entry: {e}")
     
@@ -532,15 +689,15 @@ class LiveTradingBot:
         
         self.awaiting_entry[symbol] = {
             **setup,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "last_check": datetime.now(timezone.utc).isoformat(),
+            "created_at": utc_now().isoformat(),
+            "last_check": utc_now().isoformat(),
             "check_count": 0,
         }
         self._save_awaiting_entry()
         
         # Calculate current distance for logging
         broker_symbol = self.symbol_map.get(symbol, symbol)
-        tick = self.mt5.get_tick(broker_symbol)
+        tick = self.quotes.tick(broker_symbol, max_age_s=self.QUOTE_MAX_AGE_SECONDS)
         if tick:
             risk = abs(entry - sl) if entry and sl else 0
             if risk > 0:
@@ -554,8 +711,9 @@ class LiveTradingBot:
     
     def check_awaiting_entry_signals(self):
         """
-        Check signals waiting for price to approach entry level.
-        Called every ENTRY_CHECK_INTERVAL_MINUTES (default: 30 min).
+        Sweep signals waiting for price to approach entry level.
+        Called every ENTRY_CHECK_INTERVAL_MINUTES (default: 30 min); proximity
+        crossings in between are picked up by poll_quotes within seconds.
         
         Logic:
         - If price is within limit_order_proximity_r (0.3R) of entry: place limit order
@@ -565,89 +723,87 @@ class LiveTradingBot:
         if not self.awaiting_entry:
             return
         
-        now = datetime.now(timezone.utc)
-        signals_to_remove = []
+        now = utc_now()
+        log.info(f"Checking {len(self.awaiting_entry)} signals awaiting price proximity...")
+        
+        signals_to_remove = [
+            symbol for symbol, setup in list(self.awaiting_entry.items())
+            if self._process_awaiting_entry(symbol, setup, now)
+        ]
+        self._remove_from_queue(self.awaiting_entry, signals_to_remove, self._save_awaiting_entry)
+    
+    def _process_awaiting_entry(self, symbol: str, setup: Dict, now: datetime, tick=None) -> bool:
+        """Act on one entry-queue signal; True when it should leave the queue."""
+        # Check age - expire after MAX_ENTRY_WAIT_HOURS
+        created_at = _parse_iso_utc(setup.get("created_at", ""))
+        if created_at is not None:
+            age_hours = (now - created_at).total_seconds() / 3600
+            if age_hours > self.MAX_ENTRY_WAIT_HOURS:
+                log.info(f"[{symbol}] Entry signal expired after {age_hours:.1f} hours")
+                return True
+        
+        # Get current price (a quote polled seconds ago is good enough)
+        broker_symbol = self.symbol_map.get(symbol, symbol)
+        if tick is None:
+            tick = self.quotes.tick(broker_symbol, max_age_s=self.QUOTE_MAX_AGE_SECONDS)
+        if not tick:
+            log.debug(f"[{symbol}] Cannot get tick, will retry later")
+            return False
+        
+        entry = setup.get("entry", 0)
+        sl = setup.get("stop_loss", 0)
+        risk = abs(entry - sl) if entry and sl else 0
+        
+        if risk <= 0:
+            log.warning(f"[{symbol}] Invalid risk={risk}, removing from queue")
+            return True
+        
         proximity_r = FIVEERS_CONFIG.limit_order_proximity_r  # 0.3R
+        current_price = tick.bid if setup.get("direction") == "bullish" else tick.ask
+        entry_distance_r = abs(current_price - entry) / risk
         
-        log.info(f"Checking {len(self.awaiting_entry)} signals awaiting price proximity...")
+        # Check if entry still valid (not too far)
+        if entry_distance_r > FIVEERS_CONFIG.max_entry_distance_r:
+            log.info(f"[{symbol}] Entry too far ({entry_distance_r:.2f}R > {FIVEERS_CONFIG.max_entry_distance_r}R), removing")
+            return True
         
-        for symbol, setup in list(self.awaiting_entry.items()):
-            # Check age - expire after MAX_ENTRY_WAIT_HOURS
-            created_at_str = setup.get("created_at", "")
-            if created_at_str:
-                try:
-                    created_at = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
-                    age_hours = (now - created_at).total_seconds() / 3600
-                    
-                    if age_hours > self.MAX_ENTRY_WAIT_HOURS:
-                        log.info(f"[{symbol}] Entry signal expired after {age_hours:.1f} hours")
-                        signals_to_remove.append(symbol)
-                        continue
-                except ValueError:
-                    pass
-            
-            # Get current price
-            broker_symbol = self.symbol_map.get(symbol, symbol)
-            tick = self.mt5.get_tick(broker_symbol)
-            if not tick:
-                log.debug(f"[{symbol}] Cannot get tick, will retry later")
-                continue
-            
-            entry = setup.get("entry", 0)
-            sl = setup.get("stop_loss", 0)
-            risk = abs(entry - sl) if entry and sl else 0
+        # Check if price is close enough to place limit order
+        if entry_distance_r <= proximity_r:
+            log.info(f"[{symbol}] ✅ Price within {proximity_r}R of entry ({entry_distance_r:.2f}R)")
             
-            if risk <= 0:
-                log.warning(f"[{symbol}] Invalid risk={risk}, removing from queue")
-                signals_to_remove.append(symbol)
-                continue
+            # Check spread before placing order
+            conditions = self.check_market_conditions(symbol, tick=tick)
             
-            current_price = tick.bid if setup.get("direction") == "bullish" else tick.ask
-            entry_distance_r = abs(current_price - entry) / risk
+            if conditions["spread_ok"]:
+                log.info(f"[{symbol}] Placing limit order!")
+                return bool(self.place_setup_order(setup, check_spread=False, skip_proximity_check=True))
             
-            # Check if entry still valid (not too far)
-            if entry_distance_r > FIVEERS_CONFIG.max_entry_distance_r:
-                log.info(f"[{symbol}] Entry too far ({entry_distance_r:.2f}R > {FIVEERS_CONFIG.max_entry_distance_r}R), removing")
-                signals_to_remove.append(symbol)
-                continue
-            
-            # Check if price is close enough to place limit order
-            if entry_distance_r <= proximity_r:
-                log.info(f"[{symbol}] ✅ Price within {proximity_r}R of entry ({entry_distance_r:.2f}R)")
-                
-                # Check spread before placing order
-                conditions = self.check_market_conditions(symbol)
-                
-                if conditions["spread_ok"]:
-                    log.info(f"[{symbol}] Placing limit order!")
-                    if self.place_setup_order(setup, check_spread=False, skip_proximity_check=True):
-                        signals_to_remove.append(symbol)
-                else:
-                    # Price close but spread bad - move to spread queue
-                    log.info(f"[{symbol}] Price OK but spread bad ({conditions['spread_pips']:.1f} pips)")
-                    log.info(f"[{symbol}] Moving to spread queue...")
-                    signals_to_remove.append(symbol)
-                    self.add_to_awaiting_spread(setup)
-            else:
-                # Still too far
-                setup["check_count"] = setup.get("check_count", 0) + 1
-                setup["last_check"] = now.isoformat()
-                log.debug(f"[{symbol}] Price at {entry_distance_r:.2f}R from entry, waiting for {proximity_r}R")
-        
-        # Remove processed signals
-        for symbol in signals_to_remove:
-            if symbol in self.awaiting_entry:
-                del self.awaiting_entry[symbol]
+            # Price close but spread bad - move to spread queue
+            log.info(f"[{symbol}] Price OK but spread bad ({conditions['spread_pips']:.1f} pips)")
+            log.info(f"[{symbol}] Moving to spread queue...")
+            self.add_to_awaiting_spread(setup)
+            return True
         
-        self._save_awaiting_entry()
+        # Still too far (counters are persisted with the next queue change)
+        setup["check_count"] = setup.get("check_count", 0) + 1
+        setup["last_check"] = now.isoformat()
+        log.debug(f"[{symbol}] Price at {entry_distance_r:.2f}R from entry, waiting for {proximity_r}R")
+        return False
+    
+    def _remove_from_queue(self, queue: Dict, symbols: List[str], save):
+        """Drop processed signals; the JSON state is rewritten only when something left."""
+        removed = [symbol for symbol in symbols if queue.pop(symbol, None) is not None]
+        if removed:
+            save()
+    
     
     def add_to_awaiting_spread(self, setup: Dict):
         """Add setup to awaiting spread queue."""
         symbol = setup["symbol"]
         self.awaiting_spread[symbol] = {
             **setup,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "last_check": datetime.now(timezone.utc).isoformat(),
+            "created_at": utc_now().isoformat(),
+            "last_check": utc_now().isoformat(),
             "check_count": 0,
         }
         self._save_awaiting_spread()
@@ -655,87 +811,128 @@ class LiveTradingBot:
     
     def check_awaiting_spread_signals(self):
         """
-        Check signals waiting for better spread.
-        Called every SPREAD_CHECK_INTERVAL_MINUTES.
+        Sweep signals waiting for better spread.
+        Called every SPREAD_CHECK_INTERVAL_MINUTES; a spread dropping back under
+        the limit in between is picked up by poll_quotes within seconds.
         """
         if not self.awaiting_spread:
             return
         
-        now = datetime.now(timezone.utc)
-        signals_to_remove = []
-        
+        now = utc_now()
         log.info(f"Checking {len(self.awaiting_spread)} signals waiting for spread improvement...")
         
-        for symbol, setup in list(self.awaiting_spread.items()):
-            # Check age - expire after MAX_SPREAD_WAIT_HOURS
-            created_at_str = setup.get("created_at", "")
-            if created_at_str:
-                try:
-                    created_at = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
-                    age_hours = (now - created_at).total_seconds() / 3600
-                    
-                    if age_hours > self.MAX_SPREAD_WAIT_HOURS:
-                        log.info(f"[{symbol}] Signal expired after {age_hours:.1f} hours")
-                        signals_to_remove.append(symbol)
-                        continue
-                except ValueError:
-                    pass
-            
-            # Check if entry price is still reachable
-            broker_symbol = self.symbol_map.get(symbol, symbol)
-            tick = self.mt5.get_tick(broker_symbol)
-            if not tick:
-                continue
-            
-            entry = setup.get("entry", 0)
-            sl = setup.get("stop_loss", 0)
-            risk = abs(entry - sl) if entry and sl else 0
-            
-            if risk > 0:
-                current_price = tick.bid if setup.get("direction") == "bullish" else tick.ask
-                entry_distance_r = abs(current_price - entry) / risk
-                
-                if entry_distance_r > FIVEERS_CONFIG.max_entry_distance_r:
-                    log.info(f"[{symbol}] Entry too far now ({entry_distance_r:.2f}R), removing")
-                    signals_to_remove.append(symbol)
-                    continue
+        signals_to_remove = [
+            symbol for symbol, setup in list(self.awaiting_spread.items())
+            if self._process_awaiting_spread(symbol, setup, now)
+        ]
+        self._remove_from_queue(self.awaiting_spread, signals_to_remove, self._save_awaiting_spread)
+    
+    def _process_awaiting_spread(self, symbol: str, setup: Dict, now: datetime, tick=None) -> bool:
+        """Act on one spread-queue signal; True when it should leave the queue."""
+        # Check age - expire after MAX_SPREAD_WAIT_HOURS
+        created_at = _parse_iso_utc(setup.get("created_at", ""))
+        if created_at is not None:
+            age_hours = (now - created_at).total_seconds() / 3600
+            if age_hours > self.MAX_SPREAD_WAIT_HOURS:
+                log.info(f"[{symbol}] Signal expired after {age_hours:.1f} hours")
+                return True
+        
+        # Check if entry price is still reachable
+        broker_symbol = self.symbol_map.get(symbol, symbol)
+        if tick is None:
+            tick = self.quotes.tick(broker_symbol, max_age_s=self.QUOTE_MAX_AGE_SECONDS)
+        if not tick:
+            return False
+        
+        entry = setup.get("entry", 0)
+        sl = setup.get("stop_loss", 0)
+        risk = abs(entry - sl) if entry and sl else 0
+        
+        if risk > 0:
+            current_price = tick.bid if setup.get("direction") == "bullish" else tick.ask
+            entry_distance_r = abs(current_price - entry) / risk
             
-            # Check market conditions
-            conditions = self.check_market_conditions(symbol)
+            if entry_distance_r > FIVEERS_CONFIG.max_entry_distance_r:
+                log.info(f"[{symbol}] Entry too far now ({entry_distance_r:.2f}R), removing")
+                return True
+        
+        # Check market conditions
+        conditions = self.check_market_conditions(symbol, tick=tick)
+        
+        if conditions["spread_ok"] and conditions["volume_ok"]:
+            log.info(f"[{symbol}] ✅ Spread now OK ({conditions['spread_pips']:.1f} pips)")
+            log.info(f"[{symbol}] Executing trade!")
             
-            if conditions["spread_ok"] and conditions["volume_ok"]:
-                log.info(f"[{symbol}] ✅ Spread now OK ({conditions['spread_pips']:.1f} pips)")
-                log.info(f"[{symbol}] Executing trade!")
-                
-                # Execute trade
-                if self.place_setup_order(setup, check_spread=False):
-                    signals_to_remove.append(symbol)
-            else:
-                log.debug(f"[{symbol}] Still waiting - {conditions['reason']}")
-                setup["check_count"] = setup.get("check_count", 0) + 1
-                setup["last_check"] = now.isoformat()
+            # Execute trade
+            return bool(self.place_setup_order(setup, check_spread=False))
         
-        # Remove processed signals
-        for symbol in signals_to_remove:
-            if symbol in self.awaiting_spread:
-                del self.awaiting_spread[symbol]
+        log.debug(f"[{symbol}] Still waiting - {conditions['reason']}")
+        setup["check_count"] = setup.get("check_count", 0) + 1
+        setup["last_check"] = now.isoformat()
+        return False
+    
+    # ═══════════════════════════════════════════════════════════════════════════
+    # QUOTE POLLING - Batched ticks for the entry and spread queues
+    # ═══════════════════════════════════════════════════════════════════════════
+    
+    def poll_quotes(self):
+        """
+        Refresh quotes for every queued symbol in one pass (every
+        QUOTE_POLL_INTERVAL_SECONDS) and act on the signals whose price came
+        within proximity of entry or whose spread is back under the limit.
+        """
+        self._sync_quote_watches()
+        if not self.quotes.symbols:
+            return
         
-        self._save_awaiting_spread()
+        now = utc_now()
+        for event in self.quotes.refresh():
+            if event.kind == "entry":
+                queue, process, save = self.awaiting_entry, self._process_awaiting_entry, self._save_awaiting_entry
+            else:
+                queue, process, save = self.awaiting_spread, self._process_awaiting_spread, self._save_awaiting_spread
+            
+            setup = queue.get(event.key)
+            if setup is None:
+                continue
+            log.info(f"[{event.key}] Quote event ({event.kind} queue) - bid {event.tick.bid}, ask {event.tick.ask}")
+            if process(event.key, setup, now, tick=event.tick):
+                self._remove_from_queue(queue, [event.key], save)
     
+    def _sync_quote_watches(self):
+        """Mirror the entry/spread queues into quote watches."""
+        from ftmo_config import get_pip_size
+        
+        for kind, queue in (("entry", self.awaiting_entry), ("spread", self.awaiting_spread)):
+            for symbol in self.quotes.watched(kind):
+                if symbol not in queue:
+                    self.quotes.unwatch(kind, symbol)
+            
+            for symbol, setup in queue.items():
+                broker_symbol = self.symbol_map.get(symbol, symbol)
+                if kind == "entry":
+                    condition = _entry_crossing(setup)
+                else:
+                    condition = _spread_ok(get_pip_size(symbol), FIVEERS_CONFIG.get_max_spread_pips(symbol))
+                self.quotes.watch(kind, symbol, broker_symbol, condition)
     # ═══════════════════════════════════════════════════════════════════════════
     # MARKET CONDITIONS CHECK - Spread & Volume
     # ═══════════════════════════════════════════════════════════════════════════
     
-    def check_market_conditions(self, symbol: str) -> Dict:
+    def check_market_conditions(self, symbol: str, tick=None) -> Dict:
         """
         Check volume en spread voor een symbol.
         
+        Args:
+            tick: Quote to judge (e.g. from poll_quotes); fetched when omitted
+        
         Returns:
             Dict met: spread_ok, volume_ok, spread_pips, reason
         """
         broker_symbol = self.symbol_map.get(symbol, symbol)
         
-        tick = self.mt5.get_tick(broker_symbol)
+        if tick is None:
+            tick = self.mt5.get_tick(broker_symbol)
         if not tick:
             return {
                 "spread_ok": False,
@@ -754,9 +951,9 @@ class LiveTradingBot:
         spread_ok = spread_pips <= max_spread
         
         # Volume check - basic tick volume check
-        candles = self.mt5.get_ohlcv(broker_symbol, "M1", 5)
+        candles = self.mt5.get_ohlcv(broker_symbol, "M1", 5, columnar=True)
         if candles:
-            recent_volume = sum(c.get("volume", 0) for c in candles[-3:]) / 3
+            recent_volume = float(candles.volume[-3:].sum()) / 3
             volume_ok = recent_volume > 0
         else:
             volume_ok = True  # Default to OK if we can't check
@@ -789,13 +986,12 @@ class LiveTradingBot:
         broker_symbol = self.symbol_map.get(symbol, symbol)
         
         # Get recent D1 candles
-        candles = self.mt5.get_ohlcv(broker_symbol, "D1", 5)
+        candles = self.mt5.get_ohlcv(broker_symbol, "D1", 5, columnar=True)
         if not candles or len(candles) < 2:
             return None
         
-        friday_close = candles[-2]["close"]  # Voorlaatste candle = vrijdag
-        current_candle = candles[-1]
-        monday_open = current_candle["open"]
+        friday_close = float(candles.close[-2])  # Voorlaatste candle = vrijdag
+        monday_open = float(candles.open[-1])
         
         gap_pct = ((monday_open - friday_close) / friday_close) * 100
         
@@ -815,7 +1011,7 @@ class LiveTradingBot:
         - Als SL door gap heen is gesprongen: sluit direct
         - Log significant gaps voor monitoring
         """
-        positions = self.mt5.get_my_positions()
+        positions = self.mt5.snapshot().positions
         if not positions:
             return
         
@@ -883,7 +1079,7 @@ class LiveTradingBot:
             return False
         
         equity = account.get("equity", 0)
-        status = self.dd_monitor.update(equity)
+        status = self.dd_monitor.update(equity, balance=account.get("balance", equity))
         
         # Log warning levels
         if status["is_warning"]:
@@ -904,10 +1100,10 @@ class LiveTradingBot:
             log.error("  CLOSING ALL POSITIONS!")
             log.error("=" * 70)
             
-            # Close all positions
-            positions = self.mt5.get_my_positions()
-            for pos in positions:
-                result = self.mt5.close_position(pos.ticket)
+            # Close all positions (one concurrent batch)
+            positions = self.mt5.snapshot().positions
+            results = self.mt5.gateway.run_batch([OrderOp.close(pos.ticket) for pos in positions])
+            for pos, result in zip(positions, results):
                 if result.success:
                     log.info(f"  ✓ Closed {pos.symbol}")
                 else:
@@ -918,33 +1114,55 @@ class LiveTradingBot:
         return False
 
     def _load_pending_setups(self):
-        """Load pending setups from file."""
+        """Load pending setups from the state store."""
         try:
-            if Path(self.PENDING_SETUPS_FILE).exists():
-                with open(self.PENDING_SETUPS_FILE, 'r') as f:
-                    data = json.load(f)
-                for symbol, setup_dict in data.items():
-                    self.pending_setups[symbol] = PendingSetup.from_dict(setup_dict)
-                log.info(f"Loaded {len(self.pending_setups)} pending setups from file")
+            self.state_store.migrate_json("pending_setups", self.PENDING_SETUPS_FILE)
+            data = self.state_store.items("pending_setups")
+            for symbol, setup_dict in data.items():
+                self.pending_setups[symbol] = PendingSetup.from_dict(setup_dict)
+                self._track_pending(symbol)
+            if data:
+                log.info(f"Loaded {len(self.pending_setups)} pending setups from state store")
         except Exception as e:
             log.error(f"Error loading pending setups: {e}")
             self.pending_setups = {}
+            self.risk_manager.ledger.clear_pending()
+    
+    def _track_pending(self, symbol: str):
+        """
+        Sync one symbol's pending order into the risk ledger.
+        
+        Call after any change to pending_setups[symbol] (added, filled,
+        cancelled, expired, removed) so the ledger's running totals and
+        worst-pending heap stay in step without re-scanning every setup.
+        """
+        setup = self.pending_setups.get(symbol)
+        if setup is None or setup.status != "pending":
+            self.risk_manager.untrack_pending_order(symbol)
+            return
+        self.risk_manager.track_pending_order(
+            symbol,
+            symbol,
+            setup.lot_size,
+            setup.entry_price,
+            setup.stop_loss,
+            score=getattr(setup, 'confluence_score', 4) - getattr(setup, 'entry_distance_r', 1.0),
+        )
     
     def _save_pending_setups(self):
-        """Save pending setups to file."""
+        """Save pending setups (only changed setups are written)."""
         try:
             data = {symbol: setup.to_dict() for symbol, setup in self.pending_setups.items()}
-            with open(self.PENDING_SETUPS_FILE, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            self.state_store.replace("pending_setups", data)
         except Exception as e:
             log.error(f"Error saving pending setups: {e}")
     
     def _load_trading_days(self):
-        """Load trading days from file for FTMO minimum trading days tracking."""
+        """Load trading days for FTMO minimum trading days tracking."""
         try:
-            if Path(self.TRADING_DAYS_FILE).exists():
-                with open(self.TRADING_DAYS_FILE, 'r') as f:
-                    data = json.load(f)
+            self.state_store.migrate_json("trading_days", self.TRADING_DAYS_FILE)
+            data = self.state_store.items("trading_days")
+            if data:
                 self.trading_days = set(data.get("trading_days", []))
                 start_date_str = data.get("challenge_start_date")
                 end_date_str = data.get("challenge_end_date")
@@ -954,7 +1172,7 @@ class LiveTradingBot:
                 if end_date_str:
                     normalized = end_date_str.replace("Z", "+00:00")
                     self.challenge_end_date = datetime.fromisoformat(normalized)
-                log.info(f"Loaded {len(self.trading_days)} trading days from file")
+                log.info(f"Loaded {len(self.trading_days)} trading days from state store")
         except Exception as e:
             log.error(f"Error loading trading days: {e}")
             self.trading_days = set()
@@ -965,21 +1183,20 @@ class LiveTradingBot:
         Call this when starting Phase 1, Phase 2, or resetting the challenge.
         """
         self.trading_days = set()
-        self.challenge_start_date = datetime.now(timezone.utc)
+        self.challenge_start_date = utc_now()
         self.challenge_end_date = self.challenge_start_date + timedelta(days=duration_days)
         self._save_trading_days()
         log.info(f"New challenge started: {self.challenge_start_date.date()} to {self.challenge_end_date.date()} ({duration_days} days)")
     
     def _save_trading_days(self):
-        """Save trading days to file."""
+        """Save trading days."""
         try:
             data = {
-                "trading_days": list(self.trading_days),
+                "trading_days": sorted(self.trading_days),
                 "challenge_start_date": self.challenge_start_date.isoformat() if self.challenge_start_date else None,
                 "challenge_end_date": self.challenge_end_date.isoformat() if self.challenge_end_date else None,
             }
-            with open(self.TRADING_DAYS_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
+            self.state_store.replace("trading_days", data)
         except Exception as e:
             log.error(f"Error saving trading days: {e}")
     
@@ -989,7 +1206,7 @@ class LiveTradingBot:
         Called after successful order placement/fill.
         """
         from ftmo_config import FIVEERS_CONFIG
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        today = utc_now().strftime("%Y-%m-%d")
         if today not in self.trading_days:
             self.trading_days.add(today)
             self._save_trading_days()
@@ -1005,7 +1222,7 @@ class LiveTradingBot:
         if self.challenge_end_date is None:
             return False
         
-        now = datetime.now(timezone.utc)
+        now = utc_now()
         days_remaining = (self.challenge_end_date - now).days
         trading_days_count = len(self.trading_days)
         days_needed = FIVEERS_CONFIG.min_trading_days - trading_days_count
@@ -1036,7 +1253,7 @@ class LiveTradingBot:
         }
         
         if self.challenge_end_date:
-            now = datetime.now(timezone.utc)
+            now = utc_now()
             status["days_remaining"] = max(0, (self.challenge_end_date - now).days)
         
         return status
@@ -1162,6 +1379,7 @@ class LiveTradingBot:
                     config=config,
                     mt5_client=self.mt5,
                     state_file="challenge_risk_state.json",
+                    store=self.state_store,
                 )
                 self.challenge_manager.sync_with_mt5(balance, equity)
                 log.info("Challenge Risk Manager initialized with ELITE PROTECTION")
@@ -1177,15 +1395,18 @@ class LiveTradingBot:
         """
         Get multi-timeframe candle data for a symbol.
         Same timeframes used in backtests for parity.
+        
+        Served from the incremental candle cache: after the first full pull
+        only the bars since the last cached one are requested from MT5.
         """
         # Use broker symbol format
         broker_symbol = self.symbol_map.get(symbol, symbol)
         
         data = {
-            "monthly": self.mt5.get_ohlcv(broker_symbol, "MN1", 24),
-            "weekly": self.mt5.get_ohlcv(broker_symbol, "W1", 104),
-            "daily": self.mt5.get_ohlcv(broker_symbol, "D1", 500),
-            "h4": self.mt5.get_ohlcv(broker_symbol, "H4", 500),
+            "monthly": self.candle_cache.get(broker_symbol, "MN1", 24),
+            "weekly": self.candle_cache.get(broker_symbol, "W1", 104),
+            "daily": self.candle_cache.get(broker_symbol, "D1", 500),
+            "h4": self.candle_cache.get(broker_symbol, "H4", 500),
         }
         return data
     
@@ -1193,11 +1414,7 @@ class LiveTradingBot:
         """Check if we already have a position on this symbol."""
         # symbol is in OANDA format, convert to broker format for checking
         broker_symbol = self.symbol_map.get(symbol, symbol)
-        positions = self.mt5.get_my_positions()
-        for pos in positions:
-            if pos.symbol == broker_symbol:
-                return True
-        return False
+        return self.mt5.snapshot().has_position(broker_symbol)
     
     def _calculate_atr(self, candles: List[Dict], period: int = 14) -> float:
         """
@@ -1210,31 +1427,118 @@ class LiveTradingBot:
         Returns:
             ATR value, or 0.0 if insufficient data
         """
-        if len(candles) < period + 1:
-            return 0.0
-        
-        true_ranges = []
-        for i in range(1, len(candles)):
-            high = candles[i].get("high", 0)
-            low = candles[i].get("low", 0)
-            prev_close = candles[i-1].get("close", 0)
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
+        return average_true_range(candles, period)
+    
+    # ═══════════════════════════════════════════════════════════════════════════
+    # POST-CLOSE PRECOMPUTE
+    # ═══════════════════════════════════════════════════════════════════════════
+    
+    def _server_epoch(self) -> int:
+        """Server time encoded as epoch seconds (the encoding of MT5 candle times)."""
+        return int(get_server_time().replace(tzinfo=timezone.utc).timestamp())
+    
+    def cached_evaluation(self, symbol: str, data: Dict) -> Optional[Dict]:
+        """Precomputed evaluation if it is for the last closed D1 bar and the current params."""
+        cached = self.precomputed.get(symbol)
+        if cached is None:
+            return None
+        fingerprint, evaluation = cached
+        if fingerprint != self._params_fingerprint:
+            return None
+        if evaluation["daily_bar"] != last_daily_close(data["daily"], self._server_epoch()):
+            return None
+        return evaluation
+    
+    def evaluate_symbol(self, symbol: str, data: Dict) -> Dict:
+        """Cached closed-bar evaluation, computed (and cached) inline on a miss."""
+        evaluation = self.cached_evaluation(symbol, data)
+        if evaluation is None:
+            evaluation = precompute_symbol(
+                symbol, data, self.params, self._server_epoch(), HISTORICAL_SR_AVAILABLE,
             )
-            true_ranges.append(tr)
+            self.precomputed[symbol] = (self._params_fingerprint, evaluation)
+        return evaluation
+    
+    def _open_compute_pool(self) -> Optional[ProcessPoolExecutor]:
+        if SCAN_COMPUTE_WORKERS <= 1:
+            return None
+        try:
+            return ProcessPoolExecutor(max_workers=SCAN_COMPUTE_WORKERS)
+        except (OSError, ValueError) as e:
+            log.warning(f"Scan compute pool unavailable ({e}), evaluating inline")
+            return None
+    
+    def precompute_all_symbols(self):
+        """
+        Post-close stage: evaluate every tradable symbol on its closed bars.
+        
+        Runs right after the D1 close, so the trends, S/R, fib, structure,
+        ATR and trade levels are ready before the daily scan, which then only
+        applies thresholds and live price checks. Rescans during the day hit
+        the same cache until the next D1 bar closes.
+        """
+        symbols = [s for s in TRADABLE_SYMBOLS if s in self.symbol_map]
+        start = time.monotonic()
+        limiter = _fetch_limiter()
+        server_now = self._server_epoch()
+        fingerprint = self._params_fingerprint
+        pool = self._open_compute_pool()
+        pending = {}
+        daily_by_symbol = {}
+        computed = reused = 0
         
-        if len(true_ranges) < period:
-            return 0.0
+        try:
+            for symbol in symbols:
+                limiter.wait()
+                try:
+                    with self._state_lock:
+                        data = self.get_candle_data(symbol)
+                except Exception as e:
+                    log.warning(f"[{symbol}] Precompute fetch failed: {e}")
+                    continue
+                if not data["daily"] or not data["weekly"]:
+                    continue
+                daily_by_symbol[self.symbol_map[symbol]] = data["daily"]
+                if self.cached_evaluation(symbol, data) is not None:
+                    reused += 1
+                    continue
+                args = (symbol, data, self.params, server_now, HISTORICAL_SR_AVAILABLE)
+                if pool is not None:
+                    try:
+                        pending[symbol] = pool.submit(precompute_symbol, *args)
+                        continue
+                    except BrokenProcessPool:
+                        pool = None
+                pending[symbol] = precompute_symbol(*args)
+            
+            for symbol, evaluation in pending.items():
+                try:
+                    if isinstance(evaluation, Future):
+                        evaluation = evaluation.result()
+                    self.precomputed[symbol] = (fingerprint, evaluation)
+                    computed += 1
+                except Exception as e:
+                    log.warning(f"[{symbol}] Precompute failed: {e}")
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
         
-        return sum(true_ranges[-period:]) / period
+        self._update_portfolio_risk(daily_by_symbol)
+        log.info(f"Precompute: {computed} symbols evaluated, {reused} reused in {time.monotonic() - start:.1f}s")
     
-    def scan_symbol(self, symbol: str) -> Optional[Dict]:
+    def scan_symbol(
+        self,
+        symbol: str,
+        data: Optional[Dict[str, List[Dict]]] = None,
+        evaluation: Optional[Dict] = None,
+    ) -> Optional[Dict]:
         """
         Scan a single symbol for trade setup.
         
+        `data` / `evaluation` may be supplied by the scan pipeline
+        (scan_all_symbols); otherwise candles are fetched and confluence is
+        evaluated inline.
+        
         SYMBOL FORMAT:
         - Input symbol: OANDA format (e.g., EUR_USD, XAU_USD, SPX500_USD)
         - Broker symbol: FTMO MT5 format (e.g., EURUSD, XAUUSD, US500.cash)
@@ -1270,7 +1574,9 @@ class LiveTradingBot:
                 log.info(f"[{symbol}] Already have pending setup, skipping")
                 return None
         
-        data = self.get_candle_data(symbol)
+        if data is None:
+            data = self.get_candle_data(symbol)
+            evaluation = None
         
         if not data["daily"] or len(data["daily"]) < 50:
             log.warning(f"[{symbol}] Insufficient daily data ({len(data.get('daily', []))} candles)")
@@ -1280,28 +1586,13 @@ class LiveTradingBot:
             log.warning(f"[{symbol}] Insufficient weekly data")
             return None
         
-        monthly_candles = data["monthly"] if data["monthly"] else []
-        weekly_candles = data["weekly"]
-        daily_candles = data["daily"]
-        h4_candles = data["h4"] if data["h4"] else daily_candles[-20:]
-        
-        mn_trend = _infer_trend(monthly_candles) if monthly_candles else "mixed"
-        wk_trend = _infer_trend(weekly_candles) if weekly_candles else "mixed"
-        d_trend = _infer_trend(daily_candles) if daily_candles else "mixed"
+        if evaluation is None:
+            evaluation = self.evaluate_symbol(symbol, data)
         
-        direction, _, _ = _pick_direction_from_bias(mn_trend, wk_trend, d_trend)
-        
-        historical_sr = get_all_htf_sr_levels(symbol) if HISTORICAL_SR_AVAILABLE else None
-        
-        flags, notes, trade_levels = compute_confluence(
-            monthly_candles,
-            weekly_candles,
-            daily_candles,
-            h4_candles,
-            direction,
-            self.params,
-            historical_sr,
-        )
+        direction = evaluation["direction"]
+        flags = evaluation["flags"]
+        notes = evaluation["notes"]
+        trade_levels = evaluation["trade_levels"]
         
         # compute_confluence returns 5 TP levels; unpack all to avoid tuple mismatch errors
         entry, sl, tp1, tp2, tp3, tp4, tp5 = trade_levels
@@ -1379,8 +1670,8 @@ class LiveTradingBot:
             sl_pips = min_sl_pips
             log.info(f"[{symbol}] SL adjusted to minimum: {sl:.5f} ({sl_pips:.1f} pips)")
         
-        # ATR-based SL validation (same as backtest)
-        atr = self._calculate_atr(daily_candles, period=14)
+        # ATR-based SL validation (same as backtest), daily ATR from the precompute
+        atr = evaluation["atr"]
         if atr > 0:
             sl_atr_ratio = abs(entry - sl) / atr
             
@@ -1443,20 +1734,65 @@ class LiveTradingBot:
             "sl_pips": sl_pips,
             "flags": flags,
             "notes": notes,
+            "daily_bar": evaluation["daily_bar"],
         }
     
+    def _update_portfolio_risk(self, daily_by_symbol: Dict[str, object]):
+        """
+        Feed closed D1 bars (broker symbol -> candles) into the return covariance.
+        
+        Pass every symbol at once: days are added as whole cross-sections.
+        """
+        try:
+            added = self.portfolio_risk.update(daily_by_symbol, until=self._server_epoch() - 86400)
+            if added:
+                log.debug(f"Portfolio risk: +{added} days ({self.portfolio_risk.observations} in window)")
+        except Exception as e:
+            log.warning(f"Portfolio risk update failed: {e}")
+    
+    def _portfolio_stress_ok(
+        self,
+        symbol: str,
+        broker_symbol: str,
+        direction: str,
+        lot_size: float,
+        entry: float,
+        sl: float,
+    ) -> bool:
+        """
+        Correlated stress check: False if open positions + pending orders + this
+        order project a daily loss quantile at or past the daily loss limit.
+        
+        Unlike the per-stop worst case, shared currency legs (EURUSD + EURJPY +
+        EURGBP) are priced through the rolling return covariance.
+        """
+        if CHALLENGE_MODE and self.challenge_manager:
+            day_start = self.challenge_manager.day_start_balance
+            current_loss = max(0.0, -self.challenge_manager.daily_pnl)
+        else:
+            day_start = self.risk_manager.state.day_start_balance
+            current_loss = max(0.0, day_start - self.risk_manager.state.current_balance)
+        
+        broker_state = self.mt5.snapshot()
+        self.portfolio_risk.set_book(broker_state.positions, broker_state.orders)
+        stress = self.portfolio_risk.check_order(
+            broker_symbol, direction, lot_size, entry, sl,
+            day_start_balance=day_start,
+            current_loss=current_loss,
+            limit_pct=FIVEERS_CONFIG.max_daily_loss_pct,
+        )
+        if stress.breach:
+            log.warning(
+                f"[{symbol}] Trade blocked by portfolio stress check: projected "
+                f"{PORTFOLIO_STRESS_CONFIDENCE:.0%} daily loss {stress.loss_pct:.2f}% >= {stress.limit_pct}%"
+            )
+            return False
+        log.debug(f"[{symbol}] Portfolio stress: {stress.loss_pct:.2f}% of day start ({stress.observations} days)")
+        return True
+    
     def _calculate_pending_orders_risk(self) -> float:
-        """Calculate total risk from all pending setups."""
-        pending_list = []
-        for symbol, setup in self.pending_setups.items():
-            if setup.status == "pending" and setup.lot_size > 0:
-                pending_list.append({
-                    'symbol': symbol,
-                    'lot_size': setup.lot_size,
-                    'entry_price': setup.entry_price,
-                    'stop_loss': setup.stop_loss,
-                })
-        return self.risk_manager.calculate_pending_orders_risk(pending_list)
+        """Total risk from all pending setups (running total in the risk ledger)."""
+        return self.risk_manager.ledger.pending_risk
     
     def _try_replace_worst_pending(
         self,
@@ -1472,30 +1808,13 @@ class LiveTradingBot:
         
         Returns True if replacement was made, False otherwise.
         """
-        pending_orders = [
-            (sym, setup) for sym, setup in self.pending_setups.items()
-            if setup.status == "pending"
-        ]
-        
-        if not pending_orders:
+        # Lowest confluence - entry_distance_r, kept in the ledger's heap
+        worst = self.risk_manager.ledger.worst_pending()
+        if worst is None:
             return False
         
-        worst_symbol = None
-        worst_score = float('inf')
-        worst_setup = None
-        
-        for sym, setup in pending_orders:
-            entry_dist_r = getattr(setup, 'entry_distance_r', 1.0)
-            confluence = getattr(setup, 'confluence_score', 4)
-            score = confluence - entry_dist_r
-            
-            if score < worst_score:
-                worst_score = score
-                worst_symbol = sym
-                worst_setup = setup
-        
-        if worst_symbol is None:
-            return False
+        worst_symbol, worst_score = worst
+        worst_setup = self.pending_setups.get(worst_symbol)
         
         new_score = new_confluence - new_entry_distance_r
         
@@ -1510,6 +1829,7 @@ class LiveTradingBot:
                     log.warning(f"[{worst_symbol}] Failed to cancel order: {e}")
             
             del self.pending_setups[worst_symbol]
+            self._track_pending(worst_symbol)
             self._save_pending_setups()
             return True
         
@@ -1627,8 +1947,8 @@ class LiveTradingBot:
             # DYNAMIC POSITION LIMIT based on drawdown
             # Reduces exposure when in drawdown to protect account
             max_trades = FIVEERS_CONFIG.get_max_trades(profit_pct, total_dd_pct)
-            pending_count = len([s for s in self.pending_setups.values() if s.status == "pending"])
-            open_positions = getattr(snapshot, "open_positions", len(self.mt5.get_my_positions()) if self.mt5 else 0)
+            pending_count = self.risk_manager.ledger.pending_count
+            open_positions = getattr(snapshot, "open_positions", len(self.mt5.snapshot().positions) if self.mt5 else 0)
             total_exposure = open_positions + pending_count
 
             # Check against dynamic max trades limit
@@ -1641,7 +1961,7 @@ class LiveTradingBot:
                 if not replaced:
                     log.info(f"[{symbol}] Max trades reached for DD {total_dd_pct:.1f}%: {total_exposure}/{max_trades} (positions: {open_positions}, pending: {pending_count})")
                     return False
-                pending_count = len([s for s in self.pending_setups.values() if s.status == "pending"])
+                pending_count = self.risk_manager.ledger.pending_count
             
             total_risk_pct = getattr(snapshot, "total_risk_pct", 0)
             if total_risk_pct >= FIVEERS_CONFIG.max_cumulative_risk_pct:
@@ -1664,6 +1984,13 @@ class LiveTradingBot:
             else:
                 risk_pct = FIVEERS_CONFIG.get_risk_pct(daily_loss_pct, total_dd_pct)
             
+            intraday_multiplier = self.dd_monitor.intraday_risk_multiplier()
+            if intraday_multiplier < 1.0:
+                intraday_dd = self.dd_monitor.history.drawdown_pct(INTRADAY_DD_WINDOW)
+                log.info(f"[{symbol}] Intraday risk multiplier {intraday_multiplier:.1f}x "
+                         f"({INTRADAY_DD_WINDOW} equity drop: {intraday_dd:.1f}%)")
+                risk_pct *= intraday_multiplier
+            
             if risk_pct <= 0:
                 log.warning(f"[{symbol}] Risk percentage is 0 - trading halted")
                 return False
@@ -1738,6 +2065,9 @@ class LiveTradingBot:
             
             lot_size = risk_check.adjusted_lot
         
+        if PORTFOLIO_STRESS_CHECK and not self._portfolio_stress_ok(symbol, broker_symbol, direction, lot_size, entry, sl):
+            return False
+        
         if entry_distance_r <= FIVEERS_CONFIG.immediate_entry_r:
             order_type = "MARKET"
             log.info(f"[{symbol}] Price at entry ({entry_distance_r:.2f}R) - using MARKET ORDER")
@@ -1780,7 +2110,7 @@ class LiveTradingBot:
                 confluence_score=confluence,
                 quality_factors=quality_factors,
                 entry_distance_r=entry_distance_r,
-                created_at=datetime.now(timezone.utc).isoformat(),
+                created_at=utc_now().isoformat(),
                 order_ticket=result.order_id,
                 status="filled",
                 lot_size=result.volume,
@@ -1829,13 +2159,15 @@ class LiveTradingBot:
                 confluence_score=confluence,
                 quality_factors=quality_factors,
                 entry_distance_r=entry_distance_r,
-                created_at=datetime.now(timezone.utc).isoformat(),
+                created_at=utc_now().isoformat(),
                 order_ticket=result.order_id,
                 status="pending",
                 lot_size=lot_size,
+                daily_bar=setup.get("daily_bar"),
             )
         
         self.pending_setups[symbol] = pending_setup
+        self._track_pending(symbol)
         self._save_pending_setups()
         
         if pending_setup.status == "filled":
@@ -1849,8 +2181,7 @@ class LiveTradingBot:
         
         This syncs our internal state with actual MT5 positions.
         """
-        my_positions = self.mt5.get_my_positions()
-        open_tickets = {p.ticket for p in my_positions}
+        open_tickets = self.mt5.snapshot().positions_by_ticket
         
         state_positions = self.risk_manager.state.open_positions.copy()
         
@@ -1880,14 +2211,12 @@ class LiveTradingBot:
         if not self.pending_setups:
             return
         
-        my_positions = self.mt5.get_my_positions()
-        position_symbols = {p.symbol for p in my_positions}
-        
-        my_pending_orders = self.mt5.get_my_pending_orders()
-        pending_order_tickets = {o.ticket for o in my_pending_orders}
+        broker_state = self.mt5.snapshot()
+        position_symbols = broker_state.position_symbols
+        pending_order_tickets = broker_state.orders_by_ticket
         
         setups_to_remove = []
-        now = datetime.now(timezone.utc)
+        now = utc_now()
         expiry_hours = FIVEERS_CONFIG.pending_order_expiry_hours
         
         for symbol, setup in self.pending_setups.items():
@@ -1913,6 +2242,7 @@ class LiveTradingBot:
             if broker_symbol in position_symbols:
                 log.info(f"[{symbol}] Pending order FILLED! Position now open (broker: {broker_symbol})")
                 setup.status = "filled"
+                self._track_pending(symbol)
                 
                 self.risk_manager.record_trade_open(
                     symbol=broker_symbol,
@@ -1933,35 +2263,48 @@ class LiveTradingBot:
                 setups_to_remove.append(symbol)
                 continue
             
-            tick = self.mt5.get_tick(broker_symbol)
-            if tick:
-                if setup.direction == "bullish" and tick.bid <= setup.stop_loss:
-                    log.warning(f"[{symbol}] Price ({tick.bid:.5f}) breached SL ({setup.stop_loss:.5f}) - cancelling pending order")
-                    if setup.order_ticket:
-                        self.mt5.cancel_pending_order(setup.order_ticket)
-                    setup.status = "cancelled"
-                    setups_to_remove.append(symbol)
-                elif setup.direction == "bearish" and tick.ask >= setup.stop_loss:
-                    log.warning(f"[{symbol}] Price ({tick.ask:.5f}) breached SL ({setup.stop_loss:.5f}) - cancelling pending order")
-                    if setup.order_ticket:
-                        self.mt5.cancel_pending_order(setup.order_ticket)
-                    setup.status = "cancelled"
-                    setups_to_remove.append(symbol)
+            if self._cancel_if_sl_breached(symbol, setup):
+                setups_to_remove.append(symbol)
         
         for symbol in setups_to_remove:
             del self.pending_setups[symbol]
+            self._track_pending(symbol)
         
         if setups_to_remove:
             self._save_pending_setups()
     
+    def _cancel_if_sl_breached(self, symbol: str, setup: PendingSetup) -> bool:
+        """
+        Cancel the setup's pending order if the live price has traded through
+        its SL (bid for longs, ask for shorts).
+        
+        Marks the setup "cancelled" and returns True on a breach; the caller
+        removes it from pending_setups.
+        """
+        tick = self.mt5.get_tick(self.symbol_map.get(symbol, symbol))
+        if not tick:
+            return False
+        price = tick.bid if setup.direction == "bullish" else tick.ask
+        breached = price <= setup.stop_loss if setup.direction == "bullish" else price >= setup.stop_loss
+        if not breached:
+            return False
+        log.warning(f"[{symbol}] Price ({price:.5f}) breached SL ({setup.stop_loss:.5f}) - cancelling pending order")
+        if setup.order_ticket:
+            self.mt5.cancel_pending_order(setup.order_ticket)
+        setup.status = "cancelled"
+        return True
+    
     def validate_setup(self, symbol: str) -> bool:
         """
         Re-validate a pending setup to check if it's still valid.
         
-        Like the backtest, cancels if:
-        - Structure has shifted
-        - SL has been breached
-        - Confluence is no longer met
+        Cancels if:
+        - The live price has traded through the SL (checked on every call)
+        - A newer D1 bar has closed and, evaluated on it, the direction has
+          flipped or confluence / quality are no longer met
+        
+        Until the next D1 close the evaluation is the one the setup was
+        created from, so only the SL check runs.
         """
         if symbol not in self.pending_setups:
             return True
@@ -1970,42 +2313,34 @@ class LiveTradingBot:
         if setup.status != "pending":
             return True
         
+        if self._cancel_if_sl_breached(symbol, setup):
+            del self.pending_setups[symbol]
+            self._track_pending(symbol)
+            self._save_pending_setups()
+            return False
+        
         data = self.get_candle_data(symbol)
         
         if not data["daily"] or len(data["daily"]) < 30:
             return True
         
-        monthly_candles = data["monthly"] if data["monthly"] else []
-        weekly_candles = data["weekly"]
-        daily_candles = data["daily"]
-        h4_candles = data["h4"] if data["h4"] else daily_candles[-20:]
+        if setup.daily_bar is not None and last_daily_close(data["daily"], self._server_epoch()) == setup.daily_bar:
+            return True  # No new closed D1 bar since the setup was validated
         
-        mn_trend = _infer_trend(monthly_candles) if monthly_candles else "mixed"
-        wk_trend = _infer_trend(weekly_candles) if weekly_candles else "mixed"
-        d_trend = _infer_trend(daily_candles) if daily_candles else "mixed"
-        
-        direction, _, _ = _pick_direction_from_bias(mn_trend, wk_trend, d_trend)
+        # Same closed-bar evaluation the scan uses (cached until the next D1 close)
+        evaluation = self.evaluate_symbol(symbol, data)
+        direction = evaluation["direction"]
         
         if direction != setup.direction:
             log.warning(f"[{symbol}] Direction changed from {setup.direction} to {direction} - cancelling setup")
             if setup.order_ticket:
                 self.mt5.cancel_pending_order(setup.order_ticket)
             del self.pending_setups[symbol]
+            self._track_pending(symbol)
             self._save_pending_setups()
             return False
         
-        historical_sr = get_all_htf_sr_levels(symbol) if HISTORICAL_SR_AVAILABLE else None
-        
-        flags, notes, trade_levels = compute_confluence(
-            monthly_candles,
-            weekly_candles,
-            daily_candles,
-            h4_candles,
-            direction,
-            self.params,
-            historical_sr,
-        )
-        
+        flags = evaluation["flags"]
         confluence_score = sum(1 for v in flags.values() if v)
         has_rr = flags.get("rr", False)
         quality_factors = sum([
@@ -2022,9 +2357,13 @@ class LiveTradingBot:
             if setup.order_ticket:
                 self.mt5.cancel_pending_order(setup.order_ticket)
             del self.pending_setups[symbol]
+            self._track_pending(symbol)
             self._save_pending_setups()
             return False
         
+        if setup.daily_bar != evaluation["daily_bar"]:
+            setup.daily_bar = evaluation["daily_bar"]
+            self._save_pending_setups()
         return True
     
     def validate_all_setups(self):
@@ -2039,11 +2378,11 @@ class LiveTradingBot:
         for symbol in symbols_to_validate:
             try:
                 self.validate_setup(symbol)
-                time.sleep(0.2)
+                _sleep(0.2)
             except Exception as e:
                 log.error(f"[{symbol}] Error validating setup: {e}")
         
-        self.last_validate_time = datetime.now(timezone.utc)
+        self.last_validate_time = utc_now()
     
     def monitor_live_pnl(self) -> bool:
         """
@@ -2083,17 +2422,17 @@ class LiveTradingBot:
         
         # Cancel pending orders if approaching limits (above 3.5% daily or 7% total)
         if daily_loss_pct >= 3.5 or total_dd_pct >= 7.0:
-            pending_orders = self.mt5.get_my_pending_orders()
+            pending_orders = self.mt5.snapshot().orders
             if pending_orders:
                 log.warning(f"Approaching limits (Daily: {daily_loss_pct:.1f}%, DD: {total_dd_pct:.1f}%) - cancelling {len(pending_orders)} pending orders")
-                for order in pending_orders:
-                    self.mt5.cancel_pending_order(order.ticket)
+                self.mt5.gateway.run_batch([OrderOp.cancel(order.ticket) for order in pending_orders])
                 self.pending_setups.clear()
+                self.risk_manager.ledger.clear_pending()
                 self._save_pending_setups()
         
         # Start closing positions if above 4.0% daily or 8.0% total
         if daily_loss_pct >= 4.0 or total_dd_pct >= 8.0:
-            positions = self.mt5.get_my_positions()
+            positions = self.mt5.snapshot().positions
             if not positions:
                 return False
             
@@ -2106,7 +2445,7 @@ class LiveTradingBot:
             # Sort positions by unrealized loss (worst first)
             positions_sorted = sorted(positions, key=lambda p: p.profit)
             
-            for pos in positions_sorted:
+            for i, pos in enumerate(positions_sorted):
                 log.warning(f"Closing {pos.symbol} (P/L: ${pos.profit:.2f}, Volume: {pos.volume})")
                 result = self.mt5.close_position(pos.ticket)
                 
@@ -2140,6 +2479,7 @@ class LiveTradingBot:
                         # Emergency if we've breached hard limits
                         if new_daily_loss >= 5.0 or new_total_dd >= 10.0:
                             log.error("  BREACH DETECTED - closing all remaining positions immediately!")
+                            self._close_positions_batch(positions_sorted[i + 1:])
                             break
                 else:
                     log.error(f"  ✗ Failed to close: {result.error}")
@@ -2185,24 +2525,21 @@ class LiveTradingBot:
         
         Tracks partial close state in pending_setups.partial_closes (0-3).
         """
-        positions = self.mt5.get_my_positions()
+        positions = self.mt5.snapshot().positions
         if not positions:
             return
         
+        # Index setups once: by order ticket, and by broker symbol as fallback
+        setups_by_ticket = {}
+        setups_by_broker_symbol = {}
+        for sym, s in self.pending_setups.items():
+            if s.order_ticket:
+                setups_by_ticket.setdefault(s.order_ticket, s)
+            setups_by_broker_symbol.setdefault(self.symbol_map.get(sym, sym), s)
+        
         for pos in positions:
-            # Find matching setup - try broker symbol first, then internal symbol
-            setup = None
             broker_symbol = pos.symbol
-            
-            # Try to find by broker symbol or internal symbol
-            for sym, s in self.pending_setups.items():
-                if s.order_ticket == pos.ticket:
-                    setup = s
-                    break
-                mapped_broker = self.symbol_map.get(sym, sym)
-                if mapped_broker == broker_symbol:
-                    setup = s
-                    break
+            setup = setups_by_ticket.get(pos.ticket) or setups_by_broker_symbol.get(broker_symbol)
             
             if not setup or setup.status != "filled":
                 continue
@@ -2310,6 +2647,34 @@ class LiveTradingBot:
                 else:
                     log.error(f"[{broker_symbol}] Failed to close position: {result.error}")
     
+    def _close_positions_batch(self, positions, orders=()):
+        """
+        Close `positions` and cancel `orders` in one concurrent gateway batch,
+        recording each successful close with the risk manager.
+        """
+        positions = list(positions)
+        orders = list(orders)
+        ops = [OrderOp.close(pos.ticket) for pos in positions]
+        ops += [OrderOp.cancel(order.ticket) for order in orders]
+        results = self.mt5.gateway.run_batch(ops)
+        
+        for pos, result in zip(positions, results):
+            if result.success:
+                log.info(f"  ✓ Closed {pos.symbol} at {result.price}")
+                self.risk_manager.record_trade_close(
+                    order_id=pos.ticket,
+                    exit_price=result.price,
+                    pnl_usd=pos.profit,
+                )
+            else:
+                log.error(f"  ✗ Failed to close {pos.symbol}: {result.error}")
+        
+        for order, result in zip(orders, results[len(positions):]):
+            if result.success:
+                log.info(f"  ✓ Cancelled pending order {order.ticket}")
+            else:
+                log.error(f"  ✗ Failed to cancel pending order {order.ticket}: {result.error}")
+    
     def execute_protection_actions(self) -> bool:
         """
         Execute protection actions from Challenge Risk Manager.
@@ -2345,56 +2710,50 @@ class LiveTradingBot:
                     log.error(f"Reason: {action.reason}")
                     log.error("=" * 70)
                     
-                    positions = self.mt5.get_my_positions()
-                    for pos in positions:
-                        result = self.mt5.close_position(pos.ticket)
-                        if result.success:
-                            log.info(f"  ✓ Closed {pos.symbol} at {result.price}")
-                            self.risk_manager.record_trade_close(
-                                order_id=pos.ticket,
-                                exit_price=result.price,
-                                pnl_usd=pos.profit,
-                            )
-                        else:
-                            log.error(f"  ✗ Failed to close {pos.symbol}: {result.error}")
-                    
-                    pending_orders = self.mt5.get_my_pending_orders()
-                    for order in pending_orders:
-                        self.mt5.cancel_pending_order(order.ticket)
-                        log.info(f"  ✓ Cancelled pending order {order.ticket}")
+                    # Closes and cancels go out as one concurrent batch
+                    broker_state = self.mt5.snapshot()
+                    self._close_positions_batch(broker_state.positions, broker_state.orders)
                     
                     self.pending_setups.clear()
+                    self.risk_manager.ledger.clear_pending()
                     self._save_pending_setups()
                     
                     action.executed = True
                     emergency_triggered = True
                     
                 elif action.action == ActionType.CANCEL_PENDING:
-                    for ticket in action.positions_affected:
-                        result = self.mt5.cancel_pending_order(ticket)
-                        if result:
+                    tickets = list(action.positions_affected)
+                    results = self.mt5.gateway.run_batch([OrderOp.cancel(ticket) for ticket in tickets])
+                    for ticket, result in zip(tickets, results):
+                        if result.success:
                             log.info(f"  ✓ Cancelled pending order {ticket}")
                         else:
                             log.error(f"  ✗ Failed to cancel pending order {ticket}")
                     action.executed = True
                     
                 elif action.action == ActionType.MOVE_SL_BREAKEVEN:
+                    broker_state = self.mt5.snapshot()
+                    to_modify = []
                     for ticket in action.positions_affected:
-                        positions = self.mt5.get_my_positions()
-                        pos = next((p for p in positions if p.ticket == ticket), None)
+                        pos = broker_state.position(ticket)
                         if pos:
-                            result = self.mt5.modify_sl_tp(ticket, sl=pos.price_open)
-                            if result:
-                                log.info(f"  ✓ Moved SL to breakeven for {pos.symbol} ({pos.price_open:.5f})")
-                            else:
-                                log.error(f"  ✗ Failed to move SL to breakeven for {pos.symbol}")
+                            to_modify.append(pos)
                         else:
                             log.warning(f"  Position {ticket} not found for SL modification")
+                    results = self.mt5.gateway.run_batch(
+                        [OrderOp.modify(pos.ticket, sl=pos.price_open) for pos in to_modify]
+                    )
+                    for pos, result in zip(to_modify, results):
+                        if result.success:
+                            log.info(f"  ✓ Moved SL to breakeven for {pos.symbol} ({pos.price_open:.5f})")
+                        else:
+                            log.error(f"  ✗ Failed to move SL to breakeven for {pos.symbol}")
                     action.executed = True
                     
                 elif action.action == ActionType.CLOSE_WORST:
-                    for ticket in action.positions_affected:
-                        result = self.mt5.close_position(ticket)
+                    tickets = list(action.positions_affected)
+                    results = self.mt5.gateway.run_batch([OrderOp.close(ticket) for ticket in tickets])
+                    for ticket, result in zip(tickets, results):
                         if result.success:
                             log.info(f"  ✓ Closed worst position {ticket} at {result.price}")
                             self.risk_manager.record_trade_close(
@@ -2416,6 +2775,60 @@ class LiveTradingBot:
         
         return emergency_triggered
     
+    def _prefetch_scan_data(
+        self,
+        symbols: List[str],
+        pool: Optional[ProcessPoolExecutor],
+    ) -> Dict[str, tuple]:
+        """
+        Fetch candles for every symbol that can still get a setup and submit
+        its confluence evaluation to `pool` as soon as the data arrives -
+        unless the post-close precompute already has it for this D1 bar.
+        
+        Only this (main) thread talks to MT5; fetches are rate limited with
+        SCAN_FETCH_INTERVAL_S. Symbols already in a position or with a pending
+        setup are skipped here - scan_symbol re-checks them in order anyway and
+        fetches inline if their state changed during the scan.
+        
+        Returns:
+            {symbol: (candle data, evaluation dict | Future | None)}
+        """
+        open_symbols = self.mt5.snapshot().position_symbols
+        limiter = _fetch_limiter()
+        prefetched = {}
+        
+        for symbol in symbols:
+            if self.symbol_map.get(symbol, symbol) in open_symbols:
+                continue
+            existing = self.pending_setups.get(symbol)
+            if existing is not None and existing.status == "pending":
+                continue
+            
+            limiter.wait()
+            try:
+                with self._state_lock:
+                    data = self.get_candle_data(symbol)
+            except Exception as e:
+                log.warning(f"[{symbol}] Prefetch failed ({e}), will fetch inline")
+                continue
+            
+            sufficient = (
+                data["daily"] and len(data["daily"]) >= 50
+                and data["weekly"] and len(data["weekly"]) >= 10
+            )
+            evaluation = self.cached_evaluation(symbol, data) if sufficient else None
+            if sufficient and evaluation is None and pool is not None:
+                try:
+                    evaluation = pool.submit(
+                        precompute_symbol, symbol, data, self.params, self._server_epoch(), HISTORICAL_SR_AVAILABLE,
+                    )
+                except BrokenProcessPool:
+                    evaluation = None
+            
+            prefetched[symbol] = (data, evaluation)
+        
+        return prefetched
+    
     def scan_all_symbols(self):
         """
         Scan all tradable symbols and place pending orders.
@@ -2425,7 +2838,7 @@ class LiveTradingBot:
         to match backtest entry behavior exactly.
         """
         log.info("=" * 70)
-        log.info(f"MARKET SCAN - {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
+        log.info(f"MARKET SCAN - {utc_now().strftime('%Y-%m-%d %H:%M UTC')}")
         log.info(f"Strategy Mode: {SIGNAL_MODE} (Min Confluence: {MIN_CONFLUENCE}/7)")
         log.info(f"Using PENDING ORDERS (like backtest)")
         log.info("=" * 70)
@@ -2437,34 +2850,55 @@ class LiveTradingBot:
         # Only scan symbols that are available on broker
         available_symbols = [s for s in TRADABLE_SYMBOLS if s in self.symbol_map]
         
-        for symbol in available_symbols:
-            try:
-                
-                setup = self.scan_symbol(symbol)
-                
-                if setup:
-                    signals_found += 1
+        scan_start = time.monotonic()
+        self.mt5.invalidate_snapshot()  # A scan runs long after the tick that triggered it
+        pool = self._open_compute_pool()
+        
+        try:
+            # Stage 1+2: fetch candles (rate limited) and hand confluence to the pool
+            prefetched = self._prefetch_scan_data(available_symbols, pool)
+            
+            # Stage 3: serialized, in symbol order - risk checks see one order at a time
+            for symbol in available_symbols:
+                if self.emergency_triggered:
+                    log.warning("Emergency triggered during scan - not placing further orders")
+                    break
+                try:
+                    data, evaluation = prefetched.get(symbol, (None, None))
+                    if isinstance(evaluation, Future):
+                        try:
+                            evaluation = evaluation.result()
+                            self.precomputed[symbol] = (self._params_fingerprint, evaluation)
+                        except BrokenProcessPool:
+                            evaluation = None  # Re-evaluated inline by scan_symbol
                     
-                    if self.place_setup_order(setup):
-                        orders_placed += 1
-                
-                time.sleep(0.5)
-                
-            except Exception as e:
-                log.error(f"[{symbol}] Error during scan: {e}")
-                continue
-            time.sleep(0.1)
+                    # Lock per symbol: protection jobs run between symbols, not after the scan
+                    with self._state_lock:
+                        setup = self.scan_symbol(symbol, data=data, evaluation=evaluation)
+                        
+                        if setup:
+                            signals_found += 1
+                            
+                            if self.place_setup_order(setup):
+                                orders_placed += 1
+                    
+                except Exception as e:
+                    log.error(f"[{symbol}] Error during scan: {e}")
+                    continue
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
         
         log.info("=" * 70)
         log.info("SCAN COMPLETE")
-        log.info(f"  Symbols scanned: {len(available_symbols)}/{len(TRADABLE_SYMBOLS)}")
+        log.info(f"  Symbols scanned: {len(available_symbols)}/{len(TRADABLE_SYMBOLS)} in {time.monotonic() - scan_start:.1f}s")
         log.info(f"  Active signals: {signals_found}")
         log.info(f"  Pending orders placed: {orders_placed}")
         
-        positions = self.mt5.get_my_positions()
-        pending_orders = self.mt5.get_my_pending_orders()
-        log.info(f"  Open positions: {len(positions)}")
-        log.info(f"  Pending orders: {len(pending_orders)}")
+        with self._state_lock:
+            broker_state = self.mt5.snapshot()
+        log.info(f"  Open positions: {len(broker_state.positions)}")
+        log.info(f"  Pending orders: {len(broker_state.orders)}")
         log.info(f"  Tracked setups: {len(self.pending_setups)}")
         
         status = self.risk_manager.get_status()
@@ -2476,7 +2910,134 @@ class LiveTradingBot:
         log.info(f"  Profitable Days: {status['profitable_days']}/{status['min_profitable_days']}")
         log.info("=" * 70)
         
-        self.last_scan_time = datetime.now(timezone.utc)
+        self.last_scan_time = utc_now()
+    
+    # ═══════════════════════════════════════════════════════════════════════════
+    # SCHEDULER JOBS
+    # ═══════════════════════════════════════════════════════════════════════════
+    
+    def _build_scheduler(self) -> Scheduler:
+        """
+        Register the bot's periodic and cron jobs.
+        
+        "protection" worker: reconnect, DD monitor, protection actions and
+        partial TPs - keeps its 10s cadence while a scan runs on "main".
+        """
+        interval = self.MAIN_LOOP_INTERVAL_SECONDS
+        scheduler = Scheduler(clock=lambda: _clock())
+        
+        scheduler.every("reconnect", interval, self._locked(self._job_reconnect),
+                        priority=100, worker="protection", timeout_s=120)
+        scheduler.every("dd_monitor", interval, self._locked(self._job_drawdown),
+                        priority=90, worker="protection", timeout_s=60, run_now=True)
+        scheduler.every("protection", interval, self._locked(self._job_protection, halts=True),
+                        priority=80, worker="protection", timeout_s=60, run_now=True)
+        scheduler.cron("weekend_gap", weekly_at(0, 0, 5, SERVER_TZ), self._locked(self.handle_weekend_gap_positions),
+                       priority=70, worker="protection", timeout_s=120)
+        
+        scheduler.every("pending_orders", interval, self._locked(self._job_sync_orders, halts=True),
+                        priority=50, timeout_s=60, run_now=True)
+        scheduler.every("quotes", self.QUOTE_POLL_INTERVAL_SECONDS, self._locked(self.poll_quotes, halts=True),
+                        priority=45, timeout_s=60)
+        scheduler.every("spread_queue", self.SPREAD_CHECK_INTERVAL_MINUTES * 60,
+                        self._locked(self.check_awaiting_spread_signals, halts=True),
+                        priority=40, timeout_s=300)
+        scheduler.every("entry_queue", self.ENTRY_CHECK_INTERVAL_MINUTES * 60,
+                        self._locked(self.check_awaiting_entry_signals, halts=True),
+                        priority=40, timeout_s=300)
+        scheduler.every("validate_setups", self.VALIDATE_INTERVAL_MINUTES * 60,
+                        self._locked(self.validate_all_setups, halts=True),
+                        priority=30, timeout_s=300)
+        # Locks per symbol itself (see scan_all_symbols / precompute_all_symbols)
+        # Also runs at startup: warms the evaluation cache and the portfolio covariance
+        scheduler.cron("precompute", daily_at(0, 1, SERVER_TZ, weekdays=range(5)), self._job_precompute,
+                       priority=25, timeout_s=SCAN_TIMEOUT_S, run_now=True)
+        scheduler.cron("daily_scan", daily_at(0, 10, SERVER_TZ, weekdays=range(5)), self._job_daily_scan,
+                       priority=20, timeout_s=SCAN_TIMEOUT_S)
+        
+        return scheduler
+    
+    def _locked(self, fn, halts: bool = False):
+        """
+        Wrap a job: hold the state lock, start from a fresh broker snapshot,
+        and (with `halts`) skip it once an emergency halted trading.
+        """
+        def job():
+            if halts and self.emergency_triggered:
+                return
+            with self._state_lock:
+                self.mt5.invalidate_snapshot()
+                fn()
+        return job
+    
+    def _job_reconnect(self):
+        if self.mt5.connected:
+            return
+        log.warning("MT5 connection lost, attempting reconnect...")
+        if self.connect():
+            log.info("Reconnected successfully")
+        else:
+            log.error("Reconnect failed, retrying next cycle")
+    
+    def _job_drawdown(self):
+        # 5ERS DD MONITORING (no daily DD limit!) - keeps running after a halt
+        if self.monitor_5ers_drawdown():
+            if not self.emergency_triggered:
+                log.error("5ERS STOP-OUT TRIGGERED - halting all trading")
+            self.emergency_triggered = True
+        
+        if CHALLENGE_MODE and self.challenge_manager and self.challenge_manager.halted:
+            if not self.emergency_triggered:
+                self.emergency_triggered = True
+                log.error(f"Challenge Manager halted trading: {self.challenge_manager.halt_reason}")
+    
+    def _job_protection(self):
+        if CHALLENGE_MODE and self.challenge_manager:
+            if self.execute_protection_actions():
+                self.emergency_triggered = True
+                log.error("Challenge protection triggered emergency - halting all trading")
+                return
+        else:
+            if self.monitor_live_pnl():
+                self.emergency_triggered = True
+                log.error("Emergency close triggered - halting all trading")
+                return
+        
+        # 5-TP partial close management
+        self.manage_partial_takes()
+    
+    def _job_sync_orders(self):
+        # Pending orders and position updates
+        self.check_pending_orders()
+        self.check_position_updates()
+    
+    def _job_precompute(self):
+        if self.emergency_triggered or not is_market_open():
+            return
+        self.precompute_all_symbols()
+    
+    def _job_daily_scan(self):
+        if self.emergency_triggered:
+            return
+        if is_market_open():
+            log.info("=" * 70)
+            log.info(f"📊 DAILY SCAN - {get_server_time().strftime('%Y-%m-%d %H:%M')} Server Time")
+            log.info("=" * 70)
+            self.scan_all_symbols()
+            self._log_scheduler_metrics()
+        else:
+            log.info("Market closed (weekend), skipping scan")
+            self.last_scan_time = utc_now()
+    
+    def _log_scheduler_metrics(self):
+        if self.scheduler is None:
+            return
+        log.info("Scheduler jobs (runs | lateness mean/max | duration max | timeouts/errors):")
+        for name, m in self.scheduler.metrics().items():
+            log.info(
+                f"  {name:<16} {m['runs']:>6} | {m['mean_lateness_s']:.3f}s/{m['max_lateness_s']:.3f}s"
+                f" | {m['max_duration_s']:.1f}s | {m['timeouts']}/{m['errors']}"
+            )
     
     def run(self):
         """
@@ -2490,11 +3051,15 @@ class LiveTradingBot:
         - 5-TP partial close system: 10/10/15/20/45% at 0.6R/1.2R/2.0R/2.5R/3.5R
         - DD monitoring: Total DD only (5ers has NO daily DD limit!)
         
-        SCHEDULE:
-        - Every 10 seconds: Protection checks, 5-TP management
-        - Every 10 minutes: Spread queue check, validate setups
-        - 00:10 server time: Daily market scan
-        - Monday 00:00-02:00: Weekend gap protection
+        SCHEDULE (deadline scheduler, see _build_scheduler):
+        - Every 10 seconds: DD monitor, protection checks, 5-TP management
+          (own "protection" worker - not delayed by a running scan)
+        - Every 10 seconds: Pending order / position sync
+        - Every 5 seconds: Batched quote poll - entry/spread queue events
+        - Every 10 minutes: Spread queue sweep, validate setups
+        - Every 30 minutes: Entry queue sweep
+        - 00:10 server time (Mon-Fri): Daily market scan
+        - Monday 00:05 server time: Weekend gap protection
         """
         log.info("=" * 70)
         log.info("TRADR BOT - 5ERS 60K HIGH STAKES CHALLENGE")
@@ -2541,127 +3106,28 @@ class LiveTradingBot:
         else:
             next_scan = get_next_scan_time()
             log.info(f"Skipping immediate scan - next scheduled: {next_scan.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-            self.last_scan_time = datetime.now(timezone.utc)
+            self.last_scan_time = utc_now()
         
         # Weekend gap check (only on Monday morning)
         self.handle_weekend_gap_positions()
         
-        self.last_validate_time = datetime.now(timezone.utc)
-        self.last_spread_check_time = datetime.now(timezone.utc)
-        last_protection_check = datetime.now(timezone.utc)
-        emergency_triggered = False
+        self.last_validate_time = utc_now()
         
-        while running:
-            try:
-                now = datetime.now(timezone.utc)
-                
-                # ═══════════════════════════════════════════════════════════════
-                # 5ERS DD MONITORING (no daily DD limit!)
-                # ═══════════════════════════════════════════════════════════════
-                if self.monitor_5ers_drawdown():
-                    emergency_triggered = True
-                    log.error("5ERS STOP-OUT TRIGGERED - halting all trading")
-                    continue
-                
-                # Emergency halt check
-                if CHALLENGE_MODE and self.challenge_manager and self.challenge_manager.halted:
-                    if not emergency_triggered:
-                        emergency_triggered = True
-                        log.error(f"Challenge Manager halted trading: {self.challenge_manager.halt_reason}")
-                
-                if not emergency_triggered:
-                    time_since_protection_check = (now - last_protection_check).total_seconds()
-                    if time_since_protection_check >= self.MAIN_LOOP_INTERVAL_SECONDS:
-                        # Protection checks
-                        if CHALLENGE_MODE and self.challenge_manager:
-                            if self.execute_protection_actions():
-                                emergency_triggered = True
-                                log.error("Challenge protection triggered emergency - halting all trading")
-                                continue
-                        else:
-                            if self.monitor_live_pnl():
-                                emergency_triggered = True
-                                log.error("Emergency close triggered - halting all trading")
-                                continue
-                        
-                        # 5-TP partial close management
-                        self.manage_partial_takes()
-                        last_protection_check = now
-                
-                if emergency_triggered:
-                    time.sleep(60)
-                    continue
-                
-                # ═══════════════════════════════════════════════════════════════
-                # SPREAD QUEUE CHECK - Every SPREAD_CHECK_INTERVAL_MINUTES
-                # ═══════════════════════════════════════════════════════════════
-                if self.last_spread_check_time:
-                    time_since_spread = (now - self.last_spread_check_time).total_seconds() / 60
-                    if time_since_spread >= self.SPREAD_CHECK_INTERVAL_MINUTES:
-                        self.check_awaiting_spread_signals()
-                        self.last_spread_check_time = now
-                
-                # ═══════════════════════════════════════════════════════════════
-                # ENTRY QUEUE CHECK - Every ENTRY_CHECK_INTERVAL_MINUTES
-                # Check signals waiting for price to approach entry level
-                # ═══════════════════════════════════════════════════════════════
-                if self.last_entry_check_time is None:
-                    self.last_entry_check_time = now
-                else:
-                    time_since_entry = (now - self.last_entry_check_time).total_seconds() / 60
-                    if time_since_entry >= self.ENTRY_CHECK_INTERVAL_MINUTES:
-                        self.check_awaiting_entry_signals()
-                        self.last_entry_check_time = now
-                
-                # Pending orders and position updates
-                self.check_pending_orders()
-                self.check_position_updates()
-                
-                # Validate setups
-                if self.last_validate_time:
-                    next_validate = self.last_validate_time + timedelta(minutes=self.VALIDATE_INTERVAL_MINUTES)
-                    if now >= next_validate:
-                        self.validate_all_setups()
-                
-                # ═══════════════════════════════════════════════════════════════
-                # DAILY SCAN - 10 min after daily close (00:10 server time)
-                # ═══════════════════════════════════════════════════════════════
-                next_scan = get_next_scan_time()
-                if self.last_scan_time and now >= next_scan:
-                    if is_market_open():
-                        log.info("=" * 70)
-                        log.info(f"📊 DAILY SCAN - {get_server_time().strftime('%Y-%m-%d %H:%M')} Server Time")
-                        log.info("=" * 70)
-                        self.scan_all_symbols()
-                    else:
-                        log.info("Market closed (weekend), skipping scan")
-                        # Move last_scan_time forward to avoid repeated checks
-                        self.last_scan_time = now
-                
-                # Reconnection handling
-                if not self.mt5.connected:
-                    log.warning("MT5 connection lost, attempting reconnect...")
-                    if self.connect():
-                        log.info("Reconnected successfully")
-                    else:
-                        log.error("Reconnect failed, waiting 60s...")
-                        time.sleep(60)
-                        continue
-                
-                time.sleep(self.MAIN_LOOP_INTERVAL_SECONDS)
-                
-            except KeyboardInterrupt:
-                break
-            except Exception as e:
-                log.error(f"Error in main loop: {e}")
-                import traceback
-                log.error(traceback.format_exc())
-                time.sleep(60)
+        self.scheduler = self._build_scheduler()
+        for name in self.scheduler.jobs:
+            log.info(f"  Job {name:<16} next: {self.scheduler.next_due(name).strftime('%Y-%m-%d %H:%M:%S UTC')}")
+        
+        # Blocks until signal_handler clears `running`
+        self.scheduler.run_while(lambda: running)
         
         log.info("Shutting down...")
+        self._log_scheduler_metrics()
         
         self._save_pending_setups()
         self._save_awaiting_spread()
+        self._save_awaiting_entry()
+        flush_state_store()
+        self.dd_monitor.history.dump()
         self.disconnect()
         log.info("Bot stopped")
 
@@ -2681,7 +3147,14 @@ def main():
     
     Path("logs").mkdir(exist_ok=True)
     
-    if not MT5_LOGIN or not MT5_PASSWORD:
+    emulated = os.getenv("MT5_BACKEND", "").lower() == "emulator"
+    if emulated:
+        # Offline replay: MT5Client talks to tradr.mt5.emulator, the bot runs on its clock
+        from tradr.mt5.emulator import get_emulator
+        set_clock(get_emulator().time)
+        log.info(f"MT5 emulator backend - simulated start {get_emulator().now():%Y-%m-%d %H:%M UTC}")
+    
+    if not emulated and (not MT5_LOGIN or not MT5_PASSWORD):
         print("=" * 70)
         print("TRADR BOT - CONFIGURATION REQUIRED")
         print("=" * 70)
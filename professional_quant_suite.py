@@ -16,8 +16,8 @@ Features:
 
 import numpy as np
 import pandas as pd
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional, Any
 import json
@@ -62,169 +62,226 @@ class RiskMetrics:
         }
 
 
-def calculate_risk_metrics(trades: List[Any], 
-                          risk_per_trade_pct: float = 0.5,
-                          account_size: float = 200000.0,
-                          trading_days_per_year: float = 252.0) -> RiskMetrics:
+# ============================================================================
+# COLUMNAR TRADE TABLE
+# ============================================================================
+
+R_FIELDS = ('rr', 'result_r', 'reward_risk')
+
+
+def _field(trade: Any, name: str) -> Any:
+    if isinstance(trade, dict):
+        return trade.get(name)
+    return getattr(trade, name, None)
+
+
+def _trade_r(trade: Any) -> float:
+    """R-multiple of a Trade object or dict (first of rr / result_r / reward_risk set)."""
+    for name in R_FIELDS:
+        value = _field(trade, name)
+        if value is not None:
+            return float(value)
+    return 0.0
+
+
+def to_epoch(value: Any) -> float:
     """
-    Calculate professional risk metrics for a trade sequence.
+    Seconds since epoch of a trade timestamp, NaN if missing or unparseable.
     
-    Args:
-        trades: List of Trade objects with rr (risk-reward) and entry_date
-        risk_per_trade_pct: Risk per trade as percentage
-        account_size: Starting account size
-        trading_days_per_year: Trading days (default 252 for forex)
+    Timezone-aware values keep their wall-clock time (tzinfo is dropped, as
+    the date filters here always compared naive datetimes).
+    """
+    if value is None or value == "":
+        return np.nan
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return np.nan
+    if not isinstance(value, datetime):
+        if isinstance(value, date):
+            value = datetime(value.year, value.month, value.day)
+        else:
+            try:
+                value = pd.Timestamp(value).to_pydatetime()
+            except (TypeError, ValueError):
+                return np.nan
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+@dataclass
+class TradeTable:
+    """
+    Trade list as columns, built once so metrics and date windows are array ops.
     
-    Returns:
-        RiskMetrics object with all risk calculations
+    Rows keep the order of the source list; `order` sorts them by entry time
+    (missing entries last) for searchsorted window lookups.
     """
-    if not trades:
+    
+    entry: np.ndarray  # epoch seconds (NaN = unknown)
+    exit: np.ndarray
+    rr: np.ndarray
+    symbol: np.ndarray  # int32 code into `symbols`
+    direction: np.ndarray  # int8: +1 long, -1 short, 0 unknown
+    symbols: List[str] = field(default_factory=list)
+    trades: List[Any] = field(default_factory=list)
+    
+    def __post_init__(self):
+        self.order = np.argsort(self.entry, kind='stable')
+        self.sorted_entry = self.entry[self.order]
+    
+    def __len__(self) -> int:
+        return len(self.rr)
+    
+    @classmethod
+    def from_trades(cls, trades: List[Any]) -> "TradeTable":
+        """One pass over Trade objects or dicts."""
+        n = len(trades)
+        entry = np.full(n, np.nan)
+        exit_ = np.full(n, np.nan)
+        rr = np.zeros(n)
+        symbol = np.zeros(n, dtype=np.int32)
+        direction = np.zeros(n, dtype=np.int8)
+        codes: Dict[str, int] = {}
+        for i, trade in enumerate(trades):
+            rr[i] = _trade_r(trade)
+            entry[i] = to_epoch(_field(trade, 'entry_date'))
+            exit_[i] = to_epoch(_field(trade, 'exit_date'))
+            symbol[i] = codes.setdefault(str(_field(trade, 'symbol') or ''), len(codes))
+            side = str(_field(trade, 'direction') or '').lower()
+            direction[i] = 1 if side in ('bullish', 'long', 'buy') else -1 if side in ('bearish', 'short', 'sell') else 0
+        return cls(entry, exit_, rr, symbol, direction, list(codes), list(trades))
+    
+    def between(self, start: Any, end: Any) -> np.ndarray:
+        """Row indices (source order) with start <= entry <= end."""
+        lo = np.searchsorted(self.sorted_entry, to_epoch(start), side='left')
+        hi = np.searchsorted(self.sorted_entry, to_epoch(end), side='right')
+        return np.sort(self.order[lo:hi])
+    
+    def take(self, rows: np.ndarray) -> "TradeTable":
+        return TradeTable(
+            self.entry[rows], self.exit[rows], self.rr[rows], self.symbol[rows], self.direction[rows],
+            self.symbols, [self.trades[i] for i in rows] if self.trades else [],
+        )
+
+
+# ============================================================================
+# VECTORIZED METRIC KERNELS
+# ============================================================================
+
+def _max_streaks(returns: np.ndarray) -> Tuple[int, int]:
+    """Longest run of wins and of losses (break-even trades neither extend nor break a run)."""
+    signs = np.sign(returns)
+    signs = signs[signs != 0]
+    if signs.size == 0:
+        return 0, 0
+    edges = np.flatnonzero(np.diff(signs)) + 1
+    starts = np.concatenate(([0], edges))
+    lengths = np.diff(np.concatenate((starts, [signs.size])))
+    run_signs = signs[starts]
+    wins, losses = lengths[run_signs > 0], lengths[run_signs < 0]
+    return int(wins.max()) if wins.size else 0, int(losses.max()) if losses.size else 0
+
+
+def risk_metrics_from_r(rr: np.ndarray,
+                        entry: Optional[np.ndarray] = None,
+                        risk_per_trade_pct: float = 0.5,
+                        account_size: float = 200000.0) -> RiskMetrics:
+    """RiskMetrics from R-multiples (trade order) and entry epochs (NaN = unknown)."""
+    if len(rr) == 0:
         return RiskMetrics()
     
-    # Helper to get R-multiple from Trade object or dict
-    def get_rr(t):
-        # Try object attributes first
-        for attr in ('rr', 'result_r', 'reward_risk'):
-            if hasattr(t, attr):
-                val = getattr(t, attr, None)
-                if val is not None:
-                    return val
-        # Try dict keys
-        if isinstance(t, dict):
-            for key in ('rr', 'result_r', 'reward_risk'):
-                if key in t and t[key] is not None:
-                    return t[key]
-        return 0
-    
-    # Convert R-multiples to account returns
     risk_amount = account_size * (risk_per_trade_pct / 100.0)
-    returns = [get_rr(t) * risk_amount for t in trades]
+    returns = np.asarray(rr, dtype=float) * risk_amount
+    n = returns.size
     
-    # Total return
-    total_return = sum(returns)
+    total_return = float(returns.sum())
     total_return_pct = (total_return / account_size) * 100
     
-    # Time period calculation
-    entry_dates = []
-    for t in trades:
-        # Support both object attributes and dict keys
-        entry = getattr(t, 'entry_date', None) or (t.get('entry_date') if isinstance(t, dict) else None)
-        if entry:
-            if isinstance(entry, str):
-                try:
-                    entry = datetime.fromisoformat(entry.replace("Z", "+00:00"))
-                except:
-                    continue
-            if hasattr(entry, 'replace') and entry.tzinfo:
-                entry = entry.replace(tzinfo=None)
-            entry_dates.append(entry)
-    
-    if entry_dates:
-        trading_period_days = (max(entry_dates) - min(entry_dates)).days + 1
+    known = entry[~np.isnan(entry)] if entry is not None else np.empty(0)
+    if known.size:
+        trading_period_days = int((known.max() - known.min()) // 86400) + 1
         years = trading_period_days / 365.0
         annual_return = (total_return_pct / years) if years > 0 else 0
     else:
         annual_return = total_return_pct
     
     # Win rate and profit factor
-    wins = [r for r in returns if r > 0]
-    losses = [r for r in returns if r < 0]
-    win_rate = (len(wins) / len(returns) * 100) if returns else 0
-    
-    gross_profit = sum(wins) if wins else 0
-    gross_loss = abs(sum(losses)) if losses else 0
+    wins = returns > 0
+    losses = returns < 0
+    win_rate = wins.sum() / n * 100
+    gross_profit = returns[wins].sum()
+    gross_loss = -returns[losses].sum()
     profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else float('inf')
     
-    # Drawdown analysis
+    # Drawdown (USD) and its duration in trades since the last equity high
     cumulative_returns = np.cumsum(returns)
-    running_max = np.maximum.accumulate(cumulative_returns)
-    drawdown = running_max - cumulative_returns
-    max_drawdown = np.max(drawdown) if len(drawdown) > 0 else 0
-    
-    # Drawdown duration
-    max_dd_idx = np.argmax(drawdown)
+    drawdown = np.maximum.accumulate(cumulative_returns) - cumulative_returns
+    max_dd_idx = int(np.argmax(drawdown))
+    max_drawdown = float(drawdown[max_dd_idx])
     max_drawdown_duration = 0
     if max_dd_idx > 0:
-        dd_region = drawdown[:max_dd_idx + 1]
-        recovery_idx = np.where(dd_region == 0)[0]
-        if len(recovery_idx) > 0:
-            last_recovery = recovery_idx[-1]
-            max_drawdown_duration = max_dd_idx - last_recovery
-    
-    # Risk-adjusted returns (Sharpe ratio)
-    if len(returns) > 1:
-        return_std = np.std(returns)
-        sharpe = (mean(returns) / return_std * np.sqrt(252)) if return_std > 0 else 0
-    else:
-        sharpe = 0
-    
-    # Sortino ratio (penalizes downside volatility only)
-    if len(returns) > 1:
-        downside_returns = [r for r in returns if r < 0]
-        if downside_returns:
-            downside_std = np.std(downside_returns)
-            sortino = (mean(returns) / downside_std * np.sqrt(252)) if downside_std > 0 else 0
+        recovery_idx = np.flatnonzero(drawdown[:max_dd_idx + 1] == 0)
+        if recovery_idx.size:
+            max_drawdown_duration = max_dd_idx - int(recovery_idx[-1])
+    
+    # Sharpe / Sortino (per-trade, annualized with sqrt(252))
+    mean_return = returns.mean()
+    if n > 1:
+        return_std = returns.std()
+        sharpe = (mean_return / return_std * np.sqrt(252)) if return_std > 0 else 0
+        if losses.any():
+            downside_std = returns[losses].std()
+            sortino = (mean_return / downside_std * np.sqrt(252)) if downside_std > 0 else 0
         else:
             sortino = sharpe  # No losses, same as Sharpe
     else:
-        sortino = 0
+        sharpe = sortino = 0
     
-    # Calmar ratio (return / max drawdown) - FIXED: Convert drawdown to percentage
-    # max_drawdown is in USD, we need it as percentage of account for correct Calmar
+    # Calmar ratio uses drawdown as % of account; recovery factor stays in USD
     max_drawdown_pct = (max_drawdown / account_size) * 100 if account_size > 0 else 0
     calmar = (annual_return / max_drawdown_pct) if max_drawdown_pct > 0 else 0
-    
-    # Recovery factor (total return / max drawdown in same units - USD)
     recovery_factor = (total_return / max_drawdown) if max_drawdown > 0 else 0
     
-    # Consecutive winners/losers
-    consecutive_wins = []
-    consecutive_losses = []
-    current_streak = 0
-    current_type = None
-    
-    for ret in returns:
-        if ret > 0:
-            if current_type == 'win':
-                current_streak += 1
-            else:
-                if current_type == 'loss':
-                    consecutive_losses.append(current_streak)
-                current_streak = 1
-                current_type = 'win'
-        elif ret < 0:
-            if current_type == 'loss':
-                current_streak += 1
-            else:
-                if current_type == 'win':
-                    consecutive_wins.append(current_streak)
-                current_streak = 1
-                current_type = 'loss'
-    
-    if current_type == 'win':
-        consecutive_wins.append(current_streak)
-    elif current_type == 'loss':
-        consecutive_losses.append(current_streak)
-    
-    max_consecutive_wins = max(consecutive_wins) if consecutive_wins else 0
-    max_consecutive_losses = max(consecutive_losses) if consecutive_losses else 0
+    max_consecutive_wins, max_consecutive_losses = _max_streaks(returns)
     
     return RiskMetrics(
-        total_return=total_return,  # FIXED: Return USD value, not percentage
-        annual_return=annual_return,
-        sharpe_ratio=sharpe,
-        sortino_ratio=sortino,
-        calmar_ratio=calmar,
+        total_return=total_return,  # USD, not percentage
+        annual_return=float(annual_return),
+        sharpe_ratio=float(sharpe),
+        sortino_ratio=float(sortino),
+        calmar_ratio=float(calmar),
         max_drawdown=max_drawdown,
         max_drawdown_duration=max_drawdown_duration,
-        win_rate=win_rate,
-        profit_factor=profit_factor,
-        recovery_factor=recovery_factor,
+        win_rate=float(win_rate),
+        profit_factor=float(profit_factor),
+        recovery_factor=float(recovery_factor),
         consecutive_winners=max_consecutive_wins,
         consecutive_losers=max_consecutive_losses,
     )
 
 
+def calculate_risk_metrics(trades: Any, 
+                          risk_per_trade_pct: float = 0.5,
+                          account_size: float = 200000.0,
+                          trading_days_per_year: float = 252.0) -> RiskMetrics:
+    """
+    Calculate professional risk metrics for a trade sequence.
+    
+    Args:
+        trades: List of Trade objects / dicts with rr (risk-reward) and
+            entry_date, or a TradeTable
+        risk_per_trade_pct: Risk per trade as percentage
+        account_size: Starting account size
+        trading_days_per_year: Trading days (default 252 for forex)
+    
+    Returns:
+        RiskMetrics object with all risk calculations
+    """
+    table = trades if isinstance(trades, TradeTable) else TradeTable.from_trades(trades or [])
+    return risk_metrics_from_r(table.rr, table.entry, risk_per_trade_pct, account_size)
+
+
 # ============================================================================
 # WALK-FORWARD TESTING
 # ============================================================================
@@ -236,6 +293,9 @@ class WalkForwardTester:
     Implements anchored and rolling window validation:
     - Anchored: Training window grows, validation window fixed
     - Rolling: Both windows roll forward together
+    
+    Windows advance by `step_months` (30-day months); with step_months ==
+    validate_months the validation spans tile the period without overlap.
     """
     
     def __init__(self, all_trades: List[Any], 
@@ -243,7 +303,8 @@ class WalkForwardTester:
                  end_date: datetime,
                  train_months: int = 12,
                  validate_months: int = 3,
-                 rolling: bool = True):
+                 rolling: bool = True,
+                 step_months: int = 1):
         """
         Initialize walk-forward tester.
         
@@ -254,13 +315,16 @@ class WalkForwardTester:
             train_months: Training window size in months
             validate_months: Validation window size in months
             rolling: True for rolling windows, False for anchored
+            step_months: How far each window moves forward
         """
         self.all_trades = all_trades
+        self.table = TradeTable.from_trades(all_trades)
         self.start_date = start_date
         self.end_date = end_date
         self.train_months = train_months
         self.validate_months = validate_months
         self.rolling = rolling
+        self.step_months = step_months
     
     def get_date_windows(self) -> List[Tuple[datetime, datetime, datetime, datetime]]:
         """
@@ -270,61 +334,30 @@ class WalkForwardTester:
             List of (train_start, train_end, val_start, val_end) tuples
         """
         windows = []
+        step = timedelta(days=self.step_months * 30)
+        train_start = self.start_date
+        train_end = train_start + timedelta(days=self.train_months * 30)
         
-        if self.rolling:
-            # Rolling window: both move forward
-            current_start = self.start_date
+        while True:
+            val_start = train_end + timedelta(days=1)
+            val_end = val_start + timedelta(days=self.validate_months * 30)
             
-            while True:
-                train_end = current_start + timedelta(days=self.train_months * 30)
-                val_start = train_end + timedelta(days=1)
-                val_end = val_start + timedelta(days=self.validate_months * 30)
-                
-                if val_end > self.end_date:
-                    break
-                
-                windows.append((current_start, train_end, val_start, val_end))
-                
-                # Roll forward by 1 month
-                current_start = current_start + timedelta(days=30)
-        else:
-            # Anchored window: training grows, validation fixed size
-            train_start = self.start_date
+            if val_end > self.end_date:
+                break
             
-            while True:
-                train_end = train_start + timedelta(days=self.train_months * 30)
-                val_start = train_end + timedelta(days=1)
-                val_end = val_start + timedelta(days=self.validate_months * 30)
-                
-                if val_end > self.end_date:
-                    break
-                
-                windows.append((train_start, train_end, val_start, val_end))
-                
-                # Extend training by 1 month
-                train_start = train_start + timedelta(days=30)
+            windows.append((train_start, train_end, val_start, val_end))
+            
+            if self.rolling:
+                # Rolling window: both move forward
+                train_start = train_start + step
+            # Anchored window: training start stays, training end (and validation) move forward
+            train_end = train_end + step
         
         return windows
     
     def get_trades_for_period(self, start: datetime, end: datetime) -> List[Any]:
         """Get all trades within a date range."""
-        period_trades = []
-        
-        for trade in self.all_trades:
-            entry = getattr(trade, 'entry_date', None)
-            if entry:
-                if isinstance(entry, str):
-                    try:
-                        entry = datetime.fromisoformat(entry.replace("Z", "+00:00"))
-                    except:
-                        continue
-                if hasattr(entry, 'replace') and entry.tzinfo:
-                    entry = entry.replace(tzinfo=None)
-                
-                if start <= entry <= end:
-                    period_trades.append(trade)
-        
-        return period_trades
+        return [self.all_trades[i] for i in self.table.between(start, end)]
     
     def analyze_all_windows(self, risk_per_trade_pct: float = 0.5) -> Dict:
         """
@@ -336,12 +369,14 @@ class WalkForwardTester:
         windows = self.get_date_windows()
         window_results = []
         
+        table = self.table
+        
         for i, (train_start, train_end, val_start, val_end) in enumerate(windows):
-            train_trades = self.get_trades_for_period(train_start, train_end)
-            val_trades = self.get_trades_for_period(val_start, val_end)
+            train_rows = table.between(train_start, train_end)
+            val_rows = table.between(val_start, val_end)
             
-            train_metrics = calculate_risk_metrics(train_trades, risk_per_trade_pct)
-            val_metrics = calculate_risk_metrics(val_trades, risk_per_trade_pct)
+            train_metrics = risk_metrics_from_r(table.rr[train_rows], table.entry[train_rows], risk_per_trade_pct)
+            val_metrics = risk_metrics_from_r(table.rr[val_rows], table.entry[val_rows], risk_per_trade_pct)
             
             # Calculate degradation (IS-OOS spread)
             sharpe_degradation = train_metrics.sharpe_ratio - val_metrics.sharpe_ratio
@@ -357,8 +392,8 @@ class WalkForwardTester:
                 'val_metrics': val_metrics.to_dict(),
                 'sharpe_degradation': sharpe_degradation,
                 'return_degradation': return_degradation,
-                'train_trades': len(train_trades),
-                'val_trades': len(val_trades),
+                'train_trades': len(train_rows),
+                'val_trades': len(val_rows),
             })
         
         # Calculate summary statistics
@@ -383,51 +418,127 @@ class WalkForwardTester:
 class ParameterSensitivityAnalyzer:
     """Analyze how sensitive strategy is to parameter changes."""
     
+    @staticmethod
+    def perturbation_grid(params: Dict,
+                          names: List[str],
+                          steps: int = 2,
+                          rel_step: float = 0.1) -> Dict[str, List[Tuple[int, Any]]]:
+        """
+        Perturbed values around a baseline: {name: [(offset, value), ...]}.
+        
+        Offsets run from -steps to +steps (0 = baseline). Floats move by
+        rel_step of their value per step (rel_step itself when the value is
+        0), ints by max(1, round(value * rel_step)), bools only flip (offset
+        +1). Values never go below 0; *_close_pct / *_exit_pct stay <= 1.
+        """
+        grid = {}
+        for name in names:
+            value = params[name]
+            if isinstance(value, bool):
+                grid[name] = [(0, value), (1, not value)]
+                continue
+            if isinstance(value, int):
+                delta = max(1, round(abs(value) * rel_step))
+            else:
+                delta = abs(value) * rel_step or rel_step
+            points = []
+            for offset in range(-steps, steps + 1):
+                perturbed = max(0, value + offset * delta)
+                if name.endswith(('_close_pct', '_exit_pct')):
+                    perturbed = min(perturbed, 1.0)
+                if not isinstance(value, int):
+                    perturbed = round(float(perturbed), 6)
+                if offset == 0 or perturbed != value:
+                    points.append((offset, perturbed))
+            grid[name] = points
+        return grid
+    
     @staticmethod
     def tornado_analysis(baseline_metrics: Dict, 
-                        sensitivity_results: Dict) -> Dict:
+                        sensitivity_results: Dict,
+                        metric: str = 'sharpe_ratio',
+                        higher_is_better: bool = True) -> Dict:
         """
         Create tornado chart data: impact of each parameter on performance.
         
         Args:
             baseline_metrics: Baseline performance metrics
             sensitivity_results: Dict of {param_name: [(param_value, metrics), ...]}
+                (metrics None = invalid combination, skipped)
+            metric: Metric the impacts are measured on
+            higher_is_better: False for metrics like drawdown
         
         Returns:
             Tornado chart data sorted by impact
         """
-        baseline_sharpe = baseline_metrics.get('sharpe_ratio', 0)
+        baseline_value = baseline_metrics.get(metric, 0)
         baseline_return = baseline_metrics.get('total_return', 0)
+        sign = 1 if higher_is_better else -1
         
         parameter_impacts = []
         
         for param_name, results in sensitivity_results.items():
             impacts = []
             for param_value, metrics in results:
-                impact = metrics.get('sharpe_ratio', 0) - baseline_sharpe
+                if metrics is None:
+                    continue
                 impacts.append({
                     'param_value': param_value,
-                    'sharpe_impact': impact,
+                    'impact': metrics.get(metric, 0) - baseline_value,
                     'return_impact': metrics.get('total_return', 0) - baseline_return,
                 })
             
             if impacts:
-                best = max(impacts, key=lambda x: x['sharpe_impact'])
-                worst = min(impacts, key=lambda x: x['sharpe_impact'])
+                best = max(impacts, key=lambda x: sign * x['impact'])
+                worst = min(impacts, key=lambda x: sign * x['impact'])
                 
                 parameter_impacts.append({
                     'parameter': param_name,
+                    'metric': metric,
                     'best_value': best['param_value'],
-                    'best_impact': best['sharpe_impact'],
+                    'best_impact': best['impact'],
                     'worst_value': worst['param_value'],
-                    'worst_impact': worst['sharpe_impact'],
-                    'range': best['sharpe_impact'] - worst['sharpe_impact'],
+                    'worst_impact': worst['impact'],
+                    'range': abs(best['impact'] - worst['impact']),
                 })
         
         # Sort by impact range (descending)
         parameter_impacts.sort(key=lambda x: x['range'], reverse=True)
         
         return parameter_impacts
+    
+    @staticmethod
+    def heatmap(sensitivity_results: Dict, metrics: List[str]) -> Dict:
+        """
+        Parameter x offset matrices per metric from perturbation_grid results.
+        
+        Args:
+            sensitivity_results: Dict of {param_name: [(offset, param_value, metrics), ...]}
+            metrics: Metric names to tabulate
+        
+        Returns:
+            {'parameters', 'offsets', 'param_values': rows, metric: rows} with
+            None where a point was not run or was invalid
+        """
+        offsets = sorted({offset for points in sensitivity_results.values() for offset, _, _ in points})
+        column = {offset: i for i, offset in enumerate(offsets)}
+        names = list(sensitivity_results)
+        table = {'parameters': names, 'offsets': offsets, 'param_values': []}
+        for metric in metrics:
+            table[metric] = []
+        
+        for name in names:
+            values_row = [None] * len(offsets)
+            metric_rows = {metric: [None] * len(offsets) for metric in metrics}
+            for offset, value, point_metrics in sensitivity_results[name]:
+                values_row[column[offset]] = value
+                if point_metrics is not None:
+                    for metric in metrics:
+                        metric_rows[metric][column[offset]] = point_metrics.get(metric)
+            table['param_values'].append(values_row)
+            for metric in metrics:
+                table[metric].append(metric_rows[metric])
+        return table
 
 
 # ============================================================================
@@ -519,8 +630,10 @@ if __name__ == "__main__":
     print("Professional Quant Suite Loaded")
     print("Available Classes:")
     print("  - RiskMetrics: Professional risk calculation")
+    print("  - TradeTable: Columnar trade list (vectorized metrics, searchsorted windows)")
     print("  - WalkForwardTester: Rolling/anchored window validation")
-    print("  - ParameterSensitivityAnalyzer: Parameter sensitivity analysis")
+    print("  - ParameterSensitivityAnalyzer: Perturbation grids, tornado and heat-map data")
     print("\nAvailable Functions:")
     print("  - calculate_risk_metrics()")
+    print("  - risk_metrics_from_r()")
     print("  - generate_professional_report()")
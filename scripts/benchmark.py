@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the strategy and simulation hot paths.
+
+Every case runs on frozen inputs - fixed symbols and date ranges from
+data/ohlcv, or seeded synthetic H1 data where the repo ships none - in its
+own subprocess, so peak RSS is measured per case and one case cannot warm
+the caches of the next. A case runs once to warm up and is then timed
+`--repeat` times; throughput (bars/s, trades/s, trials/hour, ...) is taken
+from the fastest run.
+
+Results are saved as a JSON baseline; --compare runs the suite again (or
+reads a second file with --against) and flags every throughput drop, time
+increase or peak RSS increase above --threshold. The exit code is 1 when
+anything regressed, so the command can gate a change.
+
+Usage:
+    python scripts/benchmark.py                                # all cases -> ftmo_analysis_output/benchmarks/
+    python scripts/benchmark.py --cases generate_signals simulate_trades --repeat 5
+    python scripts/benchmark.py --save baseline.json
+    python scripts/benchmark.py --compare baseline.json        # flag >10% regressions
+    python scripts/benchmark.py --compare baseline.json --against after.json --threshold 0.2
+    python scripts/benchmark.py --list
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "ftmo_analysis_output" / "benchmarks"
+
+# Frozen inputs. Changing any of these invalidates saved baselines.
+SIGNAL_SYMBOLS = ["EUR_USD", "GBP_JPY", "XAU_USD"]
+SIGNAL_START, SIGNAL_END = datetime(2022, 1, 1), datetime(2023, 12, 31)
+LOAD_SYMBOLS = ["EUR_USD", "GBP_JPY", "XAU_USD", "AUD_CAD", "SPX500_USD"]
+LOAD_TIMEFRAMES = ["MN", "W1", "D1", "H4"]
+LOAD_START, LOAD_END = datetime(2015, 1, 1), datetime(2024, 12, 31)
+BACKTEST_ASSETS = ["EUR_USD", "GBP_USD", "USD_JPY", "GBP_JPY", "AUD_CAD", "XAU_USD"]
+BACKTEST_START, BACKTEST_END = datetime(2023, 1, 1), datetime(2023, 6, 30)
+CONFLUENCE_CALLS = 200
+SYNTHETIC_SYMBOLS = {"EUR_USD": 1.10, "GBP_USD": 1.27, "USD_JPY": 145.0, "XAU_USD": 2000.0}
+SYNTHETIC_START, SYNTHETIC_END = "2023-01-02", "2023-12-29"
+SYNTHETIC_TRADES_PER_SYMBOL = 60
+MONTE_CARLO_TRADES = 400
+MONTE_CARLO_SIMULATIONS = 20_000
+SEED = 42
+
+# Metrics where a higher value is better; everything else (seconds, RSS) should not grow
+THROUGHPUT_SUFFIXES = ("_per_s", "_per_hour")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CASES
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class Case:
+    """A benchmark: setup() builds the frozen inputs and returns the timed callable.
+
+    The callable returns {unit: count} for the work done in one run (bars,
+    trades, calls, ...); each count becomes a `<unit>_per_s` metric.
+    """
+    name: str
+    description: str
+    setup: Callable[[], Callable[[], Dict[str, float]]]
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, description: str):
+    def register(setup):
+        CASES[name] = Case(name, description, setup)
+        return setup
+    return register
+
+
+def _load_real(symbol: str, start: datetime, end: datetime) -> Dict[str, list]:
+    from ftmo_challenge_analyzer import load_ohlcv_data
+    return {tf: load_ohlcv_data(symbol, tf, start, end) for tf in ("D1", "MN", "W1", "H4")}
+
+
+def synthetic_h1(symbol: str, start_price: float, seed: int = SEED) -> pd.DataFrame:
+    """Seeded random-walk H1 bars on weekdays (the repo ships no H1 CSVs)."""
+    rng = np.random.default_rng(seed + sum(map(ord, symbol)))
+    times = pd.date_range(SYNTHETIC_START, f"{SYNTHETIC_END} 23:00", freq="h")
+    times = times[times.dayofweek < 5]
+    vol = 0.0015 if symbol.startswith("XAU") else 0.001
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0, vol, len(times))))
+    open_ = np.concatenate([[start_price], close[:-1]])
+    wick = np.abs(rng.normal(0.0, vol / 2, (2, len(times))))
+    return pd.DataFrame({
+        "time": times,
+        "open": open_,
+        "high": np.maximum(open_, close) * (1 + wick[0]),
+        "low": np.minimum(open_, close) * (1 - wick[1]),
+        "close": close,
+        "volume": rng.integers(100, 1000, len(times)),
+    })
+
+
+def synthetic_setups(frames: Dict[str, pd.DataFrame], per_symbol: int, seed: int = SEED) -> pd.DataFrame:
+    """Seeded trade setups at H1 closes: 0.5% stop, 2R target, random direction."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for symbol, df in frames.items():
+        # Leave the last month so every setup has bars to run on
+        picks = np.sort(rng.choice(len(df) - 24 * 22, per_symbol, replace=False))
+        for i in picks:
+            entry = float(df["close"].iat[i])
+            bullish = bool(rng.integers(0, 2))
+            risk = entry * 0.005
+            sign = 1 if bullish else -1
+            rows.append({
+                "symbol": symbol,
+                "direction": "bullish" if bullish else "bearish",
+                "entry_date": df["time"].iat[i],
+                "entry_price": entry,
+                "stop_loss": entry - sign * risk,
+                "take_profit": entry + sign * 2 * risk,
+                "confluence_score": 5,
+                "quality_factors": 3,
+                "result_r": 0.0,
+            })
+    return pd.DataFrame(rows).sort_values("entry_date").reset_index(drop=True)
+
+
+@case("load_ohlcv_data", "Cold CSV load of frozen symbols x MN/W1/D1/H4 (cache cleared)")
+def _bench_load_ohlcv():
+    import ftmo_challenge_analyzer as analyzer
+
+    def run():
+        analyzer._DATA_CACHE.clear()
+        bars = 0
+        for symbol in LOAD_SYMBOLS:
+            for tf in LOAD_TIMEFRAMES:
+                bars += len(analyzer.load_ohlcv_data(symbol, tf, LOAD_START, LOAD_END))
+        return {"bars": bars, "files": len(LOAD_SYMBOLS) * len(LOAD_TIMEFRAMES)}
+    return run
+
+
+@case("generate_signals", "strategy_core.generate_signals on frozen D1 ranges with MN/W1/H4 context")
+def _bench_generate_signals():
+    from strategy_core import StrategyParams, generate_signals
+    params = StrategyParams()
+    data = {symbol: _load_real(symbol, SIGNAL_START, SIGNAL_END) for symbol in SIGNAL_SYMBOLS}
+
+    def run():
+        bars = signals = 0
+        for symbol, c in data.items():
+            bars += len(c["D1"])
+            signals += len(generate_signals(c["D1"], symbol, params, c["MN"], c["W1"], c["H4"]))
+        return {"bars": bars, "signals": signals}
+    return run
+
+
+@case("compute_confluence", "strategy_core.compute_confluence at fixed D1 bars (HTF sliced in setup)")
+def _bench_compute_confluence():
+    from strategy_core import StrategyParams, compute_confluence
+    params = StrategyParams()
+    c = _load_real("EUR_USD", SIGNAL_START, SIGNAL_END)
+    daily = c["D1"]
+
+    def until(candles, t):
+        return [x for x in candles if x["time"] <= t]
+
+    points = np.linspace(100, len(daily) - 1, CONFLUENCE_CALLS).astype(int)
+    inputs = []
+    for n, i in enumerate(points):
+        t = daily[i]["time"]
+        inputs.append((until(c["MN"], t), until(c["W1"], t), daily[: i + 1], until(c["H4"], t),
+                       "bullish" if n % 2 == 0 else "bearish"))
+
+    def run():
+        for monthly, weekly, d1, h4, direction in inputs:
+            compute_confluence(monthly, weekly, d1, h4, direction, params)
+        return {"calls": len(inputs)}
+    return run
+
+
+@case("simulate_trades", "strategy_core.simulate_trades (signals + trade management) on frozen ranges")
+def _bench_simulate_trades():
+    from strategy_core import StrategyParams, simulate_trades
+    params = StrategyParams()
+    data = {symbol: _load_real(symbol, SIGNAL_START, SIGNAL_END) for symbol in SIGNAL_SYMBOLS}
+
+    def run():
+        bars = trades = 0
+        for symbol, c in data.items():
+            bars += len(c["D1"])
+            trades += len(simulate_trades(c["D1"], symbol, params, c["MN"], c["W1"], c["H4"]))
+        return {"bars": bars, "trades": trades}
+    return run
+
+
+@case("run_full_period_backtest", "One optimizer trial: frozen assets and window, default parameters")
+def _bench_full_period_backtest():
+    import ftmo_challenge_analyzer as analyzer
+    from params.defaults import merge_with_defaults
+    kwargs = analyzer.backtest_kwargs_from_params(merge_with_defaults({}))
+    bars = sum(len(analyzer.load_ohlcv_data(a, "D1", BACKTEST_START, BACKTEST_END)) for a in BACKTEST_ASSETS)
+
+    def run():
+        trades = analyzer.run_full_period_backtest(
+            BACKTEST_START, BACKTEST_END, excluded_assets=[], assets=BACKTEST_ASSETS, **kwargs
+        )
+        return {"bars": bars, "trades": len(trades), "trials": 1}
+    return run
+
+
+@case("h1_simulate_trade", "H1TradeSimulator.simulate_trade over seeded setups on synthetic H1 CSVs")
+def _bench_h1_simulate_trade():
+    from tradr.backtest.h1_trade_simulator import H1TradeSimulator, TradeSetup
+    frames = {symbol: synthetic_h1(symbol, price) for symbol, price in SYNTHETIC_SYMBOLS.items()}
+    h1_tmp = tempfile.TemporaryDirectory(prefix="bench_h1_")
+    h1_dir = Path(h1_tmp.name)
+    for symbol, df in frames.items():
+        df.to_csv(h1_dir / f"{symbol.replace('_', '')}_H1_2023_2023.csv", index=False)
+    setups = [
+        TradeSetup(symbol=row.symbol, direction=row.direction, entry_time=row.entry_date.to_pydatetime(),
+                   entry_price=row.entry_price, stop_loss=row.stop_loss)
+        for row in synthetic_setups(frames, SYNTHETIC_TRADES_PER_SYMBOL).itertuples()
+    ]
+    simulator = H1TradeSimulator(str(h1_dir))
+    for symbol in frames:
+        simulator.load_h1_data(symbol)  # CSV parsing is load_ohlcv_data's job, not this case's
+
+    def run():
+        for setup in setups:
+            simulator.simulate_trade(setup)
+        return {"trades": len(setups)}
+    run.h1_tmp = h1_tmp  # CSVs live as long as the case; removed with it (or at exit)
+    return run
+
+
+@case("main_live_bot_simulate", "MainLiveBotSimulator.simulate on a synthetic H1 panel and seeded setups")
+def _bench_main_live_bot():
+    sys.path.insert(0, str(REPO_ROOT / "scripts"))
+    from simulate_main_live_bot import MainLiveBotSimulator, SimConfig
+    from strategy_core import StrategyParams
+    from tradr.backtest.h1_panel import H1Panel
+    frames = {symbol: synthetic_h1(symbol, price) for symbol, price in SYNTHETIC_SYMBOLS.items()}
+    panel = H1Panel.from_frames(frames)
+    trades_df = synthetic_setups(frames, SYNTHETIC_TRADES_PER_SYMBOL)
+    params = StrategyParams()
+
+    def run():
+        sim = MainLiveBotSimulator(trades_df, panel, params, SimConfig())
+        sim.simulate()
+        return {"bars": len(sim.timeline) * len(frames), "trades": len(sim.closed_trades)}
+    return run
+
+
+def _monte_carlo_case(resampling: str):
+    def setup():
+        from ftmo_challenge_analyzer import MonteCarloSimulator
+        from strategy_core import Trade
+        rng = np.random.default_rng(SEED)
+        days = pd.bdate_range("2023-01-02", periods=MONTE_CARLO_TRADES // 2)
+        trades = [
+            Trade(symbol="EUR_USD", direction="bullish", entry_date=days[i // 2], exit_date=days[i // 2],
+                  entry_price=1.0, exit_price=1.0, stop_loss=0.99,
+                  rr=float(rng.choice([-1.0, 0.5, 2.0], p=[0.45, 0.2, 0.35])))
+            for i in range(MONTE_CARLO_TRADES)
+        ]
+
+        def run():
+            MonteCarloSimulator(trades, MONTE_CARLO_SIMULATIONS, resampling=resampling, seed=SEED).run_simulation()
+            return {"sims": MONTE_CARLO_SIMULATIONS}
+        return run
+    return setup
+
+
+for _mode in ("iid", "block", "daily"):
+    case(f"monte_carlo_{_mode}", f"MonteCarloSimulator ({_mode} resampling) over seeded synthetic R values")(
+        _monte_carlo_case(_mode)
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# RUNNER
+# ═══════════════════════════════════════════════════════════════════════════
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process (None where `resource` is unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(name: str, repeat: int) -> Dict:
+    """Run one case in this process (the child side of measure())."""
+    run = CASES[name].setup()
+    run()  # Warm-up: imports, lazy caches, allocator
+    times, counts = [], {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        counts = run()
+        times.append(time.perf_counter() - start)
+
+    best = min(times)
+    metrics = {f"{unit}_per_s": round(count / best, 2) for unit, count in counts.items() if unit != "trials"}
+    if "trials" in counts:
+        metrics["trials_per_hour"] = round(counts["trials"] * 3600 / best, 1)
+    return {
+        "seconds": round(best, 4),
+        "median_seconds": round(statistics.median(times), 4),
+        "runs": len(times),
+        "counts": counts,
+        "metrics": metrics,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def measure(name: str, repeat: int, verbose: bool = False) -> Dict:
+    """Run a case in a fresh interpreter and return its result."""
+    with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+        result_file = Path(tmp) / "result.json"
+        cmd = [sys.executable, str(Path(__file__).resolve()), "--run-case", name,
+               "--repeat", str(repeat), "--result-file", str(result_file)]
+        out = None if verbose else subprocess.DEVNULL
+        proc = subprocess.run(cmd, cwd=str(REPO_ROOT), stdout=out, stderr=None if verbose else subprocess.PIPE,
+                              text=True)
+        if proc.returncode != 0 or not result_file.exists():
+            tail = (proc.stderr or "").strip().splitlines()[-5:]
+            return {"error": f"exit code {proc.returncode}", "stderr": tail}
+        return json.loads(result_file.read_text())
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=str(REPO_ROOT),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(names: List[str], repeat: int, verbose: bool = False) -> Dict:
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "cases": {},
+    }
+    for name in names:
+        print(f"⏱️  {name} ...", end=" ", flush=True)
+        result = report["cases"][name] = measure(name, repeat, verbose)
+        if "error" in result:
+            print(f"❌ {result['error']}")
+            for line in result.get("stderr", []):
+                print(f"     {line}")
+            continue
+        rates = ", ".join(f"{v:,.1f} {k.replace('_per_', '/')}" for k, v in result["metrics"].items())
+        rss = f", peak RSS {result['peak_rss_mb']:.0f} MB" if result["peak_rss_mb"] is not None else ""
+        print(f"{result['seconds']:.3f}s ({rates}{rss})")
+    return report
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# COMPARISON
+# ═══════════════════════════════════════════════════════════════════════════
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Print a comparison table; returns the regressions ("case: metric ...")."""
+    regressions = []
+    print(f"\n{'='*88}")
+    print(f"BENCHMARK COMPARISON (threshold {threshold:.0%})")
+    print(f"  Baseline: {baseline.get('created')} @ {baseline.get('commit')}")
+    print(f"  Current:  {current.get('created')} @ {current.get('commit')}")
+    print(f"{'='*88}")
+    print(f"{'Case':<26} {'Metric':<22} {'Baseline':>14} {'Current':>14} {'Change':>9}")
+    print("-" * 88)
+
+    for name, cur in current["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None or "error" in base:
+            print(f"{name:<26} (no baseline)")
+            continue
+        if "error" in cur:
+            print(f"{name:<26} ❌ failed: {cur['error']}")
+            regressions.append(f"{name}: failed ({cur['error']})")
+            continue
+
+        rows = [(k, base["metrics"].get(k), v) for k, v in cur["metrics"].items()]
+        rows.append(("seconds", base.get("seconds"), cur.get("seconds")))
+        rows.append(("peak_rss_mb", base.get("peak_rss_mb"), cur.get("peak_rss_mb")))
+        for metric, old, new in rows:
+            if not old or new is None:
+                continue
+            change = new / old - 1
+            higher_is_better = metric.endswith(THROUGHPUT_SUFFIXES)
+            regressed = (-change if higher_is_better else change) > threshold
+            flag = " ⚠️" if regressed else ""
+            print(f"{name:<26} {metric:<22} {old:>14,.2f} {new:>14,.2f} {change:>+8.1%}{flag}")
+            if regressed:
+                regressions.append(f"{name}: {metric} {old:,.2f} -> {new:,.2f} ({change:+.1%})")
+
+    print("-" * 88)
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} regression(s) above {threshold:.0%}:")
+        for line in regressions:
+            print(f"   - {line}")
+    else:
+        print(f"\n✅ No regressions above {threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the strategy and simulation hot paths")
+    parser.add_argument("--cases", nargs="+", default=None, help="Cases to run (default: all, see --list)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (after one warm-up)")
+    parser.add_argument("--save", default=None, help="Write results here (default: ftmo_analysis_output/benchmarks/)")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to compare against")
+    parser.add_argument("--against", default=None, help="With --compare: compare this saved run instead of running")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Regression threshold (0.10 = 10%%)")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of the benchmarked code")
+    parser.add_argument("--run-case", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        result = run_case(args.run_case, max(1, args.repeat))
+        Path(args.result_file).write_text(json.dumps(result))
+        return 0
+
+    if args.list:
+        for c in CASES.values():
+            print(f"  {c.name:<26} {c.description}")
+        return 0
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+
+    if args.against:
+        if baseline is None:
+            parser.error("--against needs --compare")
+        current = json.loads(Path(args.against).read_text())
+    else:
+        names = args.cases or (list(baseline["cases"]) if baseline else list(CASES))
+        unknown = [n for n in names if n not in CASES]
+        if unknown:
+            parser.error(f"unknown case(s): {', '.join(unknown)} (see --list)")
+        print(f"🏁 Benchmarking {len(names)} case(s), {args.repeat} timed run(s) each\n")
+        current = run_suite(names, max(1, args.repeat), args.verbose)
+
+        out = Path(args.save) if args.save else DEFAULT_OUTPUT_DIR / f"{datetime.now():%Y%m%d_%H%M%S}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(current, indent=2))
+        print(f"\n💾 Results saved to {out}")
+
+    if baseline is not None:
+        return 1 if compare(baseline, current, args.threshold) else 0
+    return 1 if any("error" in r for r in current["cases"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,8 @@ import optuna
 import json
 from pathlib import Path
 
+from tradr.utils.artifact_store import get_artifact_store
+
 OPTUNA_DB_PATH = "sqlite:///regime_adaptive_v2_clean.db"
 OPTUNA_STUDY_NAME = "regime_adaptive_v2_clean"
 
@@ -26,12 +28,14 @@ def main():
         print(f"Error loading study: {e}")
         return
     
-    completed = [t for t in study.trials if t.state == optuna.trial.TrialState.COMPLETE]
+    # No deepcopy: the trials are only read
+    trials = study.get_trials(deepcopy=False)
+    completed = [t for t in trials if t.state == optuna.trial.TrialState.COMPLETE]
     
     print(f"\n{'='*60}")
     print("OPTUNA STUDY STATUS")
     print(f"{'='*60}")
-    print(f"Total Trials: {len(study.trials)}")
+    print(f"Total Trials: {len(trials)}")
     print(f"Completed Trials: {len(completed)}")
     
     if completed:
@@ -52,6 +56,12 @@ def main():
             print(f"   Win Rate: {trial.user_attrs.get('win_rate', 'N/A')}%")
             print(f"   Total R: {trial.user_attrs.get('total_r', 'N/A')}")
             print(f"   Max DD: {trial.user_attrs.get('max_drawdown_pct', 'N/A')}%")
+            # Full compliance report from the artifact store (inline on older trials)
+            artifact = get_artifact_store().get(trial.user_attrs.get('artifact')) or trial.user_attrs
+            compliance = artifact.get('compliance_report')
+            if compliance:
+                status = "PASS" if compliance.get('challenge_passed') else "FAIL"
+                print(f"   FTMO DD: {compliance.get('max_ftmo_dd_pct', 0):.2f}% | Challenge: {status}")
             print("   Parameters:")
             for k, v in sorted(trial.params.items()):
                 if isinstance(v, float):
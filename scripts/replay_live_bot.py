@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Replay historical data through main_live_bot.LiveTradingBot offline.
+
+The real bot (symbol mapping, daily scan, entry/spread queues, pending order
+sync, partial TPs, DD protection) runs unmodified against the MT5 emulator
+(tradr.mt5.emulator): the simulated clock is stepped forward and every
+scheduler job that falls due is run in this thread, so a week of live
+trading replays in minutes on any OS.
+
+Bot state (bot_state.db, logs/, ...) is written to a scratch working
+directory, never to the repo root.
+
+Usage:
+    python scripts/replay_live_bot.py --start 2024-01-08 --days 5
+    python scripts/replay_live_bot.py --start 2024-03-04 --days 10 --step 300 --first-scan
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay history through the live bot (MT5 emulator)")
+    parser.add_argument("--start", default="2024-01-08", help="Simulated start (UTC, ISO date/time)")
+    parser.add_argument("--days", type=float, default=5, help="Simulated days to replay")
+    parser.add_argument("--step", type=float, default=60, help="Clock step in simulated seconds")
+    parser.add_argument("--balance", type=float, default=60_000, help="Starting balance")
+    parser.add_argument("--data-dir", default=str(REPO_ROOT / "data" / "ohlcv"), help="MN/W1/D1/H4 CSVs")
+    parser.add_argument("--h1-dir", default=None, help="H1 CSVs for the fill engine (default: data dir)")
+    parser.add_argument("--workdir", default="replay_run", help="Scratch directory for bot state files")
+    parser.add_argument("--first-scan", action="store_true", help="Scan immediately at the start time")
+    parser.add_argument("--output", default=None, help="Write the summary JSON here")
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir).resolve()
+    h1_dir = Path(args.h1_dir).resolve() if args.h1_dir else None
+    workdir = Path(args.workdir).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    os.chdir(workdir)
+    os.environ["MT5_BACKEND"] = "emulator"
+
+    from tradr.mt5.emulator import MT5Emulator, install
+
+    start = datetime.fromisoformat(args.start)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    emu = install(MT5Emulator(start=start, data_dir=str(data_dir), h1_dir=str(h1_dir) if h1_dir else None,
+                              balance=args.balance))
+
+    import main_live_bot
+    main_live_bot.set_clock(emu.time)
+
+    print("=" * 70)
+    print("🔁 LIVE BOT REPLAY (MT5 emulator)")
+    print("=" * 70)
+    print(f"   Start:   {start:%Y-%m-%d %H:%M UTC}")
+    print(f"   Days:    {args.days:g}  (step {args.step:g}s)")
+    print(f"   Workdir: {workdir}")
+
+    bot = main_live_bot.LiveTradingBot(immediate_scan=args.first_scan)
+    bot.candle_cache.persist = False
+    if not bot.connect():
+        print("❌ Emulator connect failed")
+        return 1
+
+    if args.first_scan:
+        bot.scan_all_symbols()
+    bot.scheduler = bot._build_scheduler()
+
+    # Wall-clock job latency (the scheduler's own stats are in simulated time)
+    wall = defaultdict(list)
+    for name, job in bot.scheduler.jobs.items():
+        def timed(fn=job.fn, name=name):
+            t0 = time.perf_counter()
+            try:
+                fn()
+            finally:
+                wall[name].append(time.perf_counter() - t0)
+        job.fn = timed
+
+    end = start.timestamp() + args.days * 86400
+    steps = jobs_run = 0
+    t0 = time.perf_counter()
+    while emu.time() < end and main_live_bot.running:
+        emu.advance(args.step)
+        jobs_run += bot.scheduler.run_due()
+        steps += 1
+        if steps % max(1, int(86400 / args.step)) == 0:
+            acct = emu.account_info()
+            print(f"   {emu.now():%Y-%m-%d %H:%M}  balance ${acct.balance:,.2f}  equity ${acct.equity:,.2f}  "
+                  f"positions {len(emu.positions_get())}  orders {len(emu.orders_get())}")
+    elapsed = time.perf_counter() - t0
+
+    acct = emu.account_info()
+    sim_seconds = emu.time() - start.timestamp()
+    summary = {
+        "start": start.isoformat(),
+        "end": emu.now().isoformat(),
+        "sim_days": round(sim_seconds / 86400, 3),
+        "wall_seconds": round(elapsed, 2),
+        "speedup": round(sim_seconds / elapsed, 1) if elapsed > 0 else None,
+        "steps": steps,
+        "jobs_run": jobs_run,
+        "balance": round(acct.balance, 2),
+        "equity": round(acct.equity, 2),
+        "closed_deals": len(emu.closed_deals),
+        "realized_pnl": round(sum(d["pnl"] for d in emu.closed_deals), 2),
+        "open_positions": len(emu.positions_get()),
+        "pending_orders": len(emu.orders_get()),
+        "emulator": dict(emu.stats),
+        "candle_cache": dict(bot.candle_cache.stats),
+        "jobs": {
+            name: {
+                "runs": len(samples),
+                "mean_ms": round(1000 * sum(samples) / len(samples), 2),
+                "max_ms": round(1000 * max(samples), 2),
+            }
+            for name, samples in sorted(wall.items())
+        },
+    }
+
+    print("\n" + "=" * 70)
+    print("📊 REPLAY SUMMARY")
+    print("=" * 70)
+    print(f"   Simulated:  {summary['sim_days']} days in {summary['wall_seconds']}s ({summary['speedup']}x)")
+    print(f"   Jobs run:   {jobs_run} over {steps} clock steps")
+    print(f"   Balance:    ${summary['balance']:,.2f}  (equity ${summary['equity']:,.2f})")
+    print(f"   Deals:      {summary['closed_deals']} closed, PnL ${summary['realized_pnl']:,.2f}")
+    print(f"   Open:       {summary['open_positions']} positions, {summary['pending_orders']} pending orders")
+    print("\n   Job latency (wall clock):")
+    for name, m in summary["jobs"].items():
+        print(f"     {name:<16} {m['runs']:>6} runs  mean {m['mean_ms']:>8.2f}ms  max {m['max_ms']:>9.2f}ms")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(summary, indent=2))
+        print(f"\n✅ Summary saved to {args.output}")
+
+    bot.disconnect()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
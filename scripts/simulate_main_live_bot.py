@@ -30,10 +30,9 @@ import sys
 import json
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, field
 from collections import defaultdict
-from concurrent.futures import ProcessPoolExecutor, as_completed
 import multiprocessing as mp
 import pandas as pd
 import numpy as np
@@ -44,6 +43,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from params.params_loader import load_strategy_params
 from strategy_core import StrategyParams
+from tradr.backtest.h1_panel import H1Panel
+from tradr.backtest.position_book import PositionBook
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -312,7 +313,7 @@ class MainLiveBotSimulator:
     def __init__(
         self,
         trades_df: pd.DataFrame,
-        h1_data: Dict[str, pd.DataFrame],
+        h1_data: Union[Dict[str, pd.DataFrame], H1Panel],
         params: StrategyParams,
         config: SimConfig = None,
     ):
@@ -336,6 +337,7 @@ class MainLiveBotSimulator:
         self.awaiting_entry: Dict[str, Tuple[Signal, datetime]] = {}  # symbol -> (signal, created_at)
         self.pending_orders: Dict[str, PendingOrder] = {}
         self.open_positions: Dict[str, Position] = {}
+        self.book = PositionBook()  # array mirror of open_positions for mark-to-market
         
         # Tracking
         self.closed_trades: List[Position] = []
@@ -371,39 +373,27 @@ class MainLiveBotSimulator:
             })
     
     def _build_timeline(self):
-        """Build unified H1 timeline across all symbols."""
-        all_times = set()
-        
-        for symbol, df in self.h1_data.items():
-            df['time'] = pd.to_datetime(df['time'])
-            all_times.update(df['time'].tolist())
+        """Build unified H1 timeline across all symbols on a columnar H1Panel."""
+        if isinstance(self.h1_data, H1Panel):
+            self.panel = self.h1_data
+        else:
+            self.panel = H1Panel.from_frames(self.h1_data)
         
-        self.timeline = sorted(all_times)
+        self.timeline = self.panel.timestamps()
         print(f"  Timeline: {len(self.timeline)} H1 bars")
         
-        # Index H1 data for fast lookup using dict of dicts
-        self.h1_indexed: Dict[str, Dict[datetime, dict]] = {}
-        for symbol, df in self.h1_data.items():
-            norm = normalize_symbol(symbol)
-            # Pre-convert to dict for O(1) lookup
-            self.h1_indexed[norm] = {}
-            for _, row in df.iterrows():
-                self.h1_indexed[norm][row['time']] = {
-                    'High': row.get('High', row.get('high')),
-                    'Low': row.get('Low', row.get('low')),
-                    'Close': row.get('Close', row.get('close')),
-                    'Open': row.get('Open', row.get('open')),
-                }
+        # Hour index for O(1) bar lookup into the panel arrays
+        self._time_index: Dict[datetime, int] = {t: i for i, t in enumerate(self.timeline)}
         
         # Pre-compute signal dates for O(1) lookup
         self.signal_dates = set(self.trades_by_date.keys())
     
     def get_h1_bar(self, symbol: str, time: datetime) -> Optional[dict]:
         """Get H1 bar for symbol at time."""
-        norm = normalize_symbol(symbol)
-        if norm not in self.h1_indexed:
+        t = self._time_index.get(time)
+        if t is None:
             return None
-        return self.h1_indexed[norm].get(time)
+        return self.panel.bar(symbol, t)
     
     def get_current_price(self, symbol: str, time: datetime, direction: str) -> Optional[float]:
         """Get current price (bid for sell, ask for buy approximation)."""
@@ -414,32 +404,11 @@ class MainLiveBotSimulator:
         return bar.get('Close', bar.get('close'))
     
     def calculate_equity(self, current_time: datetime) -> float:
-        """Calculate current equity including floating PnL."""
-        equity = self.balance
-        
-        for pos in self.open_positions.values():
-            bar = self.get_h1_bar(pos.signal.symbol, current_time)
-            if not bar:
-                continue
-            
-            current_price = bar.get('Close', bar.get('close'))
-            if current_price is None:
-                continue
-            
-            # Calculate floating PnL
-            if pos.signal.direction == 'bullish':
-                price_diff = current_price - pos.fill_price
-            else:
-                price_diff = pos.fill_price - current_price
-            
-            # PnL in R
-            r_pnl = price_diff / pos.signal.risk if pos.signal.risk > 0 else 0
-            
-            # PnL in USD (simplified - use risk_usd as base)
-            usd_pnl = r_pnl * pos.risk_usd * pos.remaining_pct
-            equity += usd_pnl
-        
-        return equity
+        """Calculate current equity including floating PnL (one dot product per bar)."""
+        t = self._time_index.get(current_time)
+        if t is None:
+            return self.balance
+        return self.balance + self.book.floating_pnl(self.panel.close[:, t])
     
     def check_ddd(self, equity: float) -> Tuple[float, str]:
         """Check Daily DrawDown. Returns (dd_pct, action)."""
@@ -516,6 +485,7 @@ class MainLiveBotSimulator:
         self.closed_trades.append(pos)
         if pos.signal.symbol in self.open_positions:
             del self.open_positions[pos.signal.symbol]
+            self.book.remove(pos.signal.symbol)
     
     def process_new_signals(self, current_time: datetime):
         """Process new signals from daily scan (at 00:00-01:00 bar)."""
@@ -708,6 +678,14 @@ class MainLiveBotSimulator:
         )
         
         self.open_positions[signal.symbol] = position
+        self.book.add(
+            signal.symbol,
+            col=self.panel.column(signal.symbol),
+            entry_price=fill_price,
+            risk=signal.risk,
+            risk_usd=risk_usd,
+            direction=signal.direction,
+        )
     
     def manage_positions(self, current_time: datetime):
         """Manage open positions - check SL, TP, trailing."""
@@ -771,6 +749,7 @@ class MainLiveBotSimulator:
                 self.balance += partial_profit
                 
                 pos.remaining_pct -= close_pct
+                self.book.update(signal.symbol, remaining_pct=pos.remaining_pct)
                 
                 # Move SL to breakeven
                 pos.trailing_sl = pos.fill_price
@@ -790,6 +769,7 @@ class MainLiveBotSimulator:
                 self.balance += partial_profit
                 
                 pos.remaining_pct -= close_pct
+                self.book.update(signal.symbol, remaining_pct=pos.remaining_pct)
                 
                 # Trail SL to TP1 + 0.5R
                 if signal.direction == 'bullish':
@@ -1005,35 +985,6 @@ def load_trades(path: str) -> pd.DataFrame:
     return df
 
 
-def _load_single_symbol(args):
-    """Load H1 data for a single symbol (for parallel processing)."""
-    symbol, data_path = args
-    norm = normalize_symbol(symbol)
-    filepath = Path(data_path) / f"{norm}_H1_2014_2025.csv"
-    if filepath.exists():
-        df = pd.read_csv(filepath)
-        df['time'] = pd.to_datetime(df['time'])
-        return symbol, df
-    return symbol, None
-
-
-def load_h1_data(data_dir: str, symbols: List[str], n_jobs: int = 4) -> Dict[str, pd.DataFrame]:
-    """Load H1 data for symbols in parallel."""
-    h1_data = {}
-    
-    args_list = [(s, data_dir) for s in symbols]
-    
-    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
-        futures = {executor.submit(_load_single_symbol, args): args[0] for args in args_list}
-        for future in as_completed(futures):
-            symbol, df = future.result()
-            if df is not None:
-                h1_data[symbol] = df
-    
-    print(f"✓ Loaded H1 data for {len(h1_data)}/{len(symbols)} symbols (parallel)")
-    return h1_data
-
-
 # ═══════════════════════════════════════════════════════════════════════════
 # MAIN
 # ═══════════════════════════════════════════════════════════════════════════
@@ -1056,10 +1007,11 @@ def main():
     symbols = trades_df['symbol'].unique().tolist()
     print(f"✓ Symbols in trades: {len(symbols)}")
     
-    # Load H1 data
-    h1_data = load_h1_data(args.h1_dir, symbols)
+    # Load H1 data (columnar panel, cached after the first build)
+    h1_data = H1Panel.load_or_build(symbols, data_dir=args.h1_dir)
+    print(f"✓ Loaded H1 panel for {len(h1_data.symbols)}/{len(symbols)} symbols")
     
-    if not h1_data:
+    if not h1_data.symbols:
         print("❌ No H1 data found!")
         return
     
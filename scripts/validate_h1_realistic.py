@@ -20,7 +20,6 @@ from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
-from collections import defaultdict
 import argparse
 import sys
 import warnings
@@ -30,6 +29,9 @@ warnings.filterwarnings('ignore')
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from tradr.backtest.h1_panel import H1Panel
+from tradr.backtest.position_book import PositionBook
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONTRACT SPECS (from tradr/risk/position_sizing.py)
@@ -440,9 +442,11 @@ class RealisticH1Simulator:
         # Scaling config
         self.scaling = scaling_config or ScalingConfig()
         
-        # H1 data cache
-        self._h1_cache: Dict[str, pd.DataFrame] = {}
-        self._h1_timeline: Dict[datetime, Dict[str, dict]] = {}
+        # H1 price panel (built in build_timeline)
+        self.panel: Optional[H1Panel] = None
+        
+        # Array mirror of state.open_trades for vectorized mark-to-market
+        self.book = PositionBook()
         
         # State
         self.state = SimulationState(
@@ -458,71 +462,19 @@ class RealisticH1Simulator:
         self.daily_stats: List[dict] = []
         self.safety_events: List[dict] = []
     
-    def load_h1_data(self, symbol: str) -> Optional[pd.DataFrame]:
-        """Load H1 data for symbol (cached)."""
-        if symbol in self._h1_cache:
-            return self._h1_cache[symbol]
-        
-        # Try different file patterns
-        normalized = normalize_symbol(symbol)
-        patterns = [
-            f"{symbol}_H1_*.csv",
-            f"{symbol}_H1.csv",
-            f"{normalized}_H1_*.csv",
-            f"*{normalized}*H1*.csv",
-        ]
-        
-        for pattern in patterns:
-            files = list(self.h1_data_dir.glob(pattern))
-            if files:
-                df = pd.read_csv(files[0])
-                # Find timestamp column
-                for col in ['timestamp', 'time', 'datetime', 'date', 'Time']:
-                    if col in df.columns:
-                        df['timestamp'] = pd.to_datetime(df[col])
-                        break
-                df = df.sort_values('timestamp').reset_index(drop=True)
-                df.columns = df.columns.str.lower()
-                self._h1_cache[symbol] = df
-                return df
-        
-        return None
-    
     def build_timeline(self, symbols: set, start_date: datetime, end_date: datetime):
-        """Build unified H1 timeline for all symbols."""
-        self._h1_timeline = defaultdict(dict)
-        
+        """Build unified H1 timeline for all symbols (columnar H1Panel)."""
         # Ensure start/end are timezone-naive for comparison
         if hasattr(start_date, 'tzinfo') and start_date.tzinfo is not None:
             start_date = start_date.replace(tzinfo=None)
         if hasattr(end_date, 'tzinfo') and end_date.tzinfo is not None:
             end_date = end_date.replace(tzinfo=None)
         
-        loaded_count = 0
-        for symbol in symbols:
-            df = self.load_h1_data(symbol)
-            if df is None:
-                continue
-            
-            loaded_count += 1
-            # Ensure df timestamp is timezone-naive
-            if df['timestamp'].dt.tz is not None:
-                df['timestamp'] = df['timestamp'].dt.tz_localize(None)
-            
-            mask = (df['timestamp'] >= start_date) & (df['timestamp'] <= end_date)
-            df_filtered = df[mask]
-            
-            for _, row in df_filtered.iterrows():
-                ts = row['timestamp']
-                self._h1_timeline[ts][symbol] = {
-                    'open': row['open'],
-                    'high': row['high'],
-                    'low': row['low'],
-                    'close': row['close'],
-                }
-        
-        print(f"  Loaded H1 data for {loaded_count}/{len(symbols)} symbols")
-        print(f"  Timeline: {len(self._h1_timeline)} unique hours")
+        panel = H1Panel.load_or_build(sorted(symbols), data_dir=str(self.h1_data_dir))
+        self.panel = panel.slice(start_date, end_date)
+        
+        print(f"  Loaded H1 data for {len(panel.symbols)}/{len(symbols)} symbols")
+        print(f"  Timeline: {len(self.panel)} unique hours")
     
     def _start_new_day(self, date_str: str):
         """Reset daily tracking at start of new day."""
@@ -546,29 +498,10 @@ class RealisticH1Simulator:
         # This prevents permanent halt after consecutive_loss_halt is reached
         self.state.loss_streak = 0
     
-    def _calculate_floating_pnl(self, bar_data: dict) -> float:
-        """Calculate total floating P&L for all open trades."""
-        floating_pnl = 0.0
-        
-        for trade in self.state.open_trades.values():
-            if trade.symbol not in bar_data:
-                continue
-            
-            bar = bar_data[trade.symbol]
-            current_price = bar['close']
-            
-            # Calculate unrealized P&L
-            if trade.direction == 'bullish':
-                price_diff = current_price - trade.entry_price
-            else:
-                price_diff = trade.entry_price - current_price
-            
-            # P&L = (price_diff / risk) * risk_usd * remaining_pct
-            if trade.risk > 0:
-                current_r = price_diff / trade.risk
-                floating_pnl += current_r * trade.risk_usd * trade.remaining_pct
-        
-        return floating_pnl
+    def _calculate_floating_pnl(self, t: int) -> float:
+        """Calculate total floating P&L for all open trades at panel hour t."""
+        # P&L = (price_diff / risk) * risk_usd * remaining_pct, summed as one dot product
+        return self.book.floating_pnl(self.panel.close[:, t])
     
     def _check_safety(self, timestamp: datetime) -> Tuple[bool, str]:
         """
@@ -612,6 +545,7 @@ class RealisticH1Simulator:
             self.state.safety_close_pnl += pnl
         
         self.state.open_trades.clear()
+        self.book.clear()
         self.state.trading_halted_today = True  # NO NEW TRADES until next day
         # Reset daily HWM to current balance to prevent repeated triggers
         self.state.daily_hwm = self.state.balance
@@ -873,12 +807,12 @@ class RealisticH1Simulator:
         print(f"\n  Building H1 timeline for {len(symbols)} symbols...")
         self.build_timeline(symbols, min_date, max_date)
         
-        if not self._h1_timeline:
+        if not len(self.panel):
             print("  ERROR: No H1 data loaded!")
             return self._get_results()
         
-        # Sort timestamps
-        all_timestamps = sorted(self._h1_timeline.keys())
+        # Panel axis is already sorted
+        all_timestamps = self.panel.timestamps()
         print(f"\n  Simulating {len(all_timestamps)} H1 bars...")
         
         # Simulation loop
@@ -890,7 +824,7 @@ class RealisticH1Simulator:
             if halted:
                 break
             
-            bar_data = self._h1_timeline[timestamp]
+            bar_data = self.panel.bars_at(i)
             
             # Check new day (UTC+3)
             server_time = timestamp.replace(tzinfo=timezone.utc)
@@ -905,6 +839,15 @@ class RealisticH1Simulator:
                 trade = self._open_trade(trade_data, timestamp)
                 if trade:
                     self.state.open_trades[trade.trade_id] = trade
+                    self.book.add(
+                        trade.trade_id,
+                        col=self.panel.column(trade.symbol),
+                        entry_price=trade.entry_price,
+                        risk=trade.risk,
+                        risk_usd=trade.risk_usd,
+                        direction=trade.direction,
+                        remaining_pct=trade.remaining_pct,
+                    )
                 pending_idx += 1
             
             max_concurrent = max(max_concurrent, len(self.state.open_trades))
@@ -916,8 +859,12 @@ class RealisticH1Simulator:
                     continue
                 
                 bar = bar_data[trade.symbol]
+                remaining_before = trade.remaining_pct
                 should_close = self._process_open_trade(trade, bar, timestamp)
                 
+                if not should_close and trade.remaining_pct != remaining_before:
+                    self.book.update(trade_id, remaining_pct=trade.remaining_pct)
+                
                 if should_close:
                     exit_price = bar['close']
                     if trade.tp3_hit:
@@ -935,9 +882,10 @@ class RealisticH1Simulator:
             # Remove closed trades
             for tid in closed_this_bar:
                 del self.state.open_trades[tid]
+                self.book.remove(tid)
             
             # Update equity
-            floating_pnl = self._calculate_floating_pnl(bar_data)
+            floating_pnl = self._calculate_floating_pnl(i)
             self.state.equity = self.state.balance + floating_pnl
             
             # Check safety
@@ -960,7 +908,7 @@ class RealisticH1Simulator:
         
         # Close remaining trades at timeout
         if self.state.open_trades:
-            last_bar = self._h1_timeline.get(all_timestamps[-1], {})
+            last_bar = self.panel.bars_at(len(all_timestamps) - 1)
             for trade_id, trade in list(self.state.open_trades.items()):
                 if trade.symbol in last_bar:
                     exit_price = last_bar[trade.symbol]['close']
@@ -968,6 +916,7 @@ class RealisticH1Simulator:
                     exit_price = trade.entry_price
                 self._close_trade(trade, exit_price, 'TIMEOUT', all_timestamps[-1])
             self.state.open_trades.clear()
+            self.book.clear()
         
         # Final daily stat
         if self.state.current_day:
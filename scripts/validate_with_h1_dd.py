@@ -27,12 +27,14 @@ from pathlib import Path
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple, Set
 from datetime import datetime, timedelta, date, timezone
-from collections import defaultdict
 import argparse
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from tradr.backtest.h1_panel import H1Panel
+from tradr.backtest.position_book import PositionBook
+
 # ═══════════════════════════════════════════════════════════════════════════
 # TIMEZONE CONFIGURATION - 5ers/MT5 uses UTC+3 (EET/EEST)
 # ═══════════════════════════════════════════════════════════════════════════
@@ -190,11 +192,8 @@ class FullH1Simulator:
             'tp1': 0.35, 'tp2': 0.30, 'tp3': 0.35  # TP3 closes all remaining
         }
         
-        # H1 data cache: symbol -> DataFrame
-        self._h1_cache: Dict[str, pd.DataFrame] = {}
-        
-        # Build unified H1 timeline: timestamp -> {symbol: {open, high, low, close}}
-        self._h1_timeline: Dict[datetime, Dict[str, dict]] = {}
+        # Unified H1 panel: (symbols x hours) OHLC arrays, built in build_timeline
+        self.panel: Optional[H1Panel] = None
         
         # Account state
         self.balance = rules.initial_balance
@@ -203,6 +202,7 @@ class FullH1Simulator:
         
         # Trade tracking
         self.open_trades: Dict[str, OpenTrade] = {}  # trade_id -> OpenTrade
+        self.book = PositionBook()  # array mirror of open_trades for mark-to-market
         self.closed_trades: List[OpenTrade] = []
         self.pending_entries: List[dict] = []  # Trades waiting to be opened
         
@@ -210,6 +210,7 @@ class FullH1Simulator:
         self.daily_states: List[DailyState] = []
         self.current_day: Optional[DailyState] = None
         self.dd_events: List[DrawdownEvent] = []
+        self._total_dd_logged_dates: Set[date] = set()  # O(1) once-per-day TOTAL logging
         self.hourly_snapshots: List[HourlySnapshot] = []
         
         # Day tracking (using server time UTC+3)
@@ -219,81 +220,23 @@ class FullH1Simulator:
         self.max_concurrent_trades = 0
         self.total_bars_processed = 0
         
-    def load_h1_data(self, symbol: str) -> Optional[pd.DataFrame]:
-        """Load H1 data for a symbol."""
-        if symbol in self._h1_cache:
-            return self._h1_cache[symbol]
-        
-        patterns = [
-            f"{symbol}_H1_*.csv",
-            f"{symbol}_H1.csv",
-            f"{symbol}_h1_*.csv",
-            f"{symbol}_h1.csv",
-            f"{symbol.replace('_', '')}_H1*.csv",
-        ]
-        
-        for pattern in patterns:
-            files = list(self.h1_data_dir.glob(pattern))
-            if files:
-                df = pd.read_csv(files[0])
-                
-                # Find timestamp column
-                ts_col = None
-                for col in ['timestamp', 'time', 'datetime', 'date', 'Time']:
-                    if col in df.columns:
-                        ts_col = col
-                        break
-                
-                if ts_col:
-                    df['timestamp'] = pd.to_datetime(df[ts_col])
-                    df = df.sort_values('timestamp').reset_index(drop=True)
-                    
-                    # Normalize column names
-                    df.columns = df.columns.str.lower()
-                    
-                    self._h1_cache[symbol] = df
-                    return df
-        
-        return None
-    
     def build_timeline(self, symbols: Set[str], start_date: datetime, end_date: datetime):
-        """Build unified H1 timeline for all symbols."""
+        """Build unified H1 timeline for all symbols (columnar H1Panel)."""
         print(f"  Building H1 timeline for {len(symbols)} symbols...")
         
-        self._h1_timeline = defaultdict(dict)
-        loaded = 0
-        
         # Make dates timezone-naive for comparison with H1 data
         start_naive = start_date.replace(tzinfo=None) if start_date.tzinfo else start_date
         end_naive = end_date.replace(tzinfo=None) if end_date.tzinfo else end_date
         
-        for symbol in symbols:
-            df = self.load_h1_data(symbol)
-            if df is None:
+        panel = H1Panel.load_or_build(sorted(symbols), data_dir=str(self.h1_data_dir))
+        for symbol in sorted(symbols):
+            if panel.column(symbol) is None:
                 print(f"    ⚠️  No H1 data for {symbol}")
-                continue
-            
-            # Ensure timestamps are timezone-naive
-            if df['timestamp'].dt.tz is not None:
-                df['timestamp'] = df['timestamp'].dt.tz_localize(None)
-            
-            # Filter to date range
-            mask = (df['timestamp'] >= start_naive) & (df['timestamp'] <= end_naive)
-            df_filtered = df[mask]
-            
-            for _, row in df_filtered.iterrows():
-                ts = row['timestamp']
-                self._h1_timeline[ts][symbol] = {
-                    'open': row['open'],
-                    'high': row['high'],
-                    'low': row['low'],
-                    'close': row['close'],
-                }
-            
-            loaded += 1
         
-        print(f"    Loaded {loaded}/{len(symbols)} symbols")
-        print(f"    Timeline: {len(self._h1_timeline)} unique hours")
+        self.panel = panel.slice(start_naive, end_naive)
+        
+        print(f"    Loaded {len(panel.symbols)}/{len(symbols)} symbols")
+        print(f"    Timeline: {len(self.panel)} unique hours")
     
     def prepare_trades(self, trades_df: pd.DataFrame) -> List[dict]:
         """Prepare trades for simulation."""
@@ -394,35 +337,14 @@ class FullH1Simulator:
             min_equity_allowed=hwm - daily_dd_limit,
         )
     
-    def calculate_floating_pnl(self, bar_data: Dict[str, dict]) -> float:
-        """Calculate total floating P&L from all open trades."""
-        total_floating = 0.0
-        
-        for trade_id, trade in self.open_trades.items():
-            if trade.symbol not in bar_data:
-                # Use last known price
-                continue
-            
-            bar = bar_data[trade.symbol]
-            current_price = bar['close']
-            trade.current_price = current_price
-            
-            # Calculate floating R
-            if trade.direction == 'bullish':
-                floating_r = (current_price - trade.entry_price) / trade.risk
-            else:
-                floating_r = (trade.entry_price - current_price) / trade.risk
-            
-            # Account for partially closed position
-            floating_r *= trade.remaining_pct
-            
-            # Add already realized R
-            trade.floating_r = floating_r + trade.realized_r
-            
-            # Convert to dollars
-            total_floating += trade.floating_r * self.rules.risk_per_trade
+    def calculate_floating_pnl(self, t: int) -> float:
+        """
+        Calculate total floating P&L from all open trades at panel hour t.
         
-        return total_floating
+        Per trade: (floating R on remaining size + already realized R) * risk_per_trade,
+        summed as one dot product over the position book.
+        """
+        return self.book.floating_pnl(self.panel.close[:, t])
     
     def check_trade_exits(self, timestamp: datetime, bar_data: Dict[str, dict]) -> List[OpenTrade]:
         """Check if any open trades hit SL or TP."""
@@ -436,6 +358,7 @@ class FullH1Simulator:
             high = bar['high']
             low = bar['low']
             
+            remaining_before = trade.remaining_pct
             exit_this_bar = False
             
             # ═══════════════════════════════════════════════════════════════
@@ -525,6 +448,9 @@ class FullH1Simulator:
                 
                 closed_this_bar.append(trade)
                 del self.open_trades[trade_id]
+                self.book.remove(trade_id)
+            elif trade.remaining_pct != remaining_before:
+                self.book.update(trade_id, remaining_pct=trade.remaining_pct, realized_r=trade.realized_r)
         
         return closed_this_bar
     
@@ -581,13 +507,8 @@ class FullH1Simulator:
         # ═══════════════════════════════════════════════════════════════════
         if self.equity < self.rules.stop_out_level:
             # Only log once per day to avoid spam
-            already_logged_today = any(
-                e.breach_type == 'TOTAL' and 
-                e.timestamp.date() == timestamp.date()
-                for e in self.dd_events
-            )
-            
-            if not already_logged_today:
+            if timestamp.date() not in self._total_dd_logged_dates:
+                self._total_dd_logged_dates.add(timestamp.date())
                 self.dd_events.append(DrawdownEvent(
                     timestamp=timestamp,
                     breach_type='TOTAL',
@@ -629,12 +550,12 @@ class FullH1Simulator:
         # Build H1 timeline
         self.build_timeline(symbols, min_date, max_date)
         
-        if len(self._h1_timeline) == 0:
+        if len(self.panel) == 0:
             print("  ❌ No H1 data available!")
             return pd.DataFrame()
         
         # Get sorted timestamps
-        all_timestamps = sorted(self._h1_timeline.keys())
+        all_timestamps = self.panel.timestamps()
         print(f"  Simulating {len(all_timestamps)} H1 bars...")
         print(f"  Using UTC+3 (server time) for day boundaries")
         
@@ -648,7 +569,7 @@ class FullH1Simulator:
                       f"Open trades: {len(self.open_trades)}, "
                       f"Closed: {len(self.closed_trades)}")
             
-            bar_data = self._h1_timeline[timestamp]
+            bar_data = self.panel.bars_at(bar_idx)
             
             # ═══════════════════════════════════════════════════════════════
             # CHECK FOR NEW DAY (using UTC+3 server time)
@@ -669,6 +590,16 @@ class FullH1Simulator:
                     # Open the trade
                     new_trade = self.create_open_trade(trade_data)
                     self.open_trades[new_trade.trade_id] = new_trade
+                    self.book.add(
+                        new_trade.trade_id,
+                        col=self.panel.column(new_trade.symbol),
+                        entry_price=new_trade.entry_price,
+                        risk=new_trade.risk,
+                        risk_usd=self.rules.risk_per_trade,
+                        direction=new_trade.direction,
+                        remaining_pct=new_trade.remaining_pct,
+                        realized_r=new_trade.realized_r,
+                    )
                     
                     if self.current_day:
                         self.current_day.trades_opened += 1
@@ -689,7 +620,7 @@ class FullH1Simulator:
             # ═══════════════════════════════════════════════════════════════
             # 3. CALCULATE FLOATING P&L
             # ═══════════════════════════════════════════════════════════════
-            self.floating_pnl = self.calculate_floating_pnl(bar_data)
+            self.floating_pnl = self.calculate_floating_pnl(bar_idx)
             self.equity = self.balance + self.floating_pnl
             
             # ═══════════════════════════════════════════════════════════════
@@ -723,6 +654,7 @@ class FullH1Simulator:
             self.closed_trades.append(trade)
         
         self.open_trades.clear()
+        self.book.clear()
         
         # Finalize last day
         if self.current_day:
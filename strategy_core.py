@@ -14,6 +14,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List, Dict, Tuple, Any
 
+import numpy as np
+
 from indicators import calculate_adx_with_slope, check_di_crossover
 
 try:
@@ -59,6 +61,11 @@ class ScanResult:
 # ==============================================================================
 
 
+def _is_columnar(candles) -> bool:
+    """True for columnar candle containers (tradr.mt5.candles.CandleArray)."""
+    return hasattr(candles, "column")
+
+
 def _get_candle_datetime(candle: Dict) -> Optional[datetime]:
     """Extract datetime from candle dictionary."""
     time_val = candle.get("time") or candle.get("timestamp") or candle.get("date")
@@ -506,6 +513,28 @@ def _atr(candles: List[Dict], period: int = 14) -> float:
     if len(candles) < period + 1:
         return 0.0
     
+    if _is_columnar(candles):
+        high, low, close = candles.high, candles.low, candles.close
+        tr_values = np.maximum.reduce([
+            high[1:] - low[1:],
+            np.abs(high[1:] - close[:-1]),
+            np.abs(low[1:] - close[:-1]),
+        ]).tolist()
+    else:
+        tr_values = _true_ranges(candles)
+    
+    if len(tr_values) < period:
+        return sum(tr_values) / len(tr_values) if tr_values else 0.0
+    
+    atr_val = sum(tr_values[:period]) / period
+    for tr in tr_values[period:]:
+        atr_val = (atr_val * (period - 1) + tr) / period
+    
+    return atr_val
+
+
+def _true_ranges(candles: List[Dict]) -> List[float]:
+    """True range per bar (from the second candle on) for List[Dict] candles."""
     tr_values = []
     for i in range(1, len(candles)):
         high = candles[i].get("high")
@@ -522,14 +551,7 @@ def _atr(candles: List[Dict], period: int = 14) -> float:
         )
         tr_values.append(tr)
     
-    if len(tr_values) < period:
-        return sum(tr_values) / len(tr_values) if tr_values else 0.0
-    
-    atr_val = sum(tr_values[:period]) / period
-    for tr in tr_values[period:]:
-        atr_val = (atr_val * (period - 1) + tr) / period
-    
-    return atr_val
+    return tr_values
 
 
 def _calculate_atr_percentile(candles: List[Dict], period: int = 14, lookback: int = 100) -> Tuple[float, float]:
@@ -1613,6 +1635,17 @@ def _find_pivots(candles: List[Dict], lookback: int = 5) -> Tuple[List[float], L
     if len(candles) < lookback * 2 + 1:
         return [], []
     
+    if _is_columnar(candles):
+        # A bar is a swing high/low when it is the max/min of its +/-lookback window
+        window = 2 * lookback + 1
+        highs = candles.high
+        lows = candles.low
+        center_highs = highs[lookback:len(highs) - lookback]
+        center_lows = lows[lookback:len(lows) - lookback]
+        is_high = np.lib.stride_tricks.sliding_window_view(highs, window).max(axis=1) <= center_highs
+        is_low = np.lib.stride_tricks.sliding_window_view(lows, window).min(axis=1) >= center_lows
+        return center_highs[is_high].tolist(), center_lows[is_low].tolist()
+    
     swing_highs = []
     swing_lows = []
     
@@ -1651,7 +1684,10 @@ def _infer_trend(candles: List[Dict], short_lookback: int = 8, long_lookback: in
     if not candles or len(candles) < 5:
         return "mixed"
 
-    closes = [c.get("close") for c in candles if c.get("close") is not None]
+    if _is_columnar(candles):
+        closes = candles.close.tolist()
+    else:
+        closes = [c.get("close") for c in candles if c.get("close") is not None]
     if len(closes) < 5:
         return "mixed"
 
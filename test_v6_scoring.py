@@ -3,11 +3,15 @@
 
 import optuna
 
+from tradr.utils.artifact_store import get_artifact_store
+
 # Load study
 study = optuna.load_study(
     study_name='regime_adaptive_v2_clean',
     storage='sqlite:///regime_adaptive_v2_clean.db'
 )
+trials = study.get_trials(deepcopy=False)
+artifacts = get_artifact_store()
 
 print("\n" + "="*80)
 print("V6 SCORING COMPARISON - Recalculating Old Trials")
@@ -20,13 +24,15 @@ print(f"\n{'Trial':<8} {'R':<10} {'Profit $':<15} {'V5 Score':<12} {'V6 Base':<1
 print("-"*80)
 
 for trial_num in test_trials:
-    trial = study.trials[trial_num]
+    trial = trials[trial_num]
+    # Score breakdown / quarterly stats live in the artifact store (inline on older trials)
+    artifact = artifacts.get(trial.user_attrs.get('artifact')) or trial.user_attrs
     
     # Get metrics
     total_r = trial.user_attrs.get('total_r', 0)
     
     # Estimate profit from quarterly data (since total_profit_usd not stored)
-    quarterly_stats = trial.user_attrs.get('quarterly_stats', {})
+    quarterly_stats = artifact.get('quarterly_stats', {})
     overall_stats = trial.user_attrs.get('overall_stats', {})
     total_profit = overall_stats.get('profit', 0) if overall_stats else 0
     
@@ -39,7 +45,7 @@ for trial_num in test_trials:
     
     # Estimate full V6 score (base + typical bonuses of ~70-100)
     # Old scores had bonuses, new V6 will have similar bonuses
-    score_breakdown = trial.user_attrs.get('score_breakdown', {})
+    score_breakdown = artifact.get('score_breakdown', {})
     old_bonuses = sum([
         score_breakdown.get('sharpe_bonus', 0),
         score_breakdown.get('pf_bonus', 0),
@@ -0,0 +1,215 @@
+"""
+Tests for the order-path risk state: RiskLedger running totals and the
+PortfolioRiskEngine stress check.
+
+    python -m pytest -q tests/test_order_path_risk.py
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tradr.mt5.candles import CandleArray
+from tradr.risk.ledger import RiskLedger, symbol_currencies
+from tradr.risk.portfolio import PortfolioRiskEngine, position_weight
+
+DAY = 86400
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# RiskLedger
+# ═══════════════════════════════════════════════════════════════════════════
+
+def test_totals_return_to_zero():
+    ledger = RiskLedger()
+    ledger.add_pending("EUR_USD", "EURUSD", 300.0, score=4)
+    ledger.add_pending("GBP_JPY", "GBPJPY", 150.1, score=5)
+    ledger.open(1, "XAUUSD", 200.3)
+    assert ledger.pending_risk == pytest.approx(450.1)
+    assert ledger.open_risk == pytest.approx(200.3)
+    assert ledger.total_risk == pytest.approx(650.4)
+    assert (ledger.open_count, ledger.pending_count) == (1, 2)
+
+    # Fill: the order leaves the book and the position enters it
+    ledger.cancel("EUR_USD")
+    ledger.open(2, "EURUSD", 300.0)
+    assert ledger.pending_risk == pytest.approx(150.1)
+    assert ledger.open_risk == pytest.approx(500.3)
+
+    ledger.close(1)
+    ledger.close(2)
+    ledger.cancel("GBP_JPY")
+    assert ledger.open_risk == 0.0
+    assert ledger.pending_risk == 0.0
+    assert ledger.symbol_exposure("EURUSD") == 0.0
+    assert ledger.currency_exposure("USD") == 0.0
+    assert (ledger.open_count, ledger.pending_count) == (0, 0)
+
+    # Unknown keys are no-ops
+    assert ledger.close(99) is None
+    assert ledger.cancel("NOPE") is None
+
+
+def test_open_and_add_pending_replace_existing_key():
+    ledger = RiskLedger()
+    ledger.open(1, "EURUSD", 100.0)
+    ledger.open(1, "EURUSD", 250.0)
+    ledger.add_pending("EUR_USD", "EURUSD", 80.0)
+    ledger.add_pending("EUR_USD", "EURUSD", 60.0)
+    assert ledger.open_risk == pytest.approx(250.0)
+    assert ledger.pending_risk == pytest.approx(60.0)
+    assert ledger.symbol_exposure("EUR_USD") == pytest.approx(310.0)
+
+
+def test_worst_pending_after_replace_and_cancel():
+    ledger = RiskLedger()
+    assert ledger.worst_pending() is None
+    ledger.add_pending("A", "EURUSD", 100.0, score=3)
+    ledger.add_pending("B", "GBPUSD", 100.0, score=5)
+    ledger.add_pending("C", "USDJPY", 100.0, score=4)
+    assert ledger.worst_pending() == ("A", 3)
+
+    # Replacing the worst with a better score leaves a stale heap entry behind
+    ledger.add_pending("A", "EURUSD", 100.0, score=6)
+    assert ledger.worst_pending() == ("C", 4)
+
+    # Cancelling the current worst promotes the next one
+    ledger.cancel("C")
+    assert ledger.worst_pending() == ("B", 5)
+    ledger.cancel("B")
+    ledger.cancel("A")
+    assert ledger.worst_pending() is None
+
+
+def test_worst_pending_survives_heap_rebuild():
+    ledger = RiskLedger()
+    for i in range(100):
+        ledger.add_pending("X", "EURUSD", 10.0, score=i)  # Same key: 99 stale entries
+    ledger.add_pending("Y", "GBPUSD", 10.0, score=50)
+    assert len(ledger._worst) < 100
+    assert ledger.worst_pending() == ("Y", 50)
+
+
+def test_currency_exposure():
+    assert symbol_currencies("EUR_USD") == ("EUR", "USD")
+    assert symbol_currencies("XAUUSD") == ("XAU", "USD")
+    assert symbol_currencies("US500.cash") == ("US500",)
+
+    ledger = RiskLedger()
+    ledger.open(1, "EURUSD", 300.0)
+    ledger.open(2, "EURJPY", 200.0)
+    ledger.add_pending("GBP_USD", "GBPUSD", 100.0)
+    ledger.add_pending("US500", "US500.cash", 50.0)
+    assert ledger.currency_exposure("EUR") == pytest.approx(500.0)
+    assert ledger.currency_exposure("usd") == pytest.approx(400.0)
+    assert ledger.currency_exposure("JPY") == pytest.approx(200.0)
+    assert ledger.currency_exposure("GBP") == pytest.approx(100.0)
+    assert ledger.currency_exposure("US500") == pytest.approx(50.0)
+    assert ledger.currency_exposure("CHF") == 0.0
+
+    ledger.close(1)
+    assert ledger.currency_exposure("EUR") == pytest.approx(200.0)
+    assert ledger.currency_exposure("USD") == pytest.approx(100.0)
+
+
+def test_worst_case_dd():
+    ledger = RiskLedger()
+    ledger.open(1, "EURUSD", 600.0)
+    ledger.add_pending("GBP_USD", "GBPUSD", 400.0)
+    daily, total = ledger.worst_case_dd(balance=60_000, day_start_balance=60_000, initial_balance=60_000)
+    assert daily == pytest.approx(1.0)
+    assert total == pytest.approx(1.0)
+    daily, _ = ledger.worst_case_dd(60_000, 60_000, 60_000, extra_loss=200.0, include_pending=True)
+    assert daily == pytest.approx(2.0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PortfolioRiskEngine
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _daily(closes) -> CandleArray:
+    n = len(closes)
+    times = np.arange(n) * DAY
+    return CandleArray(times, closes, closes, closes, closes, np.zeros(n, dtype=np.int64))
+
+
+def _engine(correlated: bool, days: int = 120) -> PortfolioRiskEngine:
+    """EURUSD plus a GBPUSD leg that either copies its returns or moves independently."""
+    rng = np.random.default_rng(7)
+    eur = 1.10 * np.cumprod(1 + rng.normal(0, 0.01, days))
+    gbp = eur.copy() if correlated else 1.10 * np.cumprod(1 + rng.normal(0, 0.01, days))
+    engine = PortfolioRiskEngine(window=250, confidence=0.99, min_observations=20)
+    assert engine.update({"EURUSD": _daily(eur), "GBPUSD": _daily(gbp)}) == days - 1
+    return engine
+
+
+def _position(symbol, lots, price, sl, buy=True):
+    return SimpleNamespace(symbol=symbol, type=0 if buy else 1, volume=lots, price_open=price, sl=sl)
+
+
+def test_update_adds_only_new_closed_days():
+    engine = _engine(correlated=True, days=60)
+    rng = np.random.default_rng(1)
+    closes = 1.1 * np.cumprod(1 + rng.normal(0, 0.01, 61))
+    daily = {"EURUSD": _daily(closes), "GBPUSD": _daily(closes)}
+    assert engine.update(daily, until=59 * DAY) == 0  # Nothing newer than the last update
+    assert engine.update(daily) == 1
+    assert engine.observations == 60
+    assert engine.correlation("EURUSD", "GBPUSD") == pytest.approx(1.0)
+
+
+def test_correlated_leg_adds_more_risk_than_uncorrelated():
+    results = {}
+    for correlated in (True, False):
+        engine = _engine(correlated)
+        engine.set_book(positions=[_position("EURUSD", 1.0, 1.10, 0.50)])  # Wide stop: no cap
+        single = engine.book_loss()
+        same_way = engine.check_order("GBPUSD", "bullish", 1.0, 1.10, 0.50, day_start_balance=60_000)
+        hedge = engine.check_order("GBPUSD", "bearish", 1.0, 1.10, 1.70, day_start_balance=60_000)
+        results[correlated] = (single, same_way.loss_usd, hedge.loss_usd)
+
+    single, same_way, hedge = results[True]
+    assert same_way == pytest.approx(2 * single, rel=0.02)  # Same returns: risk adds linearly
+    assert hedge < 0.05 * single  # ... and an opposite leg offsets it
+
+    single, same_way, hedge = results[False]
+    assert single * 1.2 < same_way < single * 1.6  # Independent returns: about sqrt(2)
+    assert single * 1.2 < hedge < single * 1.6
+    assert same_way < results[True][1]
+
+
+def test_check_order_matches_book_with_order_added():
+    engine = _engine(correlated=False)
+    engine.set_book(positions=[_position("EURUSD", 1.0, 1.10, 0.50)])
+    stress = engine.check_order("GBPUSD", "bullish", 0.7, 1.10, 0.50, day_start_balance=60_000)
+    engine.set_book(positions=[_position("EURUSD", 1.0, 1.10, 0.50), _position("GBPUSD", 0.7, 1.10, 0.50)])
+    assert stress.loss_usd == pytest.approx(engine.book_loss())
+
+
+def test_stop_loss_caps_projected_loss():
+    engine = _engine(correlated=True)
+    # 10-pip stops: the stops are far inside the 99% daily move
+    engine.set_book(positions=[_position("EURUSD", 1.0, 1.10, 1.0990)])
+    eur_cap = position_weight("EURUSD", "bullish", 1.0, 1.10) * 0.0010 / 1.10
+    assert engine.book_loss() == pytest.approx(eur_cap)
+
+    stress = engine.check_order("GBPUSD", "bullish", 1.0, 1.10, 1.0990, day_start_balance=60_000,
+                                current_loss=500.0)
+    gbp_cap = position_weight("GBPUSD", "bullish", 1.0, 1.10) * 0.0010 / 1.10
+    assert stress.loss_usd == pytest.approx(eur_cap + gbp_cap + 500.0)
+    assert stress.loss_pct == pytest.approx(stress.loss_usd / 60_000 * 100)
+    assert not stress.breach
+
+
+def test_breach_needs_enough_observations():
+    for days, expect_breach in ((10, False), (120, True)):
+        engine = _engine(correlated=True, days=days)
+        engine.set_book(positions=[_position("EURUSD", 5.0, 1.10, 0.50)])
+        stress = engine.check_order("GBPUSD", "bullish", 5.0, 1.10, 0.50, day_start_balance=60_000, limit_pct=5.0)
+        assert stress.loss_pct >= 5.0
+        assert stress.breach is expect_breach
@@ -3,7 +3,8 @@
 Enhanced trade registry for Blueprint Trader AI.
 
 Tracks active trades with notification state to prevent duplicate Discord messages.
-Persists to trade_state.json for crash recovery.
+Persists to the shared state store (tradr.utils.state_store, namespace
+"trade_state") for crash recovery; a legacy trade_state.json is migrated on load.
 
 Features:
 - Track active trade ideas (4/7+ confluence)
@@ -14,7 +15,6 @@ Features:
 
 from __future__ import annotations
 
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
@@ -22,9 +22,11 @@ from dataclasses import dataclass, field, asdict
 
 from strategy_core import ScanResult
 from data import get_ohlcv
+from tradr.utils.state_store import get_state_store
 
 
 TRADE_STATE_FILE = Path("trade_state.json")
+TRADE_STATE_NAMESPACE = "trade_state"
 
 
 @dataclass
@@ -208,8 +210,15 @@ def clear_sent_setups() -> None:
     _last_sent_setups.clear()
 
 
+def _state_records(state: Dict[str, Any]) -> Dict[str, Any]:
+    """{"trades": {...}, "notifications": {...}} -> one store record per trade/notification."""
+    records = {f"trades/{key}": value for key, value in state.get("trades", {}).items()}
+    records.update({f"notifications/{key}": value for key, value in state.get("notifications", {}).items()})
+    return records
+
+
 def save_state() -> None:
-    """Save current state to file."""
+    """Save current state (only changed trades/notifications are written)."""
     state = {
         "trades": {},
         "notifications": {},
@@ -237,25 +246,25 @@ def save_state() -> None:
         state["notifications"][key] = notif.to_dict()
     
     try:
-        with open(TRADE_STATE_FILE, 'w') as f:
-            json.dump(state, f, indent=2)
+        get_state_store().replace(TRADE_STATE_NAMESPACE, _state_records(state))
     except Exception as e:
         print(f"[trade_state] Error saving state: {e}")
 
 
 def load_state() -> int:
     """
-    Load state from file on startup.
+    Load state from the state store on startup.
     
     Returns:
         Number of trades restored
     """
-    if not TRADE_STATE_FILE.exists():
-        return 0
-    
     try:
-        with open(TRADE_STATE_FILE, 'r') as f:
-            state = json.load(f)
+        store = get_state_store()
+        store.migrate_json(TRADE_STATE_NAMESPACE, TRADE_STATE_FILE, to_records=_state_records)
+        state = {"trades": {}, "notifications": {}}
+        for record_key, value in store.items(TRADE_STATE_NAMESPACE).items():
+            group, _, key = record_key.partition("/")
+            state.setdefault(group, {})[key] = value
         
         # Restore trades
         for key, trade_data in state.get("trades", {}).items():
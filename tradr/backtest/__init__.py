@@ -13,6 +13,8 @@ from .h1_trade_simulator import (
     TP1_CLOSE_PCT, TP2_CLOSE_PCT, TP3_CLOSE_PCT, TP4_CLOSE_PCT, TP5_CLOSE_PCT,
     TRAIL_ACTIVATION_R,
 )
+from .h1_panel import H1Panel, H1BarView
+from .position_book import PositionBook
 
 __all__ = [
     'H1TradeSimulator',
@@ -22,4 +24,7 @@ __all__ = [
     'TP1_R', 'TP2_R', 'TP3_R', 'TP4_R', 'TP5_R',
     'TP1_CLOSE_PCT', 'TP2_CLOSE_PCT', 'TP3_CLOSE_PCT', 'TP4_CLOSE_PCT', 'TP5_CLOSE_PCT',
     'TRAIL_ACTIVATION_R',
+    'H1Panel',
+    'H1BarView',
+    'PositionBook',
 ]
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Columnar H1 Panel
+
+Shared H1 price store for the portfolio simulators
+(scripts/simulate_main_live_bot.py, scripts/validate_h1_realistic.py,
+scripts/validate_with_h1_dd.py).
+
+Instead of a dict-of-dicts keyed by timestamp and symbol, the panel holds:
+- one sorted global timestamp axis (datetime64[ns], naive UTC)
+- dense float64 arrays of shape (symbols x hours) for open/high/low/close
+- NaN wherever a symbol has no bar for that hour (see `valid`)
+
+Panels are built once from the H1 CSVs and cached as .npz files keyed by the
+source files' size and mtime, so reruns skip CSV parsing entirely.
+"""
+
+import hashlib
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PANEL_FIELDS = ('open', 'high', 'low', 'close')
+TIMESTAMP_COLUMNS = ('timestamp', 'time', 'datetime', 'date')
+
+
+def normalize_symbol(symbol: str) -> str:
+    """Normalize symbol format (EUR_USD / EURUSD.a -> EURUSD)."""
+    return symbol.replace("_", "").replace(".", "").replace("/", "").upper()
+
+
+def find_h1_file(data_dir: Path, symbol: str) -> Optional[Path]:
+    """Locate the H1 CSV for a symbol (same patterns the simulators used)."""
+    norm = normalize_symbol(symbol)
+    patterns = [
+        f"{symbol}_H1_*.csv",
+        f"{symbol}_H1.csv",
+        f"{symbol}_h1_*.csv",
+        f"{symbol}_h1.csv",
+        f"{norm}_H1_*.csv",
+        f"{norm}_H1.csv",
+        f"*{norm}*H1*.csv",
+    ]
+    for pattern in patterns:
+        files = sorted(data_dir.glob(pattern))
+        if files:
+            return files[0]
+    return None
+
+
+def read_h1_csv(path: Path) -> Optional[pd.DataFrame]:
+    """Read an H1 CSV into a frame with a naive-UTC 'timestamp' and lowercase OHLC."""
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.lower()
+
+    ts_col = next((c for c in TIMESTAMP_COLUMNS if c in df.columns), None)
+    if ts_col is None or not all(f in df.columns for f in PANEL_FIELDS):
+        return None
+
+    df['timestamp'] = pd.to_datetime(df[ts_col], utc=True).dt.tz_localize(None)
+    df = df.drop_duplicates('timestamp', keep='last').sort_values('timestamp')
+    return df[['timestamp', *PANEL_FIELDS]].reset_index(drop=True)
+
+
+class H1BarView(Mapping):
+    """
+    Read-only {symbol: {'open', 'high', 'low', 'close'}} view of one panel hour.
+
+    Drop-in replacement for the old per-timestamp bar dicts: `symbol in view`
+    is False when the symbol has no bar that hour. Nothing is materialized
+    until a symbol is looked up.
+    """
+
+    __slots__ = ('_panel', '_t')
+
+    def __init__(self, panel: "H1Panel", t: int):
+        self._panel = panel
+        self._t = t
+
+    def __getitem__(self, symbol: str) -> dict:
+        bar = self._panel.bar(symbol, self._t)
+        if bar is None:
+            raise KeyError(symbol)
+        return bar
+
+    def __contains__(self, symbol) -> bool:
+        col = self._panel.column(symbol)
+        return col is not None and self._panel.valid[col, self._t]
+
+    def __iter__(self) -> Iterator[str]:
+        for col in np.flatnonzero(self._panel.valid[:, self._t]):
+            yield self._panel.symbols[col]
+
+    def __len__(self) -> int:
+        return int(self._panel.valid[:, self._t].sum())
+
+
+@dataclass
+class H1Panel:
+    """Dense (symbols x hours) H1 OHLC arrays on one global timestamp axis."""
+
+    symbols: List[str]
+    times: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    valid: np.ndarray = field(init=False, repr=False)
+    _index: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.valid = ~np.isnan(self.close)
+        self._index = {}
+        for i, symbol in enumerate(self.symbols):
+            self._index[symbol] = i
+            self._index.setdefault(normalize_symbol(symbol), i)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> "H1Panel":
+        """Build a panel from {symbol: DataFrame} with a time column and OHLC."""
+        cleaned: Dict[str, pd.DataFrame] = {}
+        for symbol, df in frames.items():
+            df = df.copy()
+            df.columns = df.columns.str.lower()
+            ts_col = next((c for c in TIMESTAMP_COLUMNS if c in df.columns), None)
+            if ts_col is None:
+                continue
+            df['timestamp'] = pd.to_datetime(df[ts_col], utc=True).dt.tz_localize(None)
+            df = df.drop_duplicates('timestamp', keep='last')
+            cleaned[symbol] = df
+
+        symbols = list(cleaned.keys())
+        if not symbols:
+            empty = np.empty((0, 0))
+            return cls([], np.array([], dtype='datetime64[ns]'), empty, empty, empty, empty)
+
+        times = np.unique(np.concatenate([
+            df['timestamp'].values.astype('datetime64[ns]') for df in cleaned.values()
+        ]))
+
+        arrays = {f: np.full((len(symbols), times.size), np.nan) for f in PANEL_FIELDS}
+        for row, symbol in enumerate(symbols):
+            df = cleaned[symbol]
+            cols = np.searchsorted(times, df['timestamp'].values.astype('datetime64[ns]'))
+            for f in PANEL_FIELDS:
+                arrays[f][row, cols] = df[f].to_numpy(dtype=np.float64)
+
+        return cls(symbols, times, arrays['open'], arrays['high'], arrays['low'], arrays['close'])
+
+    @classmethod
+    def load_or_build(
+        cls,
+        symbols: Sequence[str],
+        data_dir: str = 'data/ohlcv',
+        cache_dir: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> "H1Panel":
+        """
+        Load the panel for `symbols` from the .npz cache, building it from the
+        H1 CSVs on a cache miss. Symbols without an H1 file are skipped.
+        """
+        data_path = Path(data_dir)
+        files = {}
+        for symbol in symbols:
+            path = find_h1_file(data_path, symbol)
+            if path is None:
+                logger.warning(f"No H1 data for {symbol}")
+                continue
+            files[symbol] = path
+
+        cache_path = None
+        if use_cache and files:
+            cache_root = Path(cache_dir) if cache_dir else data_path.parent / "cache"
+            cache_path = cache_root / f"h1_panel_{cls._cache_key(files)}.npz"
+            if cache_path.exists():
+                try:
+                    panel = cls.load(cache_path)
+                    logger.info(f"Loaded H1 panel from cache: {cache_path}")
+                    return panel
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable H1 panel cache {cache_path}: {e}")
+
+        frames = {}
+        for symbol, path in files.items():
+            df = read_h1_csv(path)
+            if df is not None:
+                frames[symbol] = df
+        panel = cls.from_frames(frames)
+
+        if cache_path is not None and panel.symbols:
+            try:
+                panel.save(cache_path)
+            except OSError as e:
+                logger.warning(f"Could not write H1 panel cache {cache_path}: {e}")
+        return panel
+
+    @staticmethod
+    def _cache_key(files: Dict[str, Path]) -> str:
+        h = hashlib.sha1()
+        for symbol in sorted(files):
+            stat = files[symbol].stat()
+            h.update(f"{symbol}|{files[symbol].name}|{stat.st_size}|{stat.st_mtime_ns};".encode())
+        return h.hexdigest()[:16]
+
+    def save(self, path: Path) -> None:
+        """Write the panel as an uncompressed .npz (load() reads it back without parsing CSVs)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, 'wb') as f:
+            np.savez(
+                f,
+                symbols=np.array(self.symbols),
+                times=self.times.astype('datetime64[ns]').astype(np.int64),
+                open=self.open, high=self.high, low=self.low, close=self.close,
+            )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "H1Panel":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                symbols=[str(s) for s in data['symbols']],
+                times=data['times'].astype('datetime64[ns]'),
+                open=data['open'], high=data['high'], low=data['low'], close=data['close'],
+            )
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return int(self.times.size)
+
+    def column(self, symbol: str) -> Optional[int]:
+        """Row index of a symbol in the arrays (raw or normalized name)."""
+        col = self._index.get(symbol)
+        if col is None:
+            col = self._index.get(normalize_symbol(symbol))
+        return col
+
+    def bar(self, symbol: str, t: int) -> Optional[dict]:
+        """OHLC dict for symbol at hour index t, or None when there is no bar."""
+        col = self.column(symbol)
+        if col is None or not self.valid[col, t]:
+            return None
+        return {
+            'open': float(self.open[col, t]),
+            'high': float(self.high[col, t]),
+            'low': float(self.low[col, t]),
+            'close': float(self.close[col, t]),
+        }
+
+    def bars_at(self, t: int) -> H1BarView:
+        """Mapping view of all symbols' bars at hour index t."""
+        return H1BarView(self, t)
+
+    def index_of(self, timestamp) -> Optional[int]:
+        """Hour index of an exact timestamp, or None when not on the axis."""
+        ts = np.datetime64(_naive(timestamp), 'ns')
+        i = int(np.searchsorted(self.times, ts))
+        if i < self.times.size and self.times[i] == ts:
+            return i
+        return None
+
+    def timestamps(self) -> List[datetime]:
+        """Timestamp axis as Python datetimes (for the simulators' bar loops)."""
+        return pd.DatetimeIndex(self.times).to_pydatetime().tolist()
+
+    def slice(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> "H1Panel":
+        """Sub-panel for start <= t <= end (inclusive), dropping hours with no bars."""
+        lo = 0 if start is None else int(np.searchsorted(self.times, np.datetime64(_naive(start), 'ns'), 'left'))
+        hi = self.times.size if end is None else int(np.searchsorted(self.times, np.datetime64(_naive(end), 'ns'), 'right'))
+        keep = lo + np.flatnonzero(self.valid[:, lo:hi].any(axis=0))
+        return H1Panel(
+            symbols=list(self.symbols),
+            times=self.times[keep],
+            open=self.open[:, keep], high=self.high[:, keep],
+            low=self.low[:, keep], close=self.close[:, keep],
+        )
+
+    def select(self, symbols: Sequence[str]) -> "H1Panel":
+        """Sub-panel restricted to `symbols` (missing symbols are skipped)."""
+        names = [s for s in symbols if self.column(s) is not None]
+        rows = [self.column(s) for s in names]
+        keep = np.flatnonzero(self.valid[rows].any(axis=0)) if rows else np.array([], dtype=np.int64)
+        return H1Panel(
+            symbols=names,
+            times=self.times[keep],
+            open=self.open[rows][:, keep], high=self.high[rows][:, keep],
+            low=self.low[rows][:, keep], close=self.close[rows][:, keep],
+        )
+
+
+def _naive(ts) -> pd.Timestamp:
+    ts = pd.Timestamp(ts)
+    return ts.tz_convert('UTC').tz_localize(None) if ts.tzinfo is not None else ts
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Struct-of-Arrays Position Book
+
+Open-position state for the H1 portfolio simulators, kept as parallel numpy
+arrays (one slot per open position) so that hourly mark-to-market is a single
+dot product against an H1Panel close row instead of a Python loop over
+position objects.
+
+Floating P&L of slot i at hour t:
+
+    risk_usd[i] * (remaining[i] * sign[i] * (close[col[i], t] - entry[i]) / risk[i]
+                   + realized_r[i])
+
+Positions whose symbol has no bar that hour (NaN close) contribute nothing,
+which matches the simulators' original `if symbol not in bar_data: continue`.
+"""
+
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+
+
+class PositionBook:
+    """Parallel arrays of open-position state with O(1) add/update/remove."""
+
+    _FIELDS = (
+        ('col', np.int64, -1),
+        ('entry', np.float64, 0.0),
+        ('sign', np.float64, 0.0),
+        ('inv_risk', np.float64, 0.0),
+        ('risk_usd', np.float64, 0.0),
+        ('remaining', np.float64, 0.0),
+        ('realized_r', np.float64, 0.0),
+    )
+
+    def __init__(self, capacity: int = 64):
+        self._n = 0
+        self._keys: List[Hashable] = []
+        self._slots: Dict[Hashable, int] = {}
+        self._alloc(max(int(capacity), 1))
+
+    def _alloc(self, capacity: int):
+        """(Re)allocate all arrays to `capacity` slots, keeping live slots."""
+        for name, dtype, fill in self._FIELDS:
+            new = np.full(capacity, fill, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __contains__(self, key) -> bool:
+        return key in self._slots
+
+    def add(
+        self,
+        key: Hashable,
+        col: Optional[int],
+        entry_price: float,
+        risk: float,
+        risk_usd: float,
+        direction: str,
+        remaining_pct: float = 1.0,
+        realized_r: float = 0.0,
+    ):
+        """
+        Insert (or replace) a position.
+
+        Args:
+            key: Position id used by the simulator's open-position dict
+            col: Symbol row in the H1Panel (None if the symbol has no H1 data)
+            entry_price: Fill price
+            risk: Price distance entry -> stop (<= 0 gives zero floating P&L)
+            risk_usd: Dollar value of 1R
+            direction: 'bullish' or 'bearish'
+        """
+        i = self._slots.get(key)
+        if i is None:
+            if self._n == self.col.size:
+                self._alloc(self.col.size * 2)
+            i = self._n
+            self._n += 1
+            self._keys.append(key)
+            self._slots[key] = i
+
+        self.col[i] = -1 if col is None else col
+        self.entry[i] = entry_price
+        self.sign[i] = 1.0 if direction == 'bullish' else -1.0
+        self.inv_risk[i] = 1.0 / risk if risk > 0 else 0.0
+        self.risk_usd[i] = risk_usd
+        self.remaining[i] = remaining_pct
+        self.realized_r[i] = realized_r
+
+    def update(
+        self,
+        key: Hashable,
+        remaining_pct: Optional[float] = None,
+        realized_r: Optional[float] = None,
+    ):
+        """Sync partial-close state (after a TP hit) for an open position."""
+        i = self._slots.get(key)
+        if i is None:
+            return
+        if remaining_pct is not None:
+            self.remaining[i] = remaining_pct
+        if realized_r is not None:
+            self.realized_r[i] = realized_r
+
+    def remove(self, key: Hashable):
+        """Remove a position by swapping the last slot into its place."""
+        i = self._slots.pop(key, None)
+        if i is None:
+            return
+        last = self._n - 1
+        if i != last:
+            moved = self._keys[last]
+            self._keys[i] = moved
+            self._slots[moved] = i
+            for name, _, _ in self._FIELDS:
+                arr = getattr(self, name)
+                arr[i] = arr[last]
+        self._keys.pop()
+        self._n = last
+
+    def clear(self):
+        self._n = 0
+        self._keys.clear()
+        self._slots.clear()
+
+    def floating_pnl(self, close_row: np.ndarray) -> float:
+        """
+        Total floating P&L (USD) given one hour of panel closes.
+
+        Args:
+            close_row: panel.close[:, t], one close per panel symbol (NaN = no bar)
+        """
+        n = self._n
+        if n == 0 or close_row.size == 0:
+            return 0.0
+
+        col = self.col[:n]
+        price = close_row[col]
+        price[col < 0] = np.nan
+
+        r = (self.remaining[:n] * self.sign[:n] * (price - self.entry[:n]) * self.inv_risk[:n]
+             + self.realized_r[:n])
+        return float(np.dot(self.risk_usd[:n], np.nan_to_num(r, nan=0.0)))
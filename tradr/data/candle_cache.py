@@ -0,0 +1,187 @@
+"""
+Incremental multi-timeframe candle cache for the live bot.
+
+Each (symbol, timeframe) keeps a bounded ring buffer of candles. The first
+request pulls full history from MT5; after that only the tail is refreshed:
+a small `get_ohlcv` call covering the bars since the last cached one, which
+replaces the still-forming bar and appends any newly opened bars. Buffers are
+persisted to disk so a restarted bot starts warm.
+
+Buffers are columnar (tradr.mt5.candles.CandleArray, fetched with
+get_ohlcv(columnar=True)); indexing one still yields the familiar candle dict
+{"time": datetime (UTC), "open", "high", "low", "close", "volume"}.
+"""
+
+import math
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from tradr.mt5.candles import CANDLE_FIELDS, CandleArray
+
+
+# Nominal bar length per timeframe. MN1 uses the shortest month so the
+# tail-size estimate can only overshoot.
+TIMEFRAME_SECONDS = {
+    "M1": 60,
+    "M5": 300,
+    "M15": 900,
+    "M30": 1800,
+    "H1": 3600,
+    "H4": 14400,
+    "D1": 86400,
+    "D": 86400,
+    "W1": 7 * 86400,
+    "W": 7 * 86400,
+    "MN1": 28 * 86400,
+    "M": 28 * 86400,
+}
+
+# MT5 bar times are broker server time (UTC+2/+3) encoded as UTC
+SERVER_OFFSET_MARGIN_S = 3 * 3600
+
+
+class CandleCache:
+    """
+    Ring-buffer candle cache in front of MT5Client.get_ohlcv.
+
+    Usage:
+        cache = CandleCache(mt5_client)
+        daily = cache.get("EURUSD", "D1", 500)
+    """
+
+    def __init__(
+        self,
+        client,
+        cache_dir: str = "data/cache/candles",
+        persist: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.client = client
+        self.clock = clock  # Epoch seconds; the emulator's clock when replaying
+        self.cache_dir = Path(cache_dir)
+        self.persist = persist
+        self._buffers: Dict[Tuple[str, str], CandleArray] = {}
+        self._maxlen: Dict[Tuple[str, str], int] = {}
+        self.stats = {"full_fetches": 0, "tail_fetches": 0, "bars_fetched": 0}
+
+    def get(self, symbol: str, timeframe: str, count: int) -> CandleArray:
+        """Return the last `count` candles, refreshing only the uncached tail."""
+        if not getattr(self.client, "connected", True):
+            return CandleArray.empty()  # Same as get_ohlcv: never serve cached bars while offline
+
+        timeframe = timeframe.upper()
+        key = (symbol, timeframe)
+
+        if key not in self._buffers and self.persist:
+            self._load(key)
+
+        buf = self._buffers.get(key)
+        if buf is None or not len(buf) or self._maxlen[key] < count:
+            buf = self._full_fetch(key, count)
+        else:
+            buf = self._refresh_tail(key, buf)
+            if buf is None:
+                # Gap larger than the tail window (long downtime) - start over
+                buf = self._full_fetch(key, max(count, self._maxlen[key]))
+
+        return buf[-count:] if count < len(buf) else buf
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop in-memory buffers (all, or one symbol) so they are refetched."""
+        for key in [k for k in self._buffers if symbol is None or k[0] == symbol]:
+            del self._buffers[key]
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    def _full_fetch(self, key: Tuple[str, str], count: int) -> CandleArray:
+        candles = self.client.get_ohlcv(key[0], key[1], count, columnar=True)
+        self.stats["full_fetches"] += 1
+        self.stats["bars_fetched"] += len(candles)
+
+        if len(candles):
+            self._buffers[key] = candles
+            self._maxlen[key] = count
+            self._save(key)
+        return candles
+
+    def _refresh_tail(self, key: Tuple[str, str], buf: CandleArray) -> Optional[CandleArray]:
+        """
+        Pull the bars from the last cached one onwards and merge them in.
+
+        Returns the updated buffer, or None when the fetched tail does not
+        overlap it.
+        """
+        maxlen = self._maxlen[key]
+        last_time = int(buf.time[-1])
+        bar_seconds = TIMEFRAME_SECONDS.get(key[1], 86400)
+        elapsed = self.clock() + SERVER_OFFSET_MARGIN_S - last_time
+        tail_count = max(0, math.ceil(elapsed / bar_seconds)) + 2
+
+        if tail_count >= maxlen:
+            return None
+
+        tail = self.client.get_ohlcv(key[0], key[1], tail_count, columnar=True)
+        self.stats["tail_fetches"] += 1
+        self.stats["bars_fetched"] += len(tail)
+
+        if not len(tail):
+            return buf  # Terminal hiccup - serve what we have
+        if tail.time[0] > last_time:
+            return None
+
+        # Replace the still-forming bar and append everything newer
+        tail = tail[int(np.searchsorted(tail.time, last_time)):]
+        if len(tail) == 1 and all(
+            getattr(tail, f)[0] == getattr(buf, f)[-1] for f in CANDLE_FIELDS
+        ):
+            return buf
+
+        merged = CandleArray(*(
+            np.concatenate([getattr(buf, f)[:-1], getattr(tail, f)])[-maxlen:]
+            for f in CANDLE_FIELDS
+        ))
+        self._buffers[key] = merged
+        self._save(key)
+        return merged
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _path(self, key: Tuple[str, str]) -> Path:
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in key[0])
+        return self.cache_dir / f"{safe}_{key[1]}.npz"
+
+    def _save(self, key: Tuple[str, str]):
+        if not self.persist:
+            return
+        buf = self._buffers[key]
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp = path.with_name(path.name + ".tmp")
+            with open(tmp, "wb") as f:
+                np.savez(
+                    f,
+                    maxlen=np.int64(self._maxlen[key]),
+                    **{name: np.ascontiguousarray(getattr(buf, name)) for name in CANDLE_FIELDS},
+                )
+            tmp.replace(path)
+        except Exception as e:
+            print(f"[CandleCache] Error saving {key[0]} {key[1]}: {e}")
+
+    def _load(self, key: Tuple[str, str]):
+        path = self._path(key)
+        if not path.exists():
+            return
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                self._buffers[key] = CandleArray(*(data[name] for name in CANDLE_FIELDS))
+                self._maxlen[key] = int(data["maxlen"])
+        except Exception as e:
+            print(f"[CandleCache] Error loading {key[0]} {key[1]}: {e}")
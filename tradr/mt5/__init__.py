@@ -6,5 +6,10 @@ Note: bridge_client.py is deprecated and moved to _deprecated/
 """
 
 from .client import MT5Client
+from .candles import CandleArray
+from .snapshot import BrokerSnapshot
+from .gateway import MT5Gateway, OrderOp
+from .emulator import MT5Emulator
+from .quotes import QuoteService
 
-__all__ = ['MT5Client']
+__all__ = ['MT5Client', 'CandleArray', 'BrokerSnapshot', 'MT5Gateway', 'OrderOp', 'MT5Emulator', 'QuoteService']
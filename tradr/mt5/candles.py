@@ -0,0 +1,105 @@
+"""
+Columnar candle container for MT5 rates.
+
+`copy_rates_from_pos` returns a NumPy structured array. CandleArray keeps its
+fields as column views (no copy) with int64 epoch-second times instead of
+building a dict + datetime per bar. Indexing still yields the familiar candle
+dict lazily, so code written for List[Dict] keeps working:
+
+    candles = client.get_ohlcv("EURUSD", "D1", 500, columnar=True)
+    candles.close[-20:].mean()          # columnar fast path
+    candles[-1]["close"]                # legacy dict view
+"""
+
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+CANDLE_FIELDS = ("time", "open", "high", "low", "close", "volume")
+
+
+class CandleArray(Sequence):
+    """Read-only OHLCV columns; behaves like a list of candle dicts."""
+
+    __slots__ = CANDLE_FIELDS
+
+    def __init__(self, time, open, high, low, close, volume):
+        self.time = np.asarray(time, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume)
+
+    @classmethod
+    def from_rates(cls, rates: np.ndarray) -> "CandleArray":
+        """Wrap an MT5 rates structured array (fields time/open/high/low/close/tick_volume)."""
+        return cls(
+            rates["time"], rates["open"], rates["high"], rates["low"], rates["close"],
+            rates["tick_volume"],
+        )
+
+    @classmethod
+    def from_dicts(cls, candles: Iterable[Dict]) -> "CandleArray":
+        """Build from legacy candle dicts (time as datetime or epoch seconds)."""
+        candles = list(candles)
+        times = [
+            int(c["time"].timestamp()) if isinstance(c["time"], datetime) else int(c["time"])
+            for c in candles
+        ]
+        return cls(
+            times,
+            [c["open"] for c in candles],
+            [c["high"] for c in candles],
+            [c["low"] for c in candles],
+            [c["close"] for c in candles],
+            np.asarray([c.get("volume", 0) for c in candles], dtype=np.int64),
+        )
+
+    @classmethod
+    def empty(cls) -> "CandleArray":
+        return cls([], [], [], [], [], np.empty(0, dtype=np.int64))
+
+    def column(self, name: str) -> np.ndarray:
+        """Column by candle-dict key ("time" is int64 epoch seconds)."""
+        return getattr(self, name)
+
+    def __len__(self) -> int:
+        return int(self.time.size)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CandleArray(*(getattr(self, f)[index] for f in CANDLE_FIELDS))
+        return {
+            "time": datetime.fromtimestamp(int(self.time[index]), tz=timezone.utc),
+            "open": self.open[index],
+            "high": self.high[index],
+            "low": self.low[index],
+            "close": self.close[index],
+            "volume": self.volume[index],
+        }
+
+    def __getstate__(self):
+        return {f: getattr(self, f) for f in CANDLE_FIELDS}
+
+    def __setstate__(self, state):
+        for f in CANDLE_FIELDS:
+            setattr(self, f, state[f])
+
+    def __repr__(self) -> str:
+        return f"CandleArray(len={len(self)})"
+
+    def to_dicts(self) -> List[Dict]:
+        """Materialize the legacy List[Dict] form."""
+        return [self[i] for i in range(len(self))]
+
+
+def candle_column(candles, name: str) -> np.ndarray:
+    """
+    Column `name` from either a CandleArray (zero-copy) or a list of candle dicts.
+    """
+    if isinstance(candles, CandleArray):
+        return candles.column(name)
+    return np.asarray([c[name] for c in candles], dtype=np.float64)
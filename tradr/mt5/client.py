@@ -5,11 +5,16 @@ This is the main client used by the standalone trading bot.
 It directly imports MetaTrader5 library (Windows only).
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass
+import os
 import time
 
+from tradr.mt5.candles import CandleArray
+from tradr.mt5.snapshot import BrokerSnapshot
+from tradr.mt5.gateway import MT5Gateway, OrderOp
+
 
 @dataclass
 class TickData:
@@ -62,6 +67,7 @@ class TradeResult:
     price: float = 0.0
     volume: float = 0.0
     error: str = ""
+    retcode: int = 0  # MT5 retcode of a failed order_send (-1: no reply)
 
 
 class MT5Client:
@@ -90,17 +96,25 @@ class MT5Client:
         server: str = "",
         login: int = 0,
         password: str = "",
+        clock: Callable[[], float] = time.time,
     ):
         self.server = server
         self.login = login
         self.password = password
+        # Epoch-seconds clock for order expirations (the bot clock under replay)
+        self.clock = clock
         self.connected = False
         self._mt5 = None
         self._last_heartbeat = 0.0
         self._consecutive_failures = 0
+        self._snapshot: Optional[BrokerSnapshot] = None
+        self._gateway: Optional[MT5Gateway] = None
     
     def _import_mt5(self):
-        """Lazy import of MetaTrader5 (Windows only)."""
+        """Lazy import of MetaTrader5 (Windows only), or the offline emulator when MT5_BACKEND=emulator."""
+        if self._mt5 is None and os.getenv("MT5_BACKEND", "").lower() == "emulator":
+            from tradr.mt5.emulator import get_emulator
+            self._mt5 = get_emulator()
         if self._mt5 is None:
             try:
                 import MetaTrader5 as mt5
@@ -135,6 +149,7 @@ class MT5Client:
                 return False
         
         self.connected = True
+        self._snapshot = None
         account = mt5.account_info()
         print(f"[MT5] Connected: {account.login} @ {account.server}")
         print(f"[MT5] Balance: ${account.balance:,.2f}, Equity: ${account.equity:,.2f}")
@@ -146,6 +161,10 @@ class MT5Client:
             self._mt5.shutdown()
         self.connected = False
         self._consecutive_failures = 0
+        self._snapshot = None
+        if self._gateway is not None:
+            self._gateway.close()
+            self._gateway = None
     
     def connect_with_retry(self, max_attempts: int = None) -> bool:
         """
@@ -321,10 +340,17 @@ class MT5Client:
         symbol: str,
         timeframe: str = "D1",
         count: int = 100,
+        columnar: bool = False,
     ) -> List[Dict]:
-        """Get OHLCV candle data."""
+        """
+        Get OHLCV candle data.
+        
+        With columnar=True a CandleArray is returned instead: zero-copy column
+        views over the MT5 rates array (int64 epoch times), which still
+        yields candle dicts on indexing for List[Dict] consumers.
+        """
         if not self.connected:
-            return []
+            return CandleArray.empty() if columnar else []
         
         mt5 = self._import_mt5()
         
@@ -348,7 +374,10 @@ class MT5Client:
         rates = mt5.copy_rates_from_pos(symbol, tf, 0, count)
         
         if rates is None:
-            return []
+            return CandleArray.empty() if columnar else []
+        
+        if columnar:
+            return CandleArray.from_rates(rates)
         
         candles = []
         for rate in rates:
@@ -376,6 +405,7 @@ class MT5Client:
         if not self.connected:
             return TradeResult(success=False, error="Not connected")
         
+        self.invalidate_snapshot()
         mt5 = self._import_mt5()
         
         tick = mt5.symbol_info_tick(symbol)
@@ -423,11 +453,22 @@ class MT5Client:
             volume=result.volume,
         )
     
+    @property
+    def gateway(self) -> MT5Gateway:
+        """Order gateway (dedicated MT5 I/O thread, batching, retries, latency stats)."""
+        if self._gateway is None:
+            self._gateway = MT5Gateway(self)
+        return self._gateway
+    
     def close_position(self, ticket: int) -> TradeResult:
         """Close a position by ticket."""
+        return self.gateway.run(OrderOp.close(ticket))
+    
+    def _send_close_position(self, ticket: int) -> TradeResult:
         if not self.connected:
             return TradeResult(success=False, error="Not connected")
         
+        self.invalidate_snapshot()
         mt5 = self._import_mt5()
         
         position = mt5.positions_get(ticket=ticket)
@@ -467,7 +508,7 @@ class MT5Client:
         
         if result is None or result.retcode != mt5.TRADE_RETCODE_DONE:
             error = result.comment if result else "Unknown error"
-            return TradeResult(success=False, error=error)
+            return TradeResult(success=False, error=error, retcode=result.retcode if result else -1)
         
         return TradeResult(
             success=True,
@@ -488,9 +529,13 @@ class MT5Client:
         Returns:
             TradeResult with success status and details
         """
+        return self.gateway.run(OrderOp.partial_close(ticket, volume))
+    
+    def _send_partial_close(self, ticket: int, volume: float) -> TradeResult:
         if not self.connected:
             return TradeResult(success=False, error="Not connected")
         
+        self.invalidate_snapshot()
         mt5 = self._import_mt5()
         
         position = mt5.positions_get(ticket=ticket)
@@ -540,7 +585,11 @@ class MT5Client:
         
         if result is None or result.retcode != mt5.TRADE_RETCODE_DONE:
             error = result.comment if result else "Unknown error"
-            return TradeResult(success=False, error=f"Partial close failed: {error}")
+            return TradeResult(
+                success=False,
+                error=f"Partial close failed: {error}",
+                retcode=result.retcode if result else -1,
+            )
         
         return TradeResult(
             success=True,
@@ -595,14 +644,18 @@ class MT5Client:
         tp: float = None,
     ) -> bool:
         """Modify stop loss and/or take profit of a position."""
+        return self.gateway.run(OrderOp.modify(ticket, sl=sl, tp=tp)).success
+    
+    def _send_modify_sl_tp(self, ticket: int, sl: float = None, tp: float = None) -> TradeResult:
         if not self.connected:
-            return False
+            return TradeResult(success=False, error="Not connected")
         
+        self.invalidate_snapshot()
         mt5 = self._import_mt5()
         
         position = mt5.positions_get(ticket=ticket)
         if not position:
-            return False
+            return TradeResult(success=False, error=f"Position {ticket} not found")
         
         position = position[0]
         
@@ -616,7 +669,7 @@ class MT5Client:
         
         result = mt5.order_send(request)
         
-        return result is not None and result.retcode == mt5.TRADE_RETCODE_DONE
+        return self._order_result(result, "Modify SL/TP failed")
     
     def get_available_symbols(self) -> List[str]:
         """Get list of all available symbols from broker."""
@@ -721,9 +774,30 @@ class MT5Client:
         For bullish: BUY_LIMIT if entry < ask, else BUY_STOP
         For bearish: SELL_LIMIT if entry > bid, else SELL_STOP
         """
+        return self.gateway.run(OrderOp.place_pending(
+            symbol=symbol,
+            direction=direction,
+            volume=volume,
+            entry_price=entry_price,
+            sl=sl,
+            tp=tp,
+            expiration_hours=expiration_hours,
+        ))
+    
+    def _send_pending_order(
+        self,
+        symbol: str,
+        direction: str,
+        volume: float,
+        entry_price: float,
+        sl: float,
+        tp: float,
+        expiration_hours: int = 24,
+    ) -> TradeResult:
         if not self.connected:
             return TradeResult(success=False, error="Not connected")
         
+        self.invalidate_snapshot()
         mt5 = self._import_mt5()
         
         tick = mt5.symbol_info_tick(symbol)
@@ -741,7 +815,7 @@ class MT5Client:
             else:
                 order_type = mt5.ORDER_TYPE_SELL_STOP
         
-        expiration_time = datetime.now(timezone.utc) + timedelta(hours=expiration_hours)
+        expiration_time = datetime.fromtimestamp(self.clock(), tz=timezone.utc) + timedelta(hours=expiration_hours)
         expiration_timestamp = int(expiration_time.timestamp())
         
         request = {
@@ -764,12 +838,13 @@ class MT5Client:
         result = mt5.order_send(request)
         
         if result is None:
-            return TradeResult(success=False, error="Order send returned None")
+            return TradeResult(success=False, error="Order send returned None", retcode=-1)
         
         if result.retcode != mt5.TRADE_RETCODE_DONE:
             return TradeResult(
                 success=False,
-                error=f"Pending order failed: {result.comment} (code: {result.retcode})"
+                error=f"Pending order failed: {result.comment} (code: {result.retcode})",
+                retcode=result.retcode,
             )
         
         return TradeResult(
@@ -781,9 +856,13 @@ class MT5Client:
     
     def cancel_pending_order(self, ticket: int) -> bool:
         """Cancel a pending order by ticket."""
+        return self.gateway.run(OrderOp.cancel(ticket)).success
+    
+    def _send_cancel_order(self, ticket: int) -> TradeResult:
         if not self.connected:
-            return False
+            return TradeResult(success=False, error="Not connected")
         
+        self.invalidate_snapshot()
         mt5 = self._import_mt5()
         
         request = {
@@ -793,7 +872,19 @@ class MT5Client:
         
         result = mt5.order_send(request)
         
-        return result is not None and result.retcode == mt5.TRADE_RETCODE_DONE
+        return self._order_result(result, "Cancel failed")
+    
+    def _order_result(self, result, action: str) -> TradeResult:
+        """TradeResult for an order_send reply that carries no fill (modify/cancel)."""
+        if result is None:
+            return TradeResult(success=False, error=f"{action}: order send returned None", retcode=-1)
+        if result.retcode != self._import_mt5().TRADE_RETCODE_DONE:
+            return TradeResult(
+                success=False,
+                error=f"{action}: {result.comment} (code: {result.retcode})",
+                retcode=result.retcode,
+            )
+        return TradeResult(success=True, order_id=getattr(result, "order", 0))
     
     def get_pending_orders(self, symbol: str = None) -> List[PendingOrder]:
         """Get pending orders, optionally filtered by symbol."""
@@ -829,11 +920,44 @@ class MT5Client:
         
         return result
     
+    def _bot_orders(self, symbol: str) -> Optional[List]:
+        """Raw MT5 pending orders this bot placed on `symbol` (None if the query failed)."""
+        if not self.connected:
+            return None
+        orders = self._import_mt5().orders_get(symbol=symbol)
+        if orders is None:
+            return None
+        return [o for o in orders if o.magic == self.MAGIC_NUMBER and o.comment == self.COMMENT]
+    
+    def _position_volume(self, ticket: int) -> Optional[float]:
+        """Open volume of a position (0.0 once closed, None if the query failed)."""
+        if not self.connected:
+            return None
+        positions = self._import_mt5().positions_get(ticket=ticket)
+        if positions is None:
+            return None
+        return float(positions[0].volume) if positions else 0.0
+    
     def get_my_pending_orders(self) -> List[PendingOrder]:
         """Get pending orders placed by this bot (by magic number)."""
         all_orders = self.get_pending_orders()
         return [o for o in all_orders if o.magic == self.MAGIC_NUMBER]
     
+    def snapshot(self) -> BrokerSnapshot:
+        """
+        Bot positions and pending orders, queried once and cached.
+        
+        The cache is dropped by every order action on this client and by
+        invalidate_snapshot() (the live bot calls it once per loop tick).
+        """
+        if self._snapshot is None:
+            self._snapshot = BrokerSnapshot.capture(self)
+        return self._snapshot
+    
+    def invalidate_snapshot(self):
+        """Force the next snapshot() to re-query MT5."""
+        self._snapshot = None
+    
     def place_market_order(
         self,
         symbol: str,
@@ -860,6 +984,7 @@ class MT5Client:
         if not self.connected:
             return TradeResult(success=False, error="Not connected")
         
+        self.invalidate_snapshot()
         mt5 = self._import_mt5()
         
         tick = mt5.symbol_info_tick(symbol)
@@ -0,0 +1,630 @@
+"""
+Offline MetaTrader5 emulator.
+
+A drop-in stand-in for the `MetaTrader5` module, served from the local OHLCV
+store (data/ohlcv) on a simulated clock, so main_live_bot.LiveTradingBot can
+run end to end on Linux without a terminal:
+
+    MT5_BACKEND=emulator MT5_EMULATOR_START=2024-01-08 MT5_EMULATOR_SPEED=360 \\
+        python main_live_bot.py
+
+MT5Client._import_mt5 returns the process-wide emulator when MT5_BACKEND is
+"emulator" (see install() / from_env()). The emulator implements the calls
+MT5Client makes - initialize/login/shutdown, account_info, symbols_get,
+symbol_info, symbol_info_tick, copy_rates_from_pos, positions_get, orders_get
+and order_send - with the same field names and constants.
+
+Clock: either stepped (`advance(seconds)`, deterministic replay) or free
+running at `speed` x real time. Before answering any call the fill engine
+catches up to the clock one "price bar" at a time (H1 when an H1 CSV exists,
+else H4): pending orders trigger on the high/low of bars opened after they
+were placed, SL/TP exits are checked SL-first from the bar after the entry,
+and orders expire at their (clock-relative) expiration.
+The current price is the open of the bar in progress plus a fixed spread,
+and bars in progress are built from closed price bars only, so nothing
+after the simulated "now" is ever visible.
+
+Bar times are returned as server time (SERVER_TZ) encoded as UTC, like MT5.
+"""
+
+import itertools
+import math
+import os
+import threading
+import time as _time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from tradr.backtest.h1_panel import find_h1_file, normalize_symbol
+from tradr.risk.position_sizing import get_contract_specs
+
+SERVER_TZ = ZoneInfo("Europe/Helsinki")
+
+RATES_DTYPE = np.dtype([
+    ("time", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"),
+    ("tick_volume", "<u8"), ("spread", "<i4"), ("real_volume", "<u8"),
+])
+
+# Broker index names -> local data names
+SYMBOL_ALIASES = {
+    "US500": "SPX500USD",
+    "SPX500": "SPX500USD",
+    "US100": "NAS100USD",
+    "NAS100": "NAS100USD",
+    "USTEC": "NAS100USD",
+}
+
+_FILE_TF = {"MN1": "MN", "W1": "W1", "D1": "D1", "H4": "H4"}
+_NOMINAL_S = {"MN1": 31 * 86400, "W1": 7 * 86400, "D1": 86400, "H4": 4 * 3600, "H1": 3600}
+
+
+def _read_ohlcv(path: Path) -> Optional[Dict[str, np.ndarray]]:
+    """CSV -> {"time" (epoch s, UTC), "open", "high", "low", "close", "volume"}."""
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.lower()
+    ts_col = next((c for c in ("timestamp", "time", "datetime", "date") if c in df.columns), None)
+    if ts_col is None:
+        return None
+    ts = pd.to_datetime(df[ts_col], utc=True)
+    epoch = (ts - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+    df = df.assign(_t=epoch).drop_duplicates("_t", keep="last").sort_values("_t")
+    volume = df["volume"] if "volume" in df.columns else pd.Series(0, index=df.index)
+    return {
+        "time": df["_t"].to_numpy(np.int64),
+        "open": df["open"].to_numpy(np.float64),
+        "high": df["high"].to_numpy(np.float64),
+        "low": df["low"].to_numpy(np.float64),
+        "close": df["close"].to_numpy(np.float64),
+        "volume": volume.fillna(0).to_numpy(np.int64),
+    }
+
+
+def _server_encoded(epoch_utc: np.ndarray) -> np.ndarray:
+    """UTC epoch seconds -> server wall time encoded as UTC (MT5 convention)."""
+    if epoch_utc.size == 0:
+        return epoch_utc
+    # Offset only changes twice a year; resolve it per distinct day
+    days = epoch_utc // 86400
+    uniq, inverse = np.unique(days, return_inverse=True)
+    offsets = np.array([_day_offset(int(d)) for d in uniq], dtype=np.int64)
+    return epoch_utc + offsets[inverse]
+
+
+_DAY_OFFSETS: Dict[int, int] = {}
+
+
+def _day_offset(day: int) -> int:
+    """SERVER_TZ UTC offset (seconds) at noon of an epoch day, memoized."""
+    offset = _DAY_OFFSETS.get(day)
+    if offset is None:
+        noon = datetime.fromtimestamp(day * 86400 + 43200, tz=timezone.utc)
+        offset = _DAY_OFFSETS[day] = int(noon.astimezone(SERVER_TZ).utcoffset().total_seconds())
+    return offset
+
+
+class _SymbolData:
+    """Lazily loaded series for one symbol plus a cursor into its price bars."""
+
+    def __init__(self, name: str, data_name: str, data_dir: Path, h1_dir: Optional[Path]):
+        self.name = name
+        self.data_name = data_name
+        self.data_dir = data_dir
+        self.h1_dir = h1_dir
+        self.series: Dict[str, Optional[Dict[str, np.ndarray]]] = {}
+        self.price: Optional[Dict[str, np.ndarray]] = None
+        self.price_bar_s = 0
+        self.cursor = 0  # Price bars [0, cursor) have closed and been processed
+
+        specs = get_contract_specs(data_name)
+        self.pip_size = specs["pip_size"]
+        self.pip_value = specs["pip_value_per_lot"]
+        self.contract_size = specs["contract_size"]
+        self.digits = max(2, int(round(-math.log10(self.pip_size))) + 1)
+        self.point = 10.0 ** -self.digits
+
+    def load_price(self):
+        if self.price is not None:
+            return
+        h1_path = find_h1_file(self.h1_dir, self.data_name) if self.h1_dir else None
+        if h1_path is not None:
+            self.price, self.price_bar_s = _read_ohlcv(h1_path), 3600
+        else:
+            self.price, self.price_bar_s = self.timeframe("H4"), 4 * 3600
+        if self.price is None:
+            self.price = {k: np.empty(0, dtype=np.int64 if k in ("time", "volume") else np.float64)
+                          for k in ("time", "open", "high", "low", "close", "volume")}
+
+    def timeframe(self, tf: str) -> Optional[Dict[str, np.ndarray]]:
+        if tf not in self.series:
+            data = None
+            if tf == "H1":
+                path = find_h1_file(self.h1_dir, self.data_name) if self.h1_dir else None
+                data = _read_ohlcv(path) if path else None
+            elif tf in _FILE_TF:
+                files = sorted(self.data_dir.glob(f"{self.data_name}_{_FILE_TF[tf]}_*.csv"))
+                data = _read_ohlcv(files[0]) if files else None
+            self.series[tf] = data
+        return self.series[tf]
+
+
+class MT5Emulator:
+    """Simulated MT5 terminal (module-compatible API, see module docstring)."""
+
+    # --- MetaTrader5 constants used by MT5Client ---------------------------
+    TIMEFRAME_M1, TIMEFRAME_M5, TIMEFRAME_M15, TIMEFRAME_M30 = 1, 5, 15, 30
+    TIMEFRAME_H1, TIMEFRAME_H4 = 16385, 16388
+    TIMEFRAME_D1, TIMEFRAME_W1, TIMEFRAME_MN1 = 16408, 32769, 49153
+    ORDER_TYPE_BUY, ORDER_TYPE_SELL = 0, 1
+    ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_LIMIT = 2, 3
+    ORDER_TYPE_BUY_STOP, ORDER_TYPE_SELL_STOP = 4, 5
+    TRADE_ACTION_DEAL, TRADE_ACTION_PENDING, TRADE_ACTION_SLTP = 1, 5, 6
+    TRADE_ACTION_MODIFY, TRADE_ACTION_REMOVE = 7, 8
+    ORDER_TIME_GTC, ORDER_TIME_DAY, ORDER_TIME_SPECIFIED = 0, 1, 2
+    ORDER_FILLING_FOK, ORDER_FILLING_IOC, ORDER_FILLING_RETURN = 0, 1, 2
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_INVALID = 10013
+    TRADE_RETCODE_INVALID_VOLUME = 10014
+    TRADE_RETCODE_INVALID_PRICE = 10015
+    TRADE_RETCODE_MARKET_CLOSED = 10018
+    TRADE_RETCODE_POSITION_CLOSED = 10036
+
+    _TF_NAMES = {16385: "H1", 16388: "H4", 16408: "D1", 32769: "W1", 49153: "MN1"}
+
+    def __init__(
+        self,
+        start: datetime,
+        data_dir: str = "data/ohlcv",
+        h1_dir: Optional[str] = None,
+        balance: float = 60_000.0,
+        speed: Optional[float] = None,
+        spread_pips: float = 1.0,
+        leverage: int = 100,
+    ):
+        """
+        Args:
+            start: Simulated start time (UTC)
+            data_dir: MN/W1/D1/H4 CSV store ({SYMBOL}_{TF}_*.csv)
+            h1_dir: Optional H1 CSV directory (finer fill engine), defaults to data_dir
+            balance: Starting balance (USD)
+            speed: Free-running clock multiplier; None = stepped via advance()
+            spread_pips: Fixed spread applied to every symbol
+        """
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        self.data_dir = Path(data_dir)
+        self.h1_dir = Path(h1_dir) if h1_dir else self.data_dir
+        self.balance = float(balance)
+        self.speed = speed
+        self.spread_pips = spread_pips
+        self.leverage = leverage
+
+        self._start = start.timestamp()
+        self._now = self._start
+        self._wall0 = _time.monotonic()
+        self._lock = threading.RLock()
+        self._tickets = itertools.count(100_000)
+        self._positions: Dict[int, SimpleNamespace] = {}
+        self._orders: Dict[int, SimpleNamespace] = {}
+        self.closed_deals: List[Dict] = []
+        self.stats = {"calls": 0, "order_sends": 0, "fills": 0, "sl_hits": 0, "tp_hits": 0, "expired": 0}
+
+        self._symbols: Dict[str, _SymbolData] = {}
+        self._resolved: Dict[str, Optional[_SymbolData]] = {}
+        for path in sorted(self.data_dir.glob("*_D1_*.csv")):
+            name = path.name.split("_D1_")[0]
+            self._symbols[name] = _SymbolData(name, name, self.data_dir, self.h1_dir)
+        for alias, target in SYMBOL_ALIASES.items():
+            if target in self._symbols and alias not in self._symbols:
+                self._symbols[alias] = _SymbolData(alias, target, self.data_dir, self.h1_dir)
+
+    @classmethod
+    def from_env(cls) -> "MT5Emulator":
+        """Build from MT5_EMULATOR_* environment variables."""
+        start = os.getenv("MT5_EMULATOR_START", "2024-01-08")
+        speed = os.getenv("MT5_EMULATOR_SPEED")
+        return cls(
+            start=datetime.fromisoformat(start),
+            data_dir=os.getenv("MT5_EMULATOR_DATA_DIR", "data/ohlcv"),
+            h1_dir=os.getenv("MT5_EMULATOR_H1_DIR"),
+            balance=float(os.getenv("MT5_EMULATOR_BALANCE", "60000")),
+            speed=float(speed) if speed else None,
+        )
+
+    # ------------------------------------------------------------------
+    # Clock
+    # ------------------------------------------------------------------
+
+    def time(self) -> float:
+        """Simulated epoch seconds (UTC)."""
+        if self.speed:
+            return self._start + (_time.monotonic() - self._wall0) * self.speed
+        return self._now
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time(), tz=timezone.utc)
+
+    def advance(self, seconds: float):
+        """Step the simulated clock (stepped mode) and run the fill engine."""
+        with self._lock:
+            self._now += seconds
+            self._sync()
+
+    def advance_to(self, when: datetime):
+        self.advance(max(0.0, when.timestamp() - self._now))
+
+    # ------------------------------------------------------------------
+    # Fill engine
+    # ------------------------------------------------------------------
+
+    def _sync(self):
+        """Process every price bar that closed up to the current clock."""
+        now = self.time()
+        active = {self._resolve(p.symbol).name for p in self._positions.values()}
+        active |= {self._resolve(o.symbol).name for o in self._orders.values()}
+        for name in active:
+            sym = self._symbols[name]
+            sym.load_price()
+            times = sym.price["time"]
+            end = int(np.searchsorted(times, now - sym.price_bar_s, side="right"))
+            for i in range(sym.cursor, end):
+                self._process_bar(sym, i)
+            sym.cursor = max(sym.cursor, end)
+        for sym in self._symbols.values():
+            if sym.price is not None and sym.name not in active:
+                sym.cursor = int(np.searchsorted(sym.price["time"], now - sym.price_bar_s, side="right"))
+
+    def _process_bar(self, sym: _SymbolData, i: int):
+        p = sym.price
+        t_open, o, h, l = int(p["time"][i]), p["open"][i], p["high"][i], p["low"][i]
+        t_close = t_open + sym.price_bar_s
+        spread = self.spread_pips * sym.pip_size
+
+        for order in [o_ for o_ in self._orders.values() if self._resolve(o_.symbol) is sym]:
+            if order.time_setup > t_open:
+                continue  # Placed mid-bar: the bar's range may predate the order
+            if order.time_expiration and order.time_expiration <= t_open:
+                del self._orders[order.ticket]
+                self.stats["expired"] += 1
+                continue
+            price = self._trigger_price(order, o, h, l, spread)
+            if price is not None:
+                del self._orders[order.ticket]
+                self._open_position(order.ticket, order.symbol, order.type % 2, order.volume_current, price,
+                                    order.sl, order.tp, t_open, order.magic, order.comment)
+
+        for pos in [p_ for p_ in self._positions.values() if self._resolve(p_.symbol) is sym]:
+            if pos.time >= t_open:
+                continue  # Exits are checked from the bar after the entry
+            exit_price, reason = self._exit_price(pos, o, h, l, spread)
+            if exit_price is not None:
+                self.stats["sl_hits" if reason == "sl" else "tp_hits"] += 1
+                self._close(pos, pos.volume, exit_price, t_close, reason)
+
+    def _trigger_price(self, order, o, h, l, spread) -> Optional[float]:
+        """Fill price if the order triggers on this bar (bid OHLC, ask = bid + spread)."""
+        price = order.price_open
+        if order.type == self.ORDER_TYPE_BUY_LIMIT and l + spread <= price:
+            return min(price, o + spread)
+        if order.type == self.ORDER_TYPE_BUY_STOP and h + spread >= price:
+            return max(price, o + spread)
+        if order.type == self.ORDER_TYPE_SELL_LIMIT and h >= price:
+            return max(price, o)
+        if order.type == self.ORDER_TYPE_SELL_STOP and l <= price:
+            return min(price, o)
+        return None
+
+    def _exit_price(self, pos, o, h, l, spread) -> Tuple[Optional[float], str]:
+        """SL/TP exit on this bar, SL checked first (gaps fill at the open)."""
+        if pos.type == self.ORDER_TYPE_BUY:
+            if pos.sl and l <= pos.sl:
+                return min(pos.sl, o), "sl"
+            if pos.tp and h >= pos.tp:
+                return max(pos.tp, o), "tp"
+        else:
+            if pos.sl and h + spread >= pos.sl:
+                return max(pos.sl, o + spread), "sl"
+            if pos.tp and l + spread <= pos.tp:
+                return min(pos.tp, o + spread), "tp"
+        return None, ""
+
+    def _profit(self, sym: _SymbolData, side: int, entry: float, price: float, volume: float) -> float:
+        sign = 1.0 if side == self.ORDER_TYPE_BUY else -1.0
+        return sign * (price - entry) / sym.pip_size * sym.pip_value * volume
+
+    def _open_position(self, ticket, symbol, side, volume, price, sl, tp, t, magic, comment):
+        self._positions[ticket] = SimpleNamespace(
+            ticket=ticket, identifier=ticket, symbol=symbol, type=side, volume=volume,
+            price_open=price, price_current=price, sl=sl or 0.0, tp=tp or 0.0, profit=0.0,
+            time=t, magic=magic, comment=comment,
+        )
+        self.stats["fills"] += 1
+
+    def _close(self, pos, volume: float, price: float, t: float, reason: str) -> float:
+        sym = self._resolve(pos.symbol)
+        pnl = self._profit(sym, pos.type, pos.price_open, price, volume)
+        self.balance += pnl
+        pos.volume = round(pos.volume - volume, 2)
+        if pos.volume <= 0:
+            del self._positions[pos.ticket]
+        self.closed_deals.append({
+            "ticket": pos.ticket, "symbol": pos.symbol, "volume": volume, "entry": pos.price_open,
+            "exit": price, "pnl": pnl, "time": int(t), "reason": reason,
+        })
+        return pnl
+
+    # ------------------------------------------------------------------
+    # Prices
+    # ------------------------------------------------------------------
+
+    def _resolve(self, symbol: str) -> Optional[_SymbolData]:
+        """Broker name (EURUSD, EURUSD.a, US500.cash, ...) -> local series."""
+        if symbol not in self._resolved:
+            sym = None
+            for name in (symbol, normalize_symbol(symbol.split(".")[0]), normalize_symbol(symbol).replace("CASH", "")):
+                sym = self._symbols.get(name) or self._symbols.get(SYMBOL_ALIASES.get(name, ""))
+                if sym is not None:
+                    break
+            self._resolved[symbol] = sym
+        return self._resolved[symbol]
+
+    def _bid(self, sym: _SymbolData, now: float) -> Optional[Tuple[float, int]]:
+        """Current bid (open of the price bar in progress, else last close)."""
+        sym.load_price()
+        p = sym.price
+        i = int(np.searchsorted(p["time"], now, side="right")) - 1
+        if i < 0:
+            return None
+        if now < p["time"][i] + sym.price_bar_s:
+            return float(p["open"][i]), int(p["time"][i])
+        return float(p["close"][i]), int(p["time"][i] + sym.price_bar_s)
+
+    # ------------------------------------------------------------------
+    # MetaTrader5 API
+    # ------------------------------------------------------------------
+
+    def initialize(self, *args, **kwargs) -> bool:
+        return True
+
+    def login(self, *args, **kwargs) -> bool:
+        return True
+
+    def shutdown(self):
+        pass
+
+    def last_error(self):
+        return (1, "Success")
+
+    def version(self):
+        return (500, 0, "emulator")
+
+    def terminal_info(self):
+        return SimpleNamespace(connected=True, trade_allowed=True, name="MT5 Emulator")
+
+    def account_info(self):
+        with self._lock:
+            self._sync()
+            floating = sum(self._floating(pos) for pos in self._positions.values())
+            equity = self.balance + floating
+            return SimpleNamespace(
+                login=0, server="Emulator", balance=self.balance, equity=equity, profit=floating,
+                margin=0.0, margin_free=equity, leverage=self.leverage, currency="USD",
+            )
+
+    def _floating(self, pos) -> float:
+        sym = self._resolve(pos.symbol)
+        quote = self._bid(sym, self.time())
+        if quote is None:
+            return 0.0
+        bid = quote[0]
+        price = bid if pos.type == self.ORDER_TYPE_BUY else bid + self.spread_pips * sym.pip_size
+        pos.price_current = price
+        pos.profit = self._profit(sym, pos.type, pos.price_open, price, pos.volume)
+        return pos.profit
+
+    def symbols_get(self, group: str = None):
+        return tuple(SimpleNamespace(name=name) for name in self._symbols)
+
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        return self._resolve(symbol) is not None
+
+    def symbol_info(self, symbol: str):
+        sym = self._resolve(symbol)
+        if sym is None:
+            return None
+        return SimpleNamespace(
+            name=symbol, digits=sym.digits, point=sym.point,
+            spread=int(round(self.spread_pips * sym.pip_size / sym.point)),
+            volume_min=0.01, volume_max=100.0, volume_step=0.01,
+            trade_contract_size=sym.contract_size, trade_tick_size=sym.point,
+            trade_tick_value=sym.pip_value * sym.point / sym.pip_size,
+            filling_mode=1, visible=True,
+        )
+
+    def symbol_info_tick(self, symbol: str):
+        sym = self._resolve(symbol)
+        if sym is None:
+            return None
+        with self._lock:
+            self.stats["calls"] += 1
+            quote = self._bid(sym, self.time())
+        if quote is None:
+            return None
+        bid, t = quote
+        ask = bid + self.spread_pips * sym.pip_size
+        return SimpleNamespace(time=int(_server_encoded(np.array([t]))[0]), bid=bid, ask=ask, last=bid, volume=0)
+
+    def copy_rates_from_pos(self, symbol: str, timeframe: int, start_pos: int, count: int):
+        sym = self._resolve(symbol)
+        tf = self._TF_NAMES.get(timeframe)
+        if sym is None or tf is None:
+            return None
+        data = sym.timeframe(tf)
+        if data is None:
+            return None
+
+        with self._lock:
+            self.stats["calls"] += 1
+            now = self.time()
+            sym.load_price()
+
+        times = data["time"]
+        end = int(np.searchsorted(times, now, side="right")) - start_pos
+        begin = max(0, end - count)
+        if end <= 0:
+            return np.empty(0, dtype=RATES_DTYPE)
+
+        rates = np.empty(end - begin, dtype=RATES_DTYPE)
+        rates["time"] = _server_encoded(times[begin:end])
+        for f in ("open", "high", "low", "close"):
+            rates[f] = data[f][begin:end]
+        rates["tick_volume"] = data["volume"][begin:end]
+        rates["spread"] = int(round(self.spread_pips * sym.pip_size / sym.point))
+        rates["real_volume"] = 0
+
+        # Bar in progress: rebuild it from closed price bars only
+        last_open = int(times[end - 1])
+        bar_end = int(times[end]) if end < times.size else last_open + _NOMINAL_S[tf]
+        if start_pos == 0 and now < bar_end:
+            p = sym.price
+            lo = int(np.searchsorted(p["time"], last_open, side="left"))
+            hi = int(np.searchsorted(p["time"], now - sym.price_bar_s, side="right"))
+            if hi > lo:
+                rates["high"][-1] = p["high"][lo:hi].max()
+                rates["low"][-1] = p["low"][lo:hi].min()
+                rates["close"][-1] = p["close"][hi - 1]
+                rates["tick_volume"][-1] = p["volume"][lo:hi].sum()
+            else:
+                rates["high"][-1] = rates["low"][-1] = rates["close"][-1] = rates["open"][-1]
+                rates["tick_volume"][-1] = 0
+        return rates
+
+    def positions_get(self, symbol: str = None, ticket: int = None, group: str = None):
+        with self._lock:
+            self.stats["calls"] += 1
+            self._sync()
+            out = []
+            for pos in self._positions.values():
+                if (symbol is None or pos.symbol == symbol) and (ticket is None or pos.ticket == ticket):
+                    self._floating(pos)
+                    out.append(SimpleNamespace(**vars(pos)))
+            for pos in out:
+                pos.time = int(_server_encoded(np.array([int(pos.time)]))[0])
+            return tuple(out)
+
+    def orders_get(self, symbol: str = None, ticket: int = None, group: str = None):
+        with self._lock:
+            self.stats["calls"] += 1
+            self._sync()
+            return tuple(
+                SimpleNamespace(**vars(o)) for o in self._orders.values()
+                if (symbol is None or o.symbol == symbol) and (ticket is None or o.ticket == ticket)
+            )
+
+    def order_send(self, request: Dict):
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["order_sends"] += 1
+            self._sync()
+            action = request.get("action")
+            if action == self.TRADE_ACTION_DEAL:
+                return self._deal(request)
+            if action == self.TRADE_ACTION_PENDING:
+                return self._pending(request)
+            if action == self.TRADE_ACTION_SLTP:
+                pos = self._positions.get(request.get("position"))
+                if pos is None:
+                    return self._reply(self.TRADE_RETCODE_POSITION_CLOSED, "Position not found")
+                pos.sl = request.get("sl", pos.sl) or 0.0
+                pos.tp = request.get("tp", pos.tp) or 0.0
+                return self._reply(self.TRADE_RETCODE_DONE, "Done", order=pos.ticket)
+            if action == self.TRADE_ACTION_REMOVE:
+                if self._orders.pop(request.get("order"), None) is None:
+                    return self._reply(self.TRADE_RETCODE_INVALID, "Order not found")
+                return self._reply(self.TRADE_RETCODE_DONE, "Done", order=request.get("order"))
+            return self._reply(self.TRADE_RETCODE_INVALID, f"Unsupported action {action}")
+
+    def _reply(self, retcode: int, comment: str, order: int = 0, deal: int = 0, price: float = 0.0, volume: float = 0.0):
+        return SimpleNamespace(retcode=retcode, comment=comment, order=order, deal=deal, price=price, volume=volume)
+
+    def _deal(self, request: Dict):
+        sym = self._resolve(request.get("symbol", ""))
+        now = self.time()
+        quote = self._bid(sym, now) if sym else None
+        if quote is None:
+            return self._reply(self.TRADE_RETCODE_MARKET_CLOSED, "No price")
+        bid = quote[0]
+        ask = bid + self.spread_pips * sym.pip_size
+        volume = round(float(request.get("volume", 0)), 2)
+        if volume <= 0:
+            return self._reply(self.TRADE_RETCODE_INVALID_VOLUME, "Invalid volume")
+
+        position_ticket = request.get("position")
+        if position_ticket:
+            pos = self._positions.get(position_ticket)
+            if pos is None:
+                return self._reply(self.TRADE_RETCODE_POSITION_CLOSED, "Position not found")
+            volume = min(volume, pos.volume)
+            price = bid if pos.type == self.ORDER_TYPE_BUY else ask
+            self._close(pos, volume, price, now, "close")
+            return self._reply(self.TRADE_RETCODE_DONE, "Done", order=next(self._tickets),
+                               deal=next(self._tickets), price=price, volume=volume)
+
+        side = request.get("type", self.ORDER_TYPE_BUY)
+        price = ask if side == self.ORDER_TYPE_BUY else bid
+        ticket = next(self._tickets)
+        self._open_position(ticket, request["symbol"], side, volume, price, request.get("sl"), request.get("tp"),
+                            now, request.get("magic", 0), request.get("comment", ""))
+        return self._reply(self.TRADE_RETCODE_DONE, "Done", order=ticket, deal=next(self._tickets),
+                           price=price, volume=volume)
+
+    def _pending(self, request: Dict):
+        sym = self._resolve(request.get("symbol", ""))
+        if sym is None:
+            return self._reply(self.TRADE_RETCODE_INVALID, "Unknown symbol")
+        volume = round(float(request.get("volume", 0)), 2)
+        if volume <= 0:
+            return self._reply(self.TRADE_RETCODE_INVALID_VOLUME, "Invalid volume")
+        price = float(request.get("price", 0))
+        if price <= 0:
+            return self._reply(self.TRADE_RETCODE_INVALID_PRICE, "Invalid price")
+
+        now = self.time()
+        expiration = 0
+        if request.get("type_time") == self.ORDER_TIME_SPECIFIED and request.get("expiration"):
+            # Expirations are absolute epoch seconds on the simulated clock
+            # (MT5Client stamps them from the bot clock, which is this one)
+            expiration = int(request["expiration"])
+
+        ticket = next(self._tickets)
+        self._orders[ticket] = SimpleNamespace(
+            ticket=ticket, symbol=request["symbol"], type=request.get("type"), volume_initial=volume,
+            volume_current=volume, price_open=price, sl=request.get("sl", 0.0) or 0.0,
+            tp=request.get("tp", 0.0) or 0.0, time_setup=int(now), time_expiration=int(expiration),
+            magic=request.get("magic", 0), comment=request.get("comment", ""),
+        )
+        return self._reply(self.TRADE_RETCODE_DONE, "Done", order=ticket, price=price, volume=volume)
+
+
+_default: Optional[MT5Emulator] = None
+
+
+def install(emulator: Optional[MT5Emulator] = None) -> MT5Emulator:
+    """Make `emulator` (or one from the environment) the MT5 backend for new MT5Clients."""
+    global _default
+    _default = emulator or MT5Emulator.from_env()
+    os.environ["MT5_BACKEND"] = "emulator"
+    return _default
+
+
+def get_emulator() -> MT5Emulator:
+    """Process-wide emulator (one simulated terminal shared by all clients)."""
+    global _default
+    if _default is None:
+        _default = MT5Emulator.from_env()
+    return _default
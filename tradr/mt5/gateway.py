@@ -0,0 +1,262 @@
+"""
+Asyncio order gateway for MT5Client.
+
+Every order operation (close, partial close, SL/TP modify, pending order
+place/cancel) is queued to a dedicated MT5 I/O thread and awaited from a
+private asyncio loop. A batch is queued in one go, so eight emergency closes
+go out back to back instead of each waiting for the caller to log, re-query
+and loop; failed requests with a transient retcode are retried with backoff
+without holding up the rest of the batch.
+
+A rejection (requote, price changed, ...) means nothing happened, so every
+operation is resent. After a timeout or no reply the broker may already have
+executed the request: close / modify / cancel by ticket are resent as-is,
+while place_pending and partial_close are resent only once the broker's
+orders (magic + comment) or the position volume show that the first attempt
+did not go through. If that cannot be established, the error is returned.
+
+    results = client.gateway.run_batch([OrderOp.close(t) for t in tickets])
+    client.gateway.latency_stats()["close"]["p95_ms"]
+
+The MetaTrader5 package talks to one terminal over IPC and is not documented
+as thread-safe, so the I/O thread pool defaults to a single thread; the
+synchronous MT5Client order methods are thin wrappers around run().
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# order_send retcodes where the request was rejected and is safe to resend
+# (requote, price changed/off, too many requests, no connection)
+REJECTED_RETCODES = frozenset({10004, 10020, 10021, 10024, 10031})
+# Timeout and -1 ("order_send returned None"): the request may have been executed
+AMBIGUOUS_RETCODES = frozenset({10012, -1})
+RETRYABLE_RETCODES = REJECTED_RETCODES | AMBIGUOUS_RETCODES
+# Operations that can be repeated without doubling their effect
+IDEMPOTENT_KINDS = frozenset({"close", "modify", "cancel"})
+
+
+@dataclass
+class OrderOp:
+    """One order request for the gateway."""
+    kind: str  # close | partial_close | modify | cancel | place_pending
+    ticket: int = 0
+    params: Dict = field(default_factory=dict)
+
+    @classmethod
+    def close(cls, ticket: int) -> "OrderOp":
+        return cls("close", ticket)
+
+    @classmethod
+    def partial_close(cls, ticket: int, volume: float) -> "OrderOp":
+        return cls("partial_close", ticket, {"volume": volume})
+
+    @classmethod
+    def modify(cls, ticket: int, sl: float = None, tp: float = None) -> "OrderOp":
+        return cls("modify", ticket, {"sl": sl, "tp": tp})
+
+    @classmethod
+    def cancel(cls, ticket: int) -> "OrderOp":
+        return cls("cancel", ticket)
+
+    @classmethod
+    def place_pending(cls, **params) -> "OrderOp":
+        """Params as MT5Client.place_pending_order (symbol, direction, volume, entry_price, sl, tp, ...)."""
+        return cls("place_pending", 0, params)
+
+
+class LatencyTracker:
+    """Rolling per-kind request latency (submit to final result, retries included)."""
+
+    def __init__(self, window: int = 1000):
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, seconds: float, retries: int, success: bool):
+        with self._lock:
+            self._samples.setdefault(kind, deque(maxlen=self._window)).append(seconds)
+            counts = self._counts.setdefault(kind, {"requests": 0, "retries": 0, "failures": 0})
+            counts["requests"] += 1
+            counts["retries"] += retries
+            counts["failures"] += 0 if success else 1
+
+    def summary(self) -> Dict[str, Dict]:
+        with self._lock:
+            out = {}
+            for kind, samples in self._samples.items():
+                ms = np.asarray(samples) * 1000.0
+                out[kind] = dict(
+                    self._counts[kind],
+                    mean_ms=round(float(ms.mean()), 2),
+                    p50_ms=round(float(np.percentile(ms, 50)), 2),
+                    p95_ms=round(float(np.percentile(ms, 95)), 2),
+                    max_ms=round(float(ms.max()), 2),
+                )
+            return out
+
+
+class MT5Gateway:
+    """
+    Queue MT5Client order operations onto a dedicated I/O thread.
+
+    Args:
+        client: MT5Client (provides the _send_* request implementations)
+        max_retries: Extra attempts for a retryable retcode
+        retry_backoff_s: First retry delay, doubled per attempt
+        io_threads: MT5 I/O threads (keep 1 unless the terminal tolerates concurrent calls)
+    """
+
+    def __init__(self, client, max_retries: int = 2, retry_backoff_s: float = 0.1, io_threads: int = 1):
+        self.client = client
+        self.max_retries = max_retries
+        self.retry_backoff_s = retry_backoff_s
+        self.io_threads = io_threads
+        self.latency = LatencyTracker()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._io: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._io = ThreadPoolExecutor(max_workers=self.io_threads, thread_name_prefix="mt5-io")
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="mt5-gateway", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def close(self):
+        """Stop the loop and I/O thread (queued requests finish first)."""
+        with self._lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._io.shutdown(wait=True)
+            self._loop.close()
+            self._loop = self._io = self._thread = None
+
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, op: OrderOp):
+        client = self.client
+        if op.kind == "close":
+            return client._send_close_position(op.ticket)
+        if op.kind == "partial_close":
+            return client._send_partial_close(op.ticket, op.params["volume"])
+        if op.kind == "modify":
+            return client._send_modify_sl_tp(op.ticket, **op.params)
+        if op.kind == "cancel":
+            return client._send_cancel_order(op.ticket)
+        if op.kind == "place_pending":
+            return client._send_pending_order(**op.params)
+        raise ValueError(f"Unknown order op: {op.kind}")
+
+    def _broker_state(self, op: OrderOp):
+        """What a non-idempotent op would change: matching bot order tickets / position volume (None = unknown)."""
+        if op.kind == "place_pending":
+            orders = self.client._bot_orders(op.params["symbol"])
+            return None if orders is None else {o.ticket for o in orders}
+        if op.kind == "partial_close":
+            return self.client._position_volume(op.ticket)
+        return None
+
+    def _reconcile(self, op: OrderOp, before, failed):
+        """
+        Resolve a timeout / no reply for place_pending or partial_close.
+        
+        Returns None if the broker shows the request was not executed (safe to
+        resend), a success TradeResult if it was, or `failed` if that cannot
+        be told.
+        """
+        from tradr.mt5.client import TradeResult
+        
+        after = self._broker_state(op)
+        if before is None or after is None:
+            return failed
+        if op.kind == "place_pending":
+            params = op.params
+            new = [
+                o for o in self.client._bot_orders(params["symbol"]) or []
+                if o.ticket not in before
+                and abs(o.price_open - params["entry_price"]) <= 1e-9 * max(1.0, abs(params["entry_price"]))
+                and abs(o.volume_current - params["volume"]) < 1e-9
+            ]
+            if not new:
+                return None
+            return TradeResult(success=True, order_id=new[0].ticket, price=new[0].price_open,
+                               volume=new[0].volume_current)
+        # partial_close: the volume dropped (or the position is gone) -> executed
+        requested = op.params["volume"]
+        if after <= before - min(requested, before) + 1e-9:
+            return TradeResult(success=True, volume=round(before - after, 2))
+        if abs(after - before) < 1e-9:
+            return None
+        return failed
+
+    async def submit(self, op: OrderOp):
+        """Run one request on the I/O thread, retrying transient failures."""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        retries = 0
+        verify = op.kind not in IDEMPOTENT_KINDS
+        before = await loop.run_in_executor(self._io, self._broker_state, op) if verify else None
+        while True:
+            result = await loop.run_in_executor(self._io, self._dispatch, op)
+            if result.success or result.retcode not in RETRYABLE_RETCODES:
+                break
+            if verify and result.retcode in AMBIGUOUS_RETCODES:
+                resolved = await loop.run_in_executor(self._io, self._reconcile, op, before, result)
+                if resolved is not None:
+                    result = resolved
+                    break
+            if retries >= self.max_retries:
+                break
+            retries += 1
+            await asyncio.sleep(self.retry_backoff_s * 2 ** (retries - 1))
+        self.latency.record(op.kind, time.perf_counter() - start, retries, result.success)
+        return result
+
+    async def submit_many(self, ops: List[OrderOp]) -> List:
+        """Queue all requests at once; results in the order of `ops`."""
+        results = await asyncio.gather(*(self.submit(op) for op in ops), return_exceptions=True)
+        return [self._as_result(r) for r in results]
+
+    @staticmethod
+    def _as_result(result):
+        if isinstance(result, BaseException):
+            from tradr.mt5.client import TradeResult
+            return TradeResult(success=False, error=f"{type(result).__name__}: {result}")
+        return result
+
+    # ------------------------------------------------------------------
+    # Blocking API (used by MT5Client and the live bot)
+    # ------------------------------------------------------------------
+
+    def run(self, op: OrderOp):
+        """Submit one request and wait for its TradeResult (exceptions propagate)."""
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(self.submit(op), loop).result()
+
+    def run_batch(self, ops: List[OrderOp]) -> List:
+        """Submit a batch of requests concurrently and wait for all TradeResults."""
+        if not ops:
+            return []
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(self.submit_many(list(ops)), loop).result()
+
+    def latency_stats(self) -> Dict[str, Dict]:
+        """Per-kind request counts, retries, failures and latency percentiles."""
+        return self.latency.summary()
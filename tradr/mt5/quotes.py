@@ -0,0 +1,130 @@
+"""
+Batched quote polling for the live bot's entry and spread queues.
+
+One refresh() pulls the latest tick for every watched symbol in a single
+pass (each symbol once, however many queues watch it), keeps bid/ask/spread
+in memory, and evaluates every watch condition against the fresh quote:
+
+    quotes = QuoteService(client)
+    quotes.watch("entry", "EUR_USD", "EURUSD", lambda tick: near_entry(tick))
+    for event in quotes.refresh():      # every few seconds
+        handle(event.kind, event.key, event.tick)
+
+Watches are edge-triggered: an event fires when a condition turns true and
+not again until it has been false in between, so a queue that cannot act on
+an event (order rejected, volume check failed) is not hammered every poll -
+the periodic queue check still retries it.
+
+tick(symbol, max_age_s) serves the cached quote while it is fresh, so the
+periodic queue checks reuse what the poller already fetched.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from tradr.mt5.client import TickData
+
+
+@dataclass
+class QuoteWatch:
+    """A condition on one symbol's quote, owned by a queue entry."""
+    kind: str  # Queue name, e.g. "entry" | "spread"
+    key: str  # Queue key (our symbol)
+    symbol: str  # Broker symbol to poll
+    condition: Callable[["TickData"], bool]
+    armed: bool = True  # False while the condition holds (after it fired)
+
+
+@dataclass
+class QuoteEvent:
+    """A watch condition that turned true on the latest refresh."""
+    kind: str
+    key: str
+    tick: "TickData"
+
+
+class QuoteService:
+    """
+    In-memory latest quotes for watched symbols, refreshed in one pass.
+
+    Args:
+        client: MT5Client (get_tick)
+        clock: Epoch-seconds clock used for quote age (the bot clock)
+    """
+
+    def __init__(self, client, clock: Callable[[], float] = time.time):
+        self.client = client
+        self.clock = clock
+        self._ticks: Dict[str, "TickData"] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._watches: Dict[Tuple[str, str], QuoteWatch] = {}
+        self.stats = {"refreshes": 0, "ticks": 0, "tick_failures": 0, "cache_hits": 0, "events": 0}
+
+    # ------------------------------------------------------------------
+    # Watches
+    # ------------------------------------------------------------------
+
+    def watch(self, kind: str, key: str, symbol: str, condition: Callable[["TickData"], bool]):
+        """Add or update a watch (an existing watch keeps its trigger state)."""
+        existing = self._watches.get((kind, key))
+        if existing is not None and existing.symbol == symbol:
+            existing.condition = condition
+        else:
+            self._watches[(kind, key)] = QuoteWatch(kind, key, symbol, condition)
+
+    def unwatch(self, kind: str, key: str):
+        self._watches.pop((kind, key), None)
+
+    def watched(self, kind: str) -> List[str]:
+        return [key for (k, key) in self._watches if k == kind]
+
+    @property
+    def symbols(self) -> List[str]:
+        return sorted({w.symbol for w in self._watches.values()})
+
+    # ------------------------------------------------------------------
+    # Quotes
+    # ------------------------------------------------------------------
+
+    def _fetch(self, symbol: str) -> Optional["TickData"]:
+        tick = self.client.get_tick(symbol)
+        if tick is None:
+            self.stats["tick_failures"] += 1
+            return None
+        self.stats["ticks"] += 1
+        self._ticks[symbol] = tick
+        self._fetched_at[symbol] = self.clock()
+        return tick
+
+    def refresh(self) -> List[QuoteEvent]:
+        """Fetch every watched symbol once and return the watches that just triggered."""
+        self.stats["refreshes"] += 1
+        ticks = {symbol: self._fetch(symbol) for symbol in self.symbols}
+
+        events = []
+        for watch in list(self._watches.values()):
+            tick = ticks.get(watch.symbol)
+            if tick is None:
+                continue
+            if watch.condition(tick):
+                if watch.armed:
+                    watch.armed = False
+                    events.append(QuoteEvent(watch.kind, watch.key, tick))
+            else:
+                watch.armed = True
+        self.stats["events"] += len(events)
+        return events
+
+    def tick(self, symbol: str, max_age_s: Optional[float] = None) -> Optional["TickData"]:
+        """Latest quote: cached while younger than `max_age_s`, else fetched now."""
+        if max_age_s is not None and symbol in self._ticks:
+            if self.clock() - self._fetched_at[symbol] <= max_age_s:
+                self.stats["cache_hits"] += 1
+                return self._ticks[symbol]
+        return self._fetch(symbol)
+
+    def last(self, symbol: str) -> Optional["TickData"]:
+        """Last fetched quote (no terminal call, may be stale)."""
+        return self._ticks.get(symbol)
@@ -0,0 +1,65 @@
+"""
+Per-tick broker state snapshot.
+
+One `positions_get` + `orders_get` round trip, indexed for the lookups the
+live bot does many times per loop iteration:
+
+    snap = client.snapshot()
+    snap.has_position("EURUSD")
+    snap.position(ticket)
+    snap.order(ticket)
+
+MT5Client caches the snapshot until `invalidate_snapshot()` is called - by the
+bot at the start of every loop tick, and by the client itself after every
+order action (open, close, partial close, modify, place/cancel pending), so a
+snapshot never outlives a change this process made to broker state.
+"""
+
+import time
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from tradr.mt5.client import PendingOrder, Position
+
+
+class BrokerSnapshot:
+    """Immutable view of this bot's open positions and pending orders."""
+
+    __slots__ = (
+        "positions", "orders", "positions_by_ticket", "positions_by_symbol",
+        "orders_by_ticket", "captured_at",
+    )
+
+    def __init__(self, positions=(), orders=()):
+        self.positions: Tuple["Position", ...] = tuple(positions)
+        self.orders: Tuple["PendingOrder", ...] = tuple(orders)
+        self.positions_by_ticket: Dict[int, "Position"] = {p.ticket: p for p in self.positions}
+        self.positions_by_symbol: Dict[str, Tuple["Position", ...]] = {}
+        for p in self.positions:
+            self.positions_by_symbol[p.symbol] = self.positions_by_symbol.get(p.symbol, ()) + (p,)
+        self.orders_by_ticket: Dict[int, "PendingOrder"] = {o.ticket: o for o in self.orders}
+        self.captured_at = time.monotonic()
+
+    @classmethod
+    def capture(cls, client) -> "BrokerSnapshot":
+        """Query the bot's (magic-number) positions and pending orders once."""
+        return cls(client.get_my_positions(), client.get_my_pending_orders())
+
+    def position(self, ticket: int) -> Optional["Position"]:
+        return self.positions_by_ticket.get(ticket)
+
+    def positions_for(self, symbol: str) -> Tuple["Position", ...]:
+        return self.positions_by_symbol.get(symbol, ())
+
+    def has_position(self, symbol: str) -> bool:
+        return symbol in self.positions_by_symbol
+
+    def order(self, ticket: int) -> Optional["PendingOrder"]:
+        return self.orders_by_ticket.get(ticket)
+
+    @property
+    def position_symbols(self):
+        return self.positions_by_symbol.keys()
+
+    def __repr__(self) -> str:
+        return f"BrokerSnapshot(positions={len(self.positions)}, orders={len(self.orders)})"
@@ -10,6 +10,10 @@ from tradr.risk.manager import (
     ChallengeState,
 )
 
+from tradr.risk.equity_history import EquityHistory
+from tradr.risk.ledger import RiskLedger
+from tradr.risk.portfolio import PortfolioRiskEngine
+
 from tradr.risk.position_sizing import (
     calculate_lot_size,
     get_pip_value,
@@ -19,6 +23,9 @@ __all__ = [
     "RiskManager",
     "RiskCheckResult",
     "ChallengeState",
+    "EquityHistory",
+    "RiskLedger",
+    "PortfolioRiskEngine",
     "calculate_lot_size",
     "get_pip_value",
 ]
@@ -0,0 +1,188 @@
+"""
+Intraday equity history for the drawdown monitor.
+
+A fixed-size ring buffer keeps the last `capacity` (time, balance, equity)
+samples; one monotonic deque pair per window keeps the rolling equity
+maximum and minimum, so window queries are O(1):
+
+    history = EquityHistory(capacity=8640, dump_dir="logs/equity")
+    history.add(now, balance, equity)                  # every DD monitor tick
+    history.peak("4h"), history.trough("4h")
+    history.drawdown_pct("4h")                         # rolling 4h peak -> now
+
+When the ring has been overwritten once since the last dump (rotation) the
+unsaved samples are written to `<dump_dir>/equity_<first>_<last>.npy`, a raw
+float64 record array (24 bytes per sample) that load_samples() reads back.
+"""
+
+from collections import deque
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+SAMPLE_DTYPE = np.dtype([("time", "f8"), ("balance", "f8"), ("equity", "f8")])
+
+DEFAULT_WINDOWS = {
+    "1h": 3600.0,
+    "4h": 4 * 3600.0,
+    "session": 8 * 3600.0,
+    "day": 24 * 3600.0,
+}
+
+
+class _RollingExtremes:
+    """Rolling max/min of equity over a time window (amortized O(1) per sample)."""
+
+    __slots__ = ("window", "_max", "_min")
+
+    def __init__(self, window: float):
+        self.window = window
+        self._max: deque = deque()  # (time, equity), equity decreasing
+        self._min: deque = deque()  # (time, equity), equity increasing
+
+    def add(self, t: float, equity: float):
+        while self._max and self._max[-1][1] <= equity:
+            self._max.pop()
+        self._max.append((t, equity))
+        while self._min and self._min[-1][1] >= equity:
+            self._min.pop()
+        self._min.append((t, equity))
+        cutoff = t - self.window
+        while self._max[0][0] < cutoff:
+            self._max.popleft()
+        while self._min[0][0] < cutoff:
+            self._min.popleft()
+
+    @property
+    def max(self) -> Optional[float]:
+        return self._max[0][1] if self._max else None
+
+    @property
+    def min(self) -> Optional[float]:
+        return self._min[0][1] if self._min else None
+
+    def clear(self):
+        self._max.clear()
+        self._min.clear()
+
+
+class EquityHistory:
+    """
+    Ring buffer of equity samples with rolling per-window extremes.
+
+    Args:
+        capacity: Samples kept in memory (8640 = one day at 10s)
+        windows: {name: seconds} for peak/trough/drawdown queries
+        dump_dir: Where rotated samples are written (None = never dump)
+    """
+
+    def __init__(
+        self,
+        capacity: int = 8640,
+        windows: Optional[Dict[str, float]] = None,
+        dump_dir: Optional[str] = None,
+    ):
+        self.capacity = capacity
+        self.dump_dir = Path(dump_dir) if dump_dir else None
+        self._buf = np.zeros(capacity, dtype=SAMPLE_DTYPE)
+        self._next = 0  # Slot the next sample goes to
+        self._count = 0  # Valid samples in the ring
+        self._unsaved = 0  # Samples written since the last dump
+        self._windows = {name: _RollingExtremes(seconds) for name, seconds in (windows or DEFAULT_WINDOWS).items()}
+        self.stats = {"samples": 0, "dumps": 0}
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def windows(self) -> Dict[str, float]:
+        return {name: w.window for name, w in self._windows.items()}
+
+    def add(self, t: float, balance: float, equity: float):
+        """Append a sample (times must not go backwards)."""
+        if self._unsaved >= self.capacity:
+            # The next write overwrites a sample that was never dumped
+            self.dump()
+        self._buf[self._next] = (t, balance, equity)
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self._unsaved += 1
+        for window in self._windows.values():
+            window.add(t, equity)
+        self.stats["samples"] += 1
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def last(self) -> Optional[np.void]:
+        return self._buf[self._next - 1] if self._count else None
+
+    def peak(self, window: str) -> Optional[float]:
+        """Highest equity within the window."""
+        return self._windows[window].max
+
+    def trough(self, window: str) -> Optional[float]:
+        """Lowest equity within the window."""
+        return self._windows[window].min
+
+    def drawdown(self, window: str) -> float:
+        """Drop from the window's equity peak to the latest equity (USD, >= 0)."""
+        peak = self._windows[window].max
+        if peak is None:
+            return 0.0
+        return max(0.0, peak - float(self._buf[self._next - 1]["equity"]))
+
+    def drawdown_pct(self, window: str) -> float:
+        """drawdown() as % of the window's equity peak."""
+        peak = self._windows[window].max
+        return self.drawdown(window) / peak * 100 if peak else 0.0
+
+    def range_pct(self, window: str) -> float:
+        """Peak-to-trough equity range within the window, % of the peak."""
+        w = self._windows[window]
+        if not w.max:
+            return 0.0
+        return (w.max - w.min) / w.max * 100
+
+    def samples(self, last: Optional[int] = None) -> np.ndarray:
+        """The newest `last` samples (default: all kept), oldest first."""
+        n = self._count if last is None else min(last, self._count)
+        if n == 0:
+            return self._buf[:0].copy()
+        start = (self._next - n) % self.capacity
+        if start + n <= self.capacity:
+            return self._buf[start:start + n].copy()
+        return np.concatenate([self._buf[start:], self._buf[:self._next]])
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def dump(self) -> Optional[Path]:
+        """Write the samples added since the last dump; returns the file (or None)."""
+        unsaved, self._unsaved = self._unsaved, 0
+        if self.dump_dir is None or unsaved == 0:
+            return None
+        rows = self.samples(unsaved)
+        path = self.dump_dir / f"equity_{int(rows['time'][0])}_{int(rows['time'][-1])}.npy"
+        try:
+            self.dump_dir.mkdir(parents=True, exist_ok=True)
+            np.save(path, rows)
+            self.stats["dumps"] += 1
+            return path
+        except Exception as e:
+            print(f"[EquityHistory] Could not dump {len(rows)} samples to {path}: {e}")
+            return None
+
+    def clear(self):
+        self._next = self._count = self._unsaved = 0
+        for window in self._windows.values():
+            window.clear()
+
+
+def load_samples(path) -> np.ndarray:
+    """Read a dumped equity file back as a (time, balance, equity) record array."""
+    return np.load(path).astype(SAMPLE_DTYPE, copy=False)
@@ -0,0 +1,184 @@
+"""
+Running portfolio risk totals for pre-trade checks.
+
+The ledger is updated on every open, close, fill and cancel, so a pre-trade
+check reads its totals instead of re-summing every position and pending
+order:
+
+    ledger = RiskLedger()
+    ledger.add_pending("EUR_USD", "EURUSD", risk_usd=300.0, score=4.2)
+    ledger.cancel("EUR_USD")                # filled: the order leaves the book ...
+    ledger.open(123456, "EURUSD", 300.0)    # ... and the position enters it
+    ledger.close(123456)
+    ledger.open_risk, ledger.pending_risk, ledger.currency_exposure("USD")
+
+All updates are O(1) (O(log n) for the pending heap); worst_pending() pops
+stale heap entries lazily.
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from tradr.risk.position_sizing import normalize_symbol
+
+CURRENCIES = frozenset({
+    "EUR", "USD", "GBP", "JPY", "AUD", "NZD", "CAD", "CHF", "XAU", "XAG", "BTC", "ETH",
+})
+
+
+def symbol_currencies(symbol: str) -> Tuple[str, ...]:
+    """Currencies a symbol is exposed to: (base, quote) for pairs, else the symbol itself."""
+    normalized = normalize_symbol(symbol)
+    if normalized.endswith("CASH"):
+        normalized = normalized[:-4]
+    base, quote = normalized[:3], normalized[3:6]
+    if len(normalized) == 6 and base in CURRENCIES and quote in CURRENCIES:
+        return (base, quote)
+    return (normalized,)
+
+
+@dataclass
+class LedgerEntry:
+    """Risk (loss at SL, USD) of one open position or pending order."""
+    symbol: str
+    risk_usd: float
+    score: float = 0.0
+    seq: int = 0
+
+
+class RiskLedger:
+    """Open / pending risk with per-symbol and per-currency totals."""
+
+    def __init__(self):
+        self._open: Dict[Hashable, LedgerEntry] = {}
+        self._pending: Dict[Hashable, LedgerEntry] = {}
+        self._worst: List[Tuple[float, int, Hashable]] = []
+        self._seq = itertools.count()
+        self.open_risk = 0.0
+        self.pending_risk = 0.0
+        self._by_symbol: Dict[str, float] = {}
+        self._by_currency: Dict[str, float] = {}
+
+    # ------------------------------------------------------------------
+    # Totals
+    # ------------------------------------------------------------------
+
+    @property
+    def total_risk(self) -> float:
+        return self.open_risk + self.pending_risk
+
+    @property
+    def open_count(self) -> int:
+        return len(self._open)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def symbol_exposure(self, symbol: str) -> float:
+        """Open + pending risk on one symbol (USD)."""
+        return self._by_symbol.get(normalize_symbol(symbol), 0.0)
+
+    def currency_exposure(self, currency: str) -> float:
+        """Open + pending risk on every symbol that contains `currency` (USD)."""
+        return self._by_currency.get(currency.upper(), 0.0)
+
+    def worst_case_dd(
+        self,
+        balance: float,
+        day_start_balance: float,
+        initial_balance: float,
+        extra_loss: float = 0.0,
+        include_pending: bool = False,
+    ) -> Tuple[float, float]:
+        """
+        (daily_dd_pct, total_dd_pct) if every open position (and optionally
+        every pending order) plus `extra_loss` hit their stops.
+        """
+        loss = self.open_risk + extra_loss + (self.pending_risk if include_pending else 0.0)
+        simulated = balance - loss
+        daily = (day_start_balance - simulated) / day_start_balance * 100 if simulated < day_start_balance else 0.0
+        total = (initial_balance - simulated) / initial_balance * 100 if simulated < initial_balance else 0.0
+        return daily, total
+
+    def _book(self, entry: LedgerEntry, sign: float):
+        symbol = normalize_symbol(entry.symbol)
+        self._by_symbol[symbol] = self._by_symbol.get(symbol, 0.0) + sign * entry.risk_usd
+        for currency in symbol_currencies(symbol):
+            self._by_currency[currency] = self._by_currency.get(currency, 0.0) + sign * entry.risk_usd
+        if sign < 0 and not self._open and not self._pending:
+            # Nothing left: drop accumulated float error
+            self.open_risk = self.pending_risk = 0.0
+            self._by_symbol.clear()
+            self._by_currency.clear()
+
+    # ------------------------------------------------------------------
+    # Positions
+    # ------------------------------------------------------------------
+
+    def open(self, key: Hashable, symbol: str, risk_usd: float):
+        """Add (or replace) an open position."""
+        self.close(key)
+        entry = self._open[key] = LedgerEntry(symbol, float(risk_usd))
+        self.open_risk += entry.risk_usd
+        self._book(entry, 1.0)
+
+    def close(self, key: Hashable) -> Optional[LedgerEntry]:
+        entry = self._open.pop(key, None)
+        if entry is not None:
+            self.open_risk -= entry.risk_usd
+            self._book(entry, -1.0)
+        return entry
+
+    # ------------------------------------------------------------------
+    # Pending orders
+    # ------------------------------------------------------------------
+
+    def add_pending(self, key: Hashable, symbol: str, risk_usd: float, score: float = 0.0):
+        """Add (or replace) a pending order; `score` ranks it for worst_pending()."""
+        self.cancel(key)
+        entry = self._pending[key] = LedgerEntry(symbol, float(risk_usd), float(score), next(self._seq))
+        self.pending_risk += entry.risk_usd
+        self._book(entry, 1.0)
+        if len(self._worst) > 2 * len(self._pending) + 16:
+            # Mostly stale entries: rebuild from the live orders
+            self._worst = [(e.score, e.seq, k) for k, e in self._pending.items() if k != key]
+            heapq.heapify(self._worst)
+        heapq.heappush(self._worst, (entry.score, entry.seq, key))
+
+    def cancel(self, key: Hashable) -> Optional[LedgerEntry]:
+        entry = self._pending.pop(key, None)
+        if entry is not None:
+            self.pending_risk -= entry.risk_usd
+            self._book(entry, -1.0)
+        return entry
+
+    def worst_pending(self) -> Optional[Tuple[Hashable, float]]:
+        """(key, score) of the lowest-scoring pending order, or None."""
+        heap = self._worst
+        while heap:
+            score, seq, key = heap[0]
+            entry = self._pending.get(key)
+            if entry is not None and entry.seq == seq:
+                return key, score
+            heapq.heappop(heap)
+        return None
+
+    def clear_open(self):
+        for key in list(self._open):
+            self.close(key)
+    
+    def clear_pending(self):
+        for key in list(self._pending):
+            self.cancel(key)
+        self._worst.clear()
+
+    def clear(self):
+        self._open.clear()
+        self._pending.clear()
+        self._worst.clear()
+        self.open_risk = self.pending_risk = 0.0
+        self._by_symbol.clear()
+        self._by_currency.clear()
@@ -7,13 +7,14 @@ All risk checks happen BEFORE a trade is placed.
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, date, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
+from tradr.risk.ledger import RiskLedger
 from tradr.risk.position_sizing import calculate_lot_size, get_pip_value, get_contract_specs
+from tradr.utils.state_store import StateStore, get_state_store, get_write_behind
 
 
 @dataclass
@@ -41,6 +42,23 @@ class OpenPosition:
         return stop_pips * pip_value * self.lot_size
 
 
+def pending_order_risk(symbol: str, lot_size: float, entry: float, sl: float) -> float:
+    """Loss in USD if a pending order fills and its SL is hit (0 for incomplete orders)."""
+    if not (lot_size > 0 and entry > 0 and sl > 0):
+        return 0.0
+    stop_distance = abs(entry - sl)
+    pip_value = get_pip_value(symbol, entry)
+    specs = get_contract_specs(symbol)
+    pip_size = specs.get("pip_value", 0.0001)
+    
+    if specs.get("pip_location", 4) == 0:
+        stop_pips = stop_distance
+    else:
+        stop_pips = stop_distance / pip_size
+    
+    return stop_pips * pip_value * lot_size
+
+
 @dataclass
 class DailyRecord:
     """Track daily PnL for profitable day counting."""
@@ -157,6 +175,10 @@ class RiskManager:
     - Max drawdown tracking: Blocks trades that would breach 10% overall limit
     - Emergency close: Closes all positions before hitting hard limits
     - Partial take profits: Scales out at TP1, TP2, TP3
+    
+    Open and pending risk are kept as running totals in `self.ledger`
+    (tradr.risk.ledger.RiskLedger), updated on every open/close/fill/cancel,
+    so check_trade costs the same however many positions are on.
     """
     
     MAX_DAILY_LOSS_PCT = 5.0
@@ -173,26 +195,48 @@ class RiskManager:
     
     DEFAULT_RISK_PCT = 0.005  # 0.5% - aligned with FTMO ultra-conservative config
     
-    def __init__(self, state_file: str = "challenge_state.json"):
+    def __init__(self, state_file: str = "challenge_state.json", store: Optional[StateStore] = None):
+        """
+        Args:
+            state_file: Legacy JSON state file; its stem names the state-store
+                namespace and it is migrated into the store on first use
+            store: State store (default: the shared bot_state.db store)
+        """
         self.state_file = Path(state_file)
+        self.store = store or get_state_store()
+        self.writer = get_write_behind(self.store)
+        self.namespace = self.state_file.stem
+        self.ledger = RiskLedger()
         self.state = self._load_state()
+        self._rebuild_ledger()
+    
+    def _rebuild_ledger(self):
+        """Re-book every open position from the state (after load / reset)."""
+        self.ledger.clear_open()
+        for pos_dict in self.state.open_positions:
+            pos = OpenPosition(**pos_dict) if isinstance(pos_dict, dict) else pos_dict
+            self.ledger.open(pos.order_id, pos.symbol, pos.potential_loss_usd())
     
     def _load_state(self) -> ChallengeState:
-        """Load state from file or create new."""
-        if self.state_file.exists():
-            try:
-                with open(self.state_file, 'r') as f:
-                    data = json.load(f)
+        """Load state from the state store or create new."""
+        try:
+            self.store.migrate_json(self.namespace, self.state_file)
+            data = self.store.items(self.namespace)
+            if data:
                 return ChallengeState.from_dict(data)
-            except Exception as e:
-                print(f"[RiskManager] Error loading state: {e}")
+        except Exception as e:
+            print(f"[RiskManager] Error loading state: {e}")
         return ChallengeState()
     
-    def save_state(self):
-        """Save state to file."""
+    def save_state(self, critical: bool = True):
+        """
+        Save state (one record per field; only changed fields are written).
+        
+        Non-critical saves - the periodic MT5 sync - are coalesced and
+        written on the store's WriteBehind cadence.
+        """
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(self.state.to_dict(), f, indent=2, default=str)
+            self.writer.stage(self.namespace, self.state.to_dict(), critical=critical)
         except Exception as e:
             print(f"[RiskManager] Error saving state: {e}")
     
@@ -203,6 +247,7 @@ class RiskManager:
         Use this on startup to ensure risk manager uses real account values
         instead of potentially stale state file values.
         """
+        reset = False
         if abs(self.state.current_balance - balance) > 1.0:
             print(f"[RiskManager] Syncing balance: {self.state.current_balance:.2f} -> {balance:.2f}")
             self.state.current_balance = balance
@@ -218,6 +263,7 @@ class RiskManager:
         
         if abs(self.state.initial_balance - balance) > 1.0 and should_reset_initial:
             print(f"[RiskManager] Syncing initial balance: {self.state.initial_balance:.2f} -> {balance:.2f}")
+            reset = True
             self.state.initial_balance = balance
             self.state.highest_balance = max(self.state.highest_balance, balance)
             self.state.day_start_balance = balance
@@ -235,7 +281,8 @@ class RiskManager:
             self.state.highest_balance = equity
         
         self.state.last_update = datetime.now(timezone.utc).isoformat()
-        self.save_state()
+        # Periodic sync: deferred unless the challenge baseline was reset
+        self.save_state(critical=reset)
     
     def start_challenge(self, phase: int = 1):
         """Start or restart a challenge."""
@@ -251,6 +298,7 @@ class RiskManager:
             start_time=now.isoformat(),
             last_update=now.isoformat(),
         )
+        self._rebuild_ledger()
         self.save_state()
         return self.state
     
@@ -299,12 +347,8 @@ class RiskManager:
             self.save_state()
     
     def _calculate_total_open_risk(self) -> float:
-        """Calculate total potential loss from all open positions."""
-        total_risk = 0.0
-        for pos_dict in self.state.open_positions:
-            pos = OpenPosition(**pos_dict) if isinstance(pos_dict, dict) else pos_dict
-            total_risk += pos.potential_loss_usd()
-        return total_risk
+        """Total potential loss from all open positions (running ledger total)."""
+        return self.ledger.open_risk
     
     def _simulate_worst_case_dd(
         self,
@@ -316,20 +360,12 @@ class RiskManager:
         Returns:
             (daily_dd_pct, total_dd_pct) after simulated losses
         """
-        existing_risk = self._calculate_total_open_risk()
-        total_potential_loss = existing_risk + new_trade_loss
-        
-        simulated_balance = self.state.current_balance - total_potential_loss
-        
-        daily_dd_pct = 0.0
-        if simulated_balance < self.state.day_start_balance:
-            daily_dd_pct = ((self.state.day_start_balance - simulated_balance) / self.state.day_start_balance) * 100
-        
-        total_dd_pct = 0.0
-        if simulated_balance < self.state.initial_balance:
-            total_dd_pct = ((self.state.initial_balance - simulated_balance) / self.state.initial_balance) * 100
-        
-        return daily_dd_pct, total_dd_pct
+        return self.ledger.worst_case_dd(
+            self.state.current_balance,
+            self.state.day_start_balance,
+            self.state.initial_balance,
+            extra_loss=new_trade_loss,
+        )
     
     def check_trade(
         self,
@@ -532,6 +568,7 @@ class RiskManager:
         )
         
         self.state.open_positions.append(asdict(position))
+        self.ledger.open(order_id, symbol, position.potential_loss_usd())
         self.state.total_trades += 1
         self.state.last_update = datetime.now(timezone.utc).isoformat()
         self.save_state()
@@ -549,6 +586,7 @@ class RiskManager:
             p for p in self.state.open_positions
             if p.get("order_id") != order_id
         ]
+        self.ledger.close(order_id)
         
         self.state.current_balance += pnl_usd
         
@@ -667,27 +705,29 @@ class RiskManager:
         Returns:
             Total potential risk in USD from all pending orders.
         """
-        total_risk = 0.0
-        for setup in pending_setups:
-            symbol = setup.get('symbol', '')
-            lot_size = setup.get('lot_size', 0.0)
-            entry = setup.get('entry_price', 0.0)
-            sl = setup.get('stop_loss', 0.0)
-            
-            if lot_size > 0 and entry > 0 and sl > 0:
-                stop_distance = abs(entry - sl)
-                pip_value = get_pip_value(symbol, entry)
-                
-                from tradr.risk.position_sizing import get_contract_specs
-                specs = get_contract_specs(symbol)
-                pip_size = specs.get("pip_value", 0.0001)
-                
-                if specs.get("pip_location", 4) == 0:
-                    stop_pips = stop_distance
-                else:
-                    stop_pips = stop_distance / pip_size
-                
-                risk_usd = stop_pips * pip_value * lot_size
-                total_risk += risk_usd
-        
-        return total_risk
+        return sum(
+            pending_order_risk(
+                setup.get('symbol', ''),
+                setup.get('lot_size', 0.0),
+                setup.get('entry_price', 0.0),
+                setup.get('stop_loss', 0.0),
+            )
+            for setup in pending_setups
+        )
+    
+    def track_pending_order(
+        self,
+        key: str,
+        symbol: str,
+        lot_size: float,
+        entry_price: float,
+        stop_loss: float,
+        score: float = 0.0,
+    ):
+        """Book (or re-book) a pending order in the ledger; `score` ranks replacement candidates."""
+        risk_usd = pending_order_risk(symbol, lot_size, entry_price, stop_loss)
+        self.ledger.add_pending(key, symbol, risk_usd, score)
+    
+    def untrack_pending_order(self, key: str):
+        """Remove a pending order from the ledger (filled, cancelled or expired)."""
+        self.ledger.cancel(key)
@@ -0,0 +1,264 @@
+"""
+Correlation-aware portfolio stress check for the order placement path.
+
+RiskManager._simulate_worst_case_dd adds up every stop independently; it
+never sees that EURUSD + EURJPY + EURGBP share the EUR leg. This engine keeps a rolling
+covariance matrix of daily symbol returns, fed incrementally from the
+closed D1 bars in the candle cache, and prices the book as one portfolio:
+
+    engine = PortfolioRiskEngine(window=250)
+    engine.update({"EURUSD": daily, "EURJPY": daily_jpy}, until=last_closed_bar)
+    engine.set_book(positions, orders)                # broker snapshot
+    stress = engine.check_order("EURGBP", "bullish", 0.5, 0.8550, 0.8500,
+                                day_start_balance=60_000, current_loss=300)
+    if stress.breach: ...
+
+A position's daily P&L is modelled as w * r, with w its signed USD
+sensitivity to a 1.0 relative price move and r the symbol's daily return.
+The book's loss quantile is z * sqrt(w' C w) at the configured confidence,
+capped by the sum of the stop-loss amounts (a stop limits the loss).
+C @ w is cached with the book, so checking one extra order costs O(1).
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from tradr.risk.position_sizing import get_contract_specs, get_pip_value, normalize_symbol
+
+BUY_TYPES = (0, 2, 4, 6)  # ORDER_TYPE_BUY / BUY_LIMIT / BUY_STOP / BUY_STOP_LIMIT
+
+
+def position_weight(symbol: str, direction: str, lots: float, price: float) -> float:
+    """Signed USD P&L of a position for a +100% price move (the return sensitivity)."""
+    spec_symbol = normalize_symbol(symbol)
+    if spec_symbol.endswith("CASH"):
+        spec_symbol = spec_symbol[:-4]  # US100.cash -> US100
+    specs = get_contract_specs(spec_symbol)
+    usd_per_price_unit = get_pip_value(spec_symbol, price) / specs.get("pip_size", 0.0001)
+    sign = 1.0 if direction in ("bullish", "buy", "long") else -1.0
+    return sign * lots * usd_per_price_unit * price
+
+
+@dataclass
+class StressResult:
+    """Projected daily loss at the engine's confidence level (USD / % of day start)."""
+    loss_usd: float
+    loss_pct: float
+    limit_pct: float
+    breach: bool
+    observations: int
+
+
+class PortfolioRiskEngine:
+    """
+    Rolling covariance of daily returns plus the current book.
+
+    Args:
+        window: Daily returns kept in the covariance (ring buffer)
+        confidence: Loss quantile for check_order (0.99 = 99th percentile)
+        min_observations: Below this many days check_order never blocks
+    """
+
+    def __init__(self, window: int = 250, confidence: float = 0.99, min_observations: int = 20):
+        self.window = window
+        self.z = NormalDist().inv_cdf(confidence)
+        self.confidence = confidence
+        self.min_observations = min_observations
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._rows: deque = deque()
+        self._sum = np.zeros(0)
+        self._outer = np.zeros((0, 0))
+        self._cov: Optional[np.ndarray] = None
+        self._last_time: Optional[int] = None
+        self._pushes = 0
+        # Book: signed weights and summed stop-loss caps
+        self._w = np.zeros(0)
+        self._cap = 0.0
+        self._cw: Optional[np.ndarray] = None
+        self._var = 0.0
+
+    # ------------------------------------------------------------------
+    # Returns / covariance
+    # ------------------------------------------------------------------
+
+    @property
+    def observations(self) -> int:
+        return len(self._rows)
+
+    def _ensure(self, symbol: str) -> int:
+        idx = self._index.get(symbol)
+        if idx is None:
+            idx = self._index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            n = len(self.symbols)
+            self._sum = np.append(self._sum, 0.0)
+            outer = np.zeros((n, n))
+            outer[:-1, :-1] = self._outer
+            self._outer = outer
+            self._rows = deque(np.append(row, 0.0) for row in self._rows)
+            self._w = np.append(self._w, 0.0)
+            self._cov = self._cw = None
+        return idx
+
+    def _push(self, row: np.ndarray):
+        self._rows.append(row)
+        self._sum += row
+        self._outer += np.outer(row, row)
+        if len(self._rows) > self.window:
+            old = self._rows.popleft()
+            self._sum -= old
+            self._outer -= np.outer(old, old)
+        self._pushes += 1
+        if self._pushes % self.window == 0:
+            # Re-sum now and then so add/subtract rounding cannot accumulate
+            rows = np.array(self._rows)
+            self._sum = rows.sum(axis=0)
+            self._outer = rows.T @ rows
+
+    def update(self, daily_by_symbol: Dict[str, object], until: Optional[int] = None) -> int:
+        """
+        Add the daily returns of bars newer than the last update.
+
+        Args:
+            daily_by_symbol: {symbol: D1 CandleArray}
+            until: Only bars opened at or before this time (the last closed
+                D1 bar; the forming bar must not enter the covariance)
+
+        Returns:
+            Number of new days added
+        """
+        series = {}
+        for symbol, candles in daily_by_symbol.items():
+            if candles is None or len(candles) < 2:
+                continue
+            times, closes = candles.time, candles.close
+            if until is not None:
+                count = int(np.searchsorted(times, until, side="right"))
+                times, closes = times[:count], closes[:count]
+            if times.size < 2:
+                continue
+            series[self._ensure(symbol)] = (times[1:], closes[1:] / closes[:-1] - 1.0)
+        if not series:
+            return 0
+
+        new_times = np.unique(np.concatenate([t for t, _ in series.values()]))
+        if self._last_time is not None:
+            new_times = new_times[new_times > self._last_time]
+        new_times = new_times[-self.window:]
+        if new_times.size == 0:
+            return 0
+
+        block = np.zeros((new_times.size, len(self.symbols)))
+        for idx, (times, returns) in series.items():
+            pos = np.searchsorted(times, new_times)
+            pos = np.minimum(pos, times.size - 1)
+            hit = times[pos] == new_times
+            block[hit, idx] = returns[pos[hit]]
+        for row in block:
+            self._push(row)
+
+        self._last_time = int(new_times[-1])
+        self._cov = self._cw = None
+        return int(new_times.size)
+
+    @property
+    def covariance(self) -> np.ndarray:
+        if self._cov is None:
+            n = len(self._rows)
+            if n < 2:
+                self._cov = np.zeros((len(self.symbols), len(self.symbols)))
+            else:
+                self._cov = (self._outer - np.outer(self._sum, self._sum) / n) / (n - 1)
+        return self._cov
+
+    def correlation(self, a: str, b: str) -> float:
+        cov = self.covariance
+        i, j = self._index.get(a), self._index.get(b)
+        if i is None or j is None or cov[i, i] <= 0 or cov[j, j] <= 0:
+            return 0.0
+        return float(cov[i, j] / np.sqrt(cov[i, i] * cov[j, j]))
+
+    # ------------------------------------------------------------------
+    # Book
+    # ------------------------------------------------------------------
+
+    def set_book(self, positions: Iterable = (), orders: Iterable = ()):
+        """
+        Replace the book with broker positions and pending orders (MT5Client
+        Position / PendingOrder). Pending orders count as if filled.
+        """
+        self._w = np.zeros(len(self.symbols))
+        self._cap = 0.0
+        for pos in positions:
+            direction = "bullish" if pos.type in BUY_TYPES else "bearish"
+            self._add(pos.symbol, direction, pos.volume, pos.price_open, pos.sl)
+        for order in orders:
+            direction = "bullish" if order.type in BUY_TYPES else "bearish"
+            self._add(order.symbol, direction, order.volume, order.price, order.sl)
+        self._cw = None
+
+    def _add(self, symbol: str, direction: str, lots: float, price: float, sl: float) -> float:
+        if price <= 0 or lots <= 0:
+            return 0.0
+        weight = position_weight(symbol, direction, lots, price)
+        idx = self._ensure(symbol)
+        self._w[idx] += weight
+        stop_loss = abs(weight) * abs(price - sl) / price if sl > 0 else float("inf")
+        self._cap += stop_loss
+        return weight
+
+    def _refresh_book(self):
+        if self._cw is None:
+            self._cw = self.covariance @ self._w
+            self._var = float(self._w @ self._cw)
+
+    def book_loss(self) -> float:
+        """Loss quantile (USD) of the current book."""
+        self._refresh_book()
+        return min(self.z * np.sqrt(max(self._var, 0.0)), self._cap)
+
+    # ------------------------------------------------------------------
+    # Pre-trade check
+    # ------------------------------------------------------------------
+
+    def check_order(
+        self,
+        symbol: str,
+        direction: str,
+        lots: float,
+        entry: float,
+        sl: float,
+        day_start_balance: float,
+        current_loss: float = 0.0,
+        limit_pct: float = 5.0,
+    ) -> StressResult:
+        """
+        Would adding this order push the projected daily loss past `limit_pct`?
+
+        `current_loss` is today's loss so far (USD, >= 0); the projection adds
+        the book's loss quantile with the new order included.
+        """
+        self._refresh_book()
+        var, cap = self._var, self._cap
+        idx = self._index.get(symbol)
+        if idx is not None and entry > 0 and lots > 0:
+            x = position_weight(symbol, direction, lots, entry)
+            cov = self.covariance
+            var += 2.0 * x * self._cw[idx] + x * x * cov[idx, idx]
+            cap += abs(x) * abs(entry - sl) / entry if sl > 0 else float("inf")
+
+        loss = min(self.z * np.sqrt(max(var, 0.0)), cap) + max(current_loss, 0.0)
+        loss_pct = loss / day_start_balance * 100 if day_start_balance > 0 else 0.0
+        enough = self.observations >= self.min_observations
+        return StressResult(
+            loss_usd=float(loss),
+            loss_pct=float(loss_pct),
+            limit_pct=limit_pct,
+            breach=bool(enough and loss_pct >= limit_pct),
+            observations=self.observations,
+        )
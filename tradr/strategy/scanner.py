@@ -0,0 +1,205 @@
+"""
+Scan pipeline helpers for the live bot.
+
+`evaluate_symbol_confluence` is the pure, MT5-free part of
+LiveTradingBot.scan_symbol (HTF trends -> direction -> confluence/levels).
+It takes plain candle lists and StrategyParams only, so it can run in a
+worker process while the main thread keeps fetching candles and placing
+orders one at a time.
+
+`precompute_symbol` runs that evaluation on the candles as they stood at
+the last daily close (closed D1/H4 bars only) and adds the daily ATR. The
+result only changes when a new D1 bar closes or the parameters change, so
+the live bot computes it right after the close and every scan that day
+just applies its thresholds and live price checks to the cached result.
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from tradr.mt5.candles import CandleArray
+from strategy_core import (
+    StrategyParams,
+    compute_confluence,
+    _infer_trend,
+    _pick_direction_from_bias,
+)
+
+
+def evaluate_symbol_confluence(
+    symbol: str,
+    data: Dict[str, List[Dict]],
+    params: StrategyParams,
+    use_historical_sr: bool = True,
+) -> Dict:
+    """
+    Evaluate HTF bias and confluence for one symbol (same steps as scan_symbol).
+
+    Args:
+        symbol: OANDA-format symbol (used for historical S/R lookup)
+        data: {"monthly", "weekly", "daily", "h4"} candle lists from get_candle_data
+        params: Strategy parameters
+        use_historical_sr: Load historical HTF S/R levels for the symbol
+
+    Returns:
+        Dict with direction, flags, notes and trade_levels
+    """
+    monthly_candles = data["monthly"] if data["monthly"] else []
+    weekly_candles = data["weekly"]
+    daily_candles = data["daily"]
+    h4_candles = data["h4"] if data["h4"] else daily_candles[-20:]
+
+    mn_trend = _infer_trend(monthly_candles) if monthly_candles else "mixed"
+    wk_trend = _infer_trend(weekly_candles) if weekly_candles else "mixed"
+    d_trend = _infer_trend(daily_candles) if daily_candles else "mixed"
+
+    direction, _, _ = _pick_direction_from_bias(mn_trend, wk_trend, d_trend)
+
+    historical_sr = None
+    if use_historical_sr:
+        try:
+            from historical_sr import get_all_htf_sr_levels
+            historical_sr = get_all_htf_sr_levels(symbol)
+        except ImportError:
+            historical_sr = None
+
+    flags, notes, trade_levels = compute_confluence(
+        monthly_candles,
+        weekly_candles,
+        daily_candles,
+        h4_candles,
+        direction,
+        params,
+        historical_sr,
+    )
+
+    return {
+        "direction": direction,
+        "flags": flags,
+        "notes": notes,
+        "trade_levels": trade_levels,
+    }
+
+
+DAILY_BAR_S = 86400
+H4_BAR_S = 4 * 3600
+
+
+def params_fingerprint(params: StrategyParams) -> str:
+    """Stable hash of every StrategyParams field (cache key for precomputed evaluations)."""
+    raw = json.dumps(asdict(params), sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def closed_bars(candles, bar_s: int, cutoff: int):
+    """Candles whose bar closed at or before `cutoff` (epoch seconds, same encoding as candle times)."""
+    if not isinstance(candles, CandleArray) or not len(candles):
+        return candles
+    count = int(np.searchsorted(candles.time + bar_s, cutoff, side="right"))
+    return candles[:count]
+
+
+def last_daily_close(daily, server_now: int) -> Optional[int]:
+    """Open time of the last D1 bar closed at `server_now` (None if there is none)."""
+    closed = closed_bars(daily, DAILY_BAR_S, server_now)
+    if not isinstance(closed, CandleArray) or not len(closed):
+        return None
+    return int(closed.time[-1])
+
+
+def average_true_range(candles, period: int = 14) -> float:
+    """
+    Average True Range over the last `period` candles.
+    
+    Args:
+        candles: CandleArray or list of candle dicts with 'high', 'low', 'close' keys
+        period: ATR period (default 14)
+    
+    Returns:
+        ATR value, or 0.0 if insufficient data
+    """
+    if len(candles) < period + 1:
+        return 0.0
+    
+    if isinstance(candles, CandleArray):
+        high, low, close = candles.high[-period:], candles.low[-period:], candles.close[-period - 1:-1]
+        true_ranges = np.maximum.reduce([high - low, np.abs(high - close), np.abs(low - close)]).tolist()
+        return sum(true_ranges) / period
+    
+    true_ranges = []
+    for i in range(1, len(candles)):
+        high = candles[i].get("high", 0)
+        low = candles[i].get("low", 0)
+        prev_close = candles[i-1].get("close", 0)
+        
+        tr = max(
+            high - low,
+            abs(high - prev_close),
+            abs(low - prev_close)
+        )
+        true_ranges.append(tr)
+    
+    if len(true_ranges) < period:
+        return 0.0
+    
+    return sum(true_ranges[-period:]) / period
+
+
+def precompute_symbol(
+    symbol: str,
+    data: Dict[str, List[Dict]],
+    params: StrategyParams,
+    server_now: int,
+    use_historical_sr: bool = True,
+) -> Dict:
+    """
+    Everything scan_symbol needs that depends only on closed bars.
+    
+    D1 and H4 are cut to the bars closed by the last daily close before
+    `server_now` (server time encoded as epoch seconds, like the candle
+    times); W1/MN keep their forming bar as before.
+    
+    Returns:
+        evaluate_symbol_confluence() result plus "daily_bar" (open time of
+        the last closed D1 bar, the cache key) and "atr" (14-period daily ATR)
+    """
+    daily_bar = last_daily_close(data["daily"], server_now)
+    if daily_bar is not None:
+        close_time = daily_bar + DAILY_BAR_S
+        data = dict(
+            data,
+            daily=closed_bars(data["daily"], DAILY_BAR_S, close_time),
+            h4=closed_bars(data["h4"], H4_BAR_S, close_time),
+        )
+    
+    evaluation = evaluate_symbol_confluence(symbol, data, params, use_historical_sr)
+    evaluation["daily_bar"] = daily_bar
+    evaluation["atr"] = average_true_range(data["daily"], period=14)
+    return evaluation
+
+
+class RateLimiter:
+    """Enforce a minimum interval between calls (e.g. MT5 history requests).
+
+    `clock` and `sleep` default to the wall clock; a replay passes its
+    simulated clock and a non-blocking sleep.
+    """
+
+    def __init__(self, min_interval_s: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.min_interval_s = max(0.0, min_interval_s)
+        self.clock = clock
+        self.sleep = sleep
+        self._last = None
+
+    def wait(self):
+        if self.min_interval_s > 0 and self._last is not None:
+            delay = self._last + self.min_interval_s - self.clock()
+            if delay > 0:
+                self.sleep(delay)
+        self._last = self.clock()
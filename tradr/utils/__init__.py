@@ -5,6 +5,13 @@ Note: state.py is deprecated and moved to _deprecated/
 """
 
 from .logger import setup_logger
+from .artifact_store import ArtifactStore, get_artifact_store
 from .output_manager import OutputManager
+from .scheduler import Scheduler
+from .state_store import StateStore, WriteBehind, get_state_store, get_write_behind
 
-__all__ = ['setup_logger', 'OutputManager']
+__all__ = [
+    'setup_logger', 'OutputManager', 'Scheduler',
+    'StateStore', 'WriteBehind', 'get_state_store', 'get_write_behind',
+    'ArtifactStore', 'get_artifact_store',
+]
@@ -0,0 +1,118 @@
+"""
+Content-addressed side store for optimization artifacts.
+
+Optuna keeps every user attribute of every trial in the study database and
+loads all of them with study.trials. Bulky per-trial data (compliance
+reports, score breakdowns, quarterly stats, trade lists) goes here instead;
+the trial only records the returned key:
+
+    store = get_artifact_store()                   # ftmo_analysis_output/artifacts (TRADR_ARTIFACT_DIR)
+    key = store.put({"compliance_report": report, "score_breakdown": breakdown})
+    trial.set_user_attr("artifact", key)
+    ...
+    store.get(trial.user_attrs["artifact"])
+
+An artifact is gzip-compressed canonical JSON at `<root>/<key[:2]>/<key>.json.gz`.
+The key is a SHA-256 prefix of that JSON, so equal content is written once.
+Writes are atomic (temp file + rename), and a small in-memory cache serves
+recent puts without touching the disk.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_ARTIFACT_DIR = "ftmo_analysis_output/artifacts"
+KEY_LENGTH = 24  # Hex chars of the SHA-256 digest
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, default=str, separators=(",", ":")).encode()
+
+
+class ArtifactStore:
+    """
+    JSON artifacts addressed by content hash (thread-safe).
+
+    Args:
+        root: Store directory (created on first put)
+        cache_size: Recently used artifacts kept in memory
+    """
+
+    def __init__(self, root: str = DEFAULT_ARTIFACT_DIR, cache_size: int = 64):
+        self.root = Path(root)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"writes": 0, "deduplicated": 0, "reads": 0, "cache_hits": 0}
+
+    @staticmethod
+    def key_for(value: Any) -> str:
+        return hashlib.sha256(_canonical(value)).hexdigest()[:KEY_LENGTH]
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json.gz"
+
+    def _remember(self, key: str, raw: bytes):
+        with self._lock:
+            self._cache[key] = raw
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def put(self, value: Any) -> str:
+        """Store a JSON-serializable value; returns its key."""
+        raw = _canonical(value)
+        key = hashlib.sha256(raw).hexdigest()[:KEY_LENGTH]
+        path = self.path(key)
+        if path.exists():
+            self.stats["deduplicated"] += 1
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with gzip.open(tmp, "wb", compresslevel=6) as f:
+                f.write(raw)
+            os.replace(tmp, path)
+            self.stats["writes"] += 1
+        self._remember(key, raw)
+        return key
+
+    def get(self, key: Optional[str], default: Any = None) -> Any:
+        """The value stored under `key` (default if missing or unreadable)."""
+        if not key:
+            return default
+        with self._lock:
+            raw = self._cache.get(key)
+        if raw is not None:
+            self.stats["cache_hits"] += 1
+            return json.loads(raw)
+        try:
+            with gzip.open(self.path(key), "rb") as f:
+                raw = f.read()
+        except (OSError, EOFError):
+            return default
+        self.stats["reads"] += 1
+        self._remember(key, raw)
+        return json.loads(raw)
+
+    def has(self, key: str) -> bool:
+        return bool(key) and (key in self._cache or self.path(key).exists())
+
+
+_stores: Dict[str, ArtifactStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_artifact_store(root: Optional[str] = None) -> ArtifactStore:
+    """Shared store per directory (default: TRADR_ARTIFACT_DIR or ftmo_analysis_output/artifacts)."""
+    root = str(Path(root or os.getenv("TRADR_ARTIFACT_DIR", DEFAULT_ARTIFACT_DIR)).resolve())
+    with _stores_lock:
+        store = _stores.get(root)
+        if store is None:
+            store = _stores[root] = ArtifactStore(root)
+        return store
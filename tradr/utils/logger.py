@@ -15,10 +15,11 @@ _loggers = {}
 
 # Fix Windows console Unicode encoding (cp1252 can't handle emojis)
 # Wrap stdout with UTF-8 to handle Unicode characters like ✅
+# (streams that already are UTF-8, e.g. pytest's capture files, are left alone)
 try:
-    if hasattr(sys.stdout, 'buffer'):
+    if hasattr(sys.stdout, 'buffer') and (sys.stdout.encoding or '').lower() not in ('utf-8', 'utf8'):
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    if hasattr(sys.stderr, 'buffer'):
+    if hasattr(sys.stderr, 'buffer') and (sys.stderr.encoding or '').lower() not in ('utf-8', 'utf8'):
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 except Exception:
     pass  # Fallback silently if stdout/stderr can't be wrapped
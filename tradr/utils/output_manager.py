@@ -6,7 +6,8 @@ Centralized module for all optimization output files.
 Output Files:
 -------------
 ftmo_analysis_output/{MODE}/
-├── optimization.log           # Real-time trial logging (current run only)
+├── trials.jsonl               # Structured trial log, one JSON record per trial (current run only)
+├── optimization.log           # Human-readable log rendered from trials.jsonl
 ├── best_trades_training.csv   # All trades from best trial - training period
 ├── best_trades_validation.csv # All trades from best trial - validation period  
 ├── best_trades_final.csv      # All trades from best trial - full period
@@ -15,6 +16,7 @@ ftmo_analysis_output/{MODE}/
 ├── optimization_report.csv    # Final report after optimization run
 └── history/                   # Archived runs (each run in separate directory)
     ├── run_001/               # First optimization run
+    │   ├── trials.jsonl
     │   ├── optimization.log
     │   ├── best_trades_training.csv
     │   ├── best_trades_validation.csv
@@ -35,6 +37,19 @@ Archiving Strategy:
 - best_params.json saved per run for easy parameter recovery
 - Current files always contain data from the active/latest run
 
+Trial Log:
+----------
+log_trial() only appends a JSON record to an in-memory buffer. The buffer is
+written to trials.jsonl every TRIAL_LOG_FLUSH_S seconds, every
+TRIAL_LOG_FLUSH_ROWS trials, on a new best trial and at exit; each flush also
+appends the rendered lines to optimization.log, so `tail -f` follows the run.
+render_log() (archiving, exit, or `python -m tradr.utils.output_manager TPE`)
+re-renders the whole file from trials.jsonl. The records load straight into
+pandas:
+    
+    df = read_trials_frame("ftmo_analysis_output/TPE/trials.jsonl")
+    df.nlargest(10, "score")
+
 Usage:
     from output_manager import OutputManager
     
@@ -45,13 +60,16 @@ Usage:
     om.generate_final_report()
 """
 
+import atexit
 import csv
 import json
 import os
+import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
+import numpy as np
 import pandas as pd
 
 
@@ -59,6 +77,16 @@ import pandas as pd
 BASE_OUTPUT_DIR = Path("ftmo_analysis_output")
 BASE_OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Trial log buffer: written at most every N seconds / N trials (and on a new best)
+TRIAL_LOG_FLUSH_S = float(os.getenv("TRADR_TRIAL_LOG_FLUSH_S", "30"))
+TRIAL_LOG_FLUSH_ROWS = 100
+
+TRADE_CSV_COLUMNS = [
+    'trade_id', 'symbol', 'direction', 'entry_date', 'exit_date',
+    'entry_price', 'exit_price', 'stop_loss', 'take_profit',
+    'result_r', 'profit_usd', 'win', 'confluence_score', 'quality_factors'
+]
+
 
 @dataclass
 class TrialResult:
@@ -84,6 +112,128 @@ class TrialResult:
     final_sharpe: Optional[float] = None
     final_win_rate: Optional[float] = None
     final_profit_usd: Optional[float] = None
+    # FTMO compliance (when tracked)
+    ftmo_dd_pct: Optional[float] = None
+    ftmo_challenge_passed: Optional[bool] = None
+
+
+# CSV column -> (Trade attribute, default)
+TRADE_FIELDS = {
+    'symbol': ('symbol', ''),
+    'direction': ('direction', ''),
+    'entry_date': ('entry_date', ''),
+    'exit_date': ('exit_date', ''),
+    'entry_price': ('entry_price', 0),
+    'exit_price': ('exit_price', 0),
+    'stop_loss': ('stop_loss', 0),
+    'take_profit': ('tp1', 0),
+    'confluence_score': ('confluence_score', 0),
+    'quality_factors': ('quality_factors', 0),
+}
+
+
+def trade_result_r(trades: List[Any]) -> np.ndarray:
+    """R multiple per trade ('rr' from strategy_core.Trade, 'result_r' legacy)."""
+    return np.fromiter(
+        (getattr(t, 'rr', getattr(t, 'result_r', 0)) for t in trades), dtype=float, count=len(trades)
+    )
+
+
+def trades_frame(trades: List[Any]) -> pd.DataFrame:
+    """Columnar table of Trade objects: the TRADE_FIELDS columns plus result_r."""
+    columns = {name: [getattr(t, attr, default) for t in trades] for name, (attr, default) in TRADE_FIELDS.items()}
+    columns['result_r'] = trade_result_r(trades)
+    return pd.DataFrame(columns)
+
+
+def _group_totals(keys: List[Any], result_r: np.ndarray, sort: bool = True):
+    """
+    (keys, trades, wins, profit_r) per distinct key in one vectorized pass;
+    sorted by key, or in first-appearance order with sort=False.
+    """
+    uniq, first, inverse = np.unique(np.asarray(keys, dtype=object), return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    trades = np.bincount(inverse, minlength=len(uniq))
+    wins = np.bincount(inverse, weights=result_r > 0, minlength=len(uniq)).astype(int)
+    profit_r = np.bincount(inverse, weights=result_r, minlength=len(uniq))
+    order = np.arange(len(uniq)) if sort else np.argsort(first, kind='stable')
+    return uniq[order].tolist(), trades[order], wins[order], profit_r[order]
+
+
+def read_trial_records(path) -> List[Dict[str, Any]]:
+    """All records of a trials.jsonl file (a torn last line is skipped)."""
+    records = []
+    path = Path(path)
+    if not path.exists():
+        return records
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def read_trials_frame(path) -> pd.DataFrame:
+    """Trial records of a trials.jsonl file as a DataFrame (one row per trial)."""
+    trials = [r for r in read_trial_records(path) if r.get('event') == 'trial']
+    return pd.DataFrame(trials).drop(columns='event', errors='ignore')
+
+
+def _render_trial(rec: Dict[str, Any]) -> List[str]:
+    trial_number, timestamp = rec['trial_number'], rec['timestamp']
+    if rec.get('is_best'):
+        lines = [
+            "-" * 80,
+            f"🏆 NEW BEST - Trial #{trial_number} [{timestamp}]",
+            "-" * 80,
+        ]
+    else:
+        lines = [f"Trial #{trial_number} [{timestamp}]"]
+    
+    lines.append(f"  Score: {rec['score']:.2f} | R: {rec['total_r']:+.1f} | Sharpe: {rec['sharpe_ratio']:.3f}")
+    lines.append(f"  Win Rate: {rec['win_rate']:.1f}% | PF: {rec['profit_factor']:.2f} | Trades: {rec['total_trades']}")
+    lines.append(f"  Profit: ${rec['profit_usd']:,.2f} | Max DD: {rec['max_drawdown_pct']:.2f}%")
+    
+    if rec.get('ftmo_dd_pct') is not None:
+        status = "PASS" if rec.get('ftmo_challenge_passed') else "FAIL"
+        lines.append(f"  FTMO DD: {rec['ftmo_dd_pct']:.1f}% | Challenge: {status}")
+    
+    if rec.get('val_total_r') is not None:
+        lines.append(f"  [Validation] R: {rec['val_total_r']:+.1f} | "
+                     f"WR: {rec['val_win_rate']:.1f}% | ${rec['val_profit_usd']:,.2f}")
+    
+    if rec.get('final_total_r') is not None:
+        lines.append(f"  [Final 2023-2025] R: {rec['final_total_r']:+.1f} | "
+                     f"WR: {rec['final_win_rate']:.1f}% | ${rec['final_profit_usd']:,.2f}")
+    
+    lines.append("")
+    return lines
+
+
+def render_trial_log(records: List[Dict[str, Any]]) -> str:
+    """The human-readable optimization.log for a list of trial-log records."""
+    lines = []
+    for rec in records:
+        event = rec.get('event')
+        if event == 'run_started':
+            lines += [
+                "=" * 80,
+                f"FTMO OPTIMIZATION LOG - {rec['optimization_mode']}",
+                f"Started: {rec['timestamp']}",
+                "=" * 80,
+                "",
+            ]
+        elif event == 'synced':
+            lines += [
+                f"[Synced] Previous best from database: Score={rec['best_value']:.2f} "
+                f"(Trial #{rec['trial_number']})",
+                "",
+            ]
+        elif event == 'trial':
+            lines += _render_trial(rec)
+    return "\n".join(lines) + "\n" if lines else ""
 
 
 class OutputManager:
@@ -91,7 +241,7 @@ class OutputManager:
     Centralized output manager for optimization results.
     
     Features:
-    - Real-time trial logging to CSV (nohup compatible)
+    - Buffered structured trial log (trials.jsonl, nohup compatible)
     - Best trial trade exports (training/validation/final)
     - Monthly statistics breakdown
     - Symbol performance analysis
@@ -99,13 +249,19 @@ class OutputManager:
     - Separate directories for NSGA-II vs TPE runs
     """
     
-    def __init__(self, output_dir: Path = None, optimization_mode: str = "NSGA"):
+    def __init__(
+        self,
+        output_dir: Path = None,
+        optimization_mode: str = "NSGA",
+        flush_interval_s: float = TRIAL_LOG_FLUSH_S,
+    ):
         """
         Initialize OutputManager.
         
         Args:
             output_dir: Custom output directory (optional)
             optimization_mode: "NSGA" or "TPE" - creates subdirectory in ftmo_analysis_output/
+            flush_interval_s: Max seconds a logged trial stays buffered in memory
         """
         if output_dir is None:
             # Create mode-specific subdirectory: ftmo_analysis_output/NSGA/ or ftmo_analysis_output/TPE/
@@ -117,6 +273,7 @@ class OutputManager:
         self.optimization_mode = optimization_mode
         
         # File paths
+        self.trials_file = self.output_dir / "trials.jsonl"
         self.log_file = self.output_dir / "optimization.log"
         self.best_training_file = self.output_dir / "best_trades_training.csv"
         self.best_validation_file = self.output_dir / "best_trades_validation.csv"
@@ -131,8 +288,14 @@ class OutputManager:
         self.trials_logged = 0
         self.best_params_dict = None  # Store best params for archiving
         
+        # Trial records not yet written to trials.jsonl
+        self.flush_interval_s = flush_interval_s
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        
         # Initialize fresh log file (archiving happens at END of run, not start)
         self._init_log_file()
+        atexit.register(self.close)
     
     def sync_best_from_study(self, study_best_value: float, study_best_trial_number: int = None):
         """
@@ -148,10 +311,14 @@ class OutputManager:
         if study_best_value is not None and study_best_value > self.best_score:
             self.best_score = study_best_value
             self.best_trial_number = study_best_trial_number
-            # Write note to log file
-            with open(self.log_file, 'a') as f:
-                f.write(f"[Synced] Previous best from database: Score={study_best_value:.2f} "
-                       f"(Trial #{study_best_trial_number})\n\n")
+            # Note in the trial log
+            self._append({
+                'event': 'synced',
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'best_value': study_best_value,
+                'trial_number': study_best_trial_number,
+            })
+            self.flush()
     
     def _get_next_run_number(self, history_dir: Path) -> int:
         """Get the next sequential run number by checking existing run directories."""
@@ -176,15 +343,66 @@ class OutputManager:
     
     def _init_log_file(self):
         """
-        Initialize a fresh log file for this run.
+        Initialize a fresh trial log (and rendered log) for this run.
         Called at startup - does NOT archive (archiving happens at END of run).
         """
-        # Create new log file with header
+        self._buffer.clear()
+        start = {
+            'event': 'run_started',
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'optimization_mode': self.optimization_mode,
+        }
+        with open(self.trials_file, 'w') as f:
+            f.write(json.dumps(start) + "\n")
+        self._last_flush = time.monotonic()
+        self.render_log()
+    
+    # ------------------------------------------------------------------
+    # Structured trial log
+    # ------------------------------------------------------------------
+    
+    def _append(self, record: Dict[str, Any]):
+        self._buffer.append(json.dumps(record, default=str))
+    
+    def flush(self) -> int:
+        """
+        Write buffered trial records to trials.jsonl and append their rendered
+        lines to optimization.log (so `tail -f` follows the run); returns how many.
+        """
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return 0
+        lines, self._buffer = self._buffer, []
+        with open(self.trials_file, 'a') as f:
+            f.write("\n".join(lines) + "\n")
+        with open(self.log_file, 'a') as f:
+            f.write(render_trial_log([json.loads(line) for line in lines]))
+        return len(lines)
+    
+    def trial_records(self) -> List[Dict[str, Any]]:
+        """Every record of this run's trial log (flushes first)."""
+        self.flush()
+        return read_trial_records(self.trials_file)
+    
+    def trials_frame(self) -> pd.DataFrame:
+        """This run's trials as a DataFrame (one row per trial)."""
+        self.flush()
+        return read_trials_frame(self.trials_file)
+    
+    def render_log(self) -> Path:
+        """Re-render optimization.log from the full trial log."""
+        text = render_trial_log(self.trial_records())
         with open(self.log_file, 'w') as f:
-            f.write("=" * 80 + "\n")
-            f.write(f"FTMO OPTIMIZATION LOG - {self.optimization_mode}\n")
-            f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
+            f.write(text)
+        return self.log_file
+    
+    def close(self):
+        """Flush the trial buffer and re-render optimization.log (also runs at exit)."""
+        try:
+            if self.trials_file.exists():
+                self.render_log()
+        except Exception as e:
+            print(f"⚠️  Could not write trial log: {e}")
     
     def archive_current_run(self):
         """
@@ -198,7 +416,9 @@ class OutputManager:
         history_dir = self.output_dir / "history"
 
         # Files to archive (explicit list)
+        self.render_log()
         files_to_archive = [
+            self.trials_file,
             self.log_file,
             self.best_training_file,
             self.best_validation_file,
@@ -207,6 +427,8 @@ class OutputManager:
             self.symbol_perf_file,
             self.output_dir / "best_params.json",
             self.output_dir / "professional_backtest_report.txt",
+            self.output_dir / "rolling_challenge_starts.json",
+            self.output_dir / "rolling_challenge_starts.csv",
         ]
 
         # Only archive the NEWEST analysis_summary (not all of them!)
@@ -262,7 +484,9 @@ class OutputManager:
         history_dir.mkdir(exist_ok=True)
 
         # Files to archive (same as regular runs)
+        self.render_log()
         files_to_archive = [
+            self.trials_file,
             self.log_file,
             self.best_training_file,
             self.best_validation_file,
@@ -347,37 +571,42 @@ class OutputManager:
             self.best_score = score
             self.best_trial_number = trial_number
         
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Write to log file in human-readable format
-        with open(self.log_file, 'a') as f:
-            if is_best:
-                f.write("-" * 80 + "\n")
-                f.write(f"🏆 NEW BEST - Trial #{trial_number} [{timestamp}]\n")
-                f.write("-" * 80 + "\n")
-            else:
-                f.write(f"Trial #{trial_number} [{timestamp}]\n")
-            
-            f.write(f"  Score: {score:.2f} | R: {total_r:+.1f} | Sharpe: {sharpe_ratio:.3f}\n")
-            f.write(f"  Win Rate: {win_rate:.1f}% | PF: {profit_factor:.2f} | Trades: {total_trades}\n")
-            f.write(f"  Profit: ${profit_usd:,.2f} | Max DD: {max_drawdown_pct:.2f}%\n")
-
-            if ftmo_dd_pct is not None:
-                status = "PASS" if ftmo_challenge_passed else "FAIL"
-                f.write(f"  FTMO DD: {ftmo_dd_pct:.1f}% | Challenge: {status}\n")
-            
-            if val_metrics:
-                f.write(f"  [Validation] R: {val_metrics['total_r']:+.1f} | ")
-                f.write(f"WR: {val_metrics['win_rate']:.1f}% | ${val_metrics['profit_usd']:,.2f}\n")
-            
-            if final_metrics:
-                f.write(f"  [Final 2023-2025] R: {final_metrics['total_r']:+.1f} | ")
-                f.write(f"WR: {final_metrics['win_rate']:.1f}% | ${final_metrics['profit_usd']:,.2f}\n")
-            
-            f.write("\n")
-        
+        val_metrics = val_metrics or {}
+        final_metrics = final_metrics or {}
+        result = TrialResult(
+            trial_number=trial_number,
+            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            score=score,
+            total_r=total_r,
+            sharpe_ratio=sharpe_ratio,
+            win_rate=win_rate,
+            profit_factor=profit_factor,
+            total_trades=total_trades,
+            profit_usd=profit_usd,
+            max_drawdown_pct=max_drawdown_pct,
+            is_best=is_best,
+            val_total_r=val_metrics.get('total_r'),
+            val_sharpe=val_metrics.get('sharpe'),
+            val_win_rate=val_metrics.get('win_rate'),
+            val_profit_usd=val_metrics.get('profit_usd'),
+            final_total_r=final_metrics.get('total_r'),
+            final_sharpe=final_metrics.get('sharpe'),
+            final_win_rate=final_metrics.get('win_rate'),
+            final_profit_usd=final_metrics.get('profit_usd'),
+            ftmo_dd_pct=ftmo_dd_pct,
+            ftmo_challenge_passed=ftmo_challenge_passed,
+        )
+        self._append({'event': 'trial', **vars(result)})
         self.trials_logged += 1
         
+        # A new best is on disk at once; other trials wait for the cadence
+        if (
+            is_best
+            or len(self._buffer) >= TRIAL_LOG_FLUSH_ROWS
+            or time.monotonic() - self._last_flush >= self.flush_interval_s
+        ):
+            self.flush()
+        
         # Print to stdout for nohup logging
         if is_best:
             print(f"🏆 NEW BEST Trial #{trial_number}: Score={score:.2f}, R={total_r:+.1f}, "
@@ -447,6 +676,27 @@ class OutputManager:
         
         print(f"💾 Best parameters saved to: {params_file.name}")
     
+    def save_rolling_starts(self, results: Dict[str, Any]):
+        """
+        Save simulate_rolling_challenge_starts() output: the summary to
+        rolling_challenge_starts.json and the per-start matrix to a CSV.
+
+        Args:
+            results: Dict returned by simulate_rolling_challenge_starts()
+        """
+        summary = {k: v for k, v in results.items() if k != "matrix"}
+        summary["timestamp"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        json_file = self.output_dir / "rolling_challenge_starts.json"
+        with open(json_file, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        matrix = results.get("matrix")
+        if matrix is not None:
+            matrix.to_csv(self.output_dir / "rolling_challenge_starts.csv", index=False)
+
+        print(f"💾 Rolling challenge starts saved to: {json_file.name}")
+
     def _export_trades_csv(
         self,
         trades: List[Any],
@@ -457,43 +707,23 @@ class OutputManager:
         """Export trades to CSV file."""
         if not trades:
             # Create empty file with headers
-            headers = [
-                'trade_id', 'symbol', 'direction', 'entry_date', 'exit_date',
-                'entry_price', 'exit_price', 'stop_loss', 'take_profit',
-                'result_r', 'profit_usd', 'win', 'confluence_score', 'quality_factors'
-            ]
             with open(filepath, 'w', newline='') as f:
                 writer = csv.writer(f)
-                writer.writerow(headers)
+                writer.writerow(TRADE_CSV_COLUMNS)
             return
         
         risk_per_trade = account_size * (risk_pct / 100)
         
-        rows = []
-        for i, t in enumerate(trades, 1):
-            # Support both 'rr' (from strategy_core.Trade) and 'result_r' (legacy)
-            result_r = getattr(t, 'rr', getattr(t, 'result_r', 0))
-            profit_usd = result_r * risk_per_trade
-            
-            rows.append({
-                'trade_id': i,
-                'symbol': getattr(t, 'symbol', ''),
-                'direction': getattr(t, 'direction', ''),
-                'entry_date': str(getattr(t, 'entry_date', '')),
-                'exit_date': str(getattr(t, 'exit_date', '')),
-                'entry_price': getattr(t, 'entry_price', 0),
-                'exit_price': getattr(t, 'exit_price', 0),
-                'stop_loss': getattr(t, 'stop_loss', 0),
-                'take_profit': getattr(t, 'tp1', 0),
-                'result_r': round(result_r, 2),
-                'profit_usd': round(profit_usd, 2),
-                'win': 1 if result_r > 0 else 0,
-                'confluence_score': getattr(t, 'confluence_score', 0),
-                'quality_factors': getattr(t, 'quality_factors', 0),
-            })
-        
-        df = pd.DataFrame(rows)
-        df.to_csv(filepath, index=False)
+        # One pass per column; round() keeps the exact decimal rounding of the row-wise export
+        columns = {name: [getattr(t, attr, default) for t in trades] for name, (attr, default) in TRADE_FIELDS.items()}
+        columns['entry_date'] = [str(d) for d in columns['entry_date']]
+        columns['exit_date'] = [str(d) for d in columns['exit_date']]
+        result_r = trade_result_r(trades)
+        columns['trade_id'] = np.arange(1, len(trades) + 1)
+        columns['result_r'] = [round(r, 2) for r in result_r.tolist()]
+        columns['profit_usd'] = [round(p, 2) for p in (result_r * risk_per_trade).tolist()]
+        columns['win'] = (result_r > 0).astype(int)
+        pd.DataFrame(columns, columns=TRADE_CSV_COLUMNS).to_csv(filepath, index=False)
     
     def generate_monthly_stats(
         self,
@@ -517,60 +747,28 @@ class OutputManager:
         
         risk_per_trade = account_size * (risk_pct / 100)
         
-        # Group trades by month
-        monthly_data = {}
-        for t in trades:
-            if hasattr(t, 'entry_date') and t.entry_date:
-                month_key = t.entry_date.strftime("%Y-%m") if hasattr(t.entry_date, 'strftime') else str(t.entry_date)[:7]
-                if month_key not in monthly_data:
-                    monthly_data[month_key] = {'trades': 0, 'wins': 0, 'profit_r': 0}
-                
-                # Support both 'rr' and 'result_r'
-                result_r = getattr(t, 'rr', getattr(t, 'result_r', 0))
-                
-                monthly_data[month_key]['trades'] += 1
-                if result_r > 0:
-                    monthly_data[month_key]['wins'] += 1
-                monthly_data[month_key]['profit_r'] += result_r
-        
-        # Build rows
-        rows = []
-        total_trades = 0
-        total_wins = 0
-        total_profit = 0
-        
-        for month, data in sorted(monthly_data.items()):
-            win_rate = (data['wins'] / data['trades'] * 100) if data['trades'] > 0 else 0
-            profit_usd = data['profit_r'] * risk_per_trade
-            
-            rows.append({
-                'period': period_name,
-                'month': month,
-                'trades': data['trades'],
-                'wins': data['wins'],
-                'win_rate': round(win_rate, 1),
-                'profit_r': round(data['profit_r'], 2),
-                'profit_usd': round(profit_usd, 2),
-            })
-            
-            total_trades += data['trades']
-            total_wins += data['wins']
-            total_profit += profit_usd
+        # Group trades by entry month ("YYYY-MM"; trades without an entry date are skipped)
+        dated = [t for t in trades if getattr(t, 'entry_date', None)]
+        months = [str(t.entry_date)[:7] for t in dated]
+        months, counts, wins, profit_r = _group_totals(months, trade_result_r(dated))
         
-        # Add total row
+        total_trades = int(counts.sum())
+        total_wins = int(wins.sum())
+        total_profit = float(profit_r.sum()) * risk_per_trade
         total_wr = (total_wins / total_trades * 100) if total_trades > 0 else 0
-        rows.append({
+        
+        win_rates = (wins / np.maximum(counts, 1) * 100).tolist()
+        df = pd.DataFrame({
             'period': period_name,
-            'month': 'TOTAL',
-            'trades': total_trades,
-            'wins': total_wins,
-            'win_rate': round(total_wr, 1),
-            'profit_r': round(sum(m['profit_r'] for m in monthly_data.values()), 2),
-            'profit_usd': round(total_profit, 2),
+            'month': months + ['TOTAL'],
+            'trades': counts.tolist() + [total_trades],
+            'wins': wins.tolist() + [total_wins],
+            'win_rate': [round(w, 1) for w in win_rates + [total_wr]],
+            'profit_r': [round(p, 2) for p in profit_r.tolist() + [float(profit_r.sum())]],
+            'profit_usd': [round(p, 2) for p in (profit_r * risk_per_trade).tolist() + [total_profit]],
         })
         
         # Append to or create file
-        df = pd.DataFrame(rows)
         if self.monthly_stats_file.exists():
             existing = pd.read_csv(self.monthly_stats_file)
             # Remove old data for this period
@@ -601,56 +799,32 @@ class OutputManager:
         
         risk_per_trade = account_size * (risk_pct / 100)
         
-        # Group by symbol
-        symbol_data = {}
-        for t in trades:
-            symbol = getattr(t, 'symbol', 'UNKNOWN')
-            if symbol not in symbol_data:
-                symbol_data[symbol] = {'trades': 0, 'wins': 0, 'profit_r': 0}
-            
-            # Support both 'rr' and 'result_r'
-            result_r = getattr(t, 'rr', getattr(t, 'result_r', 0))
-            
-            symbol_data[symbol]['trades'] += 1
-            if result_r > 0:
-                symbol_data[symbol]['wins'] += 1
-            symbol_data[symbol]['profit_r'] += result_r
-        
-        rows = []
-        for symbol, data in sorted(symbol_data.items(), key=lambda x: x[1]['profit_r'], reverse=True):
-            win_rate = (data['wins'] / data['trades'] * 100) if data['trades'] > 0 else 0
-            profit_usd = data['profit_r'] * risk_per_trade
-            avg_r = data['profit_r'] / data['trades'] if data['trades'] > 0 else 0
-            
-            rows.append({
-                'symbol': symbol,
-                'trades': data['trades'],
-                'wins': data['wins'],
-                'win_rate': round(win_rate, 1),
-                'profit_r': round(data['profit_r'], 2),
-                'profit_usd': round(profit_usd, 2),
-                'avg_r_per_trade': round(avg_r, 3),
-            })
+        # Group by symbol, most profitable first (ties keep first-appearance order)
+        symbols = [getattr(t, 'symbol', 'UNKNOWN') for t in trades]
+        symbols, counts, wins, profit_r = _group_totals(symbols, trade_result_r(trades), sort=False)
+        order = np.argsort(-profit_r, kind='stable')
+        counts, wins, profit_r = counts[order], wins[order], profit_r[order]
         
         # Add total row
-        total_trades = sum(d['trades'] for d in symbol_data.values())
-        total_wins = sum(d['wins'] for d in symbol_data.values())
-        total_r = sum(d['profit_r'] for d in symbol_data.values())
+        total_trades = int(counts.sum())
+        total_wins = int(wins.sum())
+        total_r = float(profit_r.sum())
         total_wr = (total_wins / total_trades * 100) if total_trades > 0 else 0
         
-        rows.append({
-            'symbol': 'TOTAL',
-            'trades': total_trades,
-            'wins': total_wins,
-            'win_rate': round(total_wr, 1),
-            'profit_r': round(total_r, 2),
-            'profit_usd': round(total_r * risk_per_trade, 2),
-            'avg_r_per_trade': round(total_r / total_trades if total_trades > 0 else 0, 3),
+        df = pd.DataFrame({
+            'symbol': [symbols[i] for i in order] + ['TOTAL'],
+            'trades': counts.tolist() + [total_trades],
+            'wins': wins.tolist() + [total_wins],
+            'win_rate': [round(w, 1) for w in (wins / counts * 100).tolist() + [total_wr]],
+            'profit_r': [round(p, 2) for p in profit_r.tolist() + [total_r]],
+            'profit_usd': [round(p, 2) for p in (profit_r * risk_per_trade).tolist() + [total_r * risk_per_trade]],
+            'avg_r_per_trade': [
+                round(a, 3) for a in (profit_r / counts).tolist() + [total_r / total_trades if total_trades > 0 else 0]
+            ],
         })
         
-        df = pd.DataFrame(rows)
         df.to_csv(self.symbol_perf_file, index=False)
-        print(f"📊 Symbol performance saved: {len(symbol_data)} symbols analyzed")
+        print(f"📊 Symbol performance saved: {len(symbols)} symbols analyzed")
     
     def generate_final_report(
         self,
@@ -715,6 +889,7 @@ class OutputManager:
     def clear_output(self):
         """Clear all output files for fresh optimization run."""
         files_to_clear = [
+            self.trials_file,
             self.log_file,
             self.best_training_file,
             self.best_validation_file,
@@ -765,8 +940,17 @@ def set_output_manager(optimization_mode: str = "NSGA"):
 
 
 if __name__ == "__main__":
-    # Demo/test
-    om = OutputManager()
-    print("Output Manager initialized")
-    print(f"Output directory: {om.output_dir}")
-    print(f"Log file: {om.log_file}")
+    # Render optimization.log of a (running) optimization from its trials.jsonl
+    import sys
+    
+    mode_dir = BASE_OUTPUT_DIR / (sys.argv[1] if len(sys.argv) > 1 else "TPE")
+    records = read_trial_records(mode_dir / "trials.jsonl")
+    if not records:
+        print(f"No trial log in {mode_dir}")
+        sys.exit(1)
+    (mode_dir / "optimization.log").write_text(render_trial_log(records))
+    trials = read_trials_frame(mode_dir / "trials.jsonl")
+    print(f"Rendered {len(trials)} trials -> {mode_dir / 'optimization.log'}")
+    if not trials.empty:
+        best = trials.loc[trials['score'].idxmax()]
+        print(f"Best: Trial #{best['trial_number']} Score={best['score']:.2f} R={best['total_r']:+.1f}")
@@ -0,0 +1,327 @@
+"""
+Deadline scheduler for the live bot.
+
+Jobs are kept in a priority queue ordered by their next deadline and run on
+named workers (one thread each), so a long job on one worker - the daily
+scan - never delays a job on another - drawdown protection:
+
+    scheduler = Scheduler()
+    scheduler.every("protection", 10, check_dd, priority=100, worker="protection")
+    scheduler.cron("daily_scan", daily_at(0, 10, SERVER_TZ), scan, timeout_s=1800)
+    scheduler.start()
+
+Periodic jobs keep their phase (missed runs are skipped, not replayed); cron
+jobs ask their `next_run(after)` function for the next deadline. When several
+jobs on one worker are due, the highest priority runs first. A job that
+overruns its timeout is reported by a watchdog while it is still running
+(Python threads cannot be killed, so it is flagged rather than aborted).
+
+metrics() reports per-job lateness (start time minus deadline), duration,
+timeouts and errors.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Callable, Dict, Iterable, List, Optional
+
+log = logging.getLogger("tradr.scheduler")
+
+
+def daily_at(
+    hour: int,
+    minute: int,
+    tz: tzinfo = timezone.utc,
+    weekdays: Iterable[int] = range(7),
+) -> Callable[[datetime], datetime]:
+    """
+    Cron-like next-run function: every `weekdays` day at hour:minute in `tz`.
+
+    Weekdays are 0=Monday .. 6=Sunday, evaluated in `tz` (server time for the
+    daily scan).
+    """
+    days = frozenset(weekdays)
+
+    def next_run(after: datetime) -> datetime:
+        local = after.astimezone(tz)
+        candidate = local.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if candidate <= local:
+            candidate += timedelta(days=1)
+        while candidate.weekday() not in days:
+            candidate += timedelta(days=1)
+        return candidate
+
+    return next_run
+
+
+def weekly_at(weekday: int, hour: int, minute: int, tz: tzinfo = timezone.utc) -> Callable[[datetime], datetime]:
+    """Cron-like next-run function: once a week on `weekday` at hour:minute in `tz`."""
+    return daily_at(hour, minute, tz, weekdays=(weekday,))
+
+
+@dataclass
+class JobStats:
+    """Run statistics for one job (seconds)."""
+    runs: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    skipped: int = 0
+    last_lateness: float = 0.0
+    max_lateness: float = 0.0
+    total_lateness: float = 0.0
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "last_lateness_s": round(self.last_lateness, 3),
+            "max_lateness_s": round(self.max_lateness, 3),
+            "mean_lateness_s": round(self.total_lateness / self.runs, 3) if self.runs else 0.0,
+            "last_duration_s": round(self.last_duration, 3),
+            "max_duration_s": round(self.max_duration, 3),
+        }
+
+
+@dataclass
+class Job:
+    """A scheduled callable: periodic (interval_s) or cron-like (next_run)."""
+    name: str
+    fn: Callable[[], object]
+    priority: int = 0
+    worker: str = "main"
+    interval_s: Optional[float] = None
+    next_run: Optional[Callable[[datetime], datetime]] = None
+    timeout_s: Optional[float] = None
+    due: float = 0.0
+    stats: JobStats = field(default_factory=JobStats)
+
+    def reschedule(self, now: float):
+        """Set the next deadline after a run (or skip) at `now`."""
+        if self.interval_s is not None:
+            # Keep the phase; skip runs that are already in the past
+            missed = max(0, int((now - self.due) // self.interval_s))
+            self.stats.skipped += missed
+            self.due += (missed + 1) * self.interval_s
+        else:
+            after = datetime.fromtimestamp(now, tz=timezone.utc)
+            self.due = self.next_run(after).timestamp()
+
+
+class _Worker:
+    """One thread draining its own deadline heap."""
+
+    def __init__(self, name: str, scheduler: "Scheduler"):
+        self.name = name
+        self.scheduler = scheduler
+        self.heap: List = []
+        self.cond = threading.Condition()
+        self.thread: Optional[threading.Thread] = None
+
+    def push(self, job: Job):
+        with self.cond:
+            heapq.heappush(self.heap, (job.due, -job.priority, next(self.scheduler._seq), job))
+            self.cond.notify()
+
+    def _pop_due(self) -> Optional[Job]:
+        """Highest-priority due job, or None after waiting for the next deadline."""
+        now = self.scheduler.clock()
+        if not self.heap:
+            self.cond.wait(timeout=1.0)
+            return None
+        if self.heap[0][0] > now:
+            self.cond.wait(timeout=min(self.heap[0][0] - now, 1.0))
+            return None
+
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            due.append(heapq.heappop(self.heap))
+        due.sort(key=lambda entry: (entry[1], entry[0], entry[2]))
+        for entry in due[1:]:
+            heapq.heappush(self.heap, entry)
+        return due[0][3]
+
+    def run(self):
+        stop = self.scheduler._stop
+        while not stop.is_set():
+            with self.cond:
+                job = self._pop_due()
+            if job is None:
+                continue
+            self.scheduler._run_job(job)
+            job.reschedule(self.scheduler.clock())
+            if not stop.is_set():
+                self.push(job)
+
+
+class Scheduler:
+    """
+    Priority-queue scheduler with named periodic and cron-like jobs.
+
+    Args:
+        clock: Epoch-seconds clock (time.time; injectable for replay/tests)
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.jobs: Dict[str, Job] = {}
+        self._workers: Dict[str, _Worker] = {}
+        self._seq = itertools.count()
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def every(
+        self,
+        name: str,
+        interval_s: float,
+        fn: Callable[[], object],
+        priority: int = 0,
+        worker: str = "main",
+        timeout_s: Optional[float] = None,
+        run_now: bool = False,
+    ) -> Job:
+        """Run `fn` every `interval_s` seconds (first run now or after one interval)."""
+        job = Job(name, fn, priority, worker, interval_s=float(interval_s), timeout_s=timeout_s)
+        job.due = self.clock() + (0.0 if run_now else job.interval_s)
+        return self._add(job)
+
+    def cron(
+        self,
+        name: str,
+        next_run: Callable[[datetime], datetime],
+        fn: Callable[[], object],
+        priority: int = 0,
+        worker: str = "main",
+        timeout_s: Optional[float] = None,
+        run_now: bool = False,
+    ) -> Job:
+        """Run `fn` at each deadline returned by `next_run(after)` (see daily_at / weekly_at)."""
+        job = Job(name, fn, priority, worker, next_run=next_run, timeout_s=timeout_s)
+        if run_now:
+            job.due = self.clock()
+        else:
+            job.due = next_run(datetime.fromtimestamp(self.clock(), tz=timezone.utc)).timestamp()
+        return self._add(job)
+
+    def _add(self, job: Job) -> Job:
+        if job.name in self.jobs:
+            raise ValueError(f"Job '{job.name}' already scheduled")
+        self.jobs[job.name] = job
+        worker = self._workers.get(job.worker)
+        if worker is None:
+            worker = self._workers[job.worker] = _Worker(job.worker, self)
+        worker.push(job)
+        return job
+
+    def next_due(self, name: str) -> datetime:
+        return datetime.fromtimestamp(self.jobs[name].due, tz=timezone.utc)
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    def _run_job(self, job: Job):
+        stats = job.stats
+        start = self.clock()
+        lateness = max(0.0, start - job.due)
+
+        watchdog = None
+        if job.timeout_s:
+            watchdog = threading.Timer(job.timeout_s, self._on_timeout, args=(job,))
+            watchdog.daemon = True
+            watchdog.start()
+
+        try:
+            job.fn()
+        except Exception as e:
+            stats.errors += 1
+            log.exception(f"Job '{job.name}' failed: {e}")
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+
+        duration = self.clock() - start
+        stats.runs += 1
+        stats.last_lateness = lateness
+        stats.max_lateness = max(stats.max_lateness, lateness)
+        stats.total_lateness += lateness
+        stats.last_duration = duration
+        stats.max_duration = max(stats.max_duration, duration)
+
+    def _on_timeout(self, job: Job):
+        job.stats.timeouts += 1
+        log.warning(f"Job '{job.name}' still running after its {job.timeout_s:g}s timeout")
+
+    def start(self):
+        """Start one daemon thread per worker."""
+        self._stop.clear()
+        for worker in self._workers.values():
+            if worker.thread is None or not worker.thread.is_alive():
+                worker.thread = threading.Thread(
+                    target=worker.run, name=f"scheduler-{worker.name}", daemon=True,
+                )
+                worker.thread.start()
+
+    def stop(self, wait: bool = True, timeout: Optional[float] = None):
+        """Stop dispatching; running jobs finish first when `wait` is set."""
+        self._stop.set()
+        for worker in self._workers.values():
+            with worker.cond:
+                worker.cond.notify_all()
+        if wait:
+            for worker in self._workers.values():
+                if worker.thread is not None:
+                    worker.thread.join(timeout)
+
+    def run_while(self, keep_running: Callable[[], bool], poll_s: float = 1.0):
+        """Start the workers and block the calling thread until keep_running() is False."""
+        self.start()
+        try:
+            while keep_running():
+                time.sleep(poll_s)
+        finally:
+            self.stop()
+
+    def run_due(self) -> int:
+        """
+        Run every job due at clock() in the calling thread (stepped replay).
+
+        Earliest deadline first, highest priority among equal deadlines;
+        do not mix with start(). Returns the number of jobs run.
+        """
+        ran = 0
+        while True:
+            now = self.clock()
+            due = [(job.due, -job.priority, name) for name, job in self.jobs.items() if job.due <= now]
+            if not due:
+                return ran
+            job = self.jobs[min(due)[2]]
+            self._run_job(job)
+            job.reschedule(self.clock())
+            ran += 1
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Per-job stats plus the next deadline (UTC ISO)."""
+        return {
+            name: dict(
+                job.stats.to_dict(),
+                worker=job.worker,
+                priority=job.priority,
+                next_due=self.next_due(name).isoformat(),
+            )
+            for name, job in self.jobs.items()
+        }
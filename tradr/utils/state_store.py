@@ -0,0 +1,321 @@
+"""
+Embedded state store for the live bot (SQLite, WAL mode).
+
+Every piece of persisted bot state - pending setups, entry/spread queues,
+trading days, RiskManager / ChallengeRiskManager state, the trade registry -
+lives in one database as namespaced JSON records:
+
+    store = get_state_store()                        # bot_state.db (TRADR_STATE_DB)
+    store.put("pending_setups", "EUR_USD", setup.to_dict())
+    store.replace("awaiting_entry", self.awaiting_entry)   # writes only changed records
+    queue = store.items("awaiting_entry")
+
+Each write is one transaction, so a crash leaves either the old or the new
+record, never a half-written file; WAL with synchronous=FULL makes a commit
+durable once the call returns. replace() compares against the last written
+JSON per record and touches only the records that changed.
+
+The JSON files the bot used before are migrated on first use: when a
+namespace is empty and its legacy file exists, the file is imported and
+renamed to `<name>.migrated` (see migrate_json).
+
+State that is re-synced on every protection tick (RiskManager,
+ChallengeRiskManager) goes through a WriteBehind instead: stage() keeps the
+latest records per namespace and a background thread writes them every
+TRADR_STATE_FLUSH_S seconds; critical transitions write through at once and
+flush_all() drains everything on shutdown.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+DEFAULT_STATE_DB = "bot_state.db"
+DEFAULT_FLUSH_INTERVAL_S = float(os.getenv("TRADR_STATE_FLUSH_S", "30"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+
+
+class StateStore:
+    """
+    Namespaced JSON records in one SQLite database (thread-safe).
+
+    Args:
+        path: Database file (":memory:" for tests)
+    """
+
+    def __init__(self, path: str = DEFAULT_STATE_DB):
+        self.path = str(path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(_SCHEMA)
+        # Last written JSON per record, so replace() can skip unchanged ones
+        self._written: Dict[str, Dict[str, str]] = {}
+        self.stats = {"writes": 0, "deletes": 0, "skipped": 0}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _load(self, namespace: str) -> Dict[str, str]:
+        cached = self._written.get(namespace)
+        if cached is None:
+            rows = self._conn.execute(
+                "SELECT key, value FROM records WHERE namespace = ?", (namespace,)
+            ).fetchall()
+            cached = self._written[namespace] = dict(rows)
+        return cached
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        """All records of a namespace as {key: value}."""
+        with self._lock:
+            return {key: json.loads(raw) for key, raw in self._load(namespace).items()}
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            raw = self._load(namespace).get(key)
+        return default if raw is None else json.loads(raw)
+
+    def has(self, namespace: str) -> bool:
+        with self._lock:
+            return bool(self._load(namespace))
+
+    def differs(self, namespace: str, records: Dict[str, Any], ignore: Iterable[str] = ()) -> bool:
+        """True if replace(namespace, records) would change any record outside `ignore`."""
+        skip = set(ignore)
+        encoded = {str(k): v for k, v in records.items() if str(k) not in skip}
+        with self._lock:
+            current = {k: raw for k, raw in self._load(namespace).items() if k not in skip}
+        if current.keys() != encoded.keys():
+            return True
+        return any(current[k] != _dumps(v) for k, v in encoded.items())
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def put(self, namespace: str, key: str, value: Any):
+        """Insert or update one record (no-op if unchanged)."""
+        self.replace(namespace, {key: value}, partial=True)
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            if self._load(namespace).pop(key, None) is not None:
+                self._conn.execute("DELETE FROM records WHERE namespace = ? AND key = ?", (namespace, key))
+                self.stats["deletes"] += 1
+
+    def replace(self, namespace: str, records: Dict[str, Any], partial: bool = False):
+        """
+        Make the namespace equal to `records` in one transaction.
+
+        Only records whose JSON changed are written; keys missing from
+        `records` are deleted unless `partial` is set.
+        """
+        encoded = {str(key): _dumps(value) for key, value in records.items()}
+        now = time.time()
+        with self._lock:
+            current = self._load(namespace)
+            changed = [(k, v) for k, v in encoded.items() if current.get(k) != v]
+            removed = [] if partial else [k for k in current if k not in encoded]
+            self.stats["skipped"] += len(encoded) - len(changed)
+            if not changed and not removed:
+                return
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO records (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                    [(namespace, k, v, now) for k, v in changed],
+                )
+                self._conn.executemany(
+                    "DELETE FROM records WHERE namespace = ? AND key = ?", [(namespace, k) for k in removed]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            current.update(changed)
+            for k in removed:
+                del current[k]
+            self.stats["writes"] += len(changed)
+            self.stats["deletes"] += len(removed)
+
+    def clear(self, namespace: str):
+        self.replace(namespace, {})
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def migrate_json(
+        self,
+        namespace: str,
+        path,
+        to_records: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    ) -> bool:
+        """
+        Import a legacy JSON state file into an empty namespace.
+
+        Top-level keys of the JSON object become records unless `to_records`
+        maps the document differently. The file is renamed to
+        `<name>.migrated` afterwards. Returns True when something was imported.
+        """
+        path = Path(path)
+        if not path.exists() or self.has(namespace):
+            return False
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            records = to_records(data) if to_records else data
+            self.replace(namespace, records)
+            path.replace(path.with_name(path.name + ".migrated"))
+            print(f"[StateStore] Migrated {path} -> {self.path} [{namespace}] ({len(records)} records)")
+            return True
+        except Exception as e:
+            print(f"[StateStore] Could not migrate {path}: {e}")
+            return False
+
+
+class WriteBehind:
+    """
+    Coalesced, deferred replace() calls into a StateStore.
+
+    stage() only remembers the latest records per namespace; a daemon thread
+    writes the dirty namespaces every `interval_s`. critical=True writes
+    through immediately (halts, phase changes, a new day). Records that
+    differ from the stored ones only in `volatile` keys (timestamps) are not
+    staged at all.
+
+    Args:
+        store: Target store
+        interval_s: Flush cadence in seconds
+        volatile: Keys that alone never make a namespace dirty
+    """
+
+    def __init__(
+        self,
+        store: StateStore,
+        interval_s: float = DEFAULT_FLUSH_INTERVAL_S,
+        volatile: Tuple[str, ...] = ("last_update",),
+    ):
+        self.store = store
+        self.interval_s = interval_s
+        self.volatile = volatile
+        # Re-entrant: signal_handler may flush on the main thread mid-stage()
+        self._lock = threading.RLock()
+        self._write_lock = threading.RLock()  # Keeps a write-through ordered after a running flush
+        self._dirty: Dict[str, Dict[str, Any]] = {}
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"staged": 0, "coalesced": 0, "unchanged": 0, "flushes": 0, "write_through": 0}
+
+    def stage(self, namespace: str, records: Dict[str, Any], critical: bool = False):
+        """Queue `records` as the new content of `namespace` (written now if critical)."""
+        if critical:
+            with self._write_lock:
+                with self._lock:
+                    self._dirty.pop(namespace, None)
+                self.store.replace(namespace, records)
+            self.stats["write_through"] += 1
+            return
+
+        with self._lock:
+            if namespace in self._dirty:
+                self._dirty[namespace] = records
+                self.stats["coalesced"] += 1
+            elif self.store.differs(namespace, records, ignore=self.volatile):
+                self._dirty[namespace] = records
+                self.stats["staged"] += 1
+                self._ensure_thread()
+            else:
+                self.stats["unchanged"] += 1
+
+    def flush(self) -> int:
+        """Write every dirty namespace now; returns how many were written."""
+        with self._write_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+            for namespace, records in dirty.items():
+                try:
+                    self.store.replace(namespace, records)
+                except Exception as e:
+                    print(f"[StateStore] Deferred write of {namespace} failed: {e}")
+        if dirty:
+            self.stats["flushes"] += 1
+        return len(dirty)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="state-write-behind", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._wake.wait(self.interval_s):
+            self.flush()
+        self.flush()
+
+    def close(self):
+        """Stop the flush thread after a final flush."""
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+
+_write_behinds: "weakref.WeakKeyDictionary[StateStore, WriteBehind]" = weakref.WeakKeyDictionary()
+_write_behinds_lock = threading.Lock()
+
+
+def get_write_behind(store: StateStore) -> WriteBehind:
+    """Shared WriteBehind per store (cadence: TRADR_STATE_FLUSH_S, default 30s)."""
+    with _write_behinds_lock:
+        writer = _write_behinds.get(store)
+        if writer is None:
+            writer = _write_behinds[store] = WriteBehind(store)
+        return writer
+
+
+def flush_all() -> int:
+    """Flush every WriteBehind (call on shutdown); returns namespaces written."""
+    with _write_behinds_lock:
+        writers = list(_write_behinds.values())
+    return sum(writer.flush() for writer in writers)
+
+
+_stores: Dict[str, StateStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_state_store(path: Optional[str] = None) -> StateStore:
+    """Shared store per database path (default: TRADR_STATE_DB or bot_state.db in the cwd)."""
+    path = str(Path(path or os.getenv("TRADR_STATE_DB", DEFAULT_STATE_DB)).resolve())
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = StateStore(path)
+        return store